@@ -83,7 +83,7 @@ def calculate_location_score(job: Job, recruiter: Recruiter) -> dict:
         job_province = job_address.commune.province
         if job_province:
             job_province_id = job_province.id
-            job_province_code = job_province.code if hasattr(job_province, 'code') else None
+            job_province_code = job_province.province_code
     
     # Get recruiter location
     recruiter_address = recruiter.address
@@ -94,7 +94,7 @@ def calculate_location_score(job: Job, recruiter: Recruiter) -> dict:
         recruiter_province = recruiter_address.commune.province
         if recruiter_province:
             recruiter_province_id = recruiter_province.id
-            recruiter_province_code = recruiter_province.code if hasattr(recruiter_province, 'code') else None
+            recruiter_province_code = recruiter_province.province_code
     
     # Handle unknown locations
     if not job_province_id or not recruiter_province_id:
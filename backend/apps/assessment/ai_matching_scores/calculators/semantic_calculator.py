@@ -1,21 +1,27 @@
-# Semantic Calculator using Gemini API
+# Semantic Calculator using the configured embedding backend (Gemini by default)
 import logging
 from decimal import Decimal
 from typing import Optional
 
-from apps.assessment.ai_matching_scores.services.gemini_service import GeminiService
+import numpy as np
+
+from apps.assessment.ai_matching_scores.models import EntityEmbedding
+from apps.assessment.ai_matching_scores.services.embeddings import (
+    get_embedding_backend,
+    get_entity_vector,
+)
 
 logger = logging.getLogger(__name__)
 
 
 def get_embedding_model() -> str:
     """Get the embedding model name."""
-    return 'models/text-embedding-004'
+    return get_embedding_backend().model_name
 
 
 def get_embedding(text: str) -> Optional[list[float]]:
     """
-    Get embedding vector for a text using Gemini API.
+    Get embedding vector for a text using the configured backend.
     
     Args:
         text: Text to embed
@@ -23,24 +29,39 @@ def get_embedding(text: str) -> Optional[list[float]]:
     Returns:
         List of floats representing the embedding, or None if failed
     """
-    return GeminiService.get_embedding(text)
+    return get_embedding_backend().embed(text)
+
+
+def get_job_embedding(job) -> Optional[np.ndarray]:
+    """Cached embedding of a job (embedded again only when its text changes)."""
+    return get_entity_vector(
+        EntityEmbedding.EntityType.JOB, job.pk, _build_job_text(job), embed=get_embedding
+    )
+
+
+def get_recruiter_embedding(recruiter) -> Optional[np.ndarray]:
+    """Cached embedding of a recruiter (embedded again only when its text changes)."""
+    return get_entity_vector(
+        EntityEmbedding.EntityType.RECRUITER, recruiter.pk, _build_recruiter_text(recruiter),
+        embed=get_embedding,
+    )
 
 
-def cosine_similarity(vec1: list[float], vec2: list[float]) -> float:
+def cosine_similarity(vec1, vec2) -> float:
     """
     Calculate cosine similarity between two vectors.
     """
-    if not vec1 or not vec2 or len(vec1) != len(vec2):
+    if vec1 is None or vec2 is None or len(vec1) == 0 or len(vec1) != len(vec2):
         return 0.0
     
-    dot_product = sum(a * b for a, b in zip(vec1, vec2))
-    magnitude1 = sum(a * a for a in vec1) ** 0.5
-    magnitude2 = sum(b * b for b in vec2) ** 0.5
+    a = np.asarray(vec1, dtype=np.float64)
+    b = np.asarray(vec2, dtype=np.float64)
+    magnitude = np.linalg.norm(a) * np.linalg.norm(b)
     
-    if magnitude1 == 0 or magnitude2 == 0:
+    if magnitude == 0:
         return 0.0
     
-    return dot_product / (magnitude1 * magnitude2)
+    return float(np.dot(a, b) / magnitude)
 
 
 def calculate_semantic_score(job, recruiter) -> dict:
@@ -75,11 +96,15 @@ def calculate_semantic_score(job, recruiter) -> dict:
                 }
             }
         
-        # Get embeddings
-        job_embedding = get_embedding(job_text)
-        recruiter_embedding = get_embedding(recruiter_text)
+        # Get embeddings (cached per entity content hash)
+        job_embedding = get_entity_vector(
+            EntityEmbedding.EntityType.JOB, job.pk, job_text, embed=get_embedding
+        )
+        recruiter_embedding = get_entity_vector(
+            EntityEmbedding.EntityType.RECRUITER, recruiter.pk, recruiter_text, embed=get_embedding
+        )
         
-        if not job_embedding or not recruiter_embedding:
+        if job_embedding is None or recruiter_embedding is None:
             return {
                 'score': Decimal('50.00'),
                 'is_semantic': False,
@@ -196,6 +221,6 @@ def _build_recruiter_text(recruiter) -> str:
 
 
 def is_semantic_enabled() -> bool:
-    """Check if semantic matching is enabled (Gemini configured)."""
-    # GeminiService._get_client() returns None if API key not configured
-    return GeminiService._get_client() is not None
+    """Check if semantic matching is enabled (embedding backend available)."""
+    # GeminiEmbeddingBackend is unavailable when the API key is not configured
+    return get_embedding_backend().is_available()
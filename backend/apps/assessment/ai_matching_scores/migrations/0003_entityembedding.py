@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessment_ai_matching_scores', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EntityEmbedding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity_type', models.CharField(choices=[('job', 'Công việc'), ('recruiter', 'Ứng viên')], max_length=20, verbose_name='Loại đối tượng')),
+                ('entity_id', models.BigIntegerField(verbose_name='ID đối tượng')),
+                ('model_name', models.CharField(max_length=100, verbose_name='Model embedding')),
+                ('content_hash', models.CharField(max_length=64, verbose_name='Hash nội dung')),
+                ('dimensions', models.PositiveIntegerField(verbose_name='Số chiều')),
+                ('vector', models.BinaryField(verbose_name='Vector (float32)')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Ngày cập nhật')),
+            ],
+            options={
+                'verbose_name': 'Embedding AI',
+                'verbose_name_plural': 'Embedding AI',
+                'db_table': 'ai_entity_embeddings',
+                'indexes': [models.Index(fields=['entity_type', 'model_name'], name='idx_embedding_type_model')],
+                'unique_together': {('entity_type', 'entity_id', 'model_name')},
+            },
+        ),
+    ]
@@ -82,3 +82,50 @@ class AIMatchingScore(models.Model):
     
     def __str__(self):
         return f"{self.recruiter.user.full_name} - {self.job.title} : {self.overall_score}"
+
+
+class EntityEmbedding(models.Model):
+    """Bảng AI_Entity_Embeddings - Vector embedding của Job / Recruiter"""
+    
+    class EntityType(models.TextChoices):
+        JOB = 'job', 'Công việc'
+        RECRUITER = 'recruiter', 'Ứng viên'
+    
+    entity_type = models.CharField(
+        max_length=20,
+        choices=EntityType.choices,
+        verbose_name='Loại đối tượng'
+    )
+    entity_id = models.BigIntegerField(
+        verbose_name='ID đối tượng'
+    )
+    model_name = models.CharField(
+        max_length=100,
+        verbose_name='Model embedding'
+    )
+    content_hash = models.CharField(
+        max_length=64,
+        verbose_name='Hash nội dung'
+    )
+    dimensions = models.PositiveIntegerField(
+        verbose_name='Số chiều'
+    )
+    vector = models.BinaryField(
+        verbose_name='Vector (float32)'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Ngày cập nhật'
+    )
+    
+    class Meta:
+        db_table = 'ai_entity_embeddings'
+        verbose_name = 'Embedding AI'
+        verbose_name_plural = 'Embedding AI'
+        unique_together = ['entity_type', 'entity_id', 'model_name']
+        indexes = [
+            models.Index(fields=['entity_type', 'model_name'], name='idx_embedding_type_model'),
+        ]
+    
+    def __str__(self):
+        return f"{self.entity_type}:{self.entity_id} ({self.model_name})"
@@ -1,3 +1,4 @@
+from collections import defaultdict
 from decimal import Decimal
 from typing import Optional
 from pydantic import BaseModel, Field, field_validator
@@ -18,6 +19,10 @@ from apps.assessment.ai_matching_scores.calculators import (
     calculate_semantic_score,
     is_semantic_enabled,
 )
+from apps.assessment.ai_matching_scores.services.batch_scoring import (
+    score_job_against_recruiters,
+    score_recruiter_against_jobs,
+)
 
 
 
@@ -175,31 +180,16 @@ def batch_calculate_matches(input_data: BatchCalculateInput) -> list[AIMatchingS
     """
     Calculate match scores for multiple recruiters against a single job.
     
-    Uses transaction to ensure atomicity.
+    Uses the vectorized batch engine: data is bulk-loaded once and all
+    scores are written with a single upsert.
     
     Args:
         input_data: BatchCalculateInput with job_id and recruiter_ids
         
     Returns:
-        List of AIMatchingScore instances
+        List of AIMatchingScore instances (invalid IDs are skipped)
     """
-    results = []
-    
-    with transaction.atomic():
-        for recruiter_id in input_data.recruiter_ids:
-            try:
-                score = calculate_single_match(
-                    CalculateMatchInput(
-                        job_id=input_data.job_id,
-                        recruiter_id=recruiter_id
-                    )
-                )
-                results.append(score)
-            except (Job.DoesNotExist, Recruiter.DoesNotExist):
-                # Skip invalid IDs
-                continue
-    
-    return results
+    return score_job_against_recruiters(input_data.job_id, input_data.recruiter_ids)
 
 
 def refresh_matches(input_data: RefreshMatchInput) -> int:
@@ -210,12 +200,26 @@ def refresh_matches(input_data: RefreshMatchInput) -> int:
     If recruiter_id provided: refresh all scores for that recruiter
     If both provided: refresh only that specific pair
     
+    Pairs are grouped per job and recalculated with the batch engine;
+    a recruiter-only refresh scores all of that recruiter's jobs in one
+    batch (score_recruiter_against_jobs).
+    
     Args:
         input_data: RefreshMatchInput
         
     Returns:
         Number of scores refreshed
     """
+    if input_data.recruiter_id and not input_data.job_id:
+        job_ids = list(
+            AIMatchingScore.objects.filter(recruiter_id=input_data.recruiter_id)
+            .values_list('job_id', flat=True)
+        )
+        if not job_ids:
+            return 0
+        with transaction.atomic():
+            return len(score_recruiter_against_jobs(input_data.recruiter_id, job_ids))
+    
     # Build query filter
     filters = Q()
     if input_data.job_id:
@@ -223,24 +227,17 @@ def refresh_matches(input_data: RefreshMatchInput) -> int:
     if input_data.recruiter_id:
         filters &= Q(recruiter_id=input_data.recruiter_id)
     
-    # Get existing scores to refresh
-    existing_scores = AIMatchingScore.objects.filter(filters)
+    # Group existing pairs by job
+    recruiters_by_job = defaultdict(list)
+    for job_id, recruiter_id in AIMatchingScore.objects.filter(filters).values_list(
+        'job_id', 'recruiter_id'
+    ):
+        recruiters_by_job[job_id].append(recruiter_id)
     
     count = 0
     with transaction.atomic():
-        for score in existing_scores:
-            try:
-                calculate_single_match(
-                    CalculateMatchInput(
-                        job_id=score.job_id,
-                        recruiter_id=score.recruiter_id
-                    )
-                )
-                count += 1
-            except (Job.DoesNotExist, Recruiter.DoesNotExist):
-                # Mark as invalid if entities no longer exist
-                score.is_valid = False
-                score.save(update_fields=['is_valid'])
+        for job_id, recruiter_ids in recruiters_by_job.items():
+            count += len(score_job_against_recruiters(job_id, recruiter_ids))
     
     return count
 
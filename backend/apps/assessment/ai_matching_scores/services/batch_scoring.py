@@ -0,0 +1,554 @@
+"""
+Vectorized batch scoring engine for AI Matching.
+
+Scores one job against many recruiters (or one recruiter against many jobs)
+in a handful of queries: skills, addresses and salary data are bulk-loaded
+into NumPy arrays, every rule-based component is computed for the whole
+job x recruiter matrix at once, and results are written back with a single
+upsert per chunk.
+
+The rules mirror the per-pair calculators in ``calculators/`` exactly; the
+per-pair path (``calculate_single_match``) remains the reference
+implementation and keeps the verbose ``matching_details``.
+"""
+import logging
+from decimal import Decimal
+from typing import Iterable, Optional
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from apps.assessment.ai_matching_scores.models import AIMatchingScore
+from apps.assessment.ai_matching_scores.calculators import is_semantic_enabled
+from apps.assessment.ai_matching_scores.calculators.education_calculator import (
+    _infer_required_education,
+    get_education_level_value,
+)
+from apps.assessment.ai_matching_scores.calculators.location_calculator import (
+    get_province_region,
+)
+from apps.assessment.ai_matching_scores.calculators.semantic_calculator import (
+    get_job_embedding,
+    get_recruiter_embedding,
+)
+from apps.assessment.ai_matching_scores.calculators.skill_calculator import (
+    PROFICIENCY_WEIGHTS,
+)
+from apps.assessment.ai_matching_scores.services.embeddings import normalize_rows
+from apps.candidate.recruiter_skills.models import RecruiterSkill
+from apps.candidate.recruiters.models import Recruiter
+from apps.geography.provinces.models import Province
+from apps.recruitment.job_skills.models import JobSkill
+from apps.recruitment.jobs.models import Job
+
+logger = logging.getLogger(__name__)
+
+
+# Max number of "many side" entities scored per chunk. Bounds both the size
+# of the (jobs x recruiters x skills) tensor and the size of each upsert.
+BATCH_CHUNK_SIZE = 5000
+
+SCORE_FIELDS = [
+    'overall_score',
+    'skill_match_score',
+    'experience_match_score',
+    'education_match_score',
+    'location_match_score',
+    'salary_match_score',
+]
+
+JOB_FIELDS = (
+    'id', 'level', 'experience_years_min', 'experience_years_max',
+    'salary_min', 'salary_max', 'salary_currency', 'is_salary_negotiable',
+    'is_remote', 'address__commune__province_id',
+)
+
+RECRUITER_FIELDS = (
+    'id', 'years_of_experience', 'highest_education_level',
+    'desired_salary_min', 'desired_salary_max', 'salary_currency',
+    'address__commune__province_id',
+)
+
+
+def score_job_against_recruiters(
+    job_id: int,
+    recruiter_ids: Iterable[int],
+    chunk_size: int = BATCH_CHUNK_SIZE,
+) -> list[AIMatchingScore]:
+    """
+    Score a single job against many recruiters and upsert the results.
+
+    Unknown recruiter IDs are skipped silently; an unknown job yields [].
+    """
+    recruiter_ids = list(dict.fromkeys(recruiter_ids))
+    results = []
+    for start in range(0, len(recruiter_ids), chunk_size):
+        results.extend(
+            score_pairs([job_id], recruiter_ids[start:start + chunk_size])
+        )
+    return results
+
+
+def score_recruiter_against_jobs(
+    recruiter_id: int,
+    job_ids: Iterable[int],
+    chunk_size: int = BATCH_CHUNK_SIZE,
+) -> list[AIMatchingScore]:
+    """
+    Score a single recruiter against many jobs and upsert the results.
+
+    Unknown job IDs are skipped silently; an unknown recruiter yields [].
+    """
+    job_ids = list(dict.fromkeys(job_ids))
+    results = []
+    for start in range(0, len(job_ids), chunk_size):
+        results.extend(
+            score_pairs(job_ids[start:start + chunk_size], [recruiter_id])
+        )
+    return results
+
+
+def score_pairs(job_ids: list[int], recruiter_ids: list[int]) -> list[AIMatchingScore]:
+    """
+    Score every (job, recruiter) combination of the given IDs and upsert them.
+
+    Intended for "one x many" workloads; callers should keep one side small
+    (see ``score_job_against_recruiters`` / ``score_recruiter_against_jobs``).
+    """
+    jobs = list(Job.objects.filter(id__in=job_ids).values(*JOB_FIELDS))
+    recruiters = list(
+        Recruiter.objects.filter(id__in=recruiter_ids).values(*RECRUITER_FIELDS)
+    )
+    if not jobs or not recruiters:
+        return []
+
+    matrix = calculate_score_matrix(jobs, recruiters)
+    return _save_score_matrix(matrix)
+
+
+def calculate_score_matrix(jobs: list[dict], recruiters: list[dict]) -> dict:
+    """
+    Compute all rule-based component scores for a jobs x recruiters matrix.
+
+    Args:
+        jobs: Rows of ``Job.objects.values(*JOB_FIELDS)``
+        recruiters: Rows of ``Recruiter.objects.values(*RECRUITER_FIELDS)``
+
+    Returns:
+        dict with ``job_ids`` / ``recruiter_ids`` arrays and, per component,
+        a (J, R) float array of scores plus a (J, R) array of statuses.
+    """
+    job_ids = np.array([j['id'] for j in jobs], dtype=np.int64)
+    recruiter_ids = np.array([r['id'] for r in recruiters], dtype=np.int64)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        skill = _skill_matrix(job_ids, recruiter_ids)
+        experience = _experience_matrix(jobs, recruiters)
+        education = _education_matrix(jobs, recruiters)
+        location = _location_matrix(jobs, recruiters)
+        salary = _salary_matrix(jobs, recruiters)
+
+    shape = (len(job_ids), len(recruiter_ids))
+    matrix = {
+        'job_ids': job_ids,
+        'recruiter_ids': recruiter_ids,
+    }
+    for name, component in (
+        ('skill', skill),
+        ('experience', experience),
+        ('education', education),
+        ('location', location),
+        ('salary', salary),
+    ):
+        # Some rules only depend on one side; expand everything to (J, R)
+        matrix[name] = {
+            key: np.broadcast_to(value, shape) for key, value in component.items()
+        }
+    return matrix
+
+
+# ---------------------------------------------------------------------------
+# Component matrices
+# ---------------------------------------------------------------------------
+
+def _skill_matrix(job_ids: np.ndarray, recruiter_ids: np.ndarray) -> dict:
+    """Vectorized ``calculate_skill_score``."""
+    job_skills = list(
+        JobSkill.objects.filter(job_id__in=job_ids.tolist())
+        .values_list('job_id', 'skill_id', 'is_required', 'proficiency_level')
+    )
+    shape = (len(job_ids), len(recruiter_ids))
+    if not job_skills:
+        return {
+            'score': np.full(shape, 100.0),
+            'status': np.full(shape, 'no_requirements', dtype=object),
+            'total_job_skills': np.zeros(shape, dtype=np.int64),
+            'total_matched': np.zeros(shape, dtype=np.int64),
+            'required_matched': np.zeros(shape, dtype=np.int64),
+            'required_missing': np.zeros(shape, dtype=np.int64),
+        }
+
+    skill_ids = sorted({row[1] for row in job_skills})
+    skill_index = {skill_id: i for i, skill_id in enumerate(skill_ids)}
+    job_index = {job_id: i for i, job_id in enumerate(job_ids.tolist())}
+    recruiter_index = {rid: i for i, rid in enumerate(recruiter_ids.tolist())}
+
+    # Job side: weight (3 required / 1 optional / 0 absent) and required level
+    weights = np.zeros((len(job_ids), len(skill_ids)))
+    required_levels = np.ones((len(job_ids), len(skill_ids)))
+    for job_id, skill_id, is_required, proficiency in job_skills:
+        j, s = job_index[job_id], skill_index[skill_id]
+        weights[j, s] = 3.0 if is_required else 1.0
+        required_levels[j, s] = PROFICIENCY_WEIGHTS.get(proficiency or 'intermediate', 2)
+
+    # Recruiter side: proficiency level, 0 when the skill is missing
+    levels = np.zeros((len(recruiter_ids), len(skill_ids)))
+    recruiter_skills = RecruiterSkill.objects.filter(
+        recruiter_id__in=recruiter_ids.tolist(),
+        skill_id__in=skill_ids,
+    ).values_list('recruiter_id', 'skill_id', 'proficiency_level')
+    for recruiter_id, skill_id, proficiency in recruiter_skills:
+        levels[recruiter_index[recruiter_id], skill_index[skill_id]] = (
+            PROFICIENCY_WEIGHTS.get(proficiency or 'intermediate', 2)
+        )
+
+    # (J, R, S): full credit when level >= required, else level / required
+    has_skill = levels[None, :, :] > 0
+    ratio = np.minimum(levels[None, :, :] / required_levels[:, None, :], 1.0)
+    earned = (weights[:, None, :] * 100.0 * ratio * has_skill).sum(axis=2)
+    max_points = weights.sum(axis=1) * 100.0
+
+    has_requirements = (max_points > 0)[:, None]
+    score = np.where(
+        has_requirements,
+        earned / np.where(max_points > 0, max_points, 1.0)[:, None] * 100.0,
+        100.0,
+    )
+
+    in_job = (weights > 0)[:, None, :]
+    required = (weights == 3.0)[:, None, :]
+    matched = in_job & has_skill
+
+    return {
+        'score': np.round(score, 2),
+        'status': np.where(has_requirements, 'calculated', 'no_requirements').astype(object),
+        'total_job_skills': (weights > 0).sum(axis=1)[:, None],
+        'total_matched': matched.sum(axis=2),
+        'required_matched': (matched & required).sum(axis=2),
+        'required_missing': (required & ~has_skill).sum(axis=2),
+    }
+
+
+def _experience_matrix(jobs: list[dict], recruiters: list[dict]) -> dict:
+    """Vectorized ``calculate_experience_score``."""
+    min_exp = np.array([j['experience_years_min'] or 0 for j in jobs], dtype=float)[:, None]
+    max_exp = np.array(
+        [np.nan if j['experience_years_max'] is None else j['experience_years_max'] for j in jobs],
+        dtype=float,
+    )[:, None]
+    exp = np.array([r['years_of_experience'] or 0 for r in recruiters], dtype=float)[None, :]
+
+    ratio = np.where(min_exp > 0, exp / min_exp, 0.0)
+    gap = min_exp - exp
+    has_max = ~np.isnan(max_exp)
+
+    # No upper limit
+    open_conditions = [exp >= min_exp, exp >= min_exp - 1, exp >= min_exp - 2]
+    open_score = np.select(
+        open_conditions, [100.0, 85.0, 70.0],
+        default=np.where(min_exp > 0, np.maximum(30.0, ratio * 60), 30.0),
+    )
+    open_status = np.select(
+        open_conditions,
+        ['meets_requirement', 'slightly_under', 'under_requirement'],
+        default='significantly_under',
+    )
+
+    # Bounded range
+    under = exp < min_exp
+    bounded_conditions = [
+        (exp >= min_exp) & (exp <= max_exp),
+        under & (gap <= 1),
+        under & (gap <= 2),
+        under,
+        exp - max_exp <= 3,
+    ]
+    bounded_score = np.select(
+        bounded_conditions,
+        [100.0, 85.0, 70.0, np.where(min_exp > 0, np.maximum(20.0, ratio * 50), 20.0), 100.0],
+        default=95.0,
+    )
+    bounded_status = np.select(
+        bounded_conditions,
+        ['perfect_fit', 'slightly_under', 'under_requirement',
+         'significantly_under', 'exceeds_requirement'],
+        default='significantly_exceeds',
+    )
+
+    return {
+        'score': np.round(np.where(has_max, bounded_score, open_score), 2),
+        'status': np.where(has_max, bounded_status, open_status).astype(object),
+    }
+
+
+def _education_matrix(jobs: list[dict], recruiters: list[dict]) -> dict:
+    """Vectorized ``calculate_education_score``."""
+    required = np.array(
+        [get_education_level_value(_infer_required_education(j['level'])) for j in jobs]
+    )[:, None]
+    known = np.array([bool(r['highest_education_level']) for r in recruiters])[None, :]
+    value = np.array(
+        [get_education_level_value(r['highest_education_level']) for r in recruiters]
+    )[None, :]
+
+    gap = required - value
+    conditions = [~known, gap <= 0, gap == 1, gap == 2]
+    return {
+        'score': np.select(conditions, [50.0, 100.0, 85.0, 60.0], default=30.0),
+        'status': np.select(
+            conditions,
+            ['unknown', 'meets_or_exceeds', 'slightly_below', 'below_requirement'],
+            default='significantly_below',
+        ).astype(object),
+    }
+
+
+def _location_matrix(jobs: list[dict], recruiters: list[dict]) -> dict:
+    """Vectorized ``calculate_location_score``."""
+    job_provinces = [j['address__commune__province_id'] for j in jobs]
+    recruiter_provinces = [r['address__commune__province_id'] for r in recruiters]
+
+    # Resolve regions once per distinct province, exactly like the per-pair
+    # calculator does (province_code through the same mapping).
+    province_ids = {p for p in job_provinces + recruiter_provinces if p}
+    region_codes = {None: 0}
+    province_region = {}
+    for province_id, province_code in Province.objects.filter(id__in=province_ids).values_list('id', 'province_code'):
+        region = get_province_region(province_code)
+        province_region[province_id] = region_codes.setdefault(region, len(region_codes))
+
+    is_remote = np.array([bool(j['is_remote']) for j in jobs])[:, None]
+    job_province = np.array([p or 0 for p in job_provinces])[:, None]
+    recruiter_province = np.array([p or 0 for p in recruiter_provinces])[None, :]
+    job_region = np.array([province_region.get(p, 0) for p in job_provinces])[:, None]
+    recruiter_region = np.array([province_region.get(p, 0) for p in recruiter_provinces])[None, :]
+
+    both_regions = (job_region > 0) & (recruiter_region > 0)
+    conditions = [
+        np.broadcast_to(is_remote, (len(jobs), len(recruiters))),
+        (job_province == 0) | (recruiter_province == 0),
+        job_province == recruiter_province,
+        both_regions & (job_region == recruiter_region),
+        both_regions,
+    ]
+    return {
+        'score': np.select(conditions, [100.0, 50.0, 100.0, 70.0, 40.0], default=50.0),
+        'status': np.select(
+            conditions,
+            ['remote_job', 'unknown_location', 'same_province', 'same_region', 'different_region'],
+            default='region_unknown',
+        ).astype(object),
+    }
+
+
+def _salary_matrix(jobs: list[dict], recruiters: list[dict]) -> dict:
+    """Vectorized ``calculate_salary_score``."""
+    def _amount(value) -> float:
+        return float(value) if value else 0.0
+
+    negotiable = np.array([bool(j['is_salary_negotiable']) for j in jobs])[:, None]
+    job_min = np.array([_amount(j['salary_min']) for j in jobs])[:, None]
+    job_max = np.array([_amount(j['salary_max']) for j in jobs])[:, None]
+    job_currency = np.array([j['salary_currency'] or 'VND' for j in jobs], dtype=object)[:, None]
+    rec_min = np.array([_amount(r['desired_salary_min']) for r in recruiters])[None, :]
+    rec_max = np.array([_amount(r['desired_salary_max']) for r in recruiters])[None, :]
+    rec_currency = np.array([r['salary_currency'] or 'VND' for r in recruiters], dtype=object)[None, :]
+
+    # Normalize ranges (use same value for min/max if only one is specified)
+    j_min = np.where(job_min > 0, job_min, job_max)
+    j_max = np.where(job_max > 0, job_max, job_min)
+    r_min = np.where(rec_min > 0, rec_min, rec_max)
+    r_max = np.where(rec_max > 0, rec_max, rec_min)
+
+    overlap_start = np.maximum(j_min, r_min)
+    overlap_end = np.minimum(j_max, r_max)
+    overlaps = overlap_start <= overlap_end
+
+    fallback_range = np.where(r_max * 0.1 != 0, r_max * 0.1, 1.0)
+    recruiter_range = np.where(r_max > r_min, r_max - r_min, fallback_range)
+    overlap_ratio = np.where(
+        recruiter_range > 0, (overlap_end - overlap_start) / recruiter_range, 1.0
+    )
+    below = j_max < r_min
+    gap_ratio = np.where(r_min > 0, (r_min - j_max) / r_min, 1.0)
+
+    conditions = [
+        np.broadcast_to(negotiable, (len(jobs), len(recruiters))),
+        np.broadcast_to((job_min == 0) & (job_max == 0), (len(jobs), len(recruiters))),
+        np.broadcast_to((rec_min == 0) & (rec_max == 0), (len(jobs), len(recruiters))),
+        job_currency != rec_currency,
+        overlaps & (j_min <= r_min) & (j_max >= r_max),
+        overlaps & (overlap_ratio >= 0.5),
+        overlaps,
+        below & (gap_ratio <= 0.1),
+        below & (gap_ratio <= 0.2),
+        below,
+    ]
+    return {
+        'score': np.select(
+            conditions,
+            [80.0, 70.0, 70.0, 50.0, 100.0, 85.0, 70.0, 60.0, 40.0, 20.0],
+            default=100.0,
+        ),
+        'status': np.select(
+            conditions,
+            ['negotiable', 'job_salary_unknown', 'recruiter_expectation_unknown',
+             'currency_mismatch', 'full_match', 'good_overlap', 'partial_overlap',
+             'slightly_below_expectation', 'below_expectation', 'far_below_expectation'],
+            default='above_expectation',
+        ).astype(object),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Aggregation & persistence
+# ---------------------------------------------------------------------------
+
+def _to_cents(scores: np.ndarray) -> np.ndarray:
+    return np.rint(scores * 100).astype(np.int64)
+
+
+def _weighted_overall(components: dict, weights: dict) -> np.ndarray:
+    """
+    Weighted sum in integer arithmetic (cents x hundredths), quantized to
+    cents with ROUND_HALF_EVEN so results match the Decimal-based path.
+    """
+    total = sum(
+        _to_cents(components[name]) * int(weight * 100)
+        for name, weight in weights.items()
+    )
+    quotient, remainder = np.divmod(total, 100)
+    round_up = (remainder > 50) | ((remainder == 50) & (quotient % 2 == 1))
+    return quotient + round_up
+
+
+def _semantic_matrix(job_ids: np.ndarray, recruiter_ids: np.ndarray) -> Optional[dict]:
+    """
+    Semantic scores for the whole matrix, or None when AI matching is disabled.
+
+    Each entity is embedded at most once (cached by content hash), then all
+    cosine similarities come from a single matrix product.
+    """
+    if not is_semantic_enabled():
+        return None
+
+    jobs = Job.objects.in_bulk(job_ids.tolist())
+    recruiters = Recruiter.objects.in_bulk(recruiter_ids.tolist())
+    job_vectors = [get_job_embedding(jobs[job_id]) for job_id in job_ids.tolist()]
+    recruiter_vectors = [
+        get_recruiter_embedding(recruiters[recruiter_id]) for recruiter_id in recruiter_ids.tolist()
+    ]
+
+    shape = (len(job_ids), len(recruiter_ids))
+    job_ok = np.array([v is not None for v in job_vectors])
+    recruiter_ok = np.array([v is not None for v in recruiter_vectors])
+    if not job_ok.any() or not recruiter_ok.any():
+        return {'score': np.zeros(shape), 'enabled': np.zeros(shape, dtype=bool)}
+
+    dimensions = next(v for v in job_vectors if v is not None).shape[0]
+    job_matrix = np.vstack([
+        v if v is not None else np.zeros(dimensions, dtype=np.float32) for v in job_vectors
+    ])
+    recruiter_matrix = np.vstack([
+        v if v is not None else np.zeros(dimensions, dtype=np.float32) for v in recruiter_vectors
+    ])
+    similarity = normalize_rows(job_matrix.astype(np.float64)) @ normalize_rows(
+        recruiter_matrix.astype(np.float64)
+    ).T
+
+    return {
+        'score': np.round(np.clip(similarity * 100, 0, 100), 2),
+        'enabled': job_ok[:, None] & recruiter_ok[None, :],
+    }
+
+
+def _save_score_matrix(matrix: dict) -> list[AIMatchingScore]:
+    """Combine component matrices into overall scores and upsert them."""
+    # Imported lazily: the service module imports this one for batching.
+    from apps.assessment.ai_matching_scores.services.ai_matching_scores import (
+        MATCHING_WEIGHTS_BASIC,
+        MATCHING_WEIGHTS_SEMANTIC,
+    )
+
+    components = {
+        name: matrix[name]['score']
+        for name in ('skill', 'experience', 'education', 'location', 'salary')
+    }
+    overall = _weighted_overall(components, MATCHING_WEIGHTS_BASIC)
+
+    semantic = _semantic_matrix(matrix['job_ids'], matrix['recruiter_ids'])
+    if semantic is not None:
+        overall = np.where(
+            semantic['enabled'],
+            _weighted_overall({**components, 'semantic': semantic['score']}, MATCHING_WEIGHTS_SEMANTIC),
+            overall,
+        )
+
+    now = timezone.now()
+    skill = matrix['skill']
+    objs = []
+    for j, job_id in enumerate(matrix['job_ids'].tolist()):
+        for r, recruiter_id in enumerate(matrix['recruiter_ids'].tolist()):
+            use_semantic = bool(semantic is not None and semantic['enabled'][j, r])
+            weights = MATCHING_WEIGHTS_SEMANTIC if use_semantic else MATCHING_WEIGHTS_BASIC
+            details = {
+                name: {
+                    'score': float(components[name][j, r]),
+                    'details': {'status': matrix[name]['status'][j, r]},
+                }
+                for name in components
+            }
+            details['skill']['details'].update({
+                'total_job_skills': int(skill['total_job_skills'][j, r]),
+                'total_matched': int(skill['total_matched'][j, r]),
+                'required_matched': int(skill['required_matched'][j, r]),
+                'required_missing': int(skill['required_missing'][j, r]),
+            })
+            details['weights'] = {k: float(v) for k, v in weights.items()}
+            details['semantic_enabled'] = use_semantic
+            details['engine'] = 'batch'
+            if use_semantic:
+                details['semantic'] = {'score': float(semantic['score'][j, r])}
+
+            objs.append(AIMatchingScore(
+                job_id=job_id,
+                recruiter_id=recruiter_id,
+                overall_score=Decimal(int(overall[j, r])).scaleb(-2),
+                skill_match_score=_to_decimal(components['skill'][j, r]),
+                experience_match_score=_to_decimal(components['experience'][j, r]),
+                education_match_score=_to_decimal(components['education'][j, r]),
+                location_match_score=_to_decimal(components['location'][j, r]),
+                salary_match_score=_to_decimal(components['salary'][j, r]),
+                matching_details=details,
+                calculated_at=now,
+                is_valid=True,
+            ))
+
+    with transaction.atomic():
+        saved = AIMatchingScore.objects.bulk_create(
+            objs,
+            update_conflicts=True,
+            unique_fields=['job', 'recruiter'],
+            update_fields=SCORE_FIELDS + ['matching_details', 'calculated_at', 'is_valid'],
+        )
+
+    logger.info(
+        "Batch scored %d pairs (%d jobs x %d recruiters)",
+        len(saved), len(matrix['job_ids']), len(matrix['recruiter_ids']),
+    )
+    return saved
+
+
+def _to_decimal(value: float) -> Decimal:
+    return Decimal(f'{value:.2f}')
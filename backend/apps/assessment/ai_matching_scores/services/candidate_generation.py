@@ -0,0 +1,185 @@
+"""
+Candidate generation (retrieval stage) for AI Matching.
+
+Before anything is scored, a cheap SQL stage shortlists the top-K
+recruiters for a job (or jobs for a recruiter):
+
+1. Inverted skill index: ``recruiter_skills`` / ``job_skills`` are looked up
+   by ``skill_id`` and overlap is weighted like the skill calculator
+   (required = 3, optional = 1).
+2. Location prefilter: for on-site jobs only the same province (or an
+   unknown address) is kept.
+3. Level prefilter: candidates more than 2 years under the job's minimum
+   experience are dropped (they fall in the calculator's lowest band).
+
+Only the shortlist is passed to the batch scoring engine.
+"""
+from typing import Iterator, Optional
+
+from django.conf import settings
+from django.db.models import Case, Count, IntegerField, Q, Sum, Value, When
+from django.utils import timezone
+
+from apps.candidate.recruiter_skills.models import RecruiterSkill
+from apps.candidate.recruiters.models import Recruiter
+from apps.recruitment.job_skills.models import JobSkill
+from apps.recruitment.jobs.models import Job
+
+
+DEFAULT_SHORTLIST_SIZE = 500
+DEFAULT_CHUNK_SIZE = 100
+
+ACTIVE_SEARCH_STATUSES = ['active', 'passive']
+
+# Tolerated experience gap (years) before a candidate is filtered out
+EXPERIENCE_TOLERANCE = 2
+
+REQUIRED_SKILL_WEIGHT = 3
+OPTIONAL_SKILL_WEIGHT = 1
+
+
+def get_shortlist_size() -> int:
+    """Top-K size of the retrieval stage."""
+    return getattr(settings, 'AI_MATCHING_SHORTLIST_SIZE', DEFAULT_SHORTLIST_SIZE)
+
+
+def get_chunk_size() -> int:
+    """Number of entities scored per Celery subtask."""
+    return getattr(settings, 'AI_MATCHING_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+
+
+def chunked(ids: list[int], size: int) -> Iterator[list[int]]:
+    """Split a list of IDs into chunks of at most ``size``."""
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def shortlist_recruiter_ids(job: Job, k: Optional[int] = None) -> list[int]:
+    """
+    Shortlist the top-K recruiters for a job.
+
+    Args:
+        job: Job instance
+        k: Shortlist size (defaults to AI_MATCHING_SHORTLIST_SIZE)
+
+    Returns:
+        Recruiter IDs, best skill overlap first
+    """
+    k = k or get_shortlist_size()
+    queryset = Recruiter.objects.filter(
+        job_search_status__in=ACTIVE_SEARCH_STATUSES,
+        is_profile_public=True,
+    )
+
+    # Location prefilter
+    province_ids = _get_address_province_ids(job.address if job.address_id else None)
+    if not job.is_remote and province_ids:
+        queryset = queryset.filter(
+            _same_province_q(province_ids) | Q(address__isnull=True)
+        )
+
+    # Level prefilter
+    min_exp = job.experience_years_min or 0
+    if min_exp > EXPERIENCE_TOLERANCE:
+        queryset = queryset.filter(years_of_experience__gte=min_exp - EXPERIENCE_TOLERANCE)
+
+    # Inverted skill index: only recruiters holding at least one job skill
+    job_skills = list(JobSkill.objects.filter(job=job).values_list('skill_id', 'is_required'))
+    if job_skills:
+        required_ids = [skill_id for skill_id, is_required in job_skills if is_required]
+        queryset = queryset.filter(
+            skills__skill_id__in=[skill_id for skill_id, _ in job_skills]
+        ).annotate(
+            skill_overlap=Sum(Case(
+                When(skills__skill_id__in=required_ids, then=Value(REQUIRED_SKILL_WEIGHT)),
+                default=Value(OPTIONAL_SKILL_WEIGHT),
+                output_field=IntegerField(),
+            ))
+        ).order_by('-skill_overlap', '-updated_at', 'id')
+    else:
+        queryset = queryset.order_by('-updated_at', 'id')
+
+    return list(queryset.values_list('id', flat=True)[:k])
+
+
+def shortlist_job_ids(recruiter: Recruiter, k: Optional[int] = None) -> list[int]:
+    """
+    Shortlist the top-K open jobs for a recruiter.
+
+    Jobs without skill requirements are kept (they score 100 on skills).
+
+    Args:
+        recruiter: Recruiter instance
+        k: Shortlist size (defaults to AI_MATCHING_SHORTLIST_SIZE)
+
+    Returns:
+        Job IDs, best skill overlap first
+    """
+    k = k or get_shortlist_size()
+    today = timezone.now().date()
+    queryset = Job.objects.filter(status=Job.Status.PUBLISHED).filter(
+        Q(application_deadline__isnull=True) | Q(application_deadline__gte=today)
+    )
+
+    # Location prefilter
+    province_ids = _get_address_province_ids(recruiter.address if recruiter.address_id else None)
+    if province_ids:
+        queryset = queryset.filter(
+            Q(is_remote=True)
+            | _same_province_q(province_ids)
+            | Q(address__isnull=True)
+        )
+
+    # Level prefilter
+    years = recruiter.years_of_experience or 0
+    queryset = queryset.filter(
+        Q(experience_years_min__isnull=True)
+        | Q(experience_years_min__lte=years + EXPERIENCE_TOLERANCE)
+    )
+
+    # Inverted skill index
+    skill_ids = list(
+        RecruiterSkill.objects.filter(recruiter=recruiter).values_list('skill_id', flat=True)
+    )
+    queryset = queryset.annotate(
+        skill_overlap=Sum(Case(
+            When(
+                required_skills__skill_id__in=skill_ids,
+                required_skills__is_required=True,
+                then=Value(REQUIRED_SKILL_WEIGHT),
+            ),
+            When(
+                required_skills__skill_id__in=skill_ids,
+                then=Value(OPTIONAL_SKILL_WEIGHT),
+            ),
+            default=Value(0),
+            output_field=IntegerField(),
+        )),
+        skill_count=Count('required_skills'),
+    ).filter(
+        Q(skill_overlap__gt=0) | Q(skill_count=0)
+    ).order_by('-skill_overlap', '-published_at', 'id')
+
+    return list(queryset.values_list('id', flat=True)[:k])
+
+
+def _get_address_province_ids(address) -> set[int]:
+    """
+    Provinces an address may resolve to. Scoring reads
+    address.commune.province, so the commune's province comes first, with
+    the address's own province as a fallback.
+    """
+    if address is None:
+        return set()
+    ids = {address.province_id}
+    if address.commune_id:
+        ids.add(address.commune.province_id)
+    return {province_id for province_id in ids if province_id}
+
+
+def _same_province_q(province_ids: set[int]) -> Q:
+    """Match the scoring path (address__commune__province_id) and the address province."""
+    return (
+        Q(address__commune__province_id__in=province_ids)
+        | Q(address__province_id__in=province_ids)
+    )
@@ -0,0 +1,361 @@
+"""
+Embedding cache and vector store for semantic matching.
+
+Embeddings are keyed by a SHA-256 hash of the text built by
+``_build_job_text`` / ``_build_recruiter_text``, so an entity is only
+re-embedded when its text actually changes. Lookups go through three
+layers before calling the embedding backend:
+
+    in-process LRU  ->  Redis (django cache)  ->  ai_entity_embeddings table
+
+Vectors are stored as compact float32 blobs. ``top_k_similar`` runs a
+NumPy matrix product over all stored vectors of one entity type.
+
+The backend is pluggable via ``settings.AI_EMBEDDING_BACKEND`` (dotted path).
+``HashingEmbeddingBackend`` is a deterministic, offline stand-in for tests
+and local development.
+"""
+import base64
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+from apps.assessment.ai_matching_scores.models import EntityEmbedding
+from apps.assessment.ai_matching_scores.services.gemini_service import GeminiService
+from apps.core.caching import CacheKeyBuilder, CACHE_TIMEOUT_DAY
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_EMBEDDING_BACKEND = (
+    'apps.assessment.ai_matching_scores.services.embeddings.GeminiEmbeddingBackend'
+)
+
+# Max vectors kept in the in-process LRU
+MEMORY_CACHE_SIZE = 10000
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+class EmbeddingBackend:
+    """Base class for embedding backends."""
+    model_name = ''
+
+    def is_available(self) -> bool:
+        return True
+
+    def embed(self, text: str) -> Optional[list[float]]:
+        raise NotImplementedError
+
+
+class GeminiEmbeddingBackend(EmbeddingBackend):
+    """Gemini 'text-embedding-004' (768 dims)."""
+    model_name = 'models/text-embedding-004'
+
+    def is_available(self) -> bool:
+        return GeminiService._get_client() is not None
+
+    def embed(self, text: str) -> Optional[list[float]]:
+        return GeminiService.get_embedding(text)
+
+
+class HashingEmbeddingBackend(EmbeddingBackend):
+    """
+    Deterministic local stand-in (feature hashing of word tokens).
+
+    Texts sharing vocabulary get a positive cosine similarity; no network
+    access or API key is required.
+    """
+    model_name = 'local/hashing-256'
+    dimensions = 256
+
+    def embed(self, text: str) -> Optional[list[float]]:
+        tokens = re.findall(r'\w+', text.lower())
+        if not tokens:
+            return None
+
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for token in tokens:
+            digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], 'little') % self.dimensions
+            sign = 1.0 if digest[4] & 1 else -1.0
+            vector[bucket] += sign
+        return vector.tolist()
+
+
+_backends: dict[str, EmbeddingBackend] = {}
+
+
+def get_embedding_backend() -> EmbeddingBackend:
+    """Return the configured backend (instantiated once per process)."""
+    path = getattr(settings, 'AI_EMBEDDING_BACKEND', DEFAULT_EMBEDDING_BACKEND)
+    if path not in _backends:
+        _backends[path] = import_string(path)()
+    return _backends[path]
+
+
+# ---------------------------------------------------------------------------
+# Serialization helpers
+# ---------------------------------------------------------------------------
+
+def content_hash(text: str) -> str:
+    """SHA-256 of the entity text."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def to_blob(vector: Iterable[float]) -> bytes:
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def from_blob(blob: bytes) -> np.ndarray:
+    return np.frombuffer(bytes(blob), dtype=np.float32)
+
+
+# ---------------------------------------------------------------------------
+# Lookup layers
+# ---------------------------------------------------------------------------
+
+# Shared by all threads of a worker (gthread / threaded Celery pools)
+_lock = threading.Lock()
+_memory_cache: OrderedDict = OrderedDict()     # (model, hash) -> vector
+_persisted_keys: OrderedDict = OrderedDict()   # (type, id, model, hash) -> True
+
+
+def _lru_get(store: OrderedDict, key):
+    with _lock:
+        value = store.get(key)
+        if value is not None:
+            store.move_to_end(key)
+        return value
+
+
+def _lru_set(store: OrderedDict, key, value) -> None:
+    with _lock:
+        store[key] = value
+        store.move_to_end(key)
+        while len(store) > MEMORY_CACHE_SIZE:
+            store.popitem(last=False)
+
+
+def clear_memory_cache() -> None:
+    """Drop the in-process layers (vectors, persisted markers, top-k index)."""
+    with _lock:
+        _memory_cache.clear()
+        _persisted_keys.clear()
+        _index_cache.clear()
+
+
+def _redis_get(model_name: str, text_hash: str) -> Optional[np.ndarray]:
+    # Stored as base64 so it survives the JSON serializer used in production
+    encoded = cache.get(CacheKeyBuilder.ai_embedding(model_name, text_hash))
+    if not encoded:
+        return None
+    return from_blob(base64.b64decode(encoded))
+
+
+def _redis_set(model_name: str, text_hash: str, vector: np.ndarray) -> None:
+    cache.set(
+        CacheKeyBuilder.ai_embedding(model_name, text_hash),
+        base64.b64encode(to_blob(vector)).decode('ascii'),
+        CACHE_TIMEOUT_DAY,
+    )
+
+
+def get_entity_vector(
+    entity_type: str,
+    entity_id,
+    text: str,
+    embed: Optional[Callable[[str], Optional[list[float]]]] = None,
+) -> Optional[np.ndarray]:
+    """
+    Return the float32 embedding of an entity's text, embedding it at most once.
+
+    Args:
+        entity_type: EntityEmbedding.EntityType value
+        entity_id: Primary key of the entity (only saved instances are persisted)
+        text: Text built by _build_job_text / _build_recruiter_text
+        embed: Embedding function; defaults to the configured backend
+
+    Returns:
+        np.ndarray (float32) or None if the text could not be embedded
+    """
+    if not text:
+        return None
+
+    model_name = get_embedding_backend().model_name
+    text_hash = content_hash(text)
+    persist = isinstance(entity_id, int)
+    persisted_key = (entity_type, entity_id, model_name, text_hash)
+
+    vector = _lru_get(_memory_cache, (model_name, text_hash))
+    if vector is None:
+        vector = _redis_get(model_name, text_hash)
+
+    if vector is None and persist:
+        stored = EntityEmbedding.objects.filter(
+            entity_type=entity_type,
+            entity_id=entity_id,
+            model_name=model_name,
+            content_hash=text_hash,
+        ).values_list('vector', flat=True).first()
+        if stored is not None:
+            vector = from_blob(stored)
+            _redis_set(model_name, text_hash, vector)
+            _lru_set(_persisted_keys, persisted_key, True)
+
+    if vector is None:
+        raw = (embed or get_embedding_backend().embed)(text)
+        if not raw:
+            return None
+        vector = np.asarray(raw, dtype=np.float32)
+        _redis_set(model_name, text_hash, vector)
+
+    if persist and not _lru_get(_persisted_keys, persisted_key):
+        _persist_vector(entity_type, entity_id, model_name, text_hash, vector)
+        _lru_set(_persisted_keys, persisted_key, True)
+
+    _lru_set(_memory_cache, (model_name, text_hash), vector)
+    return vector
+
+
+def _persist_vector(
+    entity_type: str,
+    entity_id: int,
+    model_name: str,
+    text_hash: str,
+    vector: np.ndarray,
+) -> None:
+    """Upsert the entity row when its content hash changed."""
+    updated = EntityEmbedding.objects.filter(
+        entity_type=entity_type,
+        entity_id=entity_id,
+        model_name=model_name,
+    ).exclude(content_hash=text_hash).update(
+        content_hash=text_hash,
+        dimensions=len(vector),
+        vector=to_blob(vector),
+    )
+    if updated:
+        _bump_index_version(entity_type, model_name)
+        return
+
+    _, created = EntityEmbedding.objects.get_or_create(
+        entity_type=entity_type,
+        entity_id=entity_id,
+        model_name=model_name,
+        defaults={
+            'content_hash': text_hash,
+            'dimensions': len(vector),
+            'vector': to_blob(vector),
+        },
+    )
+    if created:
+        _bump_index_version(entity_type, model_name)
+
+
+def delete_entity_vectors(entity_type: str, entity_ids: Iterable[int]) -> int:
+    """Remove stored vectors of deleted entities."""
+    deleted, _ = EntityEmbedding.objects.filter(
+        entity_type=entity_type, entity_id__in=list(entity_ids)
+    ).delete()
+    if deleted:
+        _bump_index_version(entity_type, get_embedding_backend().model_name)
+    return deleted
+
+
+# ---------------------------------------------------------------------------
+# Top-k search
+# ---------------------------------------------------------------------------
+
+# (entity_type, model_name) -> (version, ids, normalized matrix)
+_index_cache: dict = {}
+
+
+def _get_index_version(entity_type: str, model_name: str) -> int:
+    return cache.get(CacheKeyBuilder.ai_embedding_index_version(entity_type, model_name)) or 1
+
+
+def _bump_index_version(entity_type: str, model_name: str) -> None:
+    key = CacheKeyBuilder.ai_embedding_index_version(entity_type, model_name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 2, None)
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize each row (zero rows stay zero)."""
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def _load_index(entity_type: str, model_name: str) -> tuple[np.ndarray, np.ndarray]:
+    """Stacked, normalized vectors of one entity type (cached per version)."""
+    version = _get_index_version(entity_type, model_name)
+    cached_index = _index_cache.get((entity_type, model_name))
+    if cached_index and cached_index[0] == version:
+        return cached_index[1], cached_index[2]
+
+    rows = list(
+        EntityEmbedding.objects.filter(entity_type=entity_type, model_name=model_name)
+        .values_list('entity_id', 'vector')
+        .order_by('entity_id')
+    )
+    if rows:
+        ids = np.array([entity_id for entity_id, _ in rows], dtype=np.int64)
+        matrix = normalize_rows(np.vstack([from_blob(blob) for _, blob in rows]))
+    else:
+        ids = np.zeros(0, dtype=np.int64)
+        matrix = np.zeros((0, 0), dtype=np.float32)
+
+    _index_cache[(entity_type, model_name)] = (version, ids, matrix)
+    return ids, matrix
+
+
+def top_k_similar(
+    query_vector,
+    entity_type: str,
+    k: int = 50,
+    candidate_ids: Optional[Iterable[int]] = None,
+) -> list[tuple[int, float]]:
+    """
+    Find the k stored entities most similar to a query vector.
+
+    Args:
+        query_vector: Embedding to search with
+        entity_type: EntityEmbedding.EntityType value to search in
+        k: Number of results
+        candidate_ids: Optional whitelist of entity IDs
+
+    Returns:
+        List of (entity_id, cosine_similarity), most similar first
+    """
+    ids, matrix = _load_index(entity_type, get_embedding_backend().model_name)
+    if not len(ids) or query_vector is None:
+        return []
+
+    query = normalize_rows(np.asarray(query_vector, dtype=np.float32))
+    if query.shape[-1] != matrix.shape[1]:
+        return []
+
+    if candidate_ids is not None:
+        mask = np.isin(ids, np.fromiter(candidate_ids, dtype=np.int64))
+        ids, matrix = ids[mask], matrix[mask]
+        if not len(ids):
+            return []
+
+    similarities = matrix @ query
+    k = min(k, len(ids))
+    top = np.argpartition(-similarities, k - 1)[:k]
+    top = top[np.argsort(-similarities[top])]
+    return [(int(ids[i]), float(similarities[i])) for i in top]
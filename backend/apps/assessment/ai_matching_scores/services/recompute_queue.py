@@ -0,0 +1,159 @@
+"""
+Debounced, coalesced recomputation queue for AI Matching.
+
+Signals no longer enqueue a Celery task per save. They mark the entity as
+dirty in a Redis sorted set (member = entity id, score = due timestamp).
+``ZADD GT`` moves the due time forward on every change (trailing debounce),
+so a burst of edits (e.g. a profile with 15 skills) collapses into one
+recomputation once the entity has been quiet for the debounce window. ``flush_dirty_matches_task`` (Celery beat) pops due ids and
+dispatches the matching tasks.
+
+Without Redis (tests, local dev) the task is dispatched right away after
+commit, like before.
+"""
+import logging
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_DEBOUNCE_SECONDS = 60
+
+ENTITY_JOB = 'job'
+ENTITY_RECRUITER = 'recruiter'
+
+DIRTY_KEY_TEMPLATE = 'jobportal:ai_matching:dirty:{entity_type}'
+
+# Fields that affect scoring; saves touching none of them are ignored
+JOB_MATCH_FIELDS = frozenset({
+    'title', 'description', 'requirements', 'benefits', 'level', 'job_type',
+    'experience_years_min', 'experience_years_max', 'salary_min', 'salary_max',
+    'salary_currency', 'is_salary_negotiable', 'is_remote', 'address',
+    'status', 'application_deadline',
+})
+
+RECRUITER_MATCH_FIELDS = frozenset({
+    'current_position', 'bio', 'years_of_experience', 'highest_education_level',
+    'desired_salary_min', 'desired_salary_max', 'salary_currency', 'address',
+    'job_search_status', 'is_profile_public',
+})
+
+
+def get_debounce_seconds() -> int:
+    return getattr(settings, 'AI_MATCHING_DEBOUNCE_SECONDS', DEFAULT_DEBOUNCE_SECONDS)
+
+
+def _dirty_key(entity_type: str) -> str:
+    return DIRTY_KEY_TEMPLATE.format(entity_type=entity_type)
+
+
+def _attnames(model, field_names) -> list[str]:
+    return [model._meta.get_field(name).attname for name in field_names]
+
+
+def take_snapshot(instance, field_names, update_fields=None) -> None:
+    """
+    Load the stored match-relevant values of an instance about to be saved (pre_save).
+
+    Only full saves of existing rows need it: new rows are always queued and
+    ``update_fields`` already says what changed. One SELECT per such save,
+    instead of copying values on every instantiation.
+    """
+    instance._match_snapshot = None
+    if update_fields is not None or instance._state.adding or instance.pk is None:
+        return
+
+    model = type(instance)
+    instance._match_snapshot = (
+        model._default_manager.filter(pk=instance.pk)
+        .values(*_attnames(model, field_names))
+        .first()
+    )
+
+
+def has_relevant_changes(instance, field_names, update_fields=None) -> bool:
+    """
+    True if a save may have changed a match-relevant field.
+
+    Args:
+        instance: Saved model instance (with ``_match_snapshot`` from pre_save)
+        field_names: Match-relevant field names
+        update_fields: ``update_fields`` passed to save(), if any
+    """
+    if update_fields is not None:
+        return bool(set(update_fields) & set(field_names))
+
+    snapshot = instance.__dict__.pop('_match_snapshot', None)
+    if not snapshot:
+        # New instance or row not found: be safe
+        return True
+
+    for attname in _attnames(type(instance), field_names):
+        if attname not in snapshot or snapshot[attname] != instance.__dict__.get(attname):
+            return True
+    return False
+
+
+def mark_dirty(entity_type: str, entity_id: int) -> bool:
+    """
+    Schedule a (debounced) recomputation for one entity.
+
+    Returns:
+        True if queued in Redis, False if dispatched directly (no Redis)
+    """
+    try:
+        redis_conn = get_redis_connection("default")
+        redis_conn.zadd(
+            _dirty_key(entity_type),
+            {str(entity_id): time.time() + get_debounce_seconds()},
+            gt=True,
+        )
+        return True
+    except Exception as e:
+        logger.debug(f"Dirty queue unavailable, dispatching directly: {e}")
+        transaction.on_commit(lambda: dispatch_recompute(entity_type, [entity_id]))
+        return False
+
+
+def pop_due(entity_type: str, now: Optional[float] = None) -> list[int]:
+    """Atomically remove and return all entity ids whose window has passed."""
+    now = time.time() if now is None else now
+    key = _dirty_key(entity_type)
+    redis_conn = get_redis_connection("default")
+    pipe = redis_conn.pipeline(transaction=True)
+    pipe.zrangebyscore(key, '-inf', now)
+    pipe.zremrangebyscore(key, '-inf', now)
+    members, _ = pipe.execute()
+    return [int(member) for member in members]
+
+
+def dispatch_recompute(entity_type: str, entity_ids: list[int]) -> None:
+    """Enqueue the matching task for each entity."""
+    from apps.assessment.ai_matching_scores.tasks import (
+        calculate_candidate_matches_task,
+        calculate_job_matches_task,
+    )
+
+    task = calculate_job_matches_task if entity_type == ENTITY_JOB else calculate_candidate_matches_task
+    for entity_id in entity_ids:
+        task.delay(entity_id)
+
+
+def flush_due(now: Optional[float] = None) -> dict:
+    """
+    Dispatch recomputations for every entity whose debounce window passed.
+
+    Returns:
+        dict entity_type -> number of tasks dispatched
+    """
+    dispatched = {}
+    for entity_type in (ENTITY_JOB, ENTITY_RECRUITER):
+        entity_ids = pop_due(entity_type, now)
+        dispatch_recompute(entity_type, entity_ids)
+        dispatched[entity_type] = len(entity_ids)
+    return dispatched
@@ -1,40 +1,80 @@
 from django.dispatch import receiver
-from django.db.models.signals import post_save, m2m_changed
-from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
 from apps.candidate.recruiters.models import Recruiter
 from apps.recruitment.jobs.models import Job
-from apps.assessment.ai_matching_scores.tasks import calculate_candidate_matches_task, calculate_job_matches_task
 
 from apps.candidate.recruiter_skills.models import RecruiterSkill
 from apps.recruitment.job_skills.models import JobSkill
-from django.db.models.signals import post_delete
+from apps.assessment.ai_matching_scores.models import EntityEmbedding
+from apps.assessment.ai_matching_scores.services.embeddings import delete_entity_vectors
+from apps.assessment.ai_matching_scores.services.recompute_queue import (
+    ENTITY_JOB,
+    ENTITY_RECRUITER,
+    JOB_MATCH_FIELDS,
+    RECRUITER_MATCH_FIELDS,
+    has_relevant_changes,
+    mark_dirty,
+    take_snapshot,
+)
+
+@receiver(pre_save, sender=Recruiter)
+def snapshot_recruiter(sender, instance, update_fields=None, **kwargs):
+    """
+    Remember stored match-relevant values to detect unrelated saves.
+    """
+    take_snapshot(instance, RECRUITER_MATCH_FIELDS, update_fields)
+
+@receiver(pre_save, sender=Job)
+def snapshot_job(sender, instance, update_fields=None, **kwargs):
+    """
+    Remember stored match-relevant values to detect unrelated saves.
+    """
+    if instance.status == 'published':
+        take_snapshot(instance, JOB_MATCH_FIELDS, update_fields)
 
 @receiver(post_save, sender=Recruiter)
-def trigger_candidate_matching(sender, instance, created, **kwargs):
+def trigger_candidate_matching(sender, instance, created, update_fields=None, **kwargs):
     """
-    Trigger AI matching when a Recruiter profile is created or updated.
+    Queue AI matching when a Recruiter profile is created or a match-relevant field changes.
     """
-    transaction.on_commit(lambda: calculate_candidate_matches_task.delay(instance.id))
+    if created or has_relevant_changes(instance, RECRUITER_MATCH_FIELDS, update_fields):
+        mark_dirty(ENTITY_RECRUITER, instance.id)
 
 @receiver([post_save, post_delete], sender=RecruiterSkill)
 def trigger_candidate_matching_skills(sender, instance, **kwargs):
     """
-    Trigger AI matching when Recruiter skills are added/removed/updated.
+    Queue AI matching when Recruiter skills are added/removed/updated.
     """
-    transaction.on_commit(lambda: calculate_candidate_matches_task.delay(instance.recruiter.id))
+    mark_dirty(ENTITY_RECRUITER, instance.recruiter_id)
 
 @receiver(post_save, sender=Job)
-def trigger_job_matching(sender, instance, created, **kwargs):
+def trigger_job_matching(sender, instance, created, update_fields=None, **kwargs):
     """
-    Trigger AI matching when a Job is created or updated.
+    Queue AI matching when a published Job is created or a match-relevant field changes.
     """
-    if instance.status == 'published':
-        transaction.on_commit(lambda: calculate_job_matches_task.delay(instance.id))
+    if instance.status == 'published' and (
+        created or has_relevant_changes(instance, JOB_MATCH_FIELDS, update_fields)
+    ):
+        mark_dirty(ENTITY_JOB, instance.id)
 
 @receiver([post_save, post_delete], sender=JobSkill)
 def trigger_job_matching_skills(sender, instance, **kwargs):
     """
-    Trigger AI matching when Job skills are added/removed/updated.
+    Queue AI matching when Job skills are added/removed/updated.
     """
     if instance.job.status == 'published':
-        transaction.on_commit(lambda: calculate_job_matches_task.delay(instance.job.id))
\ No newline at end of file
+        mark_dirty(ENTITY_JOB, instance.job_id)
+
+@receiver(post_delete, sender=Job)
+def delete_job_embedding(sender, instance, **kwargs):
+    """
+    Remove the stored embedding of a deleted Job from the vector store.
+    """
+    delete_entity_vectors(EntityEmbedding.EntityType.JOB, [instance.id])
+
+@receiver(post_delete, sender=Recruiter)
+def delete_recruiter_embedding(sender, instance, **kwargs):
+    """
+    Remove the stored embedding of a deleted Recruiter from the vector store.
+    """
+    delete_entity_vectors(EntityEmbedding.EntityType.RECRUITER, [instance.id])
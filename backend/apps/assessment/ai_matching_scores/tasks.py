@@ -3,7 +3,17 @@ from django.db import transaction
 from django.apps import apps
 from celery.utils.log import get_task_logger
 
-from apps.assessment.ai_matching_scores.services.matching import AIMatchingService
+from apps.assessment.ai_matching_scores.services.batch_scoring import (
+    score_job_against_recruiters,
+    score_recruiter_against_jobs,
+)
+from apps.assessment.ai_matching_scores.services.candidate_generation import (
+    chunked,
+    get_chunk_size,
+    shortlist_job_ids,
+    shortlist_recruiter_ids,
+)
+from apps.assessment.ai_matching_scores.services.recompute_queue import flush_due
 
 logger = get_task_logger(__name__)
 
@@ -11,26 +21,23 @@ logger = get_task_logger(__name__)
 def calculate_candidate_matches_task(self, recruiter_id: int):
     """
     Calculate matches for a specific candidate against potential jobs.
-    Optimized to only check relevant jobs (e.g. status=PUBLISHED) to save AI quota.
+    Only the top-K shortlisted jobs (skill index + location/level prefilters)
+    are scored, chunked across workers.
     """
     try:
         Recruiter = apps.get_model('candidate_recruiters', 'Recruiter')
-        Job = apps.get_model('recruitment_jobs', 'Job')
-        
-        recruiter = Recruiter.objects.get(id=recruiter_id)
-        
-        # Candidate Filter Strategy:
-
-        potential_jobs = Job.objects.filter(status='published').order_by('-created_at')[:5] 
-        
-        results = []
-        for job in potential_jobs:
-            score = AIMatchingService.calculate_matching_score(job, recruiter)
-            if score:
-                results.append(score.overall_score)
-                
-        logger.info(f"Calculated {len(results)} matches for Recruiter {recruiter_id}")
-        return f"Processed {len(results)} jobs"
+
+        recruiter = Recruiter.objects.select_related('address').get(id=recruiter_id)
+
+        # Candidate Filter Strategy: retrieval stage
+        job_ids = shortlist_job_ids(recruiter)
+
+        chunks = list(chunked(job_ids, get_chunk_size()))
+        for chunk in chunks:
+            score_candidate_jobs_chunk_task.delay(recruiter_id, chunk)
+
+        logger.info(f"Shortlisted {len(job_ids)} jobs for Recruiter {recruiter_id} ({len(chunks)} chunks)")
+        return f"Dispatched {len(job_ids)} jobs"
 
     except Exception as e:
         logger.error(f"Error in calculate_candidate_matches_task: {e}")
@@ -40,29 +47,51 @@ def calculate_candidate_matches_task(self, recruiter_id: int):
 def calculate_job_matches_task(self, job_id: int):
     """
     Calculate matches for a specific job against potential candidates.
+    Only the top-K shortlisted candidates are scored, chunked across workers.
     """
     try:
-        Recruiter = apps.get_model('candidate_recruiters', 'Recruiter')
         Job = apps.get_model('recruitment_jobs', 'Job')
 
-        job = Job.objects.get(id=job_id)
-        
-        # Job Filter Strategy:
-        # Match against active candidates.
-        potential_candidates = Recruiter.objects.filter(
-            job_search_status__in=['active', 'passive'],
-            is_profile_public=True
-        ).order_by('-updated_at')[:5] # Limit 5 for demo
-        
-        results = []
-        for recruiter in potential_candidates:
-            score = AIMatchingService.calculate_matching_score(job, recruiter)
-            if score:
-                results.append(score.overall_score)
-
-        logger.info(f"Calculated {len(results)} matches for Job {job_id}")
-        return f"Processed {len(results)} candidates"
+        job = Job.objects.select_related('address').get(id=job_id)
+
+        # Job Filter Strategy: retrieval stage
+        recruiter_ids = shortlist_recruiter_ids(job)
+
+        chunks = list(chunked(recruiter_ids, get_chunk_size()))
+        for chunk in chunks:
+            score_job_candidates_chunk_task.delay(job_id, chunk)
+
+        logger.info(f"Shortlisted {len(recruiter_ids)} candidates for Job {job_id} ({len(chunks)} chunks)")
+        return f"Dispatched {len(recruiter_ids)} candidates"
 
     except Exception as e:
         logger.error(f"Error in calculate_job_matches_task: {e}")
         return f"Error: {e}"
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=3)
+def score_job_candidates_chunk_task(self, job_id: int, recruiter_ids: list[int]):
+    """
+    Score one chunk of shortlisted candidates for a job (batch engine).
+    """
+    results = score_job_against_recruiters(job_id, recruiter_ids)
+    logger.info(f"Scored {len(results)} candidates for Job {job_id}")
+    return f"Processed {len(results)} candidates"
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=3)
+def score_candidate_jobs_chunk_task(self, recruiter_id: int, job_ids: list[int]):
+    """
+    Score one chunk of shortlisted jobs for a candidate (batch engine).
+    """
+    results = score_recruiter_against_jobs(recruiter_id, job_ids)
+    logger.info(f"Scored {len(results)} jobs for Recruiter {recruiter_id}")
+    return f"Processed {len(results)} jobs"
+
+@shared_task
+def flush_dirty_matches_task():
+    """
+    Dispatch debounced recomputations whose window has passed (Celery beat).
+    """
+    dispatched = flush_due()
+    if any(dispatched.values()):
+        logger.info(f"Flushed dirty matches: {dispatched}")
+    return dispatched
@@ -0,0 +1,267 @@
+"""
+Tests for the vectorized batch scoring engine.
+
+Batch results must match the per-pair reference path (calculate_single_match).
+"""
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+
+from apps.recruitment.jobs.models import Job
+from apps.recruitment.job_skills.models import JobSkill
+from apps.candidate.recruiters.models import Recruiter
+from apps.candidate.recruiter_skills.models import RecruiterSkill
+from apps.candidate.skills.models import Skill
+from apps.candidate.skill_categories.models import SkillCategory
+from apps.company.companies.models import Company
+from apps.geography.addresses.models import Address
+from apps.geography.communes.models import Commune
+from apps.geography.provinces.models import Province
+from apps.assessment.ai_matching_scores.models import AIMatchingScore
+from apps.assessment.ai_matching_scores.services.ai_matching_scores import (
+    CalculateMatchInput,
+    calculate_single_match,
+)
+from apps.assessment.ai_matching_scores.services.batch_scoring import (
+    score_job_against_recruiters,
+    score_recruiter_against_jobs,
+)
+
+
+User = get_user_model()
+
+SCORE_FIELDS = [
+    'overall_score',
+    'skill_match_score',
+    'experience_match_score',
+    'education_match_score',
+    'location_match_score',
+    'salary_match_score',
+]
+
+
+@patch('apps.assessment.ai_matching_scores.services.batch_scoring.is_semantic_enabled', return_value=False)
+@patch('apps.assessment.ai_matching_scores.services.ai_matching_scores.is_semantic_enabled', return_value=False)
+class TestBatchScoringParity(TestCase):
+    """Batch engine vs calculate_single_match."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='owner@example.com',
+            password='testpass123',
+            full_name='Owner',
+            is_active=True
+        )
+        cls.company = Company.objects.create(
+            company_name='Batch Co',
+            slug='batch-co',
+            description='Batch'
+        )
+
+        province_hn = Province.objects.create(
+            province_code='HN', province_name='Hà Nội',
+            province_type='municipality', region='north'
+        )
+        province_hcm = Province.objects.create(
+            province_code='HCM', province_name='Hồ Chí Minh',
+            province_type='municipality', region='south'
+        )
+        commune_hn = Commune.objects.create(
+            province=province_hn, commune_name='Ba Đình', commune_type='ward'
+        )
+        commune_hcm = Commune.objects.create(
+            province=province_hcm, commune_name='Quận 1', commune_type='ward'
+        )
+        address_hn = Address.objects.create(
+            address_line='1 Hà Nội', province=province_hn, commune=commune_hn
+        )
+        address_hcm = Address.objects.create(
+            address_line='1 HCM', province=province_hcm, commune=commune_hcm
+        )
+
+        category = SkillCategory.objects.create(name='Backend', slug='backend')
+        python = Skill.objects.create(name='Python', slug='python', category=category)
+        django = Skill.objects.create(name='Django', slug='django', category=category)
+        docker = Skill.objects.create(name='Docker', slug='docker', category=category)
+
+        cls.job = Job.objects.create(
+            company=cls.company,
+            title='Backend Developer',
+            slug='backend-developer',
+            description='Backend role',
+            requirements='Python',
+            job_type='full-time',
+            level='middle',
+            experience_years_min=3,
+            experience_years_max=5,
+            salary_min=Decimal('20000000'),
+            salary_max=Decimal('30000000'),
+            address=address_hn,
+            status='published',
+            created_by=cls.user
+        )
+        JobSkill.objects.create(job=cls.job, skill=python, is_required=True, proficiency_level='advanced')
+        JobSkill.objects.create(job=cls.job, skill=django, is_required=True, proficiency_level='intermediate')
+        JobSkill.objects.create(job=cls.job, skill=docker, is_required=False, proficiency_level='basic')
+
+        cls.other_job = Job.objects.create(
+            company=cls.company,
+            title='Director',
+            slug='director',
+            description='Director role',
+            requirements='Leadership',
+            job_type='full-time',
+            level='director',
+            experience_years_min=10,
+            is_salary_negotiable=True,
+            is_remote=True,
+            status='published',
+            created_by=cls.user
+        )
+
+        profiles = [
+            # (years, education, salary_min, salary_max, currency, address, skills)
+            (4, 'dai_hoc', 22000000, 28000000, 'VND', address_hn,
+             [(python, 'expert'), (django, 'advanced'), (docker, 'basic')]),
+            (1, 'cao_dang', 35000000, None, 'VND', address_hcm,
+             [(python, 'basic')]),
+            (12, 'thac_si', 10000000, 40000000, 'USD', None,
+             [(django, 'intermediate')]),
+            (0, None, None, None, None, address_hcm, []),
+            (2, 'thpt', 25000000, 45000000, 'VND', address_hn,
+             [(python, 'intermediate'), (docker, 'expert')]),
+        ]
+        cls.recruiters = []
+        for i, (years, education, sal_min, sal_max, currency, address, skills) in enumerate(profiles):
+            user = User.objects.create_user(
+                email=f'candidate{i}@example.com',
+                password='testpass123',
+                full_name=f'Candidate {i}',
+                is_active=True
+            )
+            recruiter = Recruiter.objects.create(
+                user=user,
+                years_of_experience=years,
+                highest_education_level=education,
+                desired_salary_min=sal_min,
+                desired_salary_max=sal_max,
+                salary_currency=currency or 'VND',
+                address=address,
+                job_search_status='active'
+            )
+            for skill, level in skills:
+                RecruiterSkill.objects.create(recruiter=recruiter, skill=skill, proficiency_level=level)
+            cls.recruiters.append(recruiter)
+
+    def _reference_scores(self, job, recruiter):
+        calculate_single_match(
+            CalculateMatchInput(job_id=job.id, recruiter_id=recruiter.id)
+        )
+        return self._stored_scores(job, recruiter)
+
+    def _stored_scores(self, job, recruiter):
+        score = AIMatchingScore.objects.get(job=job, recruiter=recruiter)
+        return {field: getattr(score, field) for field in SCORE_FIELDS}
+
+    def test_job_against_recruiters_matches_single_path(self, *mocks):
+        """Every component must equal the per-pair calculators."""
+        for job in (self.job, self.other_job):
+            expected = {r.id: self._reference_scores(job, r) for r in self.recruiters}
+            AIMatchingScore.objects.all().delete()
+
+            results = score_job_against_recruiters(job.id, [r.id for r in self.recruiters])
+
+            self.assertEqual(len(results), len(self.recruiters))
+            for recruiter in self.recruiters:
+                self.assertEqual(self._stored_scores(job, recruiter), expected[recruiter.id])
+
+    def test_recruiter_against_jobs_matches_single_path(self, *mocks):
+        """Reverse direction uses the same engine."""
+        recruiter = self.recruiters[0]
+        expected = {j.id: self._reference_scores(j, recruiter) for j in (self.job, self.other_job)}
+        AIMatchingScore.objects.all().delete()
+
+        results = score_recruiter_against_jobs(recruiter.id, [self.job.id, self.other_job.id])
+
+        self.assertEqual(len(results), 2)
+        for job in (self.job, self.other_job):
+            self.assertEqual(self._stored_scores(job, recruiter), expected[job.id])
+
+    def test_region_statuses_match_single_path(self, *mocks):
+        """Provinces are mapped to regions through province_code."""
+        addresses = {}
+        for code, name, region in (
+            ('ha_noi', 'Hà Nội', 'north'),
+            ('hai_phong', 'Hải Phòng', 'north'),
+            ('ho_chi_minh', 'Hồ Chí Minh', 'south'),
+        ):
+            province = Province.objects.create(
+                province_code=code, province_name=name,
+                province_type='municipality', region=region
+            )
+            commune = Commune.objects.create(province=province, commune_name=f'{name} 1', commune_type='ward')
+            addresses[code] = Address.objects.create(address_line=f'1 {name}', province=province, commune=commune)
+
+        Job.objects.filter(id=self.job.id).update(address=addresses['ha_noi'])
+        recruiters = self.recruiters[:2]
+        Recruiter.objects.filter(id=recruiters[0].id).update(address=addresses['hai_phong'])
+        Recruiter.objects.filter(id=recruiters[1].id).update(address=addresses['ho_chi_minh'])
+
+        expected = {r.id: self._reference_scores(self.job, r) for r in recruiters}
+        AIMatchingScore.objects.all().delete()
+
+        score_job_against_recruiters(self.job.id, [r.id for r in recruiters])
+
+        statuses = []
+        for recruiter in recruiters:
+            self.assertEqual(self._stored_scores(self.job, recruiter), expected[recruiter.id])
+            score = AIMatchingScore.objects.get(job=self.job, recruiter=recruiter)
+            statuses.append(score.matching_details['location']['details']['status'])
+        self.assertEqual(statuses, ['same_region', 'different_region'])
+        self.assertEqual(expected[recruiters[0].id]['location_match_score'], Decimal('70.00'))
+
+    def test_upsert_updates_existing_rows(self, *mocks):
+        """Re-scoring updates in place instead of duplicating rows."""
+        recruiter = self.recruiters[1]
+        AIMatchingScore.objects.create(
+            job=self.job, recruiter=recruiter, overall_score=Decimal('1.00'), is_valid=False
+        )
+
+        score_job_against_recruiters(self.job.id, [recruiter.id])
+
+        scores = AIMatchingScore.objects.filter(job=self.job, recruiter=recruiter)
+        self.assertEqual(scores.count(), 1)
+        self.assertTrue(scores[0].is_valid)
+        self.assertNotEqual(scores[0].overall_score, Decimal('1.00'))
+        self.assertEqual(scores[0].matching_details['engine'], 'batch')
+
+    def test_skill_details_counts(self, *mocks):
+        """Skill details carry matched / missing counts."""
+        score_job_against_recruiters(self.job.id, [self.recruiters[1].id])
+
+        details = AIMatchingScore.objects.get(
+            job=self.job, recruiter=self.recruiters[1]
+        ).matching_details['skill']['details']
+        self.assertEqual(details['total_job_skills'], 3)
+        self.assertEqual(details['total_matched'], 1)
+        self.assertEqual(details['required_matched'], 1)
+        self.assertEqual(details['required_missing'], 1)
+
+    def test_unknown_ids_are_skipped(self, *mocks):
+        """Unknown recruiters are ignored, unknown jobs yield nothing."""
+        results = score_job_against_recruiters(self.job.id, [self.recruiters[0].id, 999999])
+        self.assertEqual(len(results), 1)
+
+        self.assertEqual(score_job_against_recruiters(999999, [self.recruiters[0].id]), [])
+
+    def test_chunking_covers_all_recruiters(self, *mocks):
+        """Small chunk sizes still score every recruiter."""
+        results = score_job_against_recruiters(
+            self.job.id, [r.id for r in self.recruiters], chunk_size=2
+        )
+
+        self.assertEqual(len(results), len(self.recruiters))
+        self.assertEqual(AIMatchingScore.objects.filter(job=self.job).count(), len(self.recruiters))
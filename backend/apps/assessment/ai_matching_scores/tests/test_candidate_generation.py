@@ -0,0 +1,214 @@
+"""
+Tests for the candidate-generation (retrieval) stage and the matching tasks.
+"""
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from apps.recruitment.jobs.models import Job
+from apps.recruitment.job_skills.models import JobSkill
+from apps.candidate.recruiters.models import Recruiter
+from apps.candidate.recruiter_skills.models import RecruiterSkill
+from apps.candidate.skills.models import Skill
+from apps.candidate.skill_categories.models import SkillCategory
+from apps.company.companies.models import Company
+from apps.geography.addresses.models import Address
+from apps.geography.communes.models import Commune
+from apps.geography.provinces.models import Province
+from apps.assessment.ai_matching_scores.services.candidate_generation import (
+    shortlist_job_ids,
+    shortlist_recruiter_ids,
+)
+from apps.assessment.ai_matching_scores.tasks import (
+    calculate_candidate_matches_task,
+    calculate_job_matches_task,
+)
+
+
+User = get_user_model()
+
+
+class CandidateGenerationTestMixin:
+    """Shared fixtures: two provinces, three skills, helpers."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(
+            email='owner-cg@example.com',
+            password='testpass123',
+            full_name='Owner',
+            is_active=True
+        )
+        cls.company = Company.objects.create(
+            company_name='Retrieval Co',
+            slug='retrieval-co',
+            description='Retrieval'
+        )
+        province_hn = Province.objects.create(
+            province_code='HN', province_name='Hà Nội',
+            province_type='municipality', region='north'
+        )
+        province_hcm = Province.objects.create(
+            province_code='HCM', province_name='Hồ Chí Minh',
+            province_type='municipality', region='south'
+        )
+        cls.address_hn = Address.objects.create(address_line='HN', province=province_hn)
+        cls.address_hcm = Address.objects.create(address_line='HCM', province=province_hcm)
+        # Province resolved through the commune (the path scoring uses)
+        commune_hn = Commune.objects.create(province=province_hn, commune_name='Phường Láng', commune_type='ward')
+        cls.address_commune_hn = Address.objects.create(
+            address_line='HN commune', commune=commune_hn, province=province_hcm
+        )
+
+        category = SkillCategory.objects.create(name='Backend', slug='backend-cg')
+        cls.python = Skill.objects.create(name='Python', slug='python-cg', category=category)
+        cls.django = Skill.objects.create(name='Django', slug='django-cg', category=category)
+        cls.excel = Skill.objects.create(name='Excel', slug='excel-cg', category=category)
+
+    @classmethod
+    def create_job(cls, slug, skills=(), **kwargs):
+        defaults = {
+            'company': cls.company,
+            'title': slug,
+            'slug': slug,
+            'description': 'Job',
+            'requirements': 'Requirements',
+            'job_type': 'full-time',
+            'level': 'junior',
+            'status': 'published',
+            'created_by': cls.owner,
+        }
+        defaults.update(kwargs)
+        job = Job.objects.create(**defaults)
+        for skill, is_required in skills:
+            JobSkill.objects.create(job=job, skill=skill, is_required=is_required)
+        return job
+
+    @classmethod
+    def create_recruiter(cls, name, skills=(), **kwargs):
+        user = User.objects.create_user(
+            email=f'{name}@example.com',
+            password='testpass123',
+            full_name=name,
+            is_active=True
+        )
+        defaults = {'user': user, 'job_search_status': 'active', 'years_of_experience': 3}
+        defaults.update(kwargs)
+        recruiter = Recruiter.objects.create(**defaults)
+        for skill in skills:
+            RecruiterSkill.objects.create(recruiter=recruiter, skill=skill)
+        return recruiter
+
+
+class TestShortlistRecruiters(CandidateGenerationTestMixin, TestCase):
+    """shortlist_recruiter_ids"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.job = cls.create_job(
+            'backend-job',
+            skills=[(cls.python, True), (cls.django, False)],
+            address=cls.address_hn,
+            experience_years_min=4,
+        )
+        cls.full = cls.create_recruiter('full', [cls.python, cls.django], address=cls.address_hn)
+        cls.required_only = cls.create_recruiter('required', [cls.python])
+        cls.optional_only = cls.create_recruiter('optional', [cls.django], address=cls.address_hn)
+        cls.no_overlap = cls.create_recruiter('nooverlap', [cls.excel], address=cls.address_hn)
+        cls.other_city = cls.create_recruiter('othercity', [cls.python], address=cls.address_hcm)
+        cls.too_junior = cls.create_recruiter('junior', [cls.python], years_of_experience=1)
+        cls.inactive = cls.create_recruiter('inactive', [cls.python], job_search_status='not_looking')
+
+    def test_ranked_by_weighted_skill_overlap(self):
+        """Required skills weigh more than optional ones; no overlap is excluded."""
+        self.assertEqual(
+            shortlist_recruiter_ids(self.job),
+            [self.full.id, self.required_only.id, self.optional_only.id],
+        )
+
+    def test_top_k_limit(self):
+        self.assertEqual(shortlist_recruiter_ids(self.job, k=2), [self.full.id, self.required_only.id])
+
+    def test_remote_job_skips_location_prefilter(self):
+        self.job.is_remote = True
+        self.assertIn(self.other_city.id, shortlist_recruiter_ids(self.job))
+
+    def test_location_prefilter_uses_commune_province(self):
+        """Scoring reads address.commune.province, so the prefilter must keep these recruiters."""
+        commune_only = self.create_recruiter('commune', [self.python], address=self.address_commune_hn)
+
+        self.assertIn(commune_only.id, shortlist_recruiter_ids(self.job))
+
+    def test_job_without_skills_keeps_all_prefiltered(self):
+        job = self.create_job('no-skill-job', is_remote=True)
+        ids = shortlist_recruiter_ids(job)
+        self.assertIn(self.no_overlap.id, ids)
+        self.assertNotIn(self.inactive.id, ids)
+
+
+class TestShortlistJobs(CandidateGenerationTestMixin, TestCase):
+    """shortlist_job_ids"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.recruiter = cls.create_recruiter(
+            'seeker', [cls.python], address=cls.address_hn, years_of_experience=2
+        )
+        cls.required_match = cls.create_job('required-match', [(cls.python, True)], address=cls.address_hn)
+        cls.optional_match = cls.create_job('optional-match', [(cls.python, False)], is_remote=True)
+        cls.no_requirements = cls.create_job('no-requirements', address=cls.address_hn)
+        cls.no_overlap = cls.create_job('no-overlap', [(cls.excel, True)], address=cls.address_hn)
+        cls.other_city = cls.create_job('other-city', [(cls.python, True)], address=cls.address_hcm)
+        cls.too_senior = cls.create_job('too-senior', [(cls.python, True)], experience_years_min=8)
+        cls.expired = cls.create_job(
+            'expired', [(cls.python, True)],
+            application_deadline=timezone.now().date() - timedelta(days=1),
+        )
+        cls.draft = cls.create_job('draft', [(cls.python, True)], status='draft')
+
+    def test_shortlist_jobs(self):
+        """Overlap first, skill-free jobs kept, prefiltered jobs excluded."""
+        self.assertEqual(
+            shortlist_job_ids(self.recruiter),
+            [self.required_match.id, self.optional_match.id, self.no_requirements.id],
+        )
+
+
+class TestShortlistJobsByCommune(CandidateGenerationTestMixin, TestCase):
+    """shortlist_job_ids with a commune-resolved province"""
+
+    def test_location_prefilter_uses_commune_province(self):
+        recruiter = self.create_recruiter('commune-seeker', [self.python], address=self.address_commune_hn)
+        job = self.create_job('commune-job', [(self.python, True)], address=self.address_hn)
+
+        self.assertIn(job.id, shortlist_job_ids(recruiter))
+
+
+@override_settings(AI_MATCHING_CHUNK_SIZE=2)
+class TestMatchingTasks(CandidateGenerationTestMixin, TestCase):
+    """Tasks dispatch one scoring subtask per shortlist chunk."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.job = cls.create_job('task-job', [(cls.python, True)], is_remote=True)
+        cls.recruiters = [cls.create_recruiter(f'task{i}', [cls.python]) for i in range(5)]
+
+    @patch('apps.assessment.ai_matching_scores.tasks.score_job_candidates_chunk_task.delay')
+    def test_job_task_chunks_shortlist(self, mock_delay):
+        calculate_job_matches_task(self.job.id)
+
+        self.assertEqual(mock_delay.call_count, 3)
+        dispatched = [rid for call in mock_delay.call_args_list for rid in call.args[1]]
+        self.assertEqual(sorted(dispatched), sorted(r.id for r in self.recruiters))
+
+    @patch('apps.assessment.ai_matching_scores.tasks.score_candidate_jobs_chunk_task.delay')
+    def test_candidate_task_chunks_shortlist(self, mock_delay):
+        calculate_candidate_matches_task(self.recruiters[0].id)
+
+        mock_delay.assert_called_once_with(self.recruiters[0].id, [self.job.id])
@@ -0,0 +1,223 @@
+"""
+Tests for the embedding cache and vector store.
+
+Uses the deterministic HashingEmbeddingBackend, no API key required.
+"""
+import threading
+from unittest.mock import patch
+
+import numpy as np
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+
+from apps.recruitment.jobs.models import Job
+from apps.candidate.recruiters.models import Recruiter
+from apps.company.companies.models import Company
+from apps.assessment.ai_matching_scores.models import AIMatchingScore, EntityEmbedding
+from apps.assessment.ai_matching_scores.calculators.semantic_calculator import (
+    calculate_semantic_score,
+)
+from apps.assessment.ai_matching_scores.services.ai_matching_scores import (
+    CalculateMatchInput,
+    calculate_single_match,
+)
+from apps.assessment.ai_matching_scores.services.batch_scoring import (
+    score_job_against_recruiters,
+)
+from apps.assessment.ai_matching_scores.services import embeddings
+from apps.assessment.ai_matching_scores.services.embeddings import (
+    HashingEmbeddingBackend,
+    clear_memory_cache,
+    from_blob,
+    get_entity_vector,
+    top_k_similar,
+)
+
+
+User = get_user_model()
+
+HASHING_BACKEND = 'apps.assessment.ai_matching_scores.services.embeddings.HashingEmbeddingBackend'
+
+
+@override_settings(AI_EMBEDDING_BACKEND=HASHING_BACKEND)
+class TestEmbeddingStore(TestCase):
+    """Lookup layers and persistence."""
+
+    def setUp(self):
+        cache.clear()
+        clear_memory_cache()
+
+    def test_hashing_backend_is_deterministic(self):
+        """Same text -> same vector; shared vocabulary -> higher similarity."""
+        backend = HashingEmbeddingBackend()
+        self.assertEqual(backend.embed('Python Django'), backend.embed('Python Django'))
+        self.assertIsNone(backend.embed('   '))
+
+        python = np.array(backend.embed('python django developer'))
+        similar = np.array(backend.embed('senior python django engineer'))
+        other = np.array(backend.embed('accountant finance excel'))
+        self.assertGreater(python @ similar, python @ other)
+
+    def test_vector_is_persisted_as_float32_blob(self):
+        """First lookup embeds and stores a compact float32 blob."""
+        vector = get_entity_vector('job', 1, 'Python developer')
+
+        row = EntityEmbedding.objects.get(entity_type='job', entity_id=1)
+        self.assertEqual(row.dimensions, HashingEmbeddingBackend.dimensions)
+        self.assertEqual(len(bytes(row.vector)), HashingEmbeddingBackend.dimensions * 4)
+        np.testing.assert_array_equal(from_blob(row.vector), vector)
+
+    def test_unchanged_text_is_not_embedded_again(self):
+        """Memory, Redis and DB layers are consulted before the backend."""
+        with patch.object(HashingEmbeddingBackend, 'embed', return_value=[1.0, 0.0]) as mock_embed:
+            get_entity_vector('recruiter', 7, 'Bio: backend engineer')
+            get_entity_vector('recruiter', 7, 'Bio: backend engineer')
+
+            clear_memory_cache()
+            get_entity_vector('recruiter', 7, 'Bio: backend engineer')
+
+            clear_memory_cache()
+            cache.clear()
+            get_entity_vector('recruiter', 7, 'Bio: backend engineer')
+
+        self.assertEqual(mock_embed.call_count, 1)
+
+    def test_changed_text_replaces_stored_vector(self):
+        """A new content hash re-embeds and updates the row in place."""
+        get_entity_vector('job', 3, 'Python developer')
+        old_hash = EntityEmbedding.objects.get(entity_type='job', entity_id=3).content_hash
+
+        get_entity_vector('job', 3, 'Accountant')
+
+        rows = EntityEmbedding.objects.filter(entity_type='job', entity_id=3)
+        self.assertEqual(rows.count(), 1)
+        self.assertNotEqual(rows[0].content_hash, old_hash)
+
+    def test_top_k_similar(self):
+        """Most similar entities come first; candidate_ids restricts the search."""
+        get_entity_vector('recruiter', 1, 'python django backend developer')
+        get_entity_vector('recruiter', 2, 'accountant finance excel')
+        get_entity_vector('recruiter', 3, 'python flask backend engineer')
+        query = HashingEmbeddingBackend().embed('python backend developer')
+
+        results = top_k_similar(query, 'recruiter', k=2)
+        self.assertEqual([entity_id for entity_id, _ in results], [1, 3])
+        self.assertGreaterEqual(results[0][1], results[1][1])
+
+        results = top_k_similar(query, 'recruiter', k=5, candidate_ids=[2, 3])
+        self.assertEqual([entity_id for entity_id, _ in results], [3, 2])
+
+    def test_top_k_sees_new_vectors(self):
+        """Index is reloaded after a new vector is stored."""
+        get_entity_vector('job', 1, 'python developer')
+        query = HashingEmbeddingBackend().embed('python developer')
+        self.assertEqual(len(top_k_similar(query, 'job')), 1)
+
+        get_entity_vector('job', 2, 'python engineer')
+        self.assertEqual(len(top_k_similar(query, 'job')), 2)
+
+    def test_memory_cache_is_thread_safe(self):
+        """Concurrent get/set with evictions keeps the LRU consistent."""
+        errors = []
+
+        def worker(offset):
+            try:
+                for i in range(2000):
+                    key = ('model', f'{offset}-{i % 50}')
+                    embeddings._lru_set(embeddings._memory_cache, key, i)
+                    embeddings._lru_get(embeddings._memory_cache, ('model', f'{offset - 1}-{i % 50}'))
+            except Exception as e:
+                errors.append(e)
+
+        with patch.object(embeddings, 'MEMORY_CACHE_SIZE', 64):
+            threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(embeddings._memory_cache), 64)
+
+
+@override_settings(AI_EMBEDDING_BACKEND=HASHING_BACKEND)
+class TestSemanticMatchingWithStore(TestCase):
+    """Semantic scoring through the vector store."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='semantic@example.com',
+            password='testpass123',
+            full_name='Semantic Owner',
+            is_active=True
+        )
+        cls.company = Company.objects.create(
+            company_name='Semantic Co',
+            slug='semantic-co',
+            description='Semantic'
+        )
+        cls.job = Job.objects.create(
+            company=cls.company,
+            title='Python Developer',
+            slug='python-developer',
+            description='Build Django APIs',
+            requirements='Python, Django',
+            job_type='full-time',
+            level='junior',
+            status='published',
+            created_by=cls.user
+        )
+        cls.recruiters = []
+        for i, bio in enumerate(['Python Django developer', 'Accountant with Excel skills']):
+            user = User.objects.create_user(
+                email=f'semantic{i}@example.com',
+                password='testpass123',
+                full_name=f'Semantic {i}',
+                is_active=True
+            )
+            cls.recruiters.append(Recruiter.objects.create(
+                user=user,
+                bio=bio,
+                current_position='Engineer',
+                years_of_experience=2,
+                job_search_status='active'
+            ))
+
+    def setUp(self):
+        cache.clear()
+        clear_memory_cache()
+
+    def test_job_is_embedded_once_across_pairs(self):
+        """Scoring N pairs embeds each entity once, not twice per pair."""
+        with patch(
+            'apps.assessment.ai_matching_scores.calculators.semantic_calculator.get_embedding',
+            wraps=HashingEmbeddingBackend().embed,
+        ) as mock_embed:
+            for recruiter in self.recruiters:
+                result = calculate_semantic_score(self.job, recruiter)
+                self.assertTrue(result['is_semantic'])
+            for recruiter in self.recruiters:
+                calculate_semantic_score(self.job, recruiter)
+
+        self.assertEqual(mock_embed.call_count, 1 + len(self.recruiters))
+
+    def test_batch_semantic_matches_single_path(self):
+        """Batch engine's matrix-product semantic score equals the per-pair one."""
+        expected = {}
+        for recruiter in self.recruiters:
+            calculate_single_match(
+                CalculateMatchInput(job_id=self.job.id, recruiter_id=recruiter.id)
+            )
+            score = AIMatchingScore.objects.get(job=self.job, recruiter=recruiter)
+            self.assertTrue(score.matching_details['semantic_enabled'])
+            expected[recruiter.id] = score.overall_score
+        AIMatchingScore.objects.all().delete()
+
+        score_job_against_recruiters(self.job.id, [r.id for r in self.recruiters])
+
+        for recruiter in self.recruiters:
+            score = AIMatchingScore.objects.get(job=self.job, recruiter=recruiter)
+            self.assertTrue(score.matching_details['semantic_enabled'])
+            self.assertEqual(score.overall_score, expected[recruiter.id])
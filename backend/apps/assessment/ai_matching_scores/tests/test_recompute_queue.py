@@ -0,0 +1,165 @@
+"""
+Tests for the debounced match recomputation queue and its signals.
+"""
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+
+from apps.recruitment.jobs.models import Job
+from apps.candidate.recruiters.models import Recruiter
+from apps.candidate.recruiter_skills.models import RecruiterSkill
+from apps.candidate.skills.models import Skill
+from apps.candidate.skill_categories.models import SkillCategory
+from apps.company.companies.models import Company
+from apps.assessment.ai_matching_scores.services import recompute_queue
+
+
+User = get_user_model()
+
+
+class FakeRedis:
+    """Minimal sorted-set subset of the redis client."""
+
+    def __init__(self):
+        self.zsets = {}
+
+    def zadd(self, key, mapping, gt=False):
+        zset = self.zsets.setdefault(key, {})
+        for member, score in mapping.items():
+            if gt and member in zset and zset[member] >= score:
+                continue
+            zset[member] = score
+
+    def zrangebyscore(self, key, low, high):
+        return [m for m, s in sorted(self.zsets.get(key, {}).items(), key=lambda i: i[1]) if s <= high]
+
+    def zremrangebyscore(self, key, low, high):
+        zset = self.zsets.get(key, {})
+        for member in [m for m, s in zset.items() if s <= high]:
+            del zset[member]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def members(self, entity_type):
+        return self.zsets.get(recompute_queue._dirty_key(entity_type), {})
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+        return queue
+
+    def execute(self):
+        return [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+class TestRecomputeQueue(TestCase):
+    """Coalescing and relevance filtering."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='queue@example.com',
+            password='testpass123',
+            full_name='Queue User',
+            is_active=True
+        )
+        cls.company = Company.objects.create(
+            company_name='Queue Co',
+            slug='queue-co',
+            description='Queue'
+        )
+        category = SkillCategory.objects.create(name='Queue', slug='queue')
+        cls.skills = [
+            Skill.objects.create(name=f'Skill {i}', slug=f'queue-skill-{i}', category=category)
+            for i in range(15)
+        ]
+
+    def setUp(self):
+        self.redis = FakeRedis()
+        patcher = patch.object(recompute_queue, 'get_redis_connection', return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.recruiter = Recruiter.objects.create(
+            user=self.user, years_of_experience=2, job_search_status='active'
+        )
+        self.redis.zsets.clear()
+
+    def test_skill_burst_coalesces_into_one_entry(self):
+        """15 skill saves -> one dirty recruiter."""
+        for skill in self.skills:
+            RecruiterSkill.objects.create(recruiter=self.recruiter, skill=skill)
+
+        self.assertEqual(list(self.redis.members('recruiter')), [str(self.recruiter.id)])
+
+    @patch.object(recompute_queue.time, 'time')
+    def test_later_change_pushes_due_time(self, mock_time):
+        """ZADD GT: the window restarts on every change (trailing debounce)."""
+        mock_time.return_value = 1000.0
+        recompute_queue.mark_dirty('recruiter', self.recruiter.id)
+
+        mock_time.return_value = 1030.0
+        recompute_queue.mark_dirty('recruiter', self.recruiter.id)
+
+        self.assertEqual(
+            self.redis.members('recruiter')[str(self.recruiter.id)],
+            1030.0 + recompute_queue.get_debounce_seconds()
+        )
+
+    def test_unrelated_update_fields_are_ignored(self):
+        self.recruiter.save(update_fields=['updated_at'])
+        self.assertEqual(self.redis.members('recruiter'), {})
+
+    def test_full_save_without_relevant_change_is_ignored(self):
+        recruiter = Recruiter.objects.get(id=self.recruiter.id)
+        recruiter.save()
+        self.assertEqual(self.redis.members('recruiter'), {})
+
+    def test_loading_does_not_snapshot(self):
+        recruiter = Recruiter.objects.get(id=self.recruiter.id)
+        self.assertNotIn('_match_snapshot', recruiter.__dict__)
+
+    def test_relevant_change_marks_dirty(self):
+        recruiter = Recruiter.objects.get(id=self.recruiter.id)
+        recruiter.years_of_experience = 5
+        recruiter.save()
+        self.assertIn(str(self.recruiter.id), self.redis.members('recruiter'))
+
+    def test_unpublished_job_is_not_queued(self):
+        job = Job.objects.create(
+            company=self.company, title='Draft', slug='draft-queue',
+            description='Draft', requirements='Draft', job_type='full-time',
+            level='junior', status='draft', created_by=self.user
+        )
+        self.assertEqual(self.redis.members('job'), {})
+
+        job.status = 'published'
+        job.save()
+        self.assertIn(str(job.id), self.redis.members('job'))
+
+    @patch('apps.assessment.ai_matching_scores.tasks.calculate_candidate_matches_task.delay')
+    def test_flush_dispatches_only_due_entities(self, mock_delay):
+        self.redis.zadd(recompute_queue._dirty_key('recruiter'), {'1': 100.0, '2': 200.0})
+
+        dispatched = recompute_queue.flush_due(now=150.0)
+
+        self.assertEqual(dispatched, {'job': 0, 'recruiter': 1})
+        mock_delay.assert_called_once_with(1)
+        self.assertEqual(list(self.redis.members('recruiter')), ['2'])
+
+    @patch('apps.assessment.ai_matching_scores.tasks.calculate_candidate_matches_task.delay')
+    def test_falls_back_to_direct_dispatch_without_redis(self, mock_delay):
+        with patch.object(recompute_queue, 'get_redis_connection', side_effect=NotImplementedError):
+            with self.captureOnCommitCallbacks(execute=True):
+                queued = recompute_queue.mark_dirty('recruiter', self.recruiter.id)
+
+        self.assertFalse(queued)
+        mock_delay.assert_called_once_with(self.recruiter.id)
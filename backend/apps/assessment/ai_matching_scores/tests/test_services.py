@@ -13,6 +13,7 @@ from apps.recruitment.jobs.models import Job
 from apps.candidate.recruiters.models import Recruiter
 from apps.company.companies.models import Company
 from apps.assessment.ai_matching_scores.models import AIMatchingScore
+from apps.assessment.ai_matching_scores.services.batch_scoring import score_recruiter_against_jobs
 from apps.assessment.ai_matching_scores.services.ai_matching_scores import (
     CalculateMatchInput,
     BatchCalculateInput,
@@ -294,6 +295,34 @@ class TestRefreshMatches(TestCase):
         
         self.assertEqual(count, 1)
     
+    @patch('apps.assessment.ai_matching_scores.services.batch_scoring.is_semantic_enabled', return_value=False)
+    def test_refresh_by_recruiter_id_uses_one_batch(self, mock_semantic):
+        """Recruiter-only refresh scores all of the recruiter's jobs at once."""
+        other_job = Job.objects.create(
+            company=self.company,
+            title='Other Refresh Job',
+            slug='other-refresh-job',
+            description='Other job desc',
+            requirements='Skills',
+            status='published',
+            created_by=self.user
+        )
+        for job in (self.job, other_job):
+            AIMatchingScore.objects.create(
+                job=job,
+                recruiter=self.recruiter,
+                overall_score=Decimal('50.00'),
+                is_valid=True
+            )
+        
+        target = 'apps.assessment.ai_matching_scores.services.ai_matching_scores.score_recruiter_against_jobs'
+        with patch(target, wraps=score_recruiter_against_jobs) as mock_score:
+            count = refresh_matches(RefreshMatchInput(recruiter_id=self.recruiter.id))
+        
+        self.assertEqual(count, 2)
+        mock_score.assert_called_once()
+        self.assertEqual(sorted(mock_score.call_args[0][1]), sorted([self.job.id, other_job.id]))
+    
     def test_refresh_no_existing_scores(self):
         """Should return 0 when no scores to refresh."""
         input_data = RefreshMatchInput(job_id=self.job.id)
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 from apps.blog.models import Post, Category, Tag
+from apps.core.counters import blog_post_view_counter
+from apps.core.serializers import CounterField, CounterListSerializer
 
 class CategorySerializer(serializers.ModelSerializer):
     class Meta:
@@ -21,9 +23,11 @@ class PostSerializer(serializers.ModelSerializer):
     tag_ids = serializers.PrimaryKeyRelatedField(
         queryset=Tag.objects.all(), source='tags', write_only=True, many=True, required=False
     )
+    view_count = CounterField(blog_post_view_counter)
     
     class Meta:
         model = Post
+        list_serializer_class = CounterListSerializer
         fields = [
             'id', 'title', 'slug', 'author_name', 'category', 'category_id', 
             'tags', 'tag_ids', 'summary', 'content', 'thumbnail', 
@@ -1,6 +1,7 @@
 from django.utils import timezone
 from django.core.exceptions import PermissionDenied
 from apps.blog.models import Post
+from apps.core.counters import blog_post_view_counter
 
 class BlogService:
     @staticmethod
@@ -30,6 +31,5 @@ class BlogService:
 
     @staticmethod
     def increment_view_count(post: Post) -> int:
-        post.view_count += 1
-        post.save(update_fields=['view_count'])
-        return post.view_count
+        # Write-behind: tránh read-modify-write và lock hàng khi bài viết hot
+        return blog_post_view_counter.increment(post)
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from .models import RecruiterCV
 from apps.candidate.cv_templates.serializers import CVTemplateListSerializer
+from apps.core.counters import cv_download_counter, cv_view_counter
+from apps.core.serializers import CounterField, CounterListSerializer
 
 
 class RecruiterCVListSerializer(serializers.ModelSerializer):
@@ -9,9 +11,12 @@ class RecruiterCVListSerializer(serializers.ModelSerializer):
     """
     
     template_name = serializers.CharField(source='template.name', read_only=True, allow_null=True)
+    view_count = CounterField(cv_view_counter)
+    download_count = CounterField(cv_download_counter)
     
     class Meta:
         model = RecruiterCV
+        list_serializer_class = CounterListSerializer
         fields = [
             'id', 'cv_name', 'template_id', 'template_name',
             'cv_url', 'is_default', 'is_public',
@@ -25,6 +30,8 @@ class RecruiterCVDetailSerializer(serializers.ModelSerializer):
     """
     
     template = CVTemplateListSerializer(read_only=True)
+    view_count = CounterField(cv_view_counter)
+    download_count = CounterField(cv_download_counter)
     
     class Meta:
         model = RecruiterCV
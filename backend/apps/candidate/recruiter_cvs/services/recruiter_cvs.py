@@ -18,6 +18,7 @@ from apps.candidate.recruiter_certifications.models import RecruiterCertificatio
 from apps.candidate.recruiter_projects.models import RecruiterProject
 from apps.candidate.recruiter_languages.models import RecruiterLanguage
 from apps.company.companies.utils.cloudinary import save_raw_file
+from apps.core.counters import cv_download_counter, cv_view_counter
 
 @transaction.atomic
 def set_cv_as_default(cv: RecruiterCV) -> RecruiterCV:
@@ -57,8 +58,7 @@ def generate_cv_download(cv: RecruiterCV, force_regenerate: bool = False) -> dic
     # Use cached URL if exists and not forced
     if cv.cv_url and not force_regenerate:
         # Increment download count
-        cv.download_count += 1
-        cv.save(update_fields=['download_count'])
+        cv_download_counter.increment(cv)
         return {
             "download_url": cv.cv_url,
             "format": "pdf",
@@ -88,8 +88,8 @@ def generate_cv_download(cv: RecruiterCV, force_regenerate: bool = False) -> dic
 
     # Update CV
     cv.cv_url = cv_url
-    cv.download_count += 1
-    cv.save(update_fields=['cv_url', 'download_count'])
+    cv.save(update_fields=['cv_url'])
+    cv_download_counter.increment(cv)
     
     return {
         "download_url": cv_url,
@@ -102,8 +102,7 @@ def generate_cv_preview(cv: RecruiterCV) -> dict:
     """
     Return HTML for preview.
     """
-    cv.view_count += 1
-    cv.save(update_fields=['view_count'])
+    cv_view_counter.increment(cv)
     
     html_content = render_to_string('cv/modern.html', {'data': cv.cv_data})
     
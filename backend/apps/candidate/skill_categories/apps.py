@@ -5,3 +5,6 @@ class SkillCategoriesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.candidate.skill_categories'
     label = 'candidate_skill_categories'
+
+    def ready(self):
+        import apps.candidate.skill_categories.signals
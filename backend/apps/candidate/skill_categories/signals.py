@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.core.caching import CacheService
+from apps.candidate.skill_categories.models import SkillCategory
+
+
+@receiver([post_save, post_delete], sender=SkillCategory)
+def invalidate_skill_category_cache(sender, instance, **kwargs):
+    """
+    Invalidate cache các endpoint đọc khi danh mục kỹ năng thay đổi.
+    """
+    CacheService.invalidate_now_and_on_commit('skills', also=CacheService.invalidate_taxonomy)
@@ -5,3 +5,6 @@ class SkillsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.candidate.skills'
     label = 'candidate_skills'
+
+    def ready(self):
+        import apps.candidate.skills.signals
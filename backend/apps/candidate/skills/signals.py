@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.core.caching import CacheService
+from apps.candidate.skills.models import Skill
+
+
+@receiver([post_save, post_delete], sender=Skill)
+def invalidate_skill_cache(sender, instance, **kwargs):
+    """
+    Invalidate cache các endpoint đọc khi kỹ năng thay đổi.
+    """
+    CacheService.invalidate_now_and_on_commit('skills', also=CacheService.invalidate_taxonomy)
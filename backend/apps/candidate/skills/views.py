@@ -3,6 +3,8 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAdminUser
 
+from apps.core.caching import cache_response
+
 from .models import Skill
 from .serializers import (
     SkillListSerializer,
@@ -27,7 +29,19 @@ class SkillViewSet(viewsets.ModelViewSet):
         - GET /search/       → search by name (public)
         - GET /popular/      → top 20 by usage_count (public)
         - GET /categories/   → skill categories tree (public)
+        
+        Các endpoint GET public được cache theo version (namespace 'skills'),
+        invalidate qua signals của Skill / SkillCategory.
     """
+    cache_namespace = 'skills'
+    
+    @cache_response
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    @cache_response
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
     
     def get_queryset(self):
         queryset = Skill.objects.select_related('category')
@@ -63,6 +77,7 @@ class SkillViewSet(viewsets.ModelViewSet):
         return [IsAdminUser()]
     
     @action(detail=False, methods=['get'])
+    @cache_response
     def search(self, request):
         """
         GET /api/skills/search/?q=python
@@ -81,6 +96,7 @@ class SkillViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
+    @cache_response
     def popular(self, request):
         """
         GET /api/skills/popular/
@@ -91,6 +107,7 @@ class SkillViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
+    @cache_response
     def categories(self, request):
         """
         GET /api/skills/categories/
@@ -0,0 +1,200 @@
+"""
+Gửi digest cho JobAlert có tần suất daily / weekly.
+
+Match của các alert này được lưu với is_sent=False (không gửi ngay).
+Celery beat gọi dispatch_job_alert_digests_task theo chu kỳ: lấy danh sách
+user có match chưa gửi, chia chunk và mỗi subtask gửi cho từng user
+1 email tổng hợp (qua email outbox) + 1 notification cho mỗi alert.
+"""
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.communication.job_alerts.models import JobAlert, JobAlertMatch
+from apps.communication.job_alerts.services.fanout import NOTIFICATION_TYPE_NAME
+from apps.communication.notification_types.models import NotificationType
+from apps.communication.notifications.models import Notification
+from apps.communication.notifications.services.realtime import publish_notifications
+from apps.email.services import EmailOutboxService, EmailService
+
+
+logger = logging.getLogger(__name__)
+
+DIGEST_FREQUENCIES = (JobAlert.Frequency.DAILY, JobAlert.Frequency.WEEKLY)
+
+PERIOD_DISPLAY = {
+    JobAlert.Frequency.DAILY: 'hàng ngày',
+    JobAlert.Frequency.WEEKLY: 'hàng tuần',
+}
+
+DEFAULT_CHUNK_SIZE = 500
+
+# Số việc làm tối đa liệt kê cho mỗi alert trong email
+DEFAULT_MAX_JOBS_PER_ALERT = 10
+
+DEFAULT_FRONTEND_URL = 'http://localhost:3000'
+
+
+def get_digest_chunk_size() -> int:
+    return getattr(settings, 'JOB_ALERT_DIGEST_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+
+
+def get_max_jobs_per_alert() -> int:
+    return getattr(settings, 'JOB_ALERT_DIGEST_MAX_JOBS', DEFAULT_MAX_JOBS_PER_ALERT)
+
+
+def _pending_matches(frequency: str):
+    return JobAlertMatch.objects.filter(
+        is_sent=False,
+        job_alert__frequency=frequency,
+        job_alert__is_active=True,
+    )
+
+
+def list_digest_user_ids(frequency: str) -> List[int]:
+    """ID các user có match chưa gửi cho tần suất này."""
+    return list(
+        _pending_matches(frequency)
+        .order_by()
+        .values_list('job_alert__recruiter__user_id', flat=True)
+        .distinct()
+    )
+
+
+def _group_by_user(rows) -> Dict[int, dict]:
+    """
+    Gom các match theo user -> alert (giữ thứ tự score giảm dần).
+    """
+    users: Dict[int, dict] = {}
+    for row in rows:
+        user = users.setdefault(row['job_alert__recruiter__user_id'], {
+            'email': row['job_alert__recruiter__user__email'],
+            'full_name': row['job_alert__recruiter__user__full_name'],
+            'alerts': OrderedDict(),
+            'match_ids': [],
+        })
+        alert = user['alerts'].setdefault(row['job_alert_id'], {
+            'alert_id': row['job_alert_id'],
+            'alert_name': row['job_alert__alert_name'],
+            'email_notification': row['job_alert__email_notification'],
+            'jobs': [],
+        })
+        alert['jobs'].append({
+            'title': row['job__title'],
+            'slug': row['job__slug'],
+            'company_name': row['job__company__company_name'],
+        })
+        user['match_ids'].append(row['id'])
+    return users
+
+
+def _build_email_context(user: dict, frequency: str) -> Optional[dict]:
+    """Context cho template email; None nếu user tắt email ở mọi alert."""
+    frontend_url = getattr(settings, 'FRONTEND_URL', DEFAULT_FRONTEND_URL)
+    max_jobs = get_max_jobs_per_alert()
+
+    alerts = []
+    for alert in user['alerts'].values():
+        if not alert['email_notification']:
+            continue
+        jobs = alert['jobs']
+        alerts.append({
+            'alert_name': alert['alert_name'],
+            'total': len(jobs),
+            'more': max(len(jobs) - max_jobs, 0),
+            'jobs': [
+                {**job, 'link': f"{frontend_url}/jobs/{job['slug']}"}
+                for job in jobs[:max_jobs]
+            ],
+        })
+
+    if not alerts:
+        return None
+
+    return {
+        'candidate_name': user['full_name'],
+        'period_display': PERIOD_DISPLAY.get(frequency, ''),
+        'total_jobs': sum(alert['total'] for alert in alerts),
+        'alerts': alerts,
+    }
+
+
+def send_digests_for_users(frequency: str, user_ids: List[int]) -> dict:
+    """
+    Gửi digest cho một chunk user.
+
+    Returns:
+        dict: emails, notifications, matches
+    """
+    now = timezone.now()
+    stats = {'emails': 0, 'notifications': 0, 'matches': 0}
+
+    notification_type = NotificationType.objects.filter(
+        type_name=NOTIFICATION_TYPE_NAME,
+        is_active=True
+    ).first()
+
+    with transaction.atomic():
+        rows = (
+            _pending_matches(frequency)
+            .select_for_update(skip_locked=True, of=('self',))
+            .filter(job_alert__recruiter__user_id__in=user_ids)
+            .order_by('job_alert__recruiter__user_id', 'job_alert_id', '-score', '-matched_at')
+            .values(
+                'id', 'job_alert_id', 'job_alert__alert_name', 'job_alert__email_notification',
+                'job_alert__recruiter__user_id', 'job_alert__recruiter__user__email',
+                'job_alert__recruiter__user__full_name',
+                'job__title', 'job__slug', 'job__company__company_name',
+            )
+        )
+        users = _group_by_user(rows)
+        if not users:
+            return stats
+
+        notifications = []
+        if notification_type is not None:
+            for user_id, user in users.items():
+                for alert in user['alerts'].values():
+                    notifications.append(Notification(
+                        user_id=user_id,
+                        notification_type=notification_type,
+                        title=f"{len(alert['jobs'])} việc làm mới cho '{alert['alert_name']}'",
+                        content=", ".join(job['title'] for job in alert['jobs'][:3]),
+                        link='/jobs',
+                        entity_type='job_alert',
+                        entity_id=alert['alert_id']
+                    ))
+            notifications = Notification.objects.bulk_create(notifications)
+            publish_notifications(notifications)
+
+        match_ids = [match_id for user in users.values() for match_id in user['match_ids']]
+        alert_ids = [alert_id for user in users.values() for alert_id in user['alerts']]
+        JobAlertMatch.objects.filter(id__in=match_ids).update(is_sent=True)
+        JobAlert.objects.filter(id__in=alert_ids).update(last_sent_at=now)
+
+        stats['notifications'] = len(notifications)
+        stats['matches'] = len(match_ids)
+
+        # Email vào outbox cùng transaction, worker gửi theo lô sau commit
+        for user in users.values():
+            context = _build_email_context(user, frequency)
+            if context is None or not user['email']:
+                continue
+            queued = EmailService.queue_email(
+                recipient=user['email'],
+                subject=f"[JobPortal] {context['total_jobs']} việc làm mới phù hợp với bạn",
+                template_path="emails/job_alerts/digest.html",
+                context=context,
+                schedule=False
+            )
+            if queued:
+                stats['emails'] += 1
+
+        if stats['emails']:
+            transaction.on_commit(EmailOutboxService.schedule_delivery)
+
+    return stats
@@ -0,0 +1,91 @@
+"""
+Gửi notification hàng loạt cho các JobAlert khớp với một Job.
+
+Thay cho vòng lặp record_match + send_notification theo từng alert
+(~5 query / alert): mỗi chunk chỉ cần 1 query lấy match chưa gửi,
+bulk_create notifications và 1 UPDATE is_sent.
+"""
+import logging
+from typing import List
+
+from django.conf import settings
+from django.db import transaction
+
+from apps.communication.job_alerts.models import JobAlertMatch
+from apps.communication.notification_types.models import NotificationType
+from apps.communication.notifications.models import Notification
+from apps.communication.notifications.services.realtime import publish_notifications
+from apps.recruitment.jobs.models import Job
+
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_TYPE_NAME = 'job_alert_match'
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def get_fanout_chunk_size() -> int:
+    return getattr(settings, 'JOB_ALERT_FANOUT_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+
+
+def chunk_ids(ids: List[int], size: int) -> List[List[int]]:
+    """Chia danh sách id thành các chunk cho Celery subtasks."""
+    return [ids[i:i + size] for i in range(0, len(ids), size)]
+
+
+def send_match_notifications(job: Job, alert_ids: List[int]) -> int:
+    """
+    Tạo notification cho các match chưa gửi của job trong danh sách alert.
+    
+    Match được khóa (skip_locked) trong transaction, nên hai subtask chạy
+    trùng chunk không gửi trùng notification.
+    
+    Args:
+        job: Job đã match (cần select_related('company'))
+        alert_ids: ID các JobAlert trong chunk
+    
+    Returns:
+        Số notification đã tạo
+    """
+    notification_type = NotificationType.objects.filter(
+        type_name=NOTIFICATION_TYPE_NAME,
+        is_active=True
+    ).first()
+    if notification_type is None:
+        logger.warning(f"NotificationType '{NOTIFICATION_TYPE_NAME}' missing, skip job {job.id}")
+        return 0
+    
+    title = f"Job matched: {job.title}"
+    link = f"/jobs/{job.slug}"
+    
+    with transaction.atomic():
+        pending = list(
+            JobAlertMatch.objects
+            .select_for_update(skip_locked=True, of=('self',))
+            .filter(job=job, job_alert_id__in=alert_ids, is_sent=False)
+            .values_list('id', 'job_alert__alert_name', 'job_alert__recruiter__user_id')
+        )
+        if not pending:
+            return 0
+        
+        notifications = Notification.objects.bulk_create([
+            Notification(
+                user_id=user_id,
+                notification_type=notification_type,
+                title=title,
+                content=f"Job {job.title} at {job.company.company_name} is matched with your alert '{alert_name}'.",
+                link=link,
+                entity_type='job',
+                entity_id=job.id
+            )
+            for _, alert_name, user_id in pending
+        ], batch_size=get_fanout_chunk_size())
+        
+        JobAlertMatch.objects.filter(
+            id__in=[match_id for match_id, _, _ in pending]
+        ).update(is_sent=True)
+        
+        publish_notifications(notifications)
+    
+    return len(notifications)
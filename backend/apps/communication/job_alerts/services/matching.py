@@ -170,3 +170,31 @@ class JobMatchingService:
             if updated:
                 match.save()
         return match
+
+    @staticmethod
+    def bulk_record_matches(job: Job, alerts: List[JobAlert], batch_size: int = 1000) -> int:
+        """
+        Lưu lịch sử match cho nhiều alert cùng lúc (bulk insert).
+        
+        Match đã tồn tại được bỏ qua (ignore_conflicts), nên chạy lại
+        cho cùng một job không tạo bản ghi trùng và không reset is_sent.
+        
+        Args:
+            job: The Job that was matched
+            alerts: JobAlerts returned by find_alerts_for_job
+            batch_size: Số bản ghi mỗi câu INSERT
+        
+        Returns:
+            Số match đã xử lý
+        """
+        matches = [
+            JobAlertMatch(
+                job_alert_id=alert.id,
+                job=job,
+                is_sent=False,
+                score=getattr(alert, '_matching_score', 0.0) or 0.0
+            )
+            for alert in alerts
+        ]
+        JobAlertMatch.objects.bulk_create(matches, batch_size=batch_size, ignore_conflicts=True)
+        return len(matches)
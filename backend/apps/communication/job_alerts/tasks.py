@@ -1,8 +1,19 @@
 from celery import shared_task
 from django.apps import apps
+from apps.communication.job_alerts.models import JobAlert
 from apps.communication.job_alerts.services.matching import JobMatchingService
-from apps.communication.notifications.services.notifications import send_notification
+from apps.communication.job_alerts.services.digest import (
+    get_digest_chunk_size,
+    list_digest_user_ids,
+    send_digests_for_users,
+)
+from apps.communication.job_alerts.services.fanout import (
+    chunk_ids,
+    get_fanout_chunk_size,
+    send_match_notifications,
+)
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -10,11 +21,15 @@ logger = logging.getLogger(__name__)
 def process_job_matching_task(job_id):
     """
     Celery task để xử lý matching job alert bất đồng bộ.
+
+    Lưu match bằng bulk insert, sau đó chia alert 'instant' thành các chunk
+    và gửi notification trong các subtask song song. Match của alert
+    daily/weekly được giữ lại (is_sent=False) cho digest.
     """
     try:
         # Lazy import để tránh circular import
         Job = apps.get_model('recruitment_jobs', 'Job')
-        
+
         try:
             job = Job.objects.get(id=job_id)
         except Job.DoesNotExist:
@@ -22,38 +37,89 @@ def process_job_matching_task(job_id):
             return
 
         logger.info(f"Processing background matching for Job {job_id}")
-        
+        started = time.perf_counter()
+
         matched_alerts = JobMatchingService.find_alerts_for_job(job)
-        
-        count = 0
-        for alert in matched_alerts:
-            # Tạo bản ghi match
-            match = JobMatchingService.record_match(
-                job_alert=alert, 
-                job=job,
-                is_sent=False 
-            )
-            
-            if not match.is_sent:
-                # Gửi notification
-                notification = send_notification(
-                    user_id=alert.recruiter.user.id,
-                    notification_type_name='job_alert_match',
-                    title=f"Job matched: {job.title}",
-                    content=f"Job {job.title} at {job.company.company_name} is matched with your alert '{alert.alert_name}'.",
-                    link=f"/jobs/{job.slug}",
-                    entity_type='job',
-                    entity_id=job.id
-                )
-                
-                if notification:
-                    match.is_sent = True
-                    match.save()
-                    count += 1
-                else:
-                    logger.warning(f"Failed to send notification for job {job.id} (NotificationType 'job_alert_match' missing?)")
-        
-        logger.info(f"Completed matching for Job {job_id}. Notifications sent: {count}")
-            
+
+        # Tạo bản ghi match (bỏ qua match đã tồn tại)
+        JobMatchingService.bulk_record_matches(job, matched_alerts)
+
+        instant_alert_ids = [
+            alert.id for alert in matched_alerts
+            if alert.frequency == JobAlert.Frequency.INSTANT
+        ]
+        chunks = chunk_ids(instant_alert_ids, get_fanout_chunk_size())
+        for chunk in chunks:
+            send_job_alert_notifications_task.delay(job_id, chunk)
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Completed matching for Job {job_id}: {len(matched_alerts)} alerts "
+            f"({len(instant_alert_ids)} instant), {len(chunks)} chunks dispatched in {elapsed:.2f}s"
+        )
+
     except Exception as e:
         logger.error(f"Error in process_job_matching_task for job {job_id}: {str(e)}")
+
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=3)
+def send_job_alert_notifications_task(self, job_id, alert_ids):
+    """
+    Celery subtask gửi notification cho một chunk alert đã match với job.
+    """
+    Job = apps.get_model('recruitment_jobs', 'Job')
+
+    try:
+        job = Job.objects.select_related('company').get(id=job_id)
+    except Job.DoesNotExist:
+        logger.error(f"Job {job_id} not found for alert notifications")
+        return 0
+
+    started = time.perf_counter()
+    sent = send_match_notifications(job, alert_ids)
+    elapsed = time.perf_counter() - started
+
+    rate = sent / elapsed if elapsed > 0 else 0
+    logger.info(
+        f"Job {job_id}: sent {sent}/{len(alert_ids)} alert notifications "
+        f"in {elapsed:.2f}s ({rate:.0f}/s)"
+    )
+    return sent
+
+
+@shared_task
+def dispatch_job_alert_digests_task(frequency):
+    """
+    Celery beat task: chia các user có match chưa gửi (daily/weekly)
+    thành chunk và gửi digest trong các subtask.
+    """
+    started = time.perf_counter()
+    user_ids = list_digest_user_ids(frequency)
+
+    chunks = chunk_ids(user_ids, get_digest_chunk_size())
+    for chunk in chunks:
+        send_job_alert_digest_chunk_task.delay(frequency, chunk)
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"Dispatched {frequency} job alert digests: {len(user_ids)} users, "
+        f"{len(chunks)} chunks in {elapsed:.2f}s"
+    )
+    return len(user_ids)
+
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=3)
+def send_job_alert_digest_chunk_task(self, frequency, user_ids):
+    """
+    Celery subtask gửi digest (email + notification) cho một chunk user.
+    """
+    started = time.perf_counter()
+    stats = send_digests_for_users(frequency, user_ids)
+    elapsed = time.perf_counter() - started
+
+    logger.info(
+        f"Sent {frequency} digests for {len(user_ids)} users in {elapsed:.2f}s: "
+        f"{stats['emails']} emails, {stats['notifications']} notifications, "
+        f"{stats['matches']} matches"
+    )
+    return stats
@@ -0,0 +1,111 @@
+from unittest.mock import patch
+from django.conf import settings
+from django.core import mail
+from django.test import TestCase, override_settings
+from apps.communication.job_alerts.models import JobAlert, JobAlertMatch
+from apps.communication.job_alerts.tasks import (
+    dispatch_job_alert_digests_task,
+    process_job_matching_task,
+    send_job_alert_digest_chunk_task,
+)
+from apps.communication.notification_types.models import NotificationType
+from apps.communication.notifications.models import Notification
+from apps.recruitment.jobs.models import Job
+from apps.candidate.recruiters.models import Recruiter
+from apps.core.users.models import CustomUser
+from apps.company.companies.models import Company
+from apps.email.services import EmailOutboxService
+
+
+def run_digest_inline(frequency, user_ids):
+    stats = send_job_alert_digest_chunk_task.run(frequency, user_ids)
+    EmailOutboxService.deliver_batch()
+    return stats
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    TEMPLATES=[{
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [settings.BASE_DIR / 'templates'],
+        'APP_DIRS': True,
+    }]
+)
+class JobAlertDigestTest(TestCase):
+    def setUp(self):
+        owner = CustomUser.objects.create(email='owner@example.com', full_name='Owner')
+        self.company = Company.objects.create(company_name='Digest Co', slug='digest-co', user=owner)
+        self.jobs = [
+            Job.objects.create(
+                title=f'Python Developer {i}',
+                slug=f'python-developer-{i}',
+                company=self.company,
+                status='published',
+                created_by=owner
+            )
+            for i in range(3)
+        ]
+        NotificationType.objects.create(type_name='job_alert_match', template='Job alert match', is_active=True)
+
+        self.user = CustomUser.objects.create(email='candidate@example.com', full_name='Candidate')
+        recruiter = Recruiter.objects.create(user=self.user)
+        self.daily_alerts = [
+            JobAlert.objects.create(recruiter=recruiter, alert_name=f'Daily {i}', frequency=JobAlert.Frequency.DAILY)
+            for i in range(2)
+        ]
+        self.weekly_alert = JobAlert.objects.create(
+            recruiter=recruiter, alert_name='Weekly', frequency=JobAlert.Frequency.WEEKLY
+        )
+
+        for job in self.jobs:
+            for alert in self.daily_alerts + [self.weekly_alert]:
+                JobAlertMatch.objects.create(job_alert=alert, job=job, is_sent=False)
+
+    @patch('apps.communication.job_alerts.tasks.send_job_alert_notifications_task.delay')
+    def test_non_instant_matches_are_not_sent_immediately(self, mock_delay):
+        process_job_matching_task(self.jobs[0].id)
+
+        mock_delay.assert_not_called()
+        self.assertFalse(Notification.objects.exists())
+
+    @patch('apps.communication.job_alerts.tasks.send_job_alert_digest_chunk_task.delay', side_effect=run_digest_inline)
+    def test_daily_digest_sends_one_email_and_one_notification_per_alert(self, mock_delay):
+        dispatch_job_alert_digests_task('daily')
+
+        mock_delay.assert_called_once_with('daily', [self.user.id])
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn('6 việc làm mới', mail.outbox[0].subject)
+        self.assertIn('Python Developer 2', mail.outbox[0].alternatives[0][0])
+
+        notifications = Notification.objects.filter(user=self.user, entity_type='job_alert')
+        self.assertEqual(
+            set(notifications.values_list('entity_id', flat=True)),
+            {alert.id for alert in self.daily_alerts}
+        )
+
+        daily_matches = JobAlertMatch.objects.filter(job_alert__in=self.daily_alerts)
+        self.assertFalse(daily_matches.filter(is_sent=False).exists())
+        self.assertFalse(JobAlertMatch.objects.filter(job_alert=self.weekly_alert, is_sent=True).exists())
+        self.assertIsNotNone(JobAlert.objects.get(id=self.daily_alerts[0].id).last_sent_at)
+
+    @patch('apps.communication.job_alerts.tasks.send_job_alert_digest_chunk_task.delay', side_effect=run_digest_inline)
+    def test_digest_is_not_sent_twice(self, mock_delay):
+        dispatch_job_alert_digests_task('daily')
+        dispatch_job_alert_digests_task('daily')
+
+        self.assertEqual(mock_delay.call_count, 1)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_email_skipped_when_alerts_disable_email(self):
+        JobAlert.objects.filter(frequency=JobAlert.Frequency.WEEKLY).update(email_notification=False)
+
+        stats = run_digest_inline('weekly', [self.user.id])
+
+        self.assertEqual(stats, {'emails': 0, 'notifications': 1, 'matches': 3})
+        self.assertEqual(len(mail.outbox), 0)
+
+    @override_settings(JOB_ALERT_DIGEST_MAX_JOBS=1)
+    def test_email_lists_limited_jobs_per_alert(self):
+        run_digest_inline('weekly', [self.user.id])
+
+        self.assertIn('và 2 việc làm khác', mail.outbox[0].alternatives[0][0])
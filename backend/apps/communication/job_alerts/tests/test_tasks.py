@@ -0,0 +1,96 @@
+from unittest.mock import patch
+from django.test import TestCase, override_settings
+from apps.communication.job_alerts.models import JobAlert, JobAlertMatch
+from apps.communication.job_alerts.services.matching import JobMatchingService
+from apps.communication.job_alerts.tasks import (
+    process_job_matching_task,
+    send_job_alert_notifications_task,
+)
+from apps.communication.notification_types.models import NotificationType
+from apps.communication.notifications.models import Notification
+from apps.recruitment.jobs.models import Job
+from apps.candidate.recruiters.models import Recruiter
+from apps.core.users.models import CustomUser
+from apps.company.companies.models import Company
+
+
+def run_chunk_inline(job_id, alert_ids):
+    return send_job_alert_notifications_task.run(job_id, alert_ids)
+
+
+@patch('apps.communication.job_alerts.tasks.send_job_alert_notifications_task.delay', side_effect=run_chunk_inline)
+class JobAlertFanoutTaskTest(TestCase):
+    def setUp(self):
+        owner = CustomUser.objects.create(email='owner@example.com', full_name='Owner')
+        self.company = Company.objects.create(company_name='Fanout Co', slug='fanout-co', user=owner)
+        self.job = Job.objects.create(
+            title='Python Developer',
+            slug='python-developer',
+            company=self.company,
+            status='published',
+            created_by=owner
+        )
+        self.notification_type = NotificationType.objects.create(
+            type_name='job_alert_match',
+            template='Job alert match',
+            is_active=True
+        )
+        self.alerts = []
+        for i in range(3):
+            user = CustomUser.objects.create(email=f'candidate{i}@example.com', full_name=f'Candidate {i}')
+            recruiter = Recruiter.objects.create(user=user)
+            self.alerts.append(JobAlert.objects.create(
+                recruiter=recruiter,
+                alert_name=f'Alert {i}',
+                keywords='Python',
+                frequency=JobAlert.Frequency.INSTANT
+            ))
+
+    def test_fanout_creates_matches_and_notifications(self, mock_delay):
+        process_job_matching_task(self.job.id)
+
+        matches = JobAlertMatch.objects.filter(job=self.job)
+        self.assertEqual(matches.count(), 3)
+        self.assertFalse(matches.filter(is_sent=False).exists())
+
+        notifications = Notification.objects.filter(entity_type='job', entity_id=self.job.id)
+        self.assertEqual(notifications.count(), 3)
+        self.assertEqual(
+            set(notifications.values_list('user_id', flat=True)),
+            {alert.recruiter.user_id for alert in self.alerts}
+        )
+        self.assertIn("'Alert 0'", notifications.get(user_id=self.alerts[0].recruiter.user_id).content)
+
+    def test_rerun_does_not_send_twice(self, mock_delay):
+        process_job_matching_task(self.job.id)
+        process_job_matching_task(self.job.id)
+
+        self.assertEqual(JobAlertMatch.objects.filter(job=self.job).count(), 3)
+        self.assertEqual(Notification.objects.filter(entity_id=self.job.id).count(), 3)
+
+    @override_settings(JOB_ALERT_FANOUT_CHUNK_SIZE=2)
+    def test_alerts_are_split_into_chunks(self, mock_delay):
+        process_job_matching_task(self.job.id)
+
+        self.assertEqual(mock_delay.call_count, 2)
+        chunk_sizes = sorted(len(call.args[1]) for call in mock_delay.call_args_list)
+        self.assertEqual(chunk_sizes, [1, 2])
+
+    def test_missing_notification_type_keeps_matches_unsent(self, mock_delay):
+        self.notification_type.is_active = False
+        self.notification_type.save()
+
+        process_job_matching_task(self.job.id)
+
+        self.assertEqual(JobAlertMatch.objects.filter(job=self.job, is_sent=False).count(), 3)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_chunk_query_count_does_not_grow_per_alert(self, mock_delay):
+        JobMatchingService.bulk_record_matches(self.job, self.alerts)
+        alert_ids = [alert.id for alert in self.alerts]
+
+        # job + type lookup, savepoint, select pending, insert, update, release
+        with self.assertNumQueries(7):
+            sent = run_chunk_inline(self.job.id, alert_ids)
+
+        self.assertEqual(sent, 3)
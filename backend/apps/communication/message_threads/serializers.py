@@ -64,15 +64,14 @@ class MessageThreadSerializer(serializers.ModelSerializer):
         return None
     
     def get_participant_count(self, obj):
+        # list_threads annotate sẵn participant_count
+        if hasattr(obj, 'participant_count'):
+            return obj.participant_count
         return obj.participants.filter(is_active=True).count()
     
     def get_unread_count(self, obj):
-        request = self.context.get('request')
-        if not request:
-            return 0
-        
-        # Unread count temporarily disabled during Mongo migration
-        return 0
+        # View nạp unread count cho cả trang bằng 1 query (context['unread_counts'])
+        return self.context.get('unread_counts', {}).get(obj.id, 0)
 
 
 class MessageThreadDetailSerializer(serializers.ModelSerializer):
@@ -5,6 +5,7 @@ from rest_framework import viewsets, status, mixins
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 from .models import MessageThread
 from .serializers import (
@@ -22,6 +23,7 @@ from apps.communication.messages.selectors.messages import (
     list_threads,
     get_thread_by_id,
     list_messages,
+    get_unread_counts,
 )
 from apps.communication.messages.services.messages import (
     create_thread,
@@ -34,6 +36,10 @@ from apps.communication.messages.services.messages import (
     MessageCreateInput,
 )
 
+MESSAGE_PAGE_SIZE = 50
+MESSAGE_MAX_PAGE_SIZE = 100
+
+
 class MessageThreadViewSet(
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
@@ -72,15 +78,16 @@ class MessageThreadViewSet(
         queryset = self.get_queryset()
         
         page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = MessageThreadSerializer(
-                page, many=True, context={'request': request}
-            )
-            return self.get_paginated_response(serializer.data)
+        threads = page if page is not None else list(queryset)
         
         serializer = MessageThreadSerializer(
-            queryset, many=True, context={'request': request}
+            threads, many=True, context={
+                'request': request,
+                'unread_counts': get_unread_counts(request.user.id, [t.id for t in threads]),
+            }
         )
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
         return Response(serializer.data)
     
     def create(self, request):
@@ -149,22 +156,52 @@ class MessageThreadViewSet(
             return self._send_message(request, pk)
     
     def _list_messages(self, request, thread_id):
-        """Get messages in a thread."""
-        messages = list_messages(thread_id, request.user.id)
+        """
+        Get messages in a thread (keyset pagination).
+        
+        Query params:
+            - limit: page size (default 50, max 100)
+            - before: message id - load older messages (scroll up)
+            - after: message id - load newer messages
+        """
+        before = request.query_params.get('before')
+        after = request.query_params.get('after')
+        try:
+            limit = min(max(int(request.query_params.get('limit', MESSAGE_PAGE_SIZE)), 1), MESSAGE_MAX_PAGE_SIZE)
+        except ValueError:
+            limit = MESSAGE_PAGE_SIZE
         
-        if messages is None:
+        try:
+            page = list_messages(thread_id, request.user.id, limit=limit, before=before, after=after)
+        except ValueError as e:
+            return Response(
+                {'detail': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if page is None:
             return Response(
                 {'detail': 'Thread not found or access denied'},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        page = self.paginate_queryset(messages)
-        if page is not None:
-            serializer = MongoMessageSerializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+        messages = page['results']
+        forward = bool(after) and not before
+        has_older = page['has_more'] if not forward else bool(messages)
+        has_newer = page['has_more'] if forward else bool(before and messages)
         
         serializer = MongoMessageSerializer(messages, many=True)
-        return Response(serializer.data)
+        return Response({
+            'page_size': limit,
+            'previous': self._message_cursor_link(request, 'before', messages[0]['id']) if has_older else None,
+            'next': self._message_cursor_link(request, 'after', messages[-1]['id']) if has_newer else None,
+            'results': serializer.data
+        })
+    
+    def _message_cursor_link(self, request, param, message_id):
+        url = request.build_absolute_uri()
+        url = remove_query_param(url, 'after' if param == 'before' else 'before')
+        return replace_query_param(url, param, message_id)
     
     def _send_message(self, request, thread_id):
         """Send a message to a thread."""
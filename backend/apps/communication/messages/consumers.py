@@ -4,10 +4,8 @@ from channels.db import database_sync_to_async
 from django.utils import timezone
 
 """Lưu tin nhắn vào database."""
-from apps.communication.message_threads.models import MessageThread
 from apps.communication.message_participants.models import MessageParticipant
-from apps.communication.messages.services.mongo_service import MongoChatService
-from apps.communication.messages.tasks import persist_chat_message_task
+from apps.communication.messages.services.chat_buffer import chat_write_buffer
 from bson import ObjectId
 
 
@@ -72,6 +70,9 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 self.room_group_name,
                 self.channel_name
             )
+            
+            # Ghi ngay các tin còn trong buffer
+            await chat_write_buffer.flush()
     
     async def receive(self, text_data):
         """Xử lý khi nhận tin nhắn từ client."""
@@ -107,18 +108,16 @@ class ChatConsumer(AsyncWebsocketConsumer):
         message_id = str(ObjectId())
         created_at = timezone.now().isoformat()
         
-        # Update thread metadata in SQL (keep this fast)
-        await self.update_thread_metadata()
-        
-        # Offload Storage to background worker
-        persist_chat_message_task.delay(
-            thread_id=self.thread_id,
-            sender_id=self.user.id,
-            sender_name=self.user.full_name,
-            sender_avatar=getattr(self.user, 'avatar_url', None),
-            content=content,
-            message_id=message_id
-        )
+        # Write-behind: buffer ghi theo lô (Mongo, metadata thread, unread counters)
+        await chat_write_buffer.add({
+            'id': message_id,
+            'thread_id': int(self.thread_id),
+            'sender_id': self.user.id,
+            'sender_name': self.user.full_name,
+            'sender_avatar': getattr(self.user, 'avatar_url', None),
+            'content': content,
+            'created_at': created_at,
+        })
         
         # Gửi tin nhắn đến tất cả users trong room ngay lập tức
         await self.channel_layer.group_send(
@@ -209,16 +208,6 @@ class ChatConsumer(AsyncWebsocketConsumer):
             is_active=True
         ).exists()
     
-    @database_sync_to_async
-    def update_thread_metadata(self):
-        """Cập nhật thời gian update của thread trong DB chính."""
-        try:
-            thread = MessageThread.objects.get(id=self.thread_id)
-            thread.save() # Triggers auto_now update
-            return True
-        except MessageThread.DoesNotExist:
-            return False
-    
     @database_sync_to_async
     def mark_thread_as_read(self):
         """Đánh dấu thread là đã đọc."""
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from apps.communication.messages.services.mongo_service import MongoChatService
+
+
+class Command(BaseCommand):
+    help = 'Tạo index MongoDB cho messages / unread_counters (idempotent)'
+
+    def handle(self, *args, **options):
+        for name in MongoChatService.ensure_indexes():
+            self.stdout.write(f"Ensured index {name}")
+
+        self.stdout.write(self.style.SUCCESS("MongoDB chat indexes are up to date."))
@@ -1,8 +1,14 @@
-from django.db.models import QuerySet, Count, Q
+import logging
+from typing import Optional
+
+from django.db.models import QuerySet, Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
 from apps.communication.message_threads.models import MessageThread
 from apps.communication.message_participants.models import MessageParticipant
 from apps.communication.messages.services.mongo_service import MongoChatService
 
+logger = logging.getLogger(__name__)
+
 
 def list_threads(user_id: int) -> QuerySet:
     """
@@ -12,13 +18,23 @@ def list_threads(user_id: int) -> QuerySet:
         user_id: ID of the user
     
     Returns:
-        QuerySet of threads the user participates in, ordered by updated_at
+        QuerySet of threads the user participates in, ordered by updated_at,
+        annotated with participant_count (active participants)
     """
+    # Subquery thay vì Count(): join participants ở filter chỉ chứa dòng của user
+    active_participants = MessageParticipant.objects.filter(
+        thread_id=OuterRef('pk'),
+        is_active=True
+    ).order_by().values('thread_id').annotate(total=Count('id')).values('total')
+    
     return MessageThread.objects.filter(
         participants__user_id=user_id,
         participants__is_active=True
-    ).prefetch_related(
-        'participants__user'
+    ).annotate(
+        participant_count=Coalesce(
+            Subquery(active_participants, output_field=IntegerField()),
+            Value(0)
+        )
     ).order_by('-last_message_at', '-updated_at')
 
 
@@ -47,16 +63,30 @@ def get_thread_by_id(thread_id: int, user_id: int) -> Optional[MessageThread]:
         return None
 
 
-def list_messages(thread_id: int, user_id: int) -> Optional[QuerySet]:
+def list_messages(
+    thread_id: int,
+    user_id: int,
+    limit: int = 50,
+    before: Optional[str] = None,
+    after: Optional[str] = None
+) -> Optional[dict]:
     """
-    Get messages in a thread.
+    Get a page of messages in a thread (keyset pagination on message id).
     
     Args:
         thread_id: ID of the thread
         user_id: ID of the user (for access check)
+        limit: Page size
+        before: Only messages older than this message id
+        after: Only messages newer than this message id
     
     Returns:
-        QuerySet of messages or None if thread not found or no access
+        {"results": [...oldest -> newest], "has_more": bool} or None if thread
+        not found or no access. has_more refers to the paging direction
+        (older messages, or newer ones when paging with `after`).
+    
+    Raises:
+        ValueError: Invalid cursor
     """
     # Check access
     if not MessageParticipant.objects.filter(
@@ -66,13 +96,38 @@ def list_messages(thread_id: int, user_id: int) -> Optional[QuerySet]:
     ).exists():
         return None
     
-    # MongoDB Logic
-    return MongoChatService.get_messages(thread_id=thread_id)
+    # MongoDB Logic - lấy thêm 1 tin để biết còn trang tiếp hay không
+    # (thread_id trong Mongo là int, pk từ URL là str)
+    messages = MongoChatService.get_messages(
+        thread_id=int(thread_id),
+        limit=limit + 1,
+        before=before,
+        after=after
+    )
+    has_more = len(messages) > limit
+    if has_more:
+        messages = messages[:-1] if after and not before else messages[1:]
+    
+    return {"results": messages, "has_more": has_more}
 
 
 # get_message_by_id removed (SQL)
 
 
+def get_unread_counts(user_id: int, thread_ids: list[int]) -> dict[int, int]:
+    """
+    Unread counts for a page of threads (one MongoDB query).
+    
+    Returns:
+        thread_id -> unread count; empty if MongoDB is unavailable
+    """
+    try:
+        return MongoChatService.get_unread_counts(user_id, thread_ids)
+    except Exception as e:
+        logger.warning(f"Could not load unread counts for user {user_id}: {e}")
+        return {}
+
+
 def count_unread_messages(user_id: int) -> int:
     """
     Count total unread messages across all threads for a user.
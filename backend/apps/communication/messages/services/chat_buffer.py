@@ -0,0 +1,97 @@
+"""
+Write-behind buffer cho tin nhắn WebSocket.
+
+ChatConsumer không ghi từng tin (1 Celery task + 1 insert_one + 1 UPDATE
+thread mỗi tin) mà đưa vào buffer của process ASGI. Buffer flush khi đủ
+CHAT_BUFFER_MAX_MESSAGES tin hoặc sau CHAT_BUFFER_FLUSH_INTERVAL giây kể
+từ tin đầu tiên, và khi consumer ngắt kết nối: persist_message_batch ghi
+cả lô (insert_many, 1 UPDATE / thread, 1 bulk_write unread counters).
+
+Nếu ghi lỗi, lô được chuyển sang Celery (persist_chat_messages_task) để
+broker giữ lại và thử lại. Nếu cả broker cũng lỗi, nội dung lô được ghi
+vào log (JSON) để có thể nạp lại bằng tay.
+"""
+import asyncio
+import json
+import logging
+
+from channels.db import database_sync_to_async
+from django.conf import settings
+
+from apps.communication.messages.services.messages import persist_message_batch
+from apps.communication.messages.tasks import persist_chat_messages_task
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_MAX_MESSAGES = 200
+DEFAULT_FLUSH_INTERVAL = 0.5
+
+
+class ChatWriteBuffer:
+    """
+    Buffer tin nhắn dùng chung cho mọi consumer trong 1 process.
+
+    Chỉ được dùng từ event loop (không cần lock: không có await giữa lúc
+    đọc và lúc tráo list tin nhắn).
+    """
+
+    def __init__(self):
+        self._messages = []
+        self._timer = None
+
+    @property
+    def max_messages(self) -> int:
+        return getattr(settings, 'CHAT_BUFFER_MAX_MESSAGES', DEFAULT_MAX_MESSAGES)
+
+    @property
+    def flush_interval(self) -> float:
+        return getattr(settings, 'CHAT_BUFFER_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL)
+
+    def __len__(self):
+        return len(self._messages)
+
+    async def add(self, message: dict) -> None:
+        """Thêm 1 tin (dict theo format persist_message_batch)."""
+        self._messages.append(message)
+
+        if len(self._messages) >= self.max_messages:
+            await self.flush()
+        elif self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.flush_interval, self._flush_later)
+
+    def _flush_later(self):
+        self._timer = None
+        asyncio.ensure_future(self.flush())
+
+    async def flush(self) -> int:
+        """
+        Ghi các tin đang chờ.
+
+        Returns:
+            int: Số tin đã flush
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        messages, self._messages = self._messages, []
+        if not messages:
+            return 0
+
+        try:
+            await database_sync_to_async(persist_message_batch)(messages)
+        except Exception as e:
+            logger.error(f"Chat buffer flush failed, handing {len(messages)} messages to Celery: {e}")
+            try:
+                persist_chat_messages_task.delay(messages)
+            except Exception as task_error:
+                logger.critical(
+                    f"Could not queue {len(messages)} chat messages, they were not persisted: {task_error}. "
+                    f"Payload: {json.dumps(messages, ensure_ascii=False)}"
+                )
+        return len(messages)
+
+
+chat_write_buffer = ChatWriteBuffer()
@@ -1,6 +1,8 @@
 import os
 import uuid
 
+from collections import Counter, defaultdict
+from datetime import datetime, timezone as dt_timezone
 from typing import Optional
 
 from django.utils import timezone
@@ -8,6 +10,7 @@ from django.db import transaction
 from django.core.files.uploadedfile import UploadedFile
 from django.conf import settings
 
+from bson import ObjectId
 from pydantic import BaseModel
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
@@ -125,7 +128,7 @@ def send_message(
     thread_id: int,
     sender: CustomUser,
     data: MessageCreateInput
-) -> Message:
+) -> dict:
     """
     Send a message to a thread.
     
@@ -135,7 +138,7 @@ def send_message(
         data: Message data
     
     Returns:
-        Created Message object
+        Created message dict (MongoDB)
     
     Raises:
         ValueError: If thread not found or sender is not a participant
@@ -201,6 +204,78 @@ def send_message(
     return message
 
 
+def persist_message_batch(messages: list[dict]) -> int:
+    """
+    Persist a batch of chat messages buffered by ChatWriteBuffer.
+    
+    - MongoDB: 1 insert_many for all messages
+    - SQL: 1 UPDATE per thread with the latest message (last_message_*)
+    - Unread counters: 1 bulk_write, +N for each active participant
+      other than the sender, counting only messages this call inserted
+      ($inc is not idempotent, a retried batch must not count twice)
+    
+    Args:
+        messages: Dicts with id, thread_id, sender_id, sender_name,
+            sender_avatar, content, created_at (ISO) - in send order
+    
+    Returns:
+        Number of messages newly persisted
+    """
+    if not messages:
+        return 0
+    
+    docs = []
+    latest = {}
+    for message in messages:
+        created_at = datetime.fromisoformat(message['created_at'])
+        # Mongo lưu datetime UTC naive giống save_message
+        if timezone.is_aware(created_at):
+            created_at = timezone.make_naive(created_at, dt_timezone.utc)
+        docs.append({
+            "_id": ObjectId(message['id']),
+            "thread_id": message['thread_id'],
+            "sender_id": message['sender_id'],
+            "sender_name": message['sender_name'],
+            "sender_avatar": message['sender_avatar'],
+            "content": message['content'],
+            "attachments": [],
+            "is_system_message": False,
+            "created_at": created_at,
+            "updated_at": created_at,
+        })
+        latest[message['thread_id']] = message
+    
+    inserted_ids = MongoChatService.save_messages(docs)
+    
+    # Update thread updated_at AND last_message metadata
+    now = timezone.now()
+    for thread_id, message in latest.items():
+        MessageThread.objects.filter(id=thread_id).update(
+            updated_at=now,
+            last_message_at=datetime.fromisoformat(message['created_at']),
+            last_message_content=message['content'][:500]
+        )
+    
+    # Increment Unread Counters for OTHER participants
+    members = defaultdict(list)
+    for thread_id, user_id in MessageParticipant.objects.filter(
+        thread_id__in=latest,
+        is_active=True
+    ).values_list('thread_id', 'user_id'):
+        members[thread_id].append(user_id)
+    
+    counts = Counter()
+    for message in messages:
+        if ObjectId(message['id']) not in inserted_ids:
+            continue
+        for user_id in members[message['thread_id']]:
+            if user_id != message['sender_id']:
+                counts[(message['thread_id'], user_id)] += 1
+    MongoChatService.add_unread_counts(dict(counts))
+    
+    return len(inserted_ids)
+
+
 def delete_message(message_id: int, user_id: int) -> bool:
     """
     Delete a message.
@@ -1,8 +1,19 @@
+import logging
 from datetime import datetime
 from django.conf import settings
 import pymongo
 from bson import ObjectId
 from bson.errors import InvalidId
+from pymongo.errors import BulkWriteError, PyMongoError
+
+logger = logging.getLogger(__name__)
+
+# (collection, keys, options) - create_index idempotent, chạy lại không sao
+INDEXES = [
+    ('messages', [("thread_id", pymongo.ASCENDING), ("_id", pymongo.ASCENDING)], {}),
+    ('unread_counters', [("user_id", pymongo.ASCENDING), ("thread_id", pymongo.ASCENDING)], {"unique": True}),
+]
+
 
 class MongoChatService:
     _client = None
@@ -14,8 +25,28 @@ class MongoChatService:
             if cls._client is None:
                 cls._client = pymongo.MongoClient(settings.MONGO_URI)
             cls._db = cls._client[settings.MONGO_DB_NAME]
+            if getattr(settings, 'MONGO_ENSURE_INDEXES', True):
+                try:
+                    cls.ensure_indexes()
+                except PyMongoError as e:
+                    logger.warning(f"Could not ensure MongoDB chat indexes: {e}")
         return cls._db
 
+    @classmethod
+    def ensure_indexes(cls) -> list[str]:
+        """
+        Tạo index cho messages / unread_counters nếu chưa có (idempotent).
+        Chạy 1 lần mỗi process khi kết nối, hoặc qua lệnh ensure_mongo_indexes.
+
+        Returns:
+            Tên các index
+        """
+        db = cls._get_db()
+        return [
+            db[collection].create_index(keys, **options)
+            for collection, keys, options in INDEXES
+        ]
+
     @classmethod
     def _get_collection(cls):
         db = cls._get_db()
@@ -59,6 +90,28 @@ class MongoChatService:
         
         return ret_doc
 
+    @classmethod
+    def save_messages(cls, docs: list[dict]) -> set:
+        """
+        Lưu nhiều tin nhắn bằng 1 lệnh insert_many (ghi theo lô từ ChatWriteBuffer).
+        Tin đã tồn tại (_id trùng khi ghi lại 1 lô) được bỏ qua.
+
+        Returns:
+            Tập _id của các tin nhắn được lưu mới
+        """
+        if not docs:
+            return set()
+
+        collection = cls._get_collection()
+        try:
+            return set(collection.insert_many(docs, ordered=False).inserted_ids)
+        except BulkWriteError as e:
+            errors = e.details.get('writeErrors', [])
+            if any(error.get('code') != 11000 for error in errors):
+                raise
+            duplicates = {error['index'] for error in errors}
+            return {doc['_id'] for index, doc in enumerate(docs) if index not in duplicates}
+
     @classmethod
     def increment_unread_counters(cls, thread_id: int, recipient_ids: list[int]):
         """
@@ -66,21 +119,31 @@ class MongoChatService:
         """
         if not recipient_ids:
             return
-            
+
+        cls.add_unread_counts({(thread_id, uid): 1 for uid in recipient_ids})
+
+    @classmethod
+    def add_unread_counts(cls, counts: dict[tuple[int, int], int]):
+        """
+        Cộng unread count theo (thread_id, user_id) -> số tin, 1 lệnh bulk_write.
+        """
+        if not counts:
+            return
+
         db = cls._get_db()
         counters_col = db['unread_counters']
-        
+        now = datetime.utcnow()
+
         # Use bulk_write for performance
         operations = [
             pymongo.UpdateOne(
                 {"user_id": uid, "thread_id": thread_id},
-                {"$inc": {"count": 1}, "$set": {"last_updated": datetime.utcnow()}},
+                {"$inc": {"count": count}, "$set": {"last_updated": now}},
                 upsert=True
-            ) for uid in recipient_ids
+            ) for (thread_id, uid), count in counts.items()
         ]
-        
-        if operations:
-            counters_col.bulk_write(operations)
+
+        counters_col.bulk_write(operations, ordered=False)
 
     @classmethod
     def mark_read(cls, user_id: int, thread_id: int):
@@ -97,17 +160,37 @@ class MongoChatService:
         )
 
     @classmethod
-    def get_messages(cls, thread_id: int, limit=50, offset=0):
+    def get_messages(cls, thread_id: int, limit=50, before=None, after=None):
         """
-        Lấy danh sách tin nhắn từ MongoDB (Pagination).
+        Lấy danh sách tin nhắn từ MongoDB (keyset pagination theo _id).
+
+        - Mặc định: `limit` tin mới nhất
+        - before: `limit` tin cũ hơn tin có id = before (cuộn lên xem lịch sử)
+        - after: `limit` tin mới hơn tin có id = after
+
+        Dùng index {thread_id, _id} nên chi phí mỗi trang không phụ thuộc
+        vị trí trong thread (không skip). Kết quả luôn sắp xếp cũ -> mới.
+
+        Raises:
+            ValueError: Cursor không phải ObjectId hợp lệ
         """
         collection = cls._get_collection()
-        
-        cursor = collection.find({"thread_id": thread_id})\
-                           .sort("created_at", pymongo.DESCENDING)\
-                           .skip(offset)\
+
+        query = {"thread_id": thread_id}
+        try:
+            if before:
+                query["_id"] = {"$lt": ObjectId(before)}
+            if after:
+                query.setdefault("_id", {})["$gt"] = ObjectId(after)
+        except (InvalidId, TypeError):
+            raise ValueError("Invalid message cursor")
+
+        # Có after (không có before) thì đọc xuôi từ cursor, còn lại đọc ngược từ mới nhất
+        ascending = bool(after) and not before
+        cursor = collection.find(query)\
+                           .sort("_id", pymongo.ASCENDING if ascending else pymongo.DESCENDING)\
                            .limit(limit)
-                           
+
         messages = []
         for doc in cursor:
             doc['id'] = str(doc['_id']) # Convert ObjectId to string
@@ -117,9 +200,9 @@ class MongoChatService:
             if isinstance(doc.get('updated_at'), datetime):
                  doc['updated_at'] = doc['updated_at'].isoformat()
             messages.append(doc)
-            
-        return messages[::-1]
-            
+
+        return messages if ascending else messages[::-1]
+
     @classmethod
     def delete_message(cls, message_id: str, user_id: int):
         """
@@ -145,6 +228,27 @@ class MongoChatService:
         collection.delete_one({"_id": obj_id})
         return True
 
+    @classmethod
+    def get_unread_counts(cls, user_id: int, thread_ids: list[int]) -> dict[int, int]:
+        """
+        Unread count của user cho nhiều thread bằng 1 query $in
+        (dùng index {user_id, thread_id}).
+
+        Returns:
+            thread_id -> count (thread không có counter thì không có key)
+        """
+        if not thread_ids:
+            return {}
+
+        db = cls._get_db()
+        counters_col = db['unread_counters']
+
+        cursor = counters_col.find(
+            {"user_id": user_id, "thread_id": {"$in": list(thread_ids)}},
+            {"_id": 0, "thread_id": 1, "count": 1}
+        )
+        return {doc['thread_id']: doc.get('count', 0) for doc in cursor}
+
     @classmethod
     def get_total_unread_count(cls, user_id: int) -> int:
         """
@@ -1,5 +1,6 @@
 from celery import shared_task
 from apps.communication.messages.services.mongo_service import MongoChatService
+from apps.communication.messages.services.messages import persist_message_batch
 import logging
 
 logger = logging.getLogger(__name__)
@@ -44,3 +45,16 @@ def persist_chat_message_task(
     except Exception as e:
         logger.error(f"Error persisting message: {str(e)}")
         raise e
+
+
+@shared_task(name="apps.communication.messages.persist_chat_messages", autoretry_for=(Exception,), retry_backoff=True, max_retries=5)
+def persist_chat_messages_task(messages: list[dict]):
+    """
+    Lưu 1 lô tin nhắn mà ChatWriteBuffer không ghi được (Mongo/DB lỗi tạm thời).
+    Ghi lại an toàn: tin đã có _id trong Mongo được bỏ qua.
+    
+    Args:
+        messages: Dicts theo format persist_message_batch
+    """
+    count = persist_message_batch(messages)
+    return f"{count} buffered messages persisted"
@@ -1,4 +1,4 @@
-from django.test import TransactionTestCase
+from django.test import TransactionTestCase, override_settings
 from unittest.mock import patch
 from channels.testing import WebsocketCommunicator
 from apps.core.users.models import CustomUser
@@ -8,6 +8,7 @@ from apps.communication.messages.consumers import ChatConsumer
 from asgiref.sync import async_to_sync
 from django.utils import timezone
 
+@override_settings(CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}})
 class ChatAsyncPersistenceTest(TransactionTestCase):
     def setUp(self):
         self.user = CustomUser.objects.create(email='chat@example.com', full_name='Chat User')
@@ -18,9 +19,9 @@ class ChatAsyncPersistenceTest(TransactionTestCase):
             is_active=True
         )
 
-    @patch('apps.communication.messages.consumers.persist_chat_message_task.delay')
-    def test_chat_message_triggers_task(self, mock_task):
-        """Test that sending a message via WebSocket triggers the Celery task."""
+    @patch('apps.communication.messages.services.chat_buffer.persist_message_batch')
+    def test_chat_message_is_buffered(self, mock_persist):
+        """Test that sending a message via WebSocket buffers it and flushes on disconnect."""
         
         async def run_test():
             communicator = WebsocketCommunicator(
@@ -56,11 +57,13 @@ class ChatAsyncPersistenceTest(TransactionTestCase):
         self.assertEqual(response['content'], 'Hello Async World')
         self.assertIn('message_id', response)
         
-        # Verify Celery task was called
-        mock_task.assert_called_once()
-        args, kwargs = mock_task.call_args
-        self.assertEqual(kwargs['content'], 'Hello Async World')
-        self.assertEqual(kwargs['thread_id'], str(self.thread.id))
-        self.assertEqual(kwargs['sender_id'], self.user.id)
+        # Verify buffered batch was persisted once (on disconnect)
+        mock_persist.assert_called_once()
+        (messages,), _ = mock_persist.call_args
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(messages[0]['id'], response['message_id'])
+        self.assertEqual(messages[0]['content'], 'Hello Async World')
+        self.assertEqual(messages[0]['thread_id'], self.thread.id)
+        self.assertEqual(messages[0]['sender_id'], self.user.id)
 
 
@@ -0,0 +1,156 @@
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.communication.message_participants.models import MessageParticipant
+from apps.communication.message_threads.models import MessageThread
+from apps.communication.messages.services.chat_buffer import ChatWriteBuffer
+from apps.communication.messages.services.messages import persist_message_batch
+from apps.communication.messages.services.mongo_service import MongoChatService
+from apps.core.users.models import CustomUser
+
+
+def make_message(thread, sender, content):
+    return {
+        'id': str(ObjectId()),
+        'thread_id': thread.id,
+        'sender_id': sender.id,
+        'sender_name': sender.full_name,
+        'sender_avatar': None,
+        'content': content,
+        'created_at': timezone.now().isoformat(),
+    }
+
+
+class PersistMessageBatchTests(TestCase):
+    """Test cases for batched persistence of buffered chat messages."""
+
+    def setUp(self):
+        self.alice = CustomUser.objects.create(email='alice@example.com', full_name='Alice')
+        self.bob = CustomUser.objects.create(email='bob@example.com', full_name='Bob')
+        self.carol = CustomUser.objects.create(email='carol@example.com', full_name='Carol')
+
+        self.thread = MessageThread.objects.create(subject='Interview')
+        self.other_thread = MessageThread.objects.create(subject='Offer')
+        for user in (self.alice, self.bob, self.carol):
+            MessageParticipant.objects.create(thread=self.thread, user=user)
+        MessageParticipant.objects.create(thread=self.other_thread, user=self.alice)
+        MessageParticipant.objects.create(thread=self.other_thread, user=self.bob)
+        MessageParticipant.objects.create(thread=self.other_thread, user=self.carol, is_active=False)
+
+    @patch('apps.communication.messages.services.messages.MongoChatService')
+    def test_batch_is_written_with_one_call_per_store(self, mock_mongo):
+        messages = [
+            make_message(self.thread, self.alice, 'Hi'),
+            make_message(self.thread, self.bob, 'Hello'),
+            make_message(self.other_thread, self.alice, 'Offer attached'),
+            make_message(self.thread, self.alice, 'See you at 9'),
+        ]
+        mock_mongo.save_messages.return_value = {ObjectId(m['id']) for m in messages}
+
+        # 1 UPDATE / thread + 1 SELECT participants
+        with self.assertNumQueries(3):
+            self.assertEqual(persist_message_batch(messages), 4)
+
+        mock_mongo.save_messages.assert_called_once()
+        docs = mock_mongo.save_messages.call_args[0][0]
+        self.assertEqual([str(doc['_id']) for doc in docs], [m['id'] for m in messages])
+        self.assertIsNone(docs[0]['created_at'].tzinfo)
+
+        mock_mongo.add_unread_counts.assert_called_once_with({
+            (self.thread.id, self.bob.id): 2,
+            (self.thread.id, self.carol.id): 3,
+            (self.thread.id, self.alice.id): 1,
+            (self.other_thread.id, self.bob.id): 1,
+        })
+
+        self.thread.refresh_from_db()
+        self.assertEqual(self.thread.last_message_content, 'See you at 9')
+        self.assertIsNotNone(self.thread.last_message_at)
+
+
+    @patch('apps.communication.messages.services.messages.MongoChatService')
+    def test_retried_batch_counts_only_new_messages(self, mock_mongo):
+        messages = [
+            make_message(self.thread, self.alice, 'Hi'),
+            make_message(self.thread, self.bob, 'Hello'),
+        ]
+        # Tin đầu đã được ghi ở lần flush trước
+        mock_mongo.save_messages.return_value = {ObjectId(messages[1]['id'])}
+
+        self.assertEqual(persist_message_batch(messages), 1)
+
+        mock_mongo.add_unread_counts.assert_called_once_with({
+            (self.thread.id, self.alice.id): 1,
+            (self.thread.id, self.carol.id): 1,
+        })
+
+
+class SaveMessagesTests(TestCase):
+    """Test cases for MongoChatService.save_messages."""
+
+    @patch.object(MongoChatService, '_get_collection')
+    def test_duplicates_are_not_reported_as_inserted(self, mock_collection):
+        docs = [{'_id': ObjectId()} for _ in range(3)]
+        mock_collection.return_value.insert_many.side_effect = BulkWriteError({
+            'writeErrors': [{'index': 1, 'code': 11000}],
+            'nInserted': 2,
+        })
+
+        self.assertEqual(MongoChatService.save_messages(docs), {docs[0]['_id'], docs[2]['_id']})
+
+
+class ChatWriteBufferTests(TestCase):
+    """Test cases for the in-process chat write buffer."""
+
+    def setUp(self):
+        self.user = CustomUser.objects.create(email='chat@example.com', full_name='Chat User')
+        self.thread = MessageThread.objects.create()
+
+    @override_settings(CHAT_BUFFER_MAX_MESSAGES=3, CHAT_BUFFER_FLUSH_INTERVAL=60)
+    @patch('apps.communication.messages.services.chat_buffer.persist_message_batch')
+    def test_flushes_when_full(self, mock_persist):
+        buffer = ChatWriteBuffer()
+
+        async def run():
+            for i in range(4):
+                await buffer.add(make_message(self.thread, self.user, f'm{i}'))
+            remaining = len(buffer)
+            await buffer.flush()
+            return remaining
+
+        self.assertEqual(async_to_sync(run)(), 1)
+        self.assertEqual([len(call.args[0]) for call in mock_persist.call_args_list], [3, 1])
+
+    @patch('apps.communication.messages.services.chat_buffer.persist_chat_messages_task')
+    @patch('apps.communication.messages.services.chat_buffer.persist_message_batch', side_effect=RuntimeError('mongo down'))
+    def test_failed_flush_is_handed_to_celery(self, mock_persist, mock_task):
+        buffer = ChatWriteBuffer()
+        message = make_message(self.thread, self.user, 'Hi')
+
+        async def run():
+            await buffer.add(message)
+            return await buffer.flush()
+
+        self.assertEqual(async_to_sync(run)(), 1)
+        mock_task.delay.assert_called_once_with([message])
+
+    @patch('apps.communication.messages.services.chat_buffer.logger')
+    @patch('apps.communication.messages.services.chat_buffer.persist_chat_messages_task')
+    @patch('apps.communication.messages.services.chat_buffer.persist_message_batch', side_effect=RuntimeError('mongo down'))
+    def test_payload_is_logged_when_broker_is_down(self, mock_persist, mock_task, mock_logger):
+        mock_task.delay.side_effect = ConnectionError('broker down')
+        buffer = ChatWriteBuffer()
+        message = make_message(self.thread, self.user, 'Hi')
+
+        async def run():
+            await buffer.add(message)
+            return await buffer.flush()
+
+        self.assertEqual(async_to_sync(run)(), 1)
+        mock_logger.critical.assert_called_once()
+        self.assertIn(message['id'], mock_logger.critical.call_args[0][0])
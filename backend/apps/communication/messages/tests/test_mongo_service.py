@@ -1,6 +1,7 @@
 from django.test import SimpleTestCase, override_settings
 from unittest.mock import patch, MagicMock
 from datetime import datetime
+from bson import ObjectId
 from apps.communication.messages.services.mongo_service import MongoChatService
 
 @override_settings(MONGO_DB_NAME='test_chat_unit_db')
@@ -58,10 +59,9 @@ class TestMongoChatService(SimpleTestCase):
         
         # Mock Find Cursor
         mock_cursor = MagicMock()
-        # Chaining calls: find().sort().skip().limit()
+        # Chaining calls: find().sort().limit()
         mock_collection.find.return_value = mock_cursor
         mock_cursor.sort.return_value = mock_cursor
-        mock_cursor.skip.return_value = mock_cursor
         mock_cursor.limit.return_value = mock_cursor
         
         # Mock Data from Mongo
@@ -88,8 +88,9 @@ class TestMongoChatService(SimpleTestCase):
         messages = MongoChatService.get_messages(thread_id=1)
         
         # Verify Sort Call
-        # Should sort by created_at DESC
-        mock_cursor.sort.assert_called_with("created_at", -1) # pymongo.DESCENDING is -1
+        # Should sort by _id DESC (keyset on {thread_id, _id}, no skip)
+        mock_cursor.sort.assert_called_with("_id", -1) # pymongo.DESCENDING is -1
+        mock_cursor.skip.assert_not_called()
         
         # Verify Result Reversal (Ascending for UI)
         self.assertEqual(messages[0]['content'], 'Message 1') # Oldest first
@@ -275,3 +276,66 @@ class TestUnreadCounters(SimpleTestCase):
         
         # Verify returns 0
         self.assertEqual(result, 0)
+
+
+@override_settings(MONGO_URI='mongodb://localhost:27017/', MONGO_DB_NAME='test_chat_unit_db')
+class TestMessageKeysetPagination(SimpleTestCase):
+    """Test cases for cursor paging and index bootstrap."""
+
+    def setUp(self):
+        patcher = patch('apps.communication.messages.services.mongo_service.pymongo.MongoClient')
+        mock_client = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.mock_db = MagicMock()
+        self.mock_collection = MagicMock()
+        mock_client.return_value.__getitem__.return_value = self.mock_db
+        self.mock_db.__getitem__.return_value = self.mock_collection
+
+        self.mock_cursor = MagicMock()
+        self.mock_collection.find.return_value = self.mock_cursor
+        self.mock_cursor.sort.return_value = self.mock_cursor
+        self.mock_cursor.limit.return_value = self.mock_cursor
+
+        # Reset singleton
+        MongoChatService._client = None
+        MongoChatService._db = None
+
+    def test_before_cursor_seeks_older_messages(self):
+        """before -> _id < cursor, newest first, returned oldest first."""
+        cursor_id = ObjectId()
+        older, oldest = ObjectId(), ObjectId()
+        self.mock_cursor.__iter__.return_value = iter([{'_id': older}, {'_id': oldest}])
+
+        messages = MongoChatService.get_messages(thread_id=1, limit=2, before=str(cursor_id))
+
+        self.mock_collection.find.assert_called_with({"thread_id": 1, "_id": {"$lt": cursor_id}})
+        self.mock_cursor.sort.assert_called_with("_id", -1)
+        self.mock_cursor.limit.assert_called_with(2)
+        self.assertEqual([m['id'] for m in messages], [str(oldest), str(older)])
+
+    def test_after_cursor_reads_forward(self):
+        """after -> _id > cursor, ascending."""
+        cursor_id = ObjectId()
+        self.mock_cursor.__iter__.return_value = iter([{'_id': ObjectId()}])
+
+        MongoChatService.get_messages(thread_id=1, after=str(cursor_id))
+
+        self.mock_collection.find.assert_called_with({"thread_id": 1, "_id": {"$gt": cursor_id}})
+        self.mock_cursor.sort.assert_called_with("_id", 1)
+
+    def test_invalid_cursor_raises(self):
+        with self.assertRaises(ValueError):
+            MongoChatService.get_messages(thread_id=1, before='not-an-object-id')
+        self.mock_collection.find.assert_not_called()
+
+    def test_ensure_indexes(self):
+        """Index được tạo 1 lần khi kết nối, unique trên counters."""
+        MongoChatService._get_db()
+        MongoChatService._get_db()
+
+        calls = self.mock_collection.create_index.call_args_list
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(calls[0].args[0], [("thread_id", 1), ("_id", 1)])
+        self.assertEqual(calls[1].args[0], [("user_id", 1), ("thread_id", 1)])
+        self.assertEqual(calls[1].kwargs, {"unique": True})
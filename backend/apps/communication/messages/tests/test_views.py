@@ -4,6 +4,8 @@ from unittest.mock import patch
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from apps.communication.message_threads.models import MessageThread
 from apps.communication.message_participants.models import MessageParticipant
@@ -51,6 +53,34 @@ class MessageViewTests(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    @patch('apps.communication.messages.selectors.messages.MongoChatService')
+    def test_list_threads_unread_and_participant_counts(self, mock_mongo):
+        """Unread counts: 1 Mongo query / page; participant counts annotated."""
+        mock_mongo.get_unread_counts.return_value = {self.message_thread.id: 3}
+        url = '/api/messages/threads/'
+        
+        with CaptureQueriesContext(connection) as single:
+            response = self.client.get(url)
+        
+        data = response.data.get('results', response.data) if isinstance(response.data, dict) else response.data
+        threads = {t['id']: t for t in data}
+        self.assertEqual(threads[self.message_thread.id]['unread_count'], 3)
+        self.assertEqual(threads[self.message_thread.id]['participant_count'], 2)
+        mock_mongo.get_unread_counts.assert_called_once_with(self.user.id, [self.message_thread.id])
+        
+        for i in range(5):
+            thread = MessageThread.objects.create(subject=f'Thread {i}')
+            MessageParticipant.objects.create(thread=thread, user=self.user)
+            MessageParticipant.objects.create(thread=thread, user=self.third_user)
+        
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(url)
+        
+        data = response.data.get('results', response.data) if isinstance(response.data, dict) else response.data
+        self.assertEqual(len(data), 6)
+        self.assertEqual(len(many), len(single))
+        self.assertEqual(mock_mongo.get_unread_counts.call_count, 2)
+
     def test_list_threads_unauthenticated(self):
         """Test listing threads requires authentication."""
         self.client.logout()
@@ -178,6 +208,41 @@ class MessageViewTests(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    @patch('apps.communication.messages.selectors.messages.MongoChatService')
+    def test_list_messages_before_cursor(self, mock_mongo):
+        """Scroll up: before cursor -> previous/next links from page edges."""
+        mock_mongo.get_messages.return_value = [
+            {
+                'id': message_id,
+                'content': 'Hi',
+                'sender_id': self.user.id,
+                'sender_name': 'Test User',
+                'created_at': '2023-01-01',
+                'updated_at': '2023-01-01',
+                'is_system_message': False,
+                'thread_id': self.message_thread.id
+            }
+            for message_id in ('a1', 'a2', 'a3')
+        ]
+        url = f'/api/messages/threads/{self.message_thread.id}/messages/?before=a9&limit=2'
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        mock_mongo.get_messages.assert_called_with(
+            thread_id=self.message_thread.id, limit=3, before='a9', after=None
+        )
+        self.assertEqual([m['id'] for m in response.data['results']], ['a2', 'a3'])
+        self.assertIn('before=a2', response.data['previous'])
+        self.assertIn('after=a3', response.data['next'])
+        self.assertNotIn('before', response.data['next'])
+
+    @patch('apps.communication.messages.selectors.messages.MongoChatService')
+    def test_list_messages_invalid_cursor(self, mock_mongo):
+        mock_mongo.get_messages.side_effect = ValueError('Invalid message cursor')
+        url = f'/api/messages/threads/{self.message_thread.id}/messages/?before=bad'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     @patch('apps.communication.messages.services.messages.MongoChatService')
     def test_send_message_success(self, mock_mongo):
         """Test sending a message to thread."""
@@ -0,0 +1,28 @@
+from django.db import migrations
+
+
+TYPE_NAME = 'application_export_ready'
+
+
+def seed_type(apps, schema_editor):
+    NotificationType = apps.get_model('communication_notification_types', 'NotificationType')
+    NotificationType.objects.get_or_create(
+        type_name=TYPE_NAME,
+        defaults={'template': 'File export danh sách ứng viên đã sẵn sàng để tải về'}
+    )
+
+
+def remove_type(apps, schema_editor):
+    NotificationType = apps.get_model('communication_notification_types', 'NotificationType')
+    NotificationType.objects.filter(type_name=TYPE_NAME).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communication_notification_types', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_type, remove_type),
+    ]
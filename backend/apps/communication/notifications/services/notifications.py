@@ -6,6 +6,7 @@ from pydantic import BaseModel
 from apps.communication.notifications.models import Notification
 from apps.communication.notification_types.models import NotificationType
 from apps.core.users.models import CustomUser
+from apps.communication.notifications.services.realtime import publish_notifications
 
 
 class NotificationCreateInput(BaseModel):
@@ -56,6 +57,7 @@ def create_notification(
         entity_type=data.entity_type or '',
         entity_id=data.entity_id
     )
+    publish_notifications([notification])
     
     return notification
 
@@ -197,7 +199,7 @@ def send_notification(
     except (CustomUser.DoesNotExist, NotificationType.DoesNotExist):
         return None
     
-    return Notification.objects.create(
+    notification = Notification.objects.create(
         user=user,
         notification_type=notification_type,
         title=title,
@@ -206,6 +208,9 @@ def send_notification(
         entity_type=entity_type or '',
         entity_id=entity_id
     )
+    publish_notifications([notification])
+    
+    return notification
 
 
 def send_bulk_notifications(
@@ -255,4 +260,7 @@ def send_bulk_notifications(
         for user in users
     ]
     
-    return Notification.objects.bulk_create(notifications)
+    created = Notification.objects.bulk_create(notifications)
+    publish_notifications(created)
+    
+    return created
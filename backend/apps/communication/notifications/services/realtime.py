@@ -0,0 +1,163 @@
+"""
+Real-time push cho notifications qua Redis pub/sub.
+
+- Service tạo notification publish payload lên channel riêng của user
+  (sau khi transaction commit).
+- SSE endpoint subscribe channel đó bằng async generator, nên mỗi kết nối
+  đang chờ không giữ worker thread và không poll database.
+- Khi reconnect, client gửi header ``Last-Event-ID`` để nhận lại các
+  notification bị lỡ (1 query duy nhất lúc kết nối).
+"""
+import json
+import logging
+from typing import AsyncIterator, Iterable, Optional
+
+import redis
+import redis.asyncio as aioredis
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+
+from apps.communication.notifications.models import Notification
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = 'jobportal:notifications:user'
+
+DEFAULT_REDIS_URL = 'redis://localhost:6379/0'
+
+# Gửi heartbeat khi không có event trong khoảng này (giây)
+HEARTBEAT_SECONDS = 30
+
+# Số notification tối đa gửi lại khi reconnect
+REPLAY_LIMIT = 100
+
+# Client reconnect sau (ms)
+RETRY_MILLISECONDS = 5000
+
+_publisher: Optional[redis.Redis] = None
+
+
+def user_channel(user_id: int) -> str:
+    """Tên Redis channel của một user."""
+    return f"{CHANNEL_PREFIX}:{user_id}"
+
+
+def get_redis_url() -> str:
+    return getattr(settings, 'NOTIFICATION_STREAM_REDIS_URL', DEFAULT_REDIS_URL)
+
+
+def _get_publisher() -> redis.Redis:
+    global _publisher
+    if _publisher is None:
+        _publisher = redis.Redis.from_url(get_redis_url(), socket_connect_timeout=1)
+    return _publisher
+
+
+def serialize_notification(notification: Notification) -> dict:
+    """Payload gửi qua SSE (giữ nguyên format của stream cũ)."""
+    return {
+        'id': notification.id,
+        'title': notification.title,
+        'content': notification.content,
+        'notification_type': notification.notification_type.type_name,
+        'created_at': notification.created_at.isoformat(),
+    }
+
+
+def format_sse(payload: dict) -> str:
+    """Format một event SSE, id = notification id để hỗ trợ Last-Event-ID."""
+    return f"id: {payload['id']}\ndata: {json.dumps(payload)}\n\n"
+
+
+def publish_notifications(notifications: Iterable[Notification]) -> None:
+    """
+    Publish notifications lên channel của từng user sau khi commit.
+
+    Lỗi Redis chỉ được log: notification đã nằm trong DB và sẽ được gửi
+    lại qua Last-Event-ID khi client reconnect.
+    """
+    messages = [
+        (user_channel(n.user_id), json.dumps(serialize_notification(n)))
+        for n in notifications
+        if n.id is not None
+    ]
+    if not messages:
+        return
+
+    def _publish():
+        try:
+            pipe = _get_publisher().pipeline(transaction=False)
+            for channel, message in messages:
+                pipe.publish(channel, message)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Notification publish failed: {e}")
+
+    transaction.on_commit(_publish)
+
+
+def _parse_last_event_id(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _replay_payloads(user_id: int, last_event_id: Optional[int]) -> list[dict]:
+    """
+    Notification cần gửi khi kết nối:
+    - có Last-Event-ID: các notification mới hơn id đó
+    - kết nối lần đầu: các notification chưa đọc
+    """
+    queryset = Notification.objects.filter(user_id=user_id).select_related('notification_type')
+    if last_event_id is not None:
+        queryset = queryset.filter(id__gt=last_event_id)
+    else:
+        queryset = queryset.filter(is_read=False)
+
+    notifications = list(queryset.order_by('-id')[:REPLAY_LIMIT])
+    return [serialize_notification(n) for n in reversed(notifications)]
+
+
+async def notification_event_stream(
+    user_id: int,
+    last_event_id=None,
+    client: Optional[aioredis.Redis] = None,
+) -> AsyncIterator[str]:
+    """
+    Async SSE generator cho một user.
+
+    Subscribe trước rồi mới replay, để không lỡ event publish trong lúc
+    đang query; event trùng được bỏ qua theo id.
+    """
+    client = client or aioredis.from_url(get_redis_url())
+    pubsub = client.pubsub()
+    last_sent = _parse_last_event_id(last_event_id)
+
+    try:
+        await pubsub.subscribe(user_channel(user_id))
+        yield f"retry: {RETRY_MILLISECONDS}\n\n"
+
+        for payload in await sync_to_async(_replay_payloads)(user_id, last_sent):
+            last_sent = payload['id']
+            yield format_sse(payload)
+
+        while True:
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True,
+                timeout=HEARTBEAT_SECONDS,
+            )
+            if message is None:
+                yield ": heartbeat\n\n"
+                continue
+
+            payload = json.loads(message['data'])
+            if last_sent is not None and payload['id'] <= last_sent:
+                continue
+            last_sent = payload['id']
+            yield format_sse(payload)
+    finally:
+        await pubsub.unsubscribe()
+        await pubsub.aclose()
+        await client.aclose()
@@ -0,0 +1,230 @@
+# Notifications Realtime (Redis pub/sub SSE) Tests
+
+import json
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.communication.notifications.models import Notification
+from apps.communication.notification_types.models import NotificationType
+from apps.communication.notifications.services import realtime
+from apps.communication.notifications.services.notifications import (
+    create_notification,
+    send_bulk_notifications,
+    NotificationCreateInput,
+)
+
+User = get_user_model()
+
+
+class FakePublisher:
+    """Ghi lại các lệnh publish (redis.Redis + pipeline)."""
+
+    def __init__(self):
+        self.published = []
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def publish(self, channel, message):
+        self.published.append((channel, json.loads(message)))
+
+    def execute(self):
+        return []
+
+
+class StreamStopped(Exception):
+    """Dừng vòng lặp vô hạn của stream trong test."""
+
+
+class FakePubSub:
+    """redis.asyncio PubSub giả: trả lần lượt các message rồi dừng stream."""
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.channels = []
+        self.closed = False
+
+    async def subscribe(self, channel):
+        self.channels.append(channel)
+
+    async def get_message(self, ignore_subscribe_messages=True, timeout=None):
+        if not self.messages:
+            raise StreamStopped
+        return self.messages.pop(0)
+
+    async def unsubscribe(self):
+        self.channels = []
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeAsyncRedis:
+    def __init__(self, pubsub):
+        self._pubsub = pubsub
+
+    def pubsub(self):
+        return self._pubsub
+
+    async def aclose(self):
+        pass
+
+
+def collect_events(user_id, last_event_id, messages):
+    """Chạy async generator tới khi hết message giả, trả về các event đã yield."""
+    pubsub = FakePubSub(messages)
+
+    async def run():
+        events = []
+        stream = realtime.notification_event_stream(
+            user_id, last_event_id, client=FakeAsyncRedis(pubsub)
+        )
+        try:
+            async for event in stream:
+                events.append(event)
+        except StreamStopped:
+            pass
+        return events
+
+    return async_to_sync(run)(), pubsub
+
+
+class NotificationRealtimeTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='realtime@example.com',
+            password='testpass123',
+            full_name='Realtime User'
+        )
+        cls.other_user = User.objects.create_user(
+            email='realtime-other@example.com',
+            password='testpass123',
+            full_name='Other User'
+        )
+        cls.notification_type = NotificationType.objects.create(
+            type_name='system',
+            template='System notification',
+            is_active=True
+        )
+
+    def setUp(self):
+        self.publisher = FakePublisher()
+        patcher = patch.object(realtime, '_get_publisher', return_value=self.publisher)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _create(self, user=None, is_read=False, title='Notification'):
+        return Notification.objects.create(
+            user=user or self.user,
+            notification_type=self.notification_type,
+            title=title,
+            content='Content',
+            is_read=is_read
+        )
+
+    # ========== Publish ==========
+
+    def test_create_notification_publishes_after_commit(self):
+        data = NotificationCreateInput(
+            notification_type_id=self.notification_type.id,
+            title='Hello',
+            content='World'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            notification = create_notification(self.user, data)
+            self.assertEqual(self.publisher.published, [])
+
+        self.assertEqual(len(self.publisher.published), 1)
+        channel, payload = self.publisher.published[0]
+        self.assertEqual(channel, realtime.user_channel(self.user.id))
+        self.assertEqual(payload['id'], notification.id)
+        self.assertEqual(payload['notification_type'], 'system')
+
+    def test_send_bulk_notifications_publishes_each_user(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            created = send_bulk_notifications(
+                [self.user.id, self.other_user.id],
+                'system',
+                'Bulk',
+                'Bulk content'
+            )
+
+        self.assertEqual(len(created), 2)
+        channels = {channel for channel, _ in self.publisher.published}
+        self.assertEqual(channels, {
+            realtime.user_channel(self.user.id),
+            realtime.user_channel(self.other_user.id),
+        })
+
+    # ========== Replay ==========
+
+    def test_replay_without_last_event_id_returns_unread(self):
+        unread = self._create()
+        self._create(is_read=True)
+        self._create(user=self.other_user)
+
+        payloads = realtime._replay_payloads(self.user.id, None)
+
+        self.assertEqual([p['id'] for p in payloads], [unread.id])
+
+    def test_replay_with_last_event_id_returns_newer_in_order(self):
+        first = self._create()
+        second = self._create(is_read=True)
+        third = self._create()
+
+        payloads = realtime._replay_payloads(self.user.id, first.id)
+
+        self.assertEqual([p['id'] for p in payloads], [second.id, third.id])
+
+    # ========== Stream ==========
+
+    def test_stream_replays_then_pushes_without_duplicates(self):
+        missed = self._create()
+        newer = self._create()
+        duplicate = {'data': json.dumps(realtime.serialize_notification(newer))}
+        pushed = {'data': json.dumps({
+            'id': newer.id + 1, 'title': 'Pushed', 'content': '',
+            'notification_type': 'system', 'created_at': '',
+        })}
+
+        events, pubsub = collect_events(self.user.id, str(missed.id - 1), [duplicate, None, pushed])
+
+        self.assertTrue(events[0].startswith('retry:'))
+        self.assertTrue(events[1].startswith(f'id: {missed.id}\n'))
+        self.assertTrue(events[2].startswith(f'id: {newer.id}\n'))
+        self.assertEqual(events[3], ': heartbeat\n\n')
+        self.assertTrue(events[4].startswith(f'id: {newer.id + 1}\n'))
+        self.assertEqual(len(events), 5)
+        self.assertTrue(pubsub.closed)
+
+    def test_stream_endpoint_accepts_event_stream(self):
+        async def fake_stream(user_id, last_event_id=None):
+            yield f"id: 1\ndata: {last_event_id}\n\n"
+
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        with patch(
+            'apps.communication.notifications.views.notification_event_stream',
+            side_effect=fake_stream
+        ):
+            response = client.get(
+                '/api/notifications/stream/',
+                HTTP_ACCEPT='text/event-stream',
+                HTTP_LAST_EVENT_ID='42'
+            )
+            body = b''.join(async_to_sync(self._consume)(response))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(body, b'id: 1\ndata: 42\n\n')
+
+    @staticmethod
+    async def _consume(response):
+        return [chunk async for chunk in response]
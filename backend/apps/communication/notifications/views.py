@@ -2,11 +2,11 @@ from rest_framework import viewsets, status, mixins
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BaseRenderer, JSONRenderer
 from django.http import StreamingHttpResponse
-from django.utils import timezone
 from .services.notifications import bulk_mark_as_read
+from .services.realtime import notification_event_stream
 import json
-import time
 
 from .models import Notification
 from .serializers import (
@@ -28,6 +28,20 @@ from .services.notifications import (
 )
 
 
+class EventStreamRenderer(BaseRenderer):
+    """
+    Renderer cho SSE, để content negotiation chấp nhận
+    'Accept: text/event-stream' do EventSource gửi lên.
+    """
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = 'utf-8'
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # Chỉ dùng cho response lỗi (401, ...); stream trả về StreamingHttpResponse
+        return json.dumps(data).encode() if data is not None else b''
+
+
 class NotificationViewSet(
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
@@ -264,44 +278,30 @@ class NotificationViewSet(
             'unread_count': unread_count
         })
     
-    @action(detail=False, methods=['get'], url_path='stream')
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='stream',
+        renderer_classes=[JSONRenderer, EventStreamRenderer]
+    )
     def stream(self, request):
         """
         GET /api/notifications/stream/
         
         SSE (Server-Sent Events) stream for real-time notifications.
         Client should connect to this endpoint and listen for events.
+        
+        Events are pushed from Redis pub/sub (async, no DB polling).
+        On reconnect, the Last-Event-ID header (or ?last_event_id=)
+        replays notifications missed in between.
         """
-        def event_stream():
-            """Generator function for SSE."""
-            last_check = None
-            
-            while True:
-                # Get new notifications
-                queryset = list_unread_notifications(request.user.id)
-                
-                if last_check:
-                    queryset = queryset.filter(created_at__gt=last_check)
-                
-                if queryset.exists():
-                    for notification in queryset:
-                        data = {
-                            'id': notification.id,
-                            'title': notification.title,
-                            'content': notification.content,
-                            'notification_type': notification.notification_type.type_name,
-                            'created_at': notification.created_at.isoformat(),
-                        }
-                        yield f"data: {json.dumps(data)}\n\n"
-                
-                last_check = timezone.now()
-                
-                # Send heartbeat every 30 seconds
-                yield f": heartbeat\n\n"
-                time.sleep(5)  # Check every 5 seconds
+        last_event_id = (
+            request.headers.get('Last-Event-ID')
+            or request.query_params.get('last_event_id')
+        )
         
         response = StreamingHttpResponse(
-            event_stream(),
+            notification_event_stream(request.user.id, last_event_id),
             content_type='text/event-stream'
         )
         response['Cache-Control'] = 'no-cache'
@@ -282,7 +282,7 @@ class CompanyViewSet(viewsets.GenericViewSet):
         # Send Admin Notification
         admin_email = getattr(settings, 'ADMIN_EMAIL', settings.DEFAULT_FROM_EMAIL)  # Fallback
         
-        EmailService.send_email(
+        EmailService.queue_email(
             recipient=admin_email,
             subject=f"[JobPortal] Yêu cầu xác thực mới: {company.company_name}",
             template_path="emails/company/verification_request.html",
@@ -5,3 +5,6 @@ class IndustriesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.company.industries'
     label = 'company_industries'
+
+    def ready(self):
+        import apps.company.industries.signals
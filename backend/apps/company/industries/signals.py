@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.core.caching import CacheService
+from apps.company.industries.models import Industry
+
+
+@receiver([post_save, post_delete], sender=Industry)
+def invalidate_industry_cache(sender, instance, **kwargs):
+    """
+    Invalidate cache các endpoint đọc khi ngành nghề thay đổi.
+    """
+    CacheService.invalidate_now_and_on_commit('industries', also=CacheService.invalidate_taxonomy)
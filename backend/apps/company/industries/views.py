@@ -3,6 +3,8 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAdminUser
 
+from apps.core.caching import cache_response
+
 from .models import Industry
 from .serializers import IndustrySerializer, IndustryTreeSerializer
 
@@ -19,8 +21,12 @@ class IndustryViewSet(viewsets.ModelViewSet):
         - POST /         → create (admin)
         - PUT /:id/      → update (admin)
         - DELETE /:id/   → destroy (admin)
+        
+        Các endpoint GET public được cache theo version (namespace 'industries'),
+        invalidate qua signals của Industry.
     """
     serializer_class = IndustrySerializer
+    cache_namespace = 'industries'
     
     def get_queryset(self):
         queryset = Industry.objects.select_related('parent')
@@ -39,6 +45,14 @@ class IndustryViewSet(viewsets.ModelViewSet):
         
         return queryset.order_by('display_order', 'name')
     
+    @cache_response
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    @cache_response
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+    
     def get_permissions(self):
         """
             Public: list, retrieve, tree
@@ -49,6 +63,7 @@ class IndustryViewSet(viewsets.ModelViewSet):
         return [IsAdminUser()]
     
     @action(detail=False, methods=['get'])
+    @cache_response
     def tree(self, request):
         """
             GET /api/industries/tree/
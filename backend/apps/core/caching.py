@@ -3,13 +3,22 @@ Redis Caching Layer cho Django Backend.
 
 Cung cấp caching utilities cho các data thường xuyên truy cập.
 """
+from collections import OrderedDict
 from functools import wraps
 from typing import Any, Callable, Optional, Union, List
 from django.core.cache import cache
 from django.conf import settings
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
 import hashlib
 import json
 import logging
+import math
+import random
+import re
+import threading
+import time
 
 from apps.billing.models import SubscriptionPlan
 from apps.geography.communes.models import Commune
@@ -23,11 +32,28 @@ from apps.geography.provinces.models import Province
 logger = logging.getLogger(__name__)
 
 # Cache timeout constants (in seconds)
+CACHE_TIMEOUT_JOB_LIST = 60  # 1 minute
 CACHE_TIMEOUT_SHORT = 60 * 5  # 5 minutes
 CACHE_TIMEOUT_MEDIUM = 60 * 30  # 30 minutes
 CACHE_TIMEOUT_LONG = 60 * 60  # 1 hour
 CACHE_TIMEOUT_DAY = 60 * 60 * 24  # 1 day
 
+# Số key mỗi lần SCAN / UNLINK
+SCAN_BATCH_SIZE = 500
+
+# L1 cache trong process (đặt trước Redis) cho get_or_set
+DEFAULT_L1_MAX_ENTRIES = 1024
+DEFAULT_L1_TTL = 5  # seconds
+
+# Giữ giá trị trong Redis thêm một khoảng sau khi hết hạn để phục vụ bản cũ
+# trong lúc một worker tính lại (single-flight)
+DEFAULT_STALE_TTL = 60 * 5
+DEFAULT_RECOMPUTE_LOCK_TIMEOUT = 30
+
+# Khi chưa có bản cũ: chờ worker đang tính lại tối đa bao lâu
+RECOMPUTE_WAIT_SECONDS = 2
+RECOMPUTE_POLL_SECONDS = 0.05
+
 
 class CacheKeyBuilder:
     """
@@ -47,7 +73,27 @@ class CacheKeyBuilder:
         Returns:
             str: Cache key
         """
-        parts = [cls.PREFIX]
+        return cls._join(cls.PREFIX, args, kwargs)
+    
+    @classmethod
+    def tagged(cls, tag: str, version: int, *args, **kwargs) -> str:
+        """
+        Build key thuộc một tag, generation của tag nằm ngay sau prefix:
+        jobportal:<tag>:v<version>:...
+        
+        Invalidate cả họ key = tăng version của tag (1 lệnh INCR),
+        key cũ không còn được đọc và tự hết hạn / bị sweeper dọn.
+        """
+        return cls._join(f"{cls.PREFIX}:{tag}:v{version}", args, kwargs)
+    
+    @classmethod
+    def tag_version(cls, tag: str) -> str:
+        """Key lưu version (generation) hiện tại của tag."""
+        return cls.build('tag', tag, 'version')
+    
+    @staticmethod
+    def _join(prefix: str, args, kwargs) -> str:
+        parts = [prefix]
         parts.extend(str(arg) for arg in args)
         
         if kwargs:
@@ -58,10 +104,10 @@ class CacheKeyBuilder:
         
         key = ':'.join(parts)
         
-        # Hash if too long
+        # Hash if too long (giữ prefix để key vẫn thuộc tag)
         if len(key) > 200:
             hash_suffix = hashlib.md5(key.encode()).hexdigest()[:12]
-            key = f"{cls.PREFIX}:hashed:{hash_suffix}"
+            key = f"{prefix}:hashed:{hash_suffix}"
         
         return key
     
@@ -94,9 +140,9 @@ class CacheKeyBuilder:
         return cls.build('geography', 'provinces', 'all')
     
     @classmethod
-    def geography_communes(cls, province_id: str) -> str:
-        """Key cho communes of a province."""
-        return cls.build('geography', 'communes', 'province', province_id)
+    def geography_communes(cls, province_id: str, version: int = 1) -> str:
+        """Key cho communes of a province (tag 'communes')."""
+        return cls.tagged('communes', version, 'selector', 'province', province_id)
     
     @classmethod
     def subscription_plans(cls) -> str:
@@ -118,16 +164,107 @@ class CacheKeyBuilder:
         """Key cho job detail."""
         return cls.build('job', 'detail', job_id)
     
+    @classmethod
+    def job_list(cls, version: int, **params) -> str:
+        """Key cho một trang job listing theo bộ filter (tag 'job_list')."""
+        return cls.tagged('job_list', version, **params)
+    
     @classmethod
     def recruiter_profile(cls, recruiter_id: str) -> str:
         """Key cho recruiter profile."""
         return cls.build('recruiter', 'profile', recruiter_id)
 
+    @classmethod
+    def ai_embedding(cls, model_name: str, content_hash: str) -> str:
+        """Key cho vector embedding theo hash nội dung."""
+        return cls.build('ai', 'embedding', model_name, content_hash)
+
+    @classmethod
+    def ai_embedding_index_version(cls, entity_type: str, model_name: str) -> str:
+        """Key cho version của vector index (job / recruiter)."""
+        return cls.build('ai', 'embedding_index', entity_type, model_name, 'version')
+
+    @classmethod
+    def email_template_version(cls) -> str:
+        """Key cho version của email template (compiled cache trong process)."""
+        return cls.build('email', 'template', 'version')
+
+    @classmethod
+    def resource_response(cls, namespace: str, version: int, **params) -> str:
+        """Key cho response đã cache của một endpoint đọc (tag = namespace)."""
+        return cls.tagged(namespace, version, 'response', **params)
+
+
+# ===== L1 cache trong process =====
+# key -> (hết hạn L1 theo monotonic, entry). Entry là envelope của get_or_set:
+# {'v': value, 'd': thời gian tính (s), 'e': hết hạn logic (epoch)}.
+# Giá trị trả về được dùng chung giữa các request -> không sửa trực tiếp.
+_l1_lock = threading.Lock()
+_l1: OrderedDict = OrderedDict()
+
+
+def get_l1_ttl() -> float:
+    return getattr(settings, 'CACHE_L1_TTL', DEFAULT_L1_TTL)
+
+
+def get_l1_max_entries() -> int:
+    return getattr(settings, 'CACHE_L1_MAX_ENTRIES', DEFAULT_L1_MAX_ENTRIES)
+
+
+def _l1_get(key: str) -> Optional[dict]:
+    with _l1_lock:
+        item = _l1.get(key)
+        if item is None:
+            return None
+        expires_at, entry = item
+        if expires_at <= time.monotonic():
+            del _l1[key]
+            return None
+        _l1.move_to_end(key)
+        return entry
+
+
+def _l1_set(key: str, entry: dict) -> None:
+    ttl = get_l1_ttl()
+    if ttl <= 0:
+        return
+    with _l1_lock:
+        _l1[key] = (time.monotonic() + ttl, entry)
+        _l1.move_to_end(key)
+        while len(_l1) > get_l1_max_entries():
+            _l1.popitem(last=False)
+
+
+def _l1_delete(*keys: str) -> None:
+    with _l1_lock:
+        for key in keys:
+            _l1.pop(key, None)
+
+
+def clear_local_cache() -> None:
+    """Xóa L1 của process hiện tại."""
+    with _l1_lock:
+        _l1.clear()
+
+
+def _is_entry(value: Any) -> bool:
+    return isinstance(value, dict) and value.keys() == {'v', 'd', 'e'}
+
+
+def _should_refresh(entry: dict, beta: float) -> bool:
+    """
+    Probabilistic early refresh (XFetch): càng gần hết hạn và giá trị càng
+    tốn thời gian tính thì càng dễ được tính lại sớm -> các worker không
+    cùng lúc thấy key hết hạn.
+    """
+    return time.time() - entry['d'] * beta * math.log(1.0 - random.random()) >= entry['e']
+
 
 def cached(
     timeout: int = CACHE_TIMEOUT_MEDIUM,
     key_func: Callable = None,
-    key_prefix: str = None
+    key_prefix: str = None,
+    tag: str = None
 ):
     """
     Decorator để cache kết quả của function.
@@ -136,58 +273,117 @@ def cached(
         timeout: Cache timeout in seconds
         key_func: Custom function để generate cache key
         key_prefix: Prefix cho cache key
+        tag: Tag của key; version của tag nằm trong key nên
+            invalidate cả họ chỉ cần CacheService.invalidate_tag(tag)
         
     Usage:
-        @cached(timeout=3600, key_prefix='skills')
+        @cached(timeout=3600, key_prefix='skills', tag='skills')
         def get_all_skills():
             return Skill.objects.all()
+        
+        get_all_skills.invalidate()      # xóa key của bộ tham số này
+        get_all_skills.invalidate_all()  # tăng version tag 'skills'
     """
     def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            # Generate cache key
+        def make_key(*args, **kwargs) -> str:
             if key_func:
-                cache_key = key_func(*args, **kwargs)
+                base_key = key_func(*args, **kwargs)
             else:
                 # Auto-generate key from function name and arguments
                 func_name = f"{func.__module__}.{func.__name__}"
                 args_str = json.dumps([str(a) for a in args], sort_keys=True)
                 kwargs_str = json.dumps({k: str(v) for k, v in kwargs.items()}, sort_keys=True)
                 key_data = f"{func_name}:{args_str}:{kwargs_str}"
-                
-                if key_prefix:
-                    cache_key = CacheKeyBuilder.build(key_prefix, hashlib.md5(key_data.encode()).hexdigest())
-                else:
-                    cache_key = CacheKeyBuilder.build('func', hashlib.md5(key_data.encode()).hexdigest())
+                base_key = CacheKeyBuilder.build(
+                    key_prefix or 'func', hashlib.md5(key_data.encode()).hexdigest()
+                )
             
-            # Try to get from cache
-            result = cache.get(cache_key)
-            
-            if result is not None:
-                logger.debug(f"Cache HIT: {cache_key}")
-                return result
-            
-            # Cache miss - execute function
-            logger.debug(f"Cache MISS: {cache_key}")
-            result = func(*args, **kwargs)
-            
-            # Store in cache
-            if result is not None:
-                cache.set(cache_key, result, timeout)
-            
-            return result
+            if tag:
+                return CacheKeyBuilder.tagged(tag, CacheService.get_tag_version(tag), base_key)
+            return base_key
         
-        # Add method to manually invalidate cache
-        wrapper.invalidate = lambda *args, **kwargs: cache.delete(
-            key_func(*args, **kwargs) if key_func 
-            else CacheKeyBuilder.build('func', func.__name__)
-        )
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return CacheService.get_or_set(
+                make_key(*args, **kwargs),
+                lambda: func(*args, **kwargs),
+                timeout
+            )
+        
+        # Cùng key với wrapper để invalidate đúng entry
+        wrapper.cache_key = make_key
+        wrapper.invalidate = lambda *args, **kwargs: CacheService.delete(make_key(*args, **kwargs))
+        if tag:
+            wrapper.invalidate_all = lambda: CacheService.invalidate_tag(tag)
         
         return wrapper
     
     return decorator
 
 
+def cache_response(func: Callable) -> Callable:
+    """
+    Decorator cho action GET của ViewSet: cache response.data theo version
+    của namespace (thuộc tính `cache_namespace` của ViewSet) và trả ETag.
+    
+    - ETag sinh từ version + key -> client gửi If-None-Match nhận 304
+      mà không cần đọc cache hay query DB.
+    - Ghi dữ liệu (post_save/post_delete) gọi CacheService.invalidate_tag
+      để tăng version, mọi key/ETag cũ tự động hết hiệu lực.
+    - Staff có thể thấy bản ghi inactive -> cache riêng.
+    
+    Usage:
+        @cache_response
+        def list(self, request, *args, **kwargs):
+            return super().list(request, *args, **kwargs)
+    """
+    @wraps(func)
+    def wrapper(self, request, *args, **kwargs):
+        if request.method != 'GET':
+            return func(self, request, *args, **kwargs)
+        
+        namespace = self.cache_namespace
+        version = CacheService.get_tag_version(namespace)
+        params = sorted(request.query_params.lists())
+        cache_key = CacheKeyBuilder.resource_response(
+            namespace,
+            version,
+            action=self.action,
+            path=request.path,
+            host=request.get_host(),
+            staff=int(bool(request.user and request.user.is_staff)),
+            params=hashlib.md5(json.dumps(params).encode()).hexdigest()[:12]
+        )
+        etag = f'"{namespace}-v{version}-{hashlib.md5(cache_key.encode()).hexdigest()[:16]}"'
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        
+        if_none_match = request.headers.get('If-None-Match', '')
+        if etag in [tag.strip() for tag in if_none_match.split(',')]:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        
+        computed = {}
+        
+        def build():
+            response = computed['response'] = func(self, request, *args, **kwargs)
+            # Chỉ cache response thành công
+            if response.status_code == status.HTTP_200_OK:
+                return response.data
+            return None
+        
+        data = CacheService.get_or_set(
+            cache_key, build, getattr(self, 'cache_timeout', CACHE_TIMEOUT_LONG)
+        )
+        response = computed.get('response')
+        if response is None:
+            return Response(data, headers=headers)
+        if response.status_code == status.HTTP_200_OK:
+            for header, value in headers.items():
+                response[header] = value
+        return response
+    
+    return wrapper
+
+
 class CacheService:
     """
     Service class cho cache operations.
@@ -210,7 +406,8 @@ class CacheService:
     
     @staticmethod
     def delete(key: str) -> bool:
-        """Delete key from cache."""
+        """Delete key from cache (cả L1 của process này)."""
+        _l1_delete(key)
         try:
             cache.delete(key)
             return True
@@ -223,43 +420,187 @@ class CacheService:
         """
         Delete all keys matching pattern.
         Note: Requires Redis backend.
+        
+        Dùng SCAN + UNLINK theo lô (không dùng KEYS - O(keyspace), block Redis).
+        Chỉ dùng cho việc dọn dẹp nền; invalidate thông thường dùng invalidate_tag.
         """
         try:
             redis_conn = get_redis_connection("default")
-            keys = redis_conn.keys(f"*{pattern}*")
-            if keys:
-                return redis_conn.delete(*keys)
-            return 0
+            return CacheService._unlink_matching(redis_conn, f"*{pattern}*")
         except Exception as e:
             logger.error(f"Cache delete pattern error for {pattern}: {e}")
             return 0
     
+    @staticmethod
+    def _unlink_matching(redis_conn, match: str, should_delete: Callable = None) -> int:
+        """SCAN các key khớp `match`, UNLINK theo lô SCAN_BATCH_SIZE."""
+        deleted = 0
+        batch = []
+        for raw_key in redis_conn.scan_iter(match=match, count=SCAN_BATCH_SIZE):
+            if should_delete and not should_delete(raw_key.decode()):
+                continue
+            batch.append(raw_key)
+            if len(batch) >= SCAN_BATCH_SIZE:
+                deleted += redis_conn.unlink(*batch)
+                batch = []
+        if batch:
+            deleted += redis_conn.unlink(*batch)
+        return deleted
+    
+    @staticmethod
+    def get_tag_version(tag: str) -> int:
+        """Version (generation) hiện tại của tag."""
+        return cache.get(CacheKeyBuilder.tag_version(tag)) or 1
+    
+    @staticmethod
+    def get_tag_versions(tags: List[str]) -> dict:
+        """Version của nhiều tag trong 1 round-trip."""
+        keys = {CacheKeyBuilder.tag_version(tag): tag for tag in tags}
+        found = cache.get_many(list(keys))
+        return {tag: found.get(key) or 1 for key, tag in keys.items()}
+    
+    @staticmethod
+    def invalidate_tag(tag: str):
+        """
+        Invalidate toàn bộ key thuộc tag bằng cách tăng version: O(1), 1 lệnh INCR.
+        Key cũ không còn được đọc, tự hết hạn theo timeout hoặc bị sweep_stale_tags dọn.
+        """
+        key = CacheKeyBuilder.tag_version(tag)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Key chưa tồn tại
+            cache.add(key, 2, None)
+        logger.debug(f"Cache tag '{tag}' invalidated")
+    
+    @staticmethod
+    def sweep_stale_tags() -> int:
+        """
+        Dọn các key thuộc version cũ của mọi tag (SCAN, không block Redis).
+        Note: Requires Redis backend.
+        
+        Returns:
+            int: Số key đã xóa
+        """
+        prefix = CacheKeyBuilder.PREFIX
+        version_key = re.compile(rf"{prefix}:tag:(.+):version$")
+        try:
+            redis_conn = get_redis_connection("default")
+            tags = []
+            for raw_key in redis_conn.scan_iter(match=f"*{prefix}:tag:*:version", count=SCAN_BATCH_SIZE):
+                match = version_key.search(raw_key.decode())
+                if match:
+                    tags.append(match.group(1))
+            
+            deleted = 0
+            for tag, current in CacheService.get_tag_versions(tags).items():
+                tagged_key = re.compile(rf"{prefix}:{re.escape(tag)}:v(\d+)(?::|$)")
+                
+                def is_stale(key, tagged_key=tagged_key, current=current):
+                    match = tagged_key.search(key)
+                    return bool(match) and int(match.group(1)) < current
+                
+                deleted += CacheService._unlink_matching(
+                    redis_conn, f"*{prefix}:{tag}:v*", is_stale
+                )
+            return deleted
+        except Exception as e:
+            logger.error(f"Cache sweep error: {e}")
+            return 0
+    
     @staticmethod
     def get_or_set(
         key: str, 
         default_func: Callable, 
-        timeout: int = CACHE_TIMEOUT_MEDIUM
+        timeout: int = CACHE_TIMEOUT_MEDIUM,
+        beta: float = 1.0
     ) -> Any:
         """
         Get from cache or set using default_func.
         
+        Hai tầng: L1 trong process (LRU, TTL ngắn) -> Redis. Khi key sắp/đã
+        hết hạn chỉ 1 worker tính lại (lock Redis), các worker khác trả bản
+        cũ; refresh sớm theo xác suất để tránh stampede lúc key hết hạn.
+        
         Args:
             key: Cache key
             default_func: Function to call if cache miss
             timeout: Cache timeout
+            beta: Hệ số refresh sớm (> 1 refresh sớm hơn, 0 để tắt)
             
         Returns:
             Cached or computed value
         """
-        result = cache.get(key)
+        entry = _l1_get(key)
+        if entry is not None and not _should_refresh(entry, beta):
+            return entry['v']
+        
+        try:
+            stored = cache.get(key)
+        except Exception as e:
+            logger.error(f"Cache get error for key {key}: {e}")
+            return default_func()
         
+        if _is_entry(stored):
+            entry = stored
+            _l1_set(key, entry)
+            if not _should_refresh(entry, beta):
+                return entry['v']
+        
+        # Single-flight: chỉ worker giữ lock tính lại
+        lock_key = f"{key}:lock"
+        lock_timeout = getattr(settings, 'CACHE_RECOMPUTE_LOCK_TIMEOUT', DEFAULT_RECOMPUTE_LOCK_TIMEOUT)
+        if cache.add(lock_key, 1, lock_timeout):
+            try:
+                return CacheService._recompute(key, default_func, timeout)
+            finally:
+                cache.delete(lock_key)
+        
+        if entry is not None:
+            logger.debug(f"Cache STALE: {key}")
+            return entry['v']
+        
+        # Chưa có bản cũ: chờ worker đang tính, quá hạn thì tự tính
+        deadline = time.monotonic() + RECOMPUTE_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(RECOMPUTE_POLL_SECONDS)
+            stored = cache.get(key)
+            if _is_entry(stored):
+                _l1_set(key, stored)
+                return stored['v']
+        
+        return CacheService._recompute(key, default_func, timeout)
+    
+    @staticmethod
+    def _recompute(key: str, default_func: Callable, timeout: int) -> Any:
+        logger.debug(f"Cache MISS: {key}")
+        started = time.monotonic()
+        result = default_func()
         if result is None:
-            result = default_func()
-            if result is not None:
-                cache.set(key, result, timeout)
+            return None
         
+        entry = {'v': result, 'd': time.monotonic() - started, 'e': time.time() + timeout}
+        stale_ttl = getattr(settings, 'CACHE_STALE_TTL', DEFAULT_STALE_TTL)
+        CacheService.set(key, entry, timeout + stale_ttl)
+        _l1_set(key, entry)
         return result
     
+    @staticmethod
+    def invalidate_now_and_on_commit(*tags: str, also: Optional[Callable[[], None]] = None):
+        """
+        Invalidate các tag (và gọi also) ngay lập tức, lặp lại sau commit:
+        request đọc trong lúc transaction chưa commit có thể đã cache lại
+        dữ liệu cũ. Dùng trong signal post_save / post_delete.
+        """
+        def invalidate():
+            for tag in tags:
+                CacheService.invalidate_tag(tag)
+            if also is not None:
+                also()
+
+        invalidate()
+        transaction.on_commit(invalidate)
+    
     @staticmethod
     def invalidate_taxonomy():
         """Invalidate all taxonomy caches."""
@@ -269,15 +610,18 @@ class CacheService:
             CacheKeyBuilder.taxonomy_industries(),
             CacheKeyBuilder.taxonomy_job_categories(),
         ]
-        for key in keys:
-            cache.delete(key)
+        _l1_delete(*keys)
+        cache.delete_many(keys)
         logger.info("Taxonomy cache invalidated")
     
     @staticmethod
     def invalidate_geography():
-        """Invalidate all geography caches."""
-        cache.delete(CacheKeyBuilder.geography_provinces())
-        CacheService.delete_pattern('geography:communes')
+        """
+        Invalidate all geography caches.
+        Communes cache theo từng tỉnh -> tăng version thay vì quét key.
+        """
+        CacheService.delete(CacheKeyBuilder.geography_provinces())
+        CacheService.invalidate_tag('communes')
         logger.info("Geography cache invalidated")
     
     @staticmethod
@@ -286,6 +630,19 @@ class CacheService:
         cache.delete(CacheKeyBuilder.company_profile(company_id))
         logger.info(f"Company {company_id} cache invalidated")
     
+    @staticmethod
+    def get_job_list_version() -> int:
+        """Version hiện tại của job listing cache."""
+        return CacheService.get_tag_version('job_list')
+    
+    @staticmethod
+    def invalidate_job_list():
+        """
+        Invalidate toàn bộ job listing cache.
+        Tăng version thay vì xóa từng key (số tổ hợp filter không giới hạn).
+        """
+        CacheService.invalidate_tag('job_list')
+    
     @staticmethod
     def invalidate_job(job_id: str):
         """Invalidate job-related caches."""
@@ -327,7 +684,7 @@ class CachedTaxonomySelectors:
         cache_key = CacheKeyBuilder.taxonomy_industries()
         
         def fetch_industries():
-            return list(Industry.objects.values('id', 'name', 'slug', 'icon'))
+            return list(Industry.objects.values('id', 'name', 'slug', 'icon_url'))
         
         return CacheService.get_or_set(cache_key, fetch_industries, CACHE_TIMEOUT_LONG)
     
@@ -353,19 +710,24 @@ class CachedGeographySelectors:
         cache_key = CacheKeyBuilder.geography_provinces()
         
         def fetch_provinces():
-            return list(Province.objects.values('id', 'name', 'code', 'name_en'))
+            return list(Province.objects.filter(is_active=True).values(
+                'id', 'province_code', 'province_name', 'province_type', 'region'
+            ))
         
         return CacheService.get_or_set(cache_key, fetch_provinces, CACHE_TIMEOUT_DAY)
     
     @staticmethod
     def get_communes_by_province(province_id: str) -> List[dict]:
         """Get communes by province with caching."""
-        cache_key = CacheKeyBuilder.geography_communes(province_id)
+        cache_key = CacheKeyBuilder.geography_communes(
+            province_id, CacheService.get_tag_version('communes')
+        )
         
         def fetch_communes():
             return list(Commune.objects.filter(
-                province_id=province_id
-            ).values('id', 'name', 'code', 'commune_type'))
+                province_id=province_id,
+                is_active=True
+            ).values('id', 'commune_name', 'commune_type', 'province_id'))
         
         return CacheService.get_or_set(cache_key, fetch_communes, CACHE_TIMEOUT_DAY)
 
@@ -382,8 +744,7 @@ class CachedBillingSelectors:
         
         def fetch_plans():
             return list(SubscriptionPlan.objects.filter(is_active=True).values(
-                'id', 'name', 'slug', 'price', 'duration_days', 
-                'max_job_posts', 'max_featured_jobs', 'features'
+                'id', 'name', 'slug', 'price', 'currency', 'duration_days', 'features'
             ))
         
         return CacheService.get_or_set(cache_key, fetch_plans, CACHE_TIMEOUT_MEDIUM)
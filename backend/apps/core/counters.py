@@ -0,0 +1,271 @@
+"""
+Write-behind counters cho các bộ đếm lượt xem / lượt tải.
+
+Request chỉ HINCRBY vào Redis hash (jobportal:counters:<model>:<field>,
+field = id bản ghi -> delta). Celery beat gọi flush_all_counters định kỳ:
+đổi tên hash sang key :flushing (RENAME, atomic - các lượt tăng mới vào hash
+mới), cộng dồn delta vào DB bằng một câu UPDATE cho mỗi lô rồi xóa key.
+
+Mỗi hash :flushing mang 1 mã generation (field __generation__). Mã này
+được ghi vào bảng counter_flushes trong cùng transaction với UPDATE, nên
+một lô đã commit không bao giờ được cộng lại (flush chạy chồng, hoặc
+worker chết giữa lúc commit và lúc xóa key). Flush còn giữ lock
+SET NX EX riêng cho từng bộ đếm.
+
+Đọc: giá trị DB + delta đang chờ (HMGET cả 2 hash). Delta trong :flushing
+bị bỏ qua nếu generation của nó đã được ghi xuống DB.
+Không có Redis (tests, local dev): cộng thẳng vào DB bằng F() như trước.
+"""
+import logging
+import uuid
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+from django_redis import get_redis_connection
+from redis.exceptions import ResponseError
+
+from apps.core.caching import CacheKeyBuilder
+
+logger = logging.getLogger(__name__)
+
+# Số bản ghi mỗi câu UPDATE khi flush
+FLUSH_BATCH_SIZE = 1000
+
+FLUSH_LOCK_TIMEOUT = 60 * 5
+
+# Field trong hash :flushing chứa mã generation của lô
+GENERATION_FIELD = '__generation__'
+
+# Thời gian giữ lịch sử generation đã flush
+FLUSH_HISTORY_RETENTION = timedelta(days=1)
+
+_registry: List['WriteBehindCounter'] = []
+
+
+class WriteBehindCounter:
+    """
+    Bộ đếm của một field số nguyên trên model, đệm trong Redis.
+
+    Usage:
+        job_view_counter = WriteBehindCounter('recruitment_jobs.Job', 'view_count')
+        new_count = job_view_counter.increment(job)
+        counts = job_view_counter.pending([job.id for job in jobs])
+    """
+
+    def __init__(self, model_label: str, field: str):
+        self.model_label = model_label
+        self.field = field
+        self.key = CacheKeyBuilder.build('counters', model_label, field)
+        self.flushing_key = f"{self.key}:flushing"
+        self.lock_key = f"{self.key}:lock"
+        _registry.append(self)
+
+    def __repr__(self):
+        return f"<WriteBehindCounter {self.model_label}.{self.field}>"
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    @property
+    def name(self) -> str:
+        return f"{self.model_label}.{self.field}"
+
+    @staticmethod
+    def _is_applied(generation) -> bool:
+        """Lô :flushing có generation này đã được commit xuống DB chưa."""
+        if not generation:
+            return False
+        if isinstance(generation, bytes):
+            generation = generation.decode()
+        CounterFlush = apps.get_model('system_counter_flushes', 'CounterFlush')
+        return CounterFlush.objects.filter(generation=generation).exists()
+
+    def increment(self, instance, amount: int = 1) -> int:
+        """
+        Tăng bộ đếm cho instance.
+
+        Returns:
+            int: Giá trị hiện tại (DB đã load + delta đang chờ)
+        """
+        current = getattr(instance, self.field)
+        try:
+            redis_conn = get_redis_connection("default")
+            pipe = redis_conn.pipeline(transaction=False)
+            pipe.hincrby(self.key, instance.pk, amount)
+            pipe.hget(self.flushing_key, instance.pk)
+            pipe.hget(self.flushing_key, GENERATION_FIELD)
+            pending, flushing, generation = pipe.execute()
+            if flushing and self._is_applied(generation):
+                flushing = 0
+            return current + int(pending) + int(flushing or 0)
+        except Exception as e:
+            logger.debug(f"Counter buffer unavailable, writing through: {e}")
+            self.model.objects.filter(pk=instance.pk).update(
+                **{self.field: F(self.field) + amount}
+            )
+            return current + amount
+
+    def pending(self, ids: Iterable[int]) -> Dict[int, int]:
+        """Delta chưa flush theo id (bỏ qua id không có delta)."""
+        ids = list(ids)
+        if not ids:
+            return {}
+        try:
+            redis_conn = get_redis_connection("default")
+            pipe = redis_conn.pipeline(transaction=False)
+            pipe.hmget(self.key, ids)
+            pipe.hmget(self.flushing_key, ids)
+            pipe.hget(self.flushing_key, GENERATION_FIELD)
+            pending, flushing, generation = pipe.execute()
+        except Exception as e:
+            logger.debug(f"Counter buffer unavailable: {e}")
+            return {}
+
+        # Lô đã commit nhưng chưa kịp xóa key: không cộng 2 lần
+        if any(flushing) and self._is_applied(generation):
+            flushing = [None] * len(ids)
+
+        deltas = {}
+        for obj_id, value, flushing_value in zip(ids, pending, flushing):
+            delta = int(value or 0) + int(flushing_value or 0)
+            if delta:
+                deltas[obj_id] = delta
+        return deltas
+
+    def value(self, instance) -> int:
+        """Giá trị hiện tại của bộ đếm cho instance đã load từ DB."""
+        return getattr(instance, self.field) + self.pending([instance.pk]).get(instance.pk, 0)
+
+    def flush(self) -> int:
+        """
+        Ghi delta đang chờ xuống DB.
+        Note: Requires Redis backend.
+
+        Nếu ghi DB lỗi, key :flushing được giữ lại và lần flush sau xử lý tiếp
+        (cùng generation, nên không bị cộng 2 lần nếu lần trước đã commit).
+
+        Returns:
+            int: Số bản ghi đã cập nhật
+        """
+        redis_conn = get_redis_connection("default")
+        token = uuid.uuid4().hex
+        if not redis_conn.set(self.lock_key, token, nx=True, ex=FLUSH_LOCK_TIMEOUT):
+            return 0
+
+        try:
+            return self._flush(redis_conn)
+        finally:
+            if redis_conn.get(self.lock_key) in (token, token.encode()):
+                redis_conn.delete(self.lock_key)
+
+    def _flush(self, redis_conn) -> int:
+        if not redis_conn.exists(self.flushing_key):
+            try:
+                redis_conn.rename(self.key, self.flushing_key)
+            except ResponseError:
+                # Không có delta nào
+                return 0
+        # Giữ nguyên generation nếu lô này đã được thử trước đó
+        redis_conn.hsetnx(self.flushing_key, GENERATION_FIELD, uuid.uuid4().hex)
+
+        deltas = {}
+        generation: Optional[str] = None
+        for field, value in redis_conn.hgetall(self.flushing_key).items():
+            field = field.decode() if isinstance(field, bytes) else str(field)
+            value = value.decode() if isinstance(value, bytes) else str(value)
+            if field == GENERATION_FIELD:
+                generation = value
+            elif int(value):
+                deltas[int(field)] = int(value)
+
+        if deltas and not self._apply_generation(generation, deltas):
+            logger.warning(f"Counter batch {generation} for {self.name} was already applied, skipping")
+            deltas = {}
+
+        redis_conn.delete(self.flushing_key)
+        return len(deltas)
+
+    def _apply_generation(self, generation: str, deltas: Dict[int, int]) -> bool:
+        """
+        Ghi generation và cộng delta trong 1 transaction.
+
+        Returns:
+            bool: False nếu generation đã được ghi trước đó
+        """
+        CounterFlush = apps.get_model('system_counter_flushes', 'CounterFlush')
+        ids = list(deltas)
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    CounterFlush.objects.create(generation=generation, counter=self.name, record_count=len(ids))
+            except IntegrityError:
+                return False
+
+            for start in range(0, len(ids), FLUSH_BATCH_SIZE):
+                self._apply({obj_id: deltas[obj_id] for obj_id in ids[start:start + FLUSH_BATCH_SIZE]})
+        return True
+
+    def _apply(self, deltas: Dict[int, int]) -> None:
+        """Cộng delta cho một lô bản ghi bằng một câu UPDATE."""
+        model = self.model
+
+        if connection.vendor == 'postgresql':
+            qn = connection.ops.quote_name
+            table = qn(model._meta.db_table)
+            column = qn(model._meta.get_field(self.field).column)
+            pk_column = qn(model._meta.pk.column)
+            values_sql = ', '.join(['(%s, %s)'] * len(deltas))
+            params = [item for pair in deltas.items() for item in pair]
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"UPDATE {table} AS t SET {column} = t.{column} + v.delta "
+                    f"FROM (VALUES {values_sql}) AS v(id, delta) "
+                    f"WHERE t.{pk_column} = v.id",
+                    params
+                )
+            return
+
+        model.objects.filter(pk__in=list(deltas)).update(**{
+            self.field: F(self.field) + Case(
+                *[When(pk=obj_id, then=Value(delta)) for obj_id, delta in deltas.items()],
+                default=Value(0)
+            )
+        })
+
+
+job_view_counter = WriteBehindCounter('recruitment_jobs.Job', 'view_count')
+blog_post_view_counter = WriteBehindCounter('blog.Post', 'view_count')
+cv_view_counter = WriteBehindCounter('candidate_recruiter_cvs.RecruiterCV', 'view_count')
+cv_download_counter = WriteBehindCounter('candidate_recruiter_cvs.RecruiterCV', 'download_count')
+
+
+def flush_all_counters() -> Dict[str, int]:
+    """
+    Flush mọi bộ đếm đã đăng ký (1 worker tại một thời điểm).
+
+    Returns:
+        dict: "<model>.<field>" -> số bản ghi đã cập nhật
+    """
+    lock_key = CacheKeyBuilder.build('counters', 'flush', 'lock')
+    if not cache.add(lock_key, 1, FLUSH_LOCK_TIMEOUT):
+        return {}
+
+    results = {}
+    try:
+        for counter in _registry:
+            try:
+                results[counter.name] = counter.flush()
+            except Exception as e:
+                logger.error(f"Counter flush failed for {counter.name}: {e}")
+
+        CounterFlush = apps.get_model('system_counter_flushes', 'CounterFlush')
+        CounterFlush.objects.filter(created_at__lt=timezone.now() - FLUSH_HISTORY_RETENTION).delete()
+    finally:
+        cache.delete(lock_key)
+    return results
@@ -3,8 +3,16 @@ Custom Pagination Classes cho Django REST Framework.
 
 Cung cấp các class pagination chuẩn hóa cho toàn bộ API.
 """
-from rest_framework.pagination import PageNumberPagination, CursorPagination
+import base64
+import json
+
+from django.db import connections
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination, CursorPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 class StandardResultsSetPagination(PageNumberPagination):
     """
@@ -73,6 +81,164 @@ class JobSearchPagination(PageNumberPagination):
         })
 
 
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination trên nhiều cột sắp xếp.
+
+    Khác với CursorPagination của DRF (chỉ seek theo cột đầu tiên rồi OFFSET
+    cho các bản ghi trùng), class này so sánh cả tuple sắp xếp nên chi phí
+    mỗi trang là hằng số, không phụ thuộc vị trí trang.
+
+    Subclass khai báo `ordering` dạng list các tuple
+    (field, descending, nullable, kind) với kind là 'bool' | 'datetime' | 'int'.
+    Field cuối cùng phải unique (thường là `id`) để tie-break
+    và không được nullable.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+    results_key = 'results'
+    ordering = []
+
+    def get_ordering_expressions(self):
+        return [F(field).desc() if descending else F(field).asc()
+                for field, descending, _null, _kind in self.ordering]
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                size = int(request.query_params[self.page_size_query_param])
+                if size > 0:
+                    return min(size, self.max_page_size)
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.next_position = None
+
+        queryset = queryset.order_by(*self.get_ordering_expressions())
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            nulls_largest = connections[queryset.db].features.nulls_order_largest
+            queryset = queryset.filter(self._build_seek_filter(position, nulls_largest))
+
+        # Lấy thêm 1 record để biết còn trang sau hay không
+        page = list(queryset[:self.page_size + 1])
+        if len(page) > self.page_size:
+            page = page[:self.page_size]
+            self.next_position = self._get_position(page[-1])
+        return page
+
+    def _build_seek_filter(self, position, nulls_largest):
+        """
+        Build điều kiện "đứng sau position" theo thứ tự `ordering`.
+
+        Vị trí của NULL theo mặc định của database (Postgres: NULL lớn nhất,
+        SQLite: NULL nhỏ nhất) để ORDER BY khớp với index không cần NULLS LAST.
+        """
+        condition = None
+        for (field, descending, nullable, _kind), value in reversed(list(zip(self.ordering, position))):
+            # NULL đứng sau các giá trị khác trong thứ tự hiện tại?
+            nulls_after = descending != nulls_largest
+            is_null = Q(**{f'{field}__isnull': True})
+
+            if value is None:
+                if nulls_after:
+                    condition = is_null & condition
+                else:
+                    condition = Q(**{f'{field}__isnull': False}) | (is_null & condition)
+                continue
+
+            lookup = 'lt' if descending else 'gt'
+            after = Q(**{f'{field}__{lookup}': value})
+            if nullable and nulls_after:
+                after |= is_null
+
+            if condition is None:
+                condition = after
+            else:
+                condition = after | (Q(**{field: value}) & condition)
+        return condition
+
+    def _get_position(self, instance):
+        return [getattr(instance, field) for field, _desc, _null, _kind in self.ordering]
+
+    def encode_cursor(self, position):
+        values = []
+        for (_field, _desc, _null, kind), value in zip(self.ordering, position):
+            if value is not None and kind == 'datetime':
+                value = value.isoformat()
+            values.append(value)
+        token = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param, token
+        )
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+
+        try:
+            values = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            position = []
+            for (_field, _desc, nullable, kind), value in zip(self.ordering, values):
+                if value is None:
+                    if not nullable:
+                        raise ValueError
+                elif kind == 'datetime':
+                    value = parse_datetime(value)
+                    if value is None:
+                        raise ValueError
+                elif kind == 'bool':
+                    value = bool(value)
+                else:
+                    value = int(value)
+                position.append(value)
+        except (TypeError, ValueError, UnicodeDecodeError, json.JSONDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'page_size': self.page_size,
+            'next': self.get_next_link(),
+            self.results_key: data
+        })
+
+
+class JobKeysetPagination(KeysetPagination):
+    """
+    Keyset pagination cho Job listing (infinite scroll / trang sâu).
+    - Ordering: featured DESC, published_at DESC, created_at DESC, id ASC
+    - Khớp với index idx_jobs_listing_keyset
+    - Query param: ?pagination=cursor&cursor=<token>
+    """
+    page_size = 20
+    max_page_size = 100
+    results_key = 'jobs'
+    ordering = [
+        ('featured', True, False, 'bool'),
+        ('published_at', True, True, 'datetime'),
+        ('created_at', True, False, 'datetime'),
+        ('id', False, False, 'int'),
+    ]
+
+
 class ApplicationPagination(PageNumberPagination):
     """
     Pagination cho Applications list.
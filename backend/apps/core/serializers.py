@@ -0,0 +1,46 @@
+from django.db import models
+from rest_framework import serializers
+
+from apps.core.counters import WriteBehindCounter
+
+
+class CounterField(serializers.IntegerField):
+    """
+    Bộ đếm write-behind (read-only): giá trị DB + delta chưa flush.
+
+    Usage:
+        view_count = CounterField(blog_post_view_counter)
+
+    Serializer dùng Meta.list_serializer_class = CounterListSerializer để
+    khi serialize nhiều bản ghi, delta của cả trang được đọc 1 lần.
+    """
+
+    def __init__(self, counter: WriteBehindCounter, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+        self.counter = counter
+
+    def get_attribute(self, instance):
+        prefetched = getattr(self.parent, '_pending_counts', None)
+        if prefetched is not None and self.field_name in prefetched:
+            pending = prefetched[self.field_name]
+        else:
+            pending = self.counter.pending([instance.pk])
+        return getattr(instance, self.counter.field) + pending.get(instance.pk, 0)
+
+
+class CounterListSerializer(serializers.ListSerializer):
+    """ListSerializer nạp delta chưa flush của mọi CounterField cho cả trang (1 lookup / bộ đếm)."""
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        ids = [item.pk for item in items]
+        self.child._pending_counts = {
+            name: field.counter.pending(ids)
+            for name, field in self.child.fields.items()
+            if isinstance(field, CounterField)
+        }
+        try:
+            return super().to_representation(items)
+        finally:
+            self.child._pending_counts = None
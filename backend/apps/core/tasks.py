@@ -0,0 +1,31 @@
+from celery import shared_task
+from celery.utils.log import get_task_logger
+
+from apps.core.caching import CacheService
+from apps.core.counters import flush_all_counters
+
+logger = get_task_logger(__name__)
+
+
+@shared_task
+def sweep_stale_cache_tags_task():
+    """
+    Dọn key của các version cũ (sau invalidate_tag) bằng SCAN.
+    Không bắt buộc cho tính đúng, chỉ giải phóng bộ nhớ Redis sớm hơn TTL.
+    """
+    deleted = CacheService.sweep_stale_tags()
+    if deleted:
+        logger.info(f"Swept {deleted} stale cache keys")
+    return deleted
+
+
+@shared_task
+def flush_counters_task():
+    """
+    Ghi các bộ đếm write-behind (lượt xem job, blog, CV...) xuống DB.
+    """
+    results = flush_all_counters()
+    flushed = {name: count for name, count in results.items() if count}
+    if flushed:
+        logger.info(f"Flushed counters: {flushed}")
+    return results
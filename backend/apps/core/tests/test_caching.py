@@ -0,0 +1,220 @@
+from fnmatch import fnmatchcase
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from apps.core import caching
+from apps.core.caching import CacheKeyBuilder, CacheService, cached, clear_local_cache
+from apps.core.tasks import sweep_stale_cache_tags_task
+
+
+class FakeRedis:
+    """Redis tối giản: chỉ SCAN / UNLINK (không có KEYS)."""
+
+    def __init__(self, keys):
+        self.keys_store = {key.encode() for key in keys}
+
+    def scan_iter(self, match=None, count=None):
+        for key in sorted(self.keys_store):
+            if fnmatchcase(key.decode(), match):
+                yield key
+
+    def unlink(self, *keys):
+        removed = self.keys_store.intersection(keys)
+        self.keys_store -= removed
+        return len(removed)
+
+
+def reset_caches():
+    cache.clear()
+    clear_local_cache()
+
+
+class TagVersionTests(SimpleTestCase):
+    """Tests cho invalidate theo tag/version"""
+
+    def setUp(self):
+        reset_caches()
+        self.addCleanup(reset_caches)
+
+    def test_invalidate_tag_changes_tagged_keys(self):
+        old_key = CacheKeyBuilder.tagged('skills', CacheService.get_tag_version('skills'), 'list')
+        CacheService.invalidate_tag('skills')
+        new_key = CacheKeyBuilder.tagged('skills', CacheService.get_tag_version('skills'), 'list')
+
+        self.assertEqual(old_key, 'jobportal:skills:v1:list')
+        self.assertEqual(new_key, 'jobportal:skills:v2:list')
+        self.assertEqual(CacheService.get_tag_versions(['skills', 'provinces']), {'skills': 2, 'provinces': 1})
+
+    def test_long_tagged_key_keeps_tag_prefix(self):
+        key = CacheKeyBuilder.tagged('skills', 3, 'x' * 300)
+        self.assertTrue(key.startswith('jobportal:skills:v3:hashed:'))
+
+    def test_cached_invalidate_deletes_auto_generated_key(self):
+        calls = []
+
+        @cached(key_prefix='test')
+        def compute(value):
+            calls.append(value)
+            return value * 2
+
+        compute(2)
+        compute(2)
+        compute.invalidate(2)
+        compute(2)
+
+        self.assertEqual(calls, [2, 2])
+
+    def test_cached_invalidate_all_bumps_tag(self):
+        calls = []
+
+        @cached(tag='skills')
+        def compute(value):
+            calls.append(value)
+            return value
+
+        compute(1)
+        compute(2)
+        compute.invalidate_all()
+        compute(1)
+        compute(2)
+
+        self.assertEqual(calls, [1, 2, 1, 2])
+
+
+class InvalidateOnCommitTests(TestCase):
+    """Tests cho invalidate ngay lập tức và lặp lại sau commit (signals)"""
+
+    def setUp(self):
+        reset_caches()
+        self.addCleanup(reset_caches)
+
+    def test_invalidates_now_and_again_after_commit(self):
+        also = Mock()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            CacheService.invalidate_now_and_on_commit('skills', 'provinces', also=also)
+            self.assertEqual(CacheService.get_tag_versions(['skills', 'provinces']), {'skills': 2, 'provinces': 2})
+            self.assertEqual(also.call_count, 1)
+
+        self.assertEqual(CacheService.get_tag_versions(['skills', 'provinces']), {'skills': 3, 'provinces': 3})
+        self.assertEqual(also.call_count, 2)
+
+
+class SweepStaleTagsTests(SimpleTestCase):
+    """Tests cho sweeper dọn key version cũ bằng SCAN"""
+
+    def setUp(self):
+        reset_caches()
+        self.addCleanup(reset_caches)
+
+    def test_sweep_only_removes_stale_versions(self):
+        CacheService.invalidate_tag('skills')
+        CacheService.invalidate_tag('skills')
+        redis = FakeRedis([
+            ':1:jobportal:tag:skills:version',
+            ':1:jobportal:skills:v1:response:a',
+            ':1:jobportal:skills:v2:hashed:abc',
+            ':1:jobportal:skills:v3:response:a',
+            ':1:jobportal:skills_extra:v1:response:a',
+            ':1:jobportal:taxonomy:skills:all',
+        ])
+
+        with patch('apps.core.caching.get_redis_connection', return_value=redis):
+            deleted = sweep_stale_cache_tags_task()
+
+        self.assertEqual(deleted, 2)
+        self.assertEqual(
+            sorted(key.decode() for key in redis.keys_store),
+            [
+                ':1:jobportal:skills:v3:response:a',
+                ':1:jobportal:skills_extra:v1:response:a',
+                ':1:jobportal:tag:skills:version',
+                ':1:jobportal:taxonomy:skills:all',
+            ]
+        )
+
+    def test_delete_pattern_uses_scan(self):
+        redis = FakeRedis([':1:jobportal:a:1', ':1:jobportal:a:2', ':1:jobportal:b:1'])
+
+        with patch('apps.core.caching.get_redis_connection', return_value=redis):
+            self.assertEqual(CacheService.delete_pattern('jobportal:a:'), 2)
+
+
+class TwoTierGetOrSetTests(SimpleTestCase):
+    """Tests cho L1 + single-flight + refresh sớm của get_or_set"""
+
+    def setUp(self):
+        reset_caches()
+        self.addCleanup(reset_caches)
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return ['value', self.calls]
+
+    def expire(self, key):
+        """Đưa entry về trạng thái đã hết hạn logic (vẫn còn trong Redis)."""
+        entry = cache.get(key)
+        entry['e'] = 0
+        cache.set(key, entry)
+        clear_local_cache()
+
+    def test_l1_serves_without_redis_round_trip(self):
+        CacheService.get_or_set('hot', self.compute, 60)
+
+        with patch.object(caching.cache, 'get', wraps=cache.get) as mock_get:
+            value = CacheService.get_or_set('hot', self.compute, 60)
+
+        self.assertEqual(value, ['value', 1])
+        mock_get.assert_not_called()
+
+    def test_other_process_reads_redis_and_fills_l1(self):
+        CacheService.get_or_set('hot', self.compute, 60)
+        clear_local_cache()
+
+        self.assertEqual(CacheService.get_or_set('hot', self.compute, 60), ['value', 1])
+        self.assertEqual(self.calls, 1)
+
+    def test_expired_key_is_recomputed_once(self):
+        CacheService.get_or_set('hot', self.compute, 60)
+        self.expire('hot')
+
+        self.assertEqual(CacheService.get_or_set('hot', self.compute, 60), ['value', 2])
+        self.assertFalse(cache.get('hot:lock'))
+
+    def test_stale_value_served_while_other_worker_recomputes(self):
+        CacheService.get_or_set('hot', self.compute, 60)
+        self.expire('hot')
+        cache.add('hot:lock', 1, 30)
+
+        self.assertEqual(CacheService.get_or_set('hot', self.compute, 60), ['value', 1])
+        self.assertEqual(self.calls, 1)
+
+    def test_cold_key_waits_for_worker_holding_lock(self):
+        cache.add('cold:lock', 1, 30)
+
+        def other_worker_finishes(_seconds):
+            cache.set('cold', {'v': 'from other worker', 'd': 0.1, 'e': caching.time.time() + 60})
+
+        with patch.object(caching.time, 'sleep', side_effect=other_worker_finishes):
+            value = CacheService.get_or_set('cold', self.compute, 60)
+
+        self.assertEqual(value, 'from other worker')
+        self.assertEqual(self.calls, 0)
+
+    def test_probabilistic_early_refresh(self):
+        CacheService.get_or_set('hot', self.compute, 60)
+        entry = cache.get('hot')
+        entry['d'] = 10  # tính lâu -> refresh sớm trước khi hết hạn
+        entry['e'] = caching.time.time() + 1
+        cache.set('hot', entry)
+        clear_local_cache()
+
+        with patch.object(caching.random, 'random', return_value=0.99):
+            self.assertEqual(CacheService.get_or_set('hot', self.compute, 60), ['value', 2])
+
+    def test_none_is_not_cached(self):
+        self.assertIsNone(CacheService.get_or_set('none', lambda: None, 60))
+        self.assertIsNone(cache.get('none'))
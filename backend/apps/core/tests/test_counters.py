@@ -0,0 +1,259 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+from redis.exceptions import ResponseError
+
+from apps.blog.models import Post
+from apps.blog.serializers import PostSerializer
+from apps.blog.services import BlogService
+from apps.candidate.recruiter_cvs.models import RecruiterCV
+from apps.candidate.recruiter_cvs.serializers import RecruiterCVDetailSerializer, RecruiterCVListSerializer
+from apps.candidate.recruiters.models import Recruiter
+from apps.core.counters import (
+    WriteBehindCounter,
+    blog_post_view_counter,
+    cv_download_counter,
+    cv_view_counter,
+    flush_all_counters,
+)
+from apps.system.counter_flushes.models import CounterFlush
+from apps.core.tasks import flush_counters_task
+from apps.core.users.models import CustomUser
+
+
+class FakeRedis:
+    """Redis tối giản cho hash (HINCRBY / HGET / HMGET / HGETALL / HSETNX / RENAME) và SET NX / GET."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.strings = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def hincrby(self, key, field, amount):
+        data = self.hashes.setdefault(key, {})
+        field = str(field).encode()
+        data[field] = int(data.get(field, 0)) + amount
+        return data[field]
+
+    def hget(self, key, field):
+        value = self.hashes.get(key, {}).get(str(field).encode())
+        return None if value is None else str(value).encode()
+
+    def hmget(self, key, fields):
+        return [self.hget(key, field) for field in fields]
+
+    def hgetall(self, key):
+        return {field: str(value).encode() for field, value in self.hashes.get(key, {}).items()}
+
+    def hsetnx(self, key, field, value):
+        data = self.hashes.setdefault(key, {})
+        field = str(field).encode()
+        if field in data:
+            return 0
+        data[field] = value
+        return 1
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = str(value).encode()
+        return True
+
+    def get(self, key):
+        return self.strings.get(key)
+
+    def exists(self, key):
+        return int(key in self.hashes)
+
+    def rename(self, src, dst):
+        if src not in self.hashes:
+            raise ResponseError("no such key")
+        self.hashes[dst] = self.hashes.pop(src)
+
+    def delete(self, *keys):
+        return sum(
+            1 for key in keys
+            if self.hashes.pop(key, None) is not None or self.strings.pop(key, None) is not None
+        )
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        return [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+class WriteBehindCounterTests(TestCase):
+    """Tests cho bộ đếm write-behind (Redis -> DB)"""
+
+    def setUp(self):
+        cache.clear()
+        self.redis = FakeRedis()
+        patcher = patch('apps.core.counters.get_redis_connection', return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        author = CustomUser.objects.create(email='author@example.com', full_name='Author')
+        self.posts = [
+            Post.objects.create(title=f'Post {i}', author=author, content='Nội dung', view_count=10)
+            for i in range(3)
+        ]
+
+    def test_increment_buffers_in_redis(self):
+        post = self.posts[0]
+
+        with self.assertNumQueries(0):
+            self.assertEqual(BlogService.increment_view_count(post), 11)
+            self.assertEqual(BlogService.increment_view_count(post), 12)
+
+        post.refresh_from_db()
+        self.assertEqual(post.view_count, 10)
+        self.assertEqual(blog_post_view_counter.value(post), 12)
+
+    def test_flush_applies_deltas_in_one_update(self):
+        for post, views in zip(self.posts, (3, 1, 0)):
+            for _ in range(views):
+                blog_post_view_counter.increment(post)
+
+        # SAVEPOINT x2 + INSERT generation + RELEASE + UPDATE + RELEASE, xóa lịch sử cũ
+        with self.assertNumQueries(7):
+            results = flush_counters_task()
+
+        self.assertEqual(results['blog.Post.view_count'], 2)
+        self.assertEqual(
+            list(Post.objects.order_by('id').values_list('view_count', flat=True)),
+            [13, 11, 10]
+        )
+        self.assertEqual(blog_post_view_counter.pending([post.id for post in self.posts]), {})
+
+    def test_increments_during_flush_are_kept(self):
+        post = self.posts[0]
+        blog_post_view_counter.increment(post)
+        self.redis.rename(blog_post_view_counter.key, blog_post_view_counter.flushing_key)
+
+        # Lượt xem mới vào hash mới trong lúc đang flush
+        self.assertEqual(blog_post_view_counter.increment(post), 12)
+
+        flush_all_counters()
+        post.refresh_from_db()
+        self.assertEqual(post.view_count, 11)
+        self.assertEqual(blog_post_view_counter.value(post), 12)
+
+        flush_all_counters()
+        post.refresh_from_db()
+        self.assertEqual(post.view_count, 12)
+
+    def test_failed_flush_is_retried(self):
+        post = self.posts[0]
+        blog_post_view_counter.increment(post)
+
+        with patch.object(type(blog_post_view_counter), '_apply', side_effect=RuntimeError("db down")):
+            flush_all_counters()
+
+        self.assertEqual(blog_post_view_counter.value(post), 11)
+        flush_all_counters()
+        post.refresh_from_db()
+        self.assertEqual(post.view_count, 11)
+
+    def test_without_redis_writes_through(self):
+        post = self.posts[0]
+
+        with patch('apps.core.counters.get_redis_connection', side_effect=NotImplementedError):
+            self.assertEqual(BlogService.increment_view_count(post), 11)
+
+        post.refresh_from_db()
+        self.assertEqual(post.view_count, 11)
+
+    def test_overlapping_flush_is_skipped(self):
+        post = self.posts[0]
+        blog_post_view_counter.increment(post)
+        self.redis.set(blog_post_view_counter.lock_key, 'other-worker', nx=True)
+
+        self.assertEqual(blog_post_view_counter.flush(), 0)
+
+        post.refresh_from_db()
+        self.assertEqual(post.view_count, 10)
+        self.assertEqual(blog_post_view_counter.value(post), 11)
+
+    def test_committed_batch_is_not_applied_twice(self):
+        post = self.posts[0]
+        blog_post_view_counter.increment(post)
+        blog_post_view_counter.increment(post)
+
+        # Worker chết sau khi commit, trước khi xóa key :flushing
+        original_delete = self.redis.delete
+        with patch.object(self.redis, 'delete', side_effect=lambda *keys: original_delete(
+            *[key for key in keys if key != blog_post_view_counter.flushing_key]
+        )):
+            blog_post_view_counter.flush()
+
+        post.refresh_from_db()
+        self.assertEqual(post.view_count, 12)
+        # Reader không cộng lô đã commit lần nữa
+        self.assertEqual(blog_post_view_counter.value(post), 12)
+
+        blog_post_view_counter.flush()
+
+        post.refresh_from_db()
+        self.assertEqual(post.view_count, 12)
+        self.assertEqual(CounterFlush.objects.count(), 1)
+        self.assertFalse(self.redis.exists(blog_post_view_counter.flushing_key))
+
+
+class CounterSerializerTests(TestCase):
+    """Tests cho serializer đọc bộ đếm kèm delta chưa flush"""
+
+    def setUp(self):
+        self.redis = FakeRedis()
+        patcher = patch('apps.core.counters.get_redis_connection', return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        author = CustomUser.objects.create(email='author@example.com', full_name='Author')
+        self.posts = [
+            Post.objects.create(title=f'Post {i}', author=author, content='Nội dung', view_count=10)
+            for i in range(3)
+        ]
+        recruiter = Recruiter.objects.create(user=author)
+        self.cv = RecruiterCV.objects.create(recruiter=recruiter, cv_name='CV', cv_data={}, view_count=5, download_count=1)
+
+    def test_post_detail_includes_pending_views(self):
+        BlogService.increment_view_count(self.posts[0])
+        BlogService.increment_view_count(self.posts[0])
+
+        post = Post.objects.get(id=self.posts[0].id)
+        self.assertEqual(PostSerializer(post).data['view_count'], 12)
+
+    def test_post_list_reads_pending_once_per_page(self):
+        blog_post_view_counter.increment(self.posts[1])
+
+        with patch.object(WriteBehindCounter, 'pending', autospec=True, side_effect=WriteBehindCounter.pending) as mock_pending:
+            data = PostSerializer(Post.objects.order_by('id'), many=True).data
+
+        mock_pending.assert_called_once()
+        self.assertEqual([item['view_count'] for item in data], [10, 11, 10])
+
+    def test_cv_counts_include_pending_deltas(self):
+        cv_view_counter.increment(self.cv)
+        cv_download_counter.increment(self.cv)
+        cv_download_counter.increment(self.cv)
+
+        cv = RecruiterCV.objects.get(id=self.cv.id)
+        detail = RecruiterCVDetailSerializer(cv).data
+        listed = RecruiterCVListSerializer([cv], many=True).data[0]
+
+        for data in (detail, listed):
+            self.assertEqual((data['view_count'], data['download_count']), (6, 3))
+        self.assertEqual((cv.view_count, cv.download_count), (5, 1))
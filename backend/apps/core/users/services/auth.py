@@ -221,7 +221,7 @@ def register_user(data: RegisterInput) -> dict:
     # Send Verification Email
     verification_link = f"http://localhost:3000/auth/verify-email?token={user.email_verification_token}"
     
-    EmailService.send_email(
+    EmailService.queue_email(
         recipient=user.email,
         subject="[JobPortal] Xác thực tài khoản của bạn",
         template_path="emails/auth/verify_email.html",
@@ -262,7 +262,7 @@ def forgot_password(data: ForgotPasswordInput) -> bool:
     user.save(update_fields=["password_reset_token", "password_reset_expires"])
     
     # Send OTP Email
-    EmailService.send_email(
+    EmailService.queue_email(
         recipient=user.email,
         subject="[JobPortal] Mã xác thực đặt lại mật khẩu",
         template_path="emails/auth/otp.html",
@@ -351,7 +351,7 @@ def resend_verification(data: ResendVerificationInput) -> bool:
     # Send Verification Email
     verification_link = f"http://localhost:3000/auth/verify-email?token={user.email_verification_token}"
     
-    EmailService.send_email(
+    EmailService.queue_email(
         recipient=user.email,
         subject="[JobPortal] Gửi lại liên kết xác thực",
         template_path="emails/auth/verify_email.html",
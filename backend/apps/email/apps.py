@@ -3,3 +3,6 @@ from django.apps import AppConfig
 class EmailConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.email'
+
+    def ready(self):
+        import apps.email.signals
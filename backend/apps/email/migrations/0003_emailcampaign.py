@@ -0,0 +1,46 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('email', '0002_emailoutbox'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailCampaign',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=255)),
+                ('subject', models.CharField(blank=True, help_text='Empty to use template subject', max_length=255)),
+                ('content_html', models.TextField(blank=True, help_text='Empty to use template body')),
+                ('audience', models.CharField(choices=[('all', 'All users'), ('recruiter', 'Candidates'), ('company', 'Companies')], default='all', max_length=20)),
+                ('status', models.CharField(choices=[('draft', 'Draft'), ('scheduled', 'Scheduled'), ('sending', 'Sending'), ('sent', 'Sent'), ('paused', 'Paused'), ('cancelled', 'Cancelled')], db_index=True, default='draft', max_length=20)),
+                ('scheduled_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('total_recipients', models.IntegerField(default=0)),
+                ('total_sent', models.IntegerField(default=0)),
+                ('total_failed', models.IntegerField(default=0)),
+                ('last_recipient_id', models.BigIntegerField(default=0)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='email_campaigns', to=settings.AUTH_USER_MODEL)),
+                ('template', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='campaigns', to='email.emailtemplate')),
+            ],
+            options={
+                'verbose_name': 'Email Campaign',
+                'verbose_name_plural': 'Email Campaigns',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='sentemail',
+            name='campaign',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sent_emails', to='email.emailcampaign'),
+        ),
+    ]
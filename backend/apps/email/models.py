@@ -1,4 +1,6 @@
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 from apps.core.models import TimeStampedModel
 from django.utils.translation import gettext_lazy as _
 
@@ -35,6 +37,59 @@ class EmailTemplate(TimeStampedModel):
     def __str__(self):
         return self.name
 
+class EmailCampaign(TimeStampedModel):
+    """
+    Chiến dịch email gửi hàng loạt (newsletter).
+    last_recipient_id là checkpoint để tạm dừng / tiếp tục.
+    """
+    class Status(models.TextChoices):
+        DRAFT = 'draft', _('Draft')
+        SCHEDULED = 'scheduled', _('Scheduled')
+        SENDING = 'sending', _('Sending')
+        SENT = 'sent', _('Sent')
+        PAUSED = 'paused', _('Paused')
+        CANCELLED = 'cancelled', _('Cancelled')
+
+    class Audience(models.TextChoices):
+        ALL = 'all', _('All users')
+        RECRUITER = 'recruiter', _('Candidates')
+        COMPANY = 'company', _('Companies')
+
+    name = models.CharField(max_length=255)
+    template = models.ForeignKey(
+        EmailTemplate,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='campaigns'
+    )
+    subject = models.CharField(max_length=255, blank=True, help_text="Empty to use template subject")
+    content_html = models.TextField(blank=True, help_text="Empty to use template body")
+    audience = models.CharField(max_length=20, choices=Audience.choices, default=Audience.ALL)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.DRAFT, db_index=True)
+    scheduled_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    total_recipients = models.IntegerField(default=0)
+    total_sent = models.IntegerField(default=0)
+    total_failed = models.IntegerField(default=0)
+    last_recipient_id = models.BigIntegerField(default=0)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='email_campaigns'
+    )
+
+    class Meta:
+        verbose_name = _('Email Campaign')
+        verbose_name_plural = _('Email Campaigns')
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return self.name
+
 class SentEmail(TimeStampedModel):
     class Status(models.TextChoices):
         SENT = 'sent', _('Sent')
@@ -51,6 +106,13 @@ class SentEmail(TimeStampedModel):
         blank=True,
         related_name='sent_emails'
     )
+    campaign = models.ForeignKey(
+        EmailCampaign,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='sent_emails'
+    )
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
     error_message = models.TextField(blank=True)
     
@@ -61,3 +123,42 @@ class SentEmail(TimeStampedModel):
 
     def __str__(self):
         return f"To: {self.recipient} - {self.subject}"
+
+class EmailOutbox(TimeStampedModel):
+    """
+    Email chờ gửi, được ghi trong transaction của nghiệp vụ.
+    Celery worker gửi theo lô và ghi kết quả vào SentEmail.
+    """
+    class Status(models.TextChoices):
+        PENDING = 'pending', _('Pending')
+        SENDING = 'sending', _('Sending')
+        SENT = 'sent', _('Sent')
+        FAILED = 'failed', _('Failed')
+
+    recipient = models.EmailField()
+    subject = models.CharField(max_length=255)
+    html_content = models.TextField()
+    plain_content = models.TextField(blank=True)
+    template = models.ForeignKey(
+        EmailTemplate,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='outbox_emails'
+    )
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = _('Email Outbox')
+        verbose_name_plural = _('Email Outbox')
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='idx_outbox_status_due'),
+        ]
+
+    def __str__(self):
+        return f"To: {self.recipient} - {self.subject} ({self.status})"
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from apps.email.models import EmailTemplate, EmailTemplateCategory, SentEmail
+from apps.email.models import EmailTemplate, EmailTemplateCategory, SentEmail, EmailCampaign
 
 class EmailTemplateCategorySerializer(serializers.ModelSerializer):
     class Meta:
@@ -22,3 +22,20 @@ class SentEmailSerializer(serializers.ModelSerializer):
     class Meta:
         model = SentEmail
         fields = ['id', 'recipient', 'subject', 'content', 'template_name', 'status', 'error_message', 'created_at']
+
+class EmailCampaignSerializer(serializers.ModelSerializer):
+    template_id = serializers.PrimaryKeyRelatedField(
+        queryset=EmailTemplate.objects.all(), source='template', required=False, allow_null=True
+    )
+
+    class Meta:
+        model = EmailCampaign
+        fields = [
+            'id', 'name', 'template_id', 'subject', 'content_html', 'audience', 'status',
+            'scheduled_at', 'started_at', 'finished_at', 'total_recipients', 'total_sent',
+            'total_failed', 'last_recipient_id', 'created_at'
+        ]
+        read_only_fields = [
+            'status', 'scheduled_at', 'started_at', 'finished_at', 'total_recipients',
+            'total_sent', 'total_failed', 'last_recipient_id', 'created_at'
+        ]
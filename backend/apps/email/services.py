@@ -1,19 +1,42 @@
 import logging
+import time
+from datetime import timedelta
 from django.conf import settings
-from django.core.mail import send_mail
+from django.contrib.auth import get_user_model
+from django.core.mail import EmailMultiAlternatives, get_connection, send_mail
+from django.db import transaction
+from django.db.models import F, Q
 from django.template import Context, Template
-from django.template.loader import render_to_string
+from django.utils import timezone
 from django.utils.html import strip_tags
-from apps.email.models import SentEmail, EmailTemplate
+from apps.email import template_cache
+from apps.email.models import SentEmail, EmailOutbox, EmailCampaign
 
 logger = logging.getLogger(__name__)
 
+# Số email tối đa mỗi lô (dùng chung 1 kết nối SMTP)
+DEFAULT_OUTBOX_BATCH_SIZE = 100
+# Số lần gửi tối đa trước khi đánh dấu failed
+DEFAULT_OUTBOX_MAX_ATTEMPTS = 5
+# Backoff: base * 2^(attempts - 1) giây
+DEFAULT_OUTBOX_RETRY_BASE_SECONDS = 60
+# Email ở trạng thái sending quá lâu (worker chết) được nhận lại
+OUTBOX_STALE_SENDING = timedelta(minutes=10)
+
+# Campaign: số người nhận mỗi chunk, tốc độ gửi (email/giây) và thời gian tối đa mỗi lần chạy task
+DEFAULT_CAMPAIGN_CHUNK_SIZE = 200
+DEFAULT_CAMPAIGN_RATE_PER_SECOND = 50
+DEFAULT_CAMPAIGN_RUN_SECONDS = 240
+
 class EmailService:
     @staticmethod
-    def send_email(recipient: str, subject: str, template_slug: str = None, context: dict = None, body: str = None, template_path: str = None):
+    def render_email(subject: str, template_slug: str = None, context: dict = None, body: str = None, template_path: str = None):
         """
-        Send email using template (File or DB) or raw body, and log it.
+        Render email from template (File or DB) or raw body.
         Priority: template_path > template_slug > body
+        
+        Returns:
+            (subject, html_content, plain_content, template_obj) or None if rendering failed
         """
         if context is None:
             context = {}
@@ -25,36 +48,35 @@ class EmailService:
         # Try File Template
         if template_path:
             try:
-                html_content = render_to_string(template_path, context)
+                html_content = template_cache.get_file_template(template_path).render(context)
                 plain_content = strip_tags(html_content)
 
             except Exception as e:
                 logger.error(f"Error rendering file template {template_path}: {e}")
-                return False
+                return None
 
         # Try DB Template (if no file template)
         elif template_slug:
             try:
-                template_obj = EmailTemplate.objects.get(slug=template_slug, is_active=True)
+                compiled = template_cache.get_db_template(template_slug)
+                if compiled is None:
+                    logger.error(f"Email template {template_slug} not found.")
+                    return None
+                template_obj = compiled.template
                 
-                # Using Django Template String from DB
-                django_template = Template(template_obj.body)
+                # Compiled Django Template from DB (cached per process)
                 django_context = Context(context)
                 
-                html_content = django_template.render(django_context)
+                html_content = compiled.body.render(django_context)
                 plain_content = strip_tags(html_content)
                 
                 # If subject not provided, use template subject
                 if not subject:
-                    subject_template = Template(template_obj.subject)
-                    subject = subject_template.render(django_context)
+                    subject = compiled.subject.render(django_context)
                     
-            except EmailTemplate.DoesNotExist:
-                logger.error(f"Email template {template_slug} not found.")
-                return False
             except Exception as e:
                 logger.error(f"Error rendering DB template {template_slug}: {e}")
-                return False
+                return None
 
         # Raw Body
         elif body:
@@ -63,7 +85,21 @@ class EmailService:
 
         if not html_content and not plain_content:
             logger.error("No content provided for email.")
+            return None
+
+        return subject, html_content, plain_content, template_obj
+
+    @staticmethod
+    def send_email(recipient: str, subject: str, template_slug: str = None, context: dict = None, body: str = None, template_path: str = None):
+        """
+        Send email synchronously and log it.
+        Only for cases that need the SMTP result right away (e.g. admin test-send);
+        business flows should use queue_email.
+        """
+        rendered = EmailService.render_email(subject, template_slug, context, body, template_path)
+        if rendered is None:
             return False
+        subject, html_content, plain_content, template_obj = rendered
 
         try:
             # Send email via Django's send_mail
@@ -96,3 +132,467 @@ class EmailService:
                 error_message=str(e)
             )
             return False
+
+
+    @staticmethod
+    def queue_email(recipient: str, subject: str, template_slug: str = None, context: dict = None, body: str = None, template_path: str = None, schedule: bool = True):
+        """
+        Render email and write it to the outbox in the caller's transaction.
+        Delivery happens in Celery workers after commit (no SMTP in the request).
+        Bulk callers pass schedule=False and call EmailOutboxService.schedule_delivery once.
+        
+        Returns:
+            EmailOutbox or None if rendering failed / no recipient
+        """
+        if not recipient:
+            logger.error(f"No recipient for email '{subject}'.")
+            return None
+
+        rendered = EmailService.render_email(subject, template_slug, context, body, template_path)
+        if rendered is None:
+            return None
+        subject, html_content, plain_content, template_obj = rendered
+
+        outbox = EmailOutbox.objects.create(
+            recipient=recipient,
+            subject=subject,
+            html_content=html_content or '',
+            plain_content=plain_content or strip_tags(html_content),
+            template=template_obj
+        )
+        if schedule:
+            transaction.on_commit(EmailOutboxService.schedule_delivery)
+        return outbox
+
+    @staticmethod
+    def queue_emails(messages: list, template_path: str = None, template_slug: str = None) -> list:
+        """
+        Queue many emails rendered from the same template with a single outbox INSERT.
+        Each message is a dict with 'recipient', 'subject' and 'context'.
+        Delivery is scheduled once after commit.
+
+        Returns:
+            list[EmailOutbox]: Queued emails (messages without recipient / failed renders are skipped)
+        """
+        rows = []
+        for message in messages:
+            recipient = message.get('recipient')
+            if not recipient:
+                logger.error(f"No recipient for email '{message.get('subject')}'.")
+                continue
+
+            rendered = EmailService.render_email(
+                message.get('subject'), template_slug, message.get('context'), template_path=template_path
+            )
+            if rendered is None:
+                continue
+            subject, html_content, plain_content, template_obj = rendered
+
+            rows.append(EmailOutbox(
+                recipient=recipient,
+                subject=subject,
+                html_content=html_content or '',
+                plain_content=plain_content or strip_tags(html_content),
+                template=template_obj
+            ))
+
+        if not rows:
+            return []
+
+        outbox = EmailOutbox.objects.bulk_create(rows, batch_size=500)
+        transaction.on_commit(EmailOutboxService.schedule_delivery)
+        return outbox
+
+
+class EmailOutboxService:
+    """Gửi email trong outbox theo lô, mỗi lô dùng 1 kết nối SMTP."""
+
+    @staticmethod
+    def schedule_delivery():
+        from apps.email.tasks import deliver_email_outbox_task
+        try:
+            deliver_email_outbox_task.delay()
+        except Exception as e:
+            # Beat sẽ gửi sau, email vẫn nằm trong outbox
+            logger.warning(f"Could not schedule outbox delivery: {e}")
+
+    @staticmethod
+    def get_batch_size() -> int:
+        return getattr(settings, 'EMAIL_OUTBOX_BATCH_SIZE', DEFAULT_OUTBOX_BATCH_SIZE)
+
+    @staticmethod
+    def get_max_attempts() -> int:
+        return getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', DEFAULT_OUTBOX_MAX_ATTEMPTS)
+
+    @staticmethod
+    def get_retry_delay(attempts: int) -> timedelta:
+        base = getattr(settings, 'EMAIL_OUTBOX_RETRY_BASE_SECONDS', DEFAULT_OUTBOX_RETRY_BASE_SECONDS)
+        return timedelta(seconds=base * 2 ** max(attempts - 1, 0))
+
+    @staticmethod
+    def claim_batch(batch_size: int = None) -> list:
+        """
+        Lấy 1 lô email đến hạn và chuyển sang 'sending'.
+        skip_locked để nhiều worker chạy song song không lấy trùng.
+        """
+        now = timezone.now()
+        batch_size = batch_size or EmailOutboxService.get_batch_size()
+
+        with transaction.atomic():
+            emails = list(
+                EmailOutbox.objects
+                .select_for_update(skip_locked=True)
+                .filter(
+                    Q(status=EmailOutbox.Status.PENDING, next_attempt_at__lte=now)
+                    | Q(status=EmailOutbox.Status.SENDING, updated_at__lt=now - OUTBOX_STALE_SENDING)
+                )
+                .order_by('id')[:batch_size]
+            )
+            if emails:
+                EmailOutbox.objects.filter(id__in=[email.id for email in emails]).update(
+                    status=EmailOutbox.Status.SENDING,
+                    updated_at=now
+                )
+        return emails
+
+    @staticmethod
+    def deliver_batch(batch_size: int = None) -> dict:
+        """
+        Gửi 1 lô email qua 1 kết nối SMTP và ghi kết quả (SentEmail).
+        
+        Returns:
+            dict: claimed, sent, retried, failed
+        """
+        emails = EmailOutboxService.claim_batch(batch_size)
+        stats = {'claimed': len(emails), 'sent': 0, 'retried': 0, 'failed': 0}
+        if not emails:
+            return stats
+
+        errors = {}
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception as e:
+            errors = {email.id: str(e) for email in emails}
+        else:
+            try:
+                for email in emails:
+                    message = EmailMultiAlternatives(
+                        subject=email.subject,
+                        body=email.plain_content,
+                        from_email=settings.DEFAULT_FROM_EMAIL,
+                        to=[email.recipient],
+                        connection=connection
+                    )
+                    message.attach_alternative(email.html_content, 'text/html')
+                    try:
+                        message.send()
+                    except Exception as e:
+                        errors[email.id] = str(e)
+            finally:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+
+        now = timezone.now()
+        max_attempts = EmailOutboxService.get_max_attempts()
+        sent_ids = []
+        logs = []
+        for email in emails:
+            error = errors.get(email.id)
+            if error is None:
+                sent_ids.append(email.id)
+                logs.append(SentEmail(
+                    recipient=email.recipient,
+                    subject=email.subject,
+                    content=email.html_content,
+                    template_id=email.template_id,
+                    status=SentEmail.Status.SENT
+                ))
+                continue
+
+            attempts = email.attempts + 1
+            if attempts >= max_attempts:
+                stats['failed'] += 1
+                EmailOutbox.objects.filter(id=email.id).update(
+                    status=EmailOutbox.Status.FAILED,
+                    attempts=attempts,
+                    last_error=error,
+                    updated_at=now
+                )
+                logs.append(SentEmail(
+                    recipient=email.recipient,
+                    subject=email.subject,
+                    content=email.html_content,
+                    template_id=email.template_id,
+                    status=SentEmail.Status.FAILED,
+                    error_message=error
+                ))
+            else:
+                stats['retried'] += 1
+                EmailOutbox.objects.filter(id=email.id).update(
+                    status=EmailOutbox.Status.PENDING,
+                    attempts=attempts,
+                    last_error=error,
+                    next_attempt_at=now + EmailOutboxService.get_retry_delay(attempts),
+                    updated_at=now
+                )
+                logger.warning(f"Email to {email.recipient} failed (attempt {attempts}): {error}")
+
+        if sent_ids:
+            EmailOutbox.objects.filter(id__in=sent_ids).update(
+                status=EmailOutbox.Status.SENT,
+                sent_at=now,
+                updated_at=now
+            )
+        if logs:
+            SentEmail.objects.bulk_create(logs)
+
+        stats['sent'] = len(sent_ids)
+        return stats
+
+
+
+class EmailCampaignService:
+    """
+    Gửi EmailCampaign: template được compile 1 lần, người nhận được duyệt
+    bằng server-side cursor theo id, gửi theo chunk trên 1 kết nối SMTP
+    với tốc độ giới hạn. last_recipient_id là checkpoint để pause / resume.
+    """
+
+    @staticmethod
+    def get_chunk_size() -> int:
+        return getattr(settings, 'EMAIL_CAMPAIGN_CHUNK_SIZE', DEFAULT_CAMPAIGN_CHUNK_SIZE)
+
+    @staticmethod
+    def get_rate() -> float:
+        return getattr(settings, 'EMAIL_CAMPAIGN_RATE_PER_SECOND', DEFAULT_CAMPAIGN_RATE_PER_SECOND)
+
+    @staticmethod
+    def get_run_seconds() -> float:
+        return getattr(settings, 'EMAIL_CAMPAIGN_RUN_SECONDS', DEFAULT_CAMPAIGN_RUN_SECONDS)
+
+    @staticmethod
+    def recipients_queryset(campaign: EmailCampaign):
+        User = get_user_model()
+        queryset = User.objects.filter(is_active=True).exclude(email='')
+        if campaign.audience != EmailCampaign.Audience.ALL:
+            queryset = queryset.filter(role=campaign.audience)
+        return queryset
+
+    @staticmethod
+    def compile_templates(campaign: EmailCampaign):
+        """
+        Compile subject / HTML / plain text 1 lần cho cả campaign.
+
+        Raises:
+            ValueError: Campaign has no content
+        """
+        template = campaign.template
+        subject = campaign.subject or (template.subject if template else '')
+        body = campaign.content_html or (template.body if template else '')
+        if not subject or not body:
+            raise ValueError("Campaign has no subject or content")
+        return Template(subject), Template(body), Template(strip_tags(body))
+
+    # ========== State transitions ==========
+
+    @staticmethod
+    def schedule(campaign: EmailCampaign, scheduled_at=None) -> EmailCampaign:
+        if campaign.status not in [EmailCampaign.Status.DRAFT, EmailCampaign.Status.SCHEDULED]:
+            raise ValueError(f"Cannot schedule a campaign in status '{campaign.status}'")
+        EmailCampaignService.compile_templates(campaign)
+
+        campaign.status = EmailCampaign.Status.SCHEDULED
+        campaign.scheduled_at = scheduled_at or timezone.now()
+        campaign.save(update_fields=['status', 'scheduled_at', 'updated_at'])
+        return campaign
+
+    @staticmethod
+    def pause(campaign: EmailCampaign) -> bool:
+        """Dừng sau chunk hiện tại; checkpoint được giữ lại."""
+        return bool(EmailCampaign.objects.filter(
+            id=campaign.id,
+            status__in=[EmailCampaign.Status.SCHEDULED, EmailCampaign.Status.SENDING]
+        ).update(status=EmailCampaign.Status.PAUSED, updated_at=timezone.now()))
+
+    @staticmethod
+    def resume(campaign: EmailCampaign) -> bool:
+        """
+        Tiếp tục gửi từ last_recipient_id.
+        Campaign bị pause khi còn 'scheduled' (chưa started_at) quay lại
+        'scheduled' và được dispatcher gửi khi tới scheduled_at.
+        """
+        now = timezone.now()
+        paused = EmailCampaign.objects.filter(id=campaign.id, status=EmailCampaign.Status.PAUSED)
+        if paused.filter(started_at__isnull=True).update(status=EmailCampaign.Status.SCHEDULED, updated_at=now):
+            return True
+
+        resumed = bool(paused.update(status=EmailCampaign.Status.SENDING, updated_at=now))
+        if resumed:
+            from apps.email.tasks import send_campaign_task
+            transaction.on_commit(lambda: send_campaign_task.delay(campaign.id))
+        return resumed
+
+    @staticmethod
+    def cancel(campaign: EmailCampaign) -> bool:
+        return bool(EmailCampaign.objects.filter(
+            id=campaign.id,
+            status__in=[
+                EmailCampaign.Status.DRAFT,
+                EmailCampaign.Status.SCHEDULED,
+                EmailCampaign.Status.SENDING,
+                EmailCampaign.Status.PAUSED,
+            ]
+        ).update(status=EmailCampaign.Status.CANCELLED, updated_at=timezone.now()))
+
+    @staticmethod
+    def claim_due_campaigns() -> list:
+        """Chuyển các campaign đến hạn sang 'sending' (mỗi campaign chỉ 1 worker nhận)."""
+        now = timezone.now()
+        due_ids = EmailCampaign.objects.filter(
+            status=EmailCampaign.Status.SCHEDULED,
+            scheduled_at__lte=now
+        ).values_list('id', flat=True)
+
+        claimed = []
+        for campaign_id in due_ids:
+            if EmailCampaign.objects.filter(id=campaign_id, status=EmailCampaign.Status.SCHEDULED).update(
+                status=EmailCampaign.Status.SENDING,
+                started_at=now,
+                updated_at=now
+            ):
+                claimed.append(campaign_id)
+        return claimed
+
+    # ========== Sending ==========
+
+    @staticmethod
+    def _iter_chunks(rows, size: int):
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def send(campaign_id: int, run_seconds: float = None) -> dict:
+        """
+        Gửi campaign từ checkpoint cho tới khi hết người nhận, bị pause/cancel
+        hoặc hết thời gian của lần chạy.
+
+        Returns:
+            dict: sent, failed, status, finished
+        """
+        stats = {'sent': 0, 'failed': 0, 'status': None, 'finished': False}
+        campaign = EmailCampaign.objects.select_related('template').get(id=campaign_id)
+        if campaign.status != EmailCampaign.Status.SENDING:
+            stats['status'] = campaign.status
+            return stats
+
+        try:
+            subject_template, html_template, plain_template = EmailCampaignService.compile_templates(campaign)
+        except ValueError as e:
+            logger.error(f"Campaign {campaign_id} paused: {e}")
+            EmailCampaignService.pause(campaign)
+            stats['status'] = EmailCampaign.Status.PAUSED
+            return stats
+
+        recipients = EmailCampaignService.recipients_queryset(campaign)
+        if not campaign.last_recipient_id:
+            EmailCampaign.objects.filter(id=campaign_id).update(total_recipients=recipients.count())
+
+        chunk_size = EmailCampaignService.get_chunk_size()
+        rate = EmailCampaignService.get_rate()
+        run_seconds = EmailCampaignService.get_run_seconds() if run_seconds is None else run_seconds
+
+        # Server-side cursor (PostgreSQL): không load toàn bộ người nhận vào memory
+        rows = (
+            recipients
+            .filter(id__gt=campaign.last_recipient_id)
+            .order_by('id')
+            .values_list('id', 'email', 'full_name')
+            .iterator(chunk_size=chunk_size)
+        )
+
+        from_email = settings.DEFAULT_FROM_EMAIL
+        connection = get_connection(fail_silently=False)
+        started = time.monotonic()
+        processed = 0
+        try:
+            connection.open()
+            for chunk in EmailCampaignService._iter_chunks(rows, chunk_size):
+                status = EmailCampaign.objects.filter(id=campaign_id).values_list('status', flat=True).first()
+                if status != EmailCampaign.Status.SENDING:
+                    stats['status'] = status
+                    return stats
+
+                logs = []
+                sent = failed = 0
+                for user_id, email, full_name in chunk:
+                    variables = {'name': full_name, 'full_name': full_name, 'email': email}
+                    html = html_template.render(Context(variables))
+                    subject = subject_template.render(Context(variables, autoescape=False))
+                    message = EmailMultiAlternatives(
+                        subject=subject,
+                        body=plain_template.render(Context(variables, autoescape=False)),
+                        from_email=from_email,
+                        to=[email],
+                        connection=connection
+                    )
+                    message.attach_alternative(html, 'text/html')
+                    try:
+                        message.send()
+                        sent += 1
+                        logs.append(SentEmail(
+                            recipient=email, subject=subject, content=html,
+                            template_id=campaign.template_id, campaign_id=campaign_id,
+                            status=SentEmail.Status.SENT
+                        ))
+                    except Exception as e:
+                        failed += 1
+                        logs.append(SentEmail(
+                            recipient=email, subject=subject, content=html,
+                            template_id=campaign.template_id, campaign_id=campaign_id,
+                            status=SentEmail.Status.FAILED, error_message=str(e)
+                        ))
+
+                SentEmail.objects.bulk_create(logs)
+                EmailCampaign.objects.filter(id=campaign_id).update(
+                    total_sent=F('total_sent') + sent,
+                    total_failed=F('total_failed') + failed,
+                    last_recipient_id=chunk[-1][0],
+                    updated_at=timezone.now()
+                )
+                stats['sent'] += sent
+                stats['failed'] += failed
+                processed += len(chunk)
+
+                # Giới hạn tốc độ gửi
+                elapsed = time.monotonic() - started
+                expected = processed / rate if rate else 0
+                if expected > elapsed:
+                    time.sleep(expected - elapsed)
+
+                if time.monotonic() - started >= run_seconds:
+                    stats['status'] = EmailCampaign.Status.SENDING
+                    return stats
+        finally:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+        now = timezone.now()
+        EmailCampaign.objects.filter(id=campaign_id, status=EmailCampaign.Status.SENDING).update(
+            status=EmailCampaign.Status.SENT,
+            finished_at=now,
+            updated_at=now
+        )
+        stats['status'] = EmailCampaign.Status.SENT
+        stats['finished'] = True
+        return stats
@@ -0,0 +1,15 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.email.models import EmailTemplate
+from apps.email.template_cache import bump_version
+
+
+@receiver([post_save, post_delete], sender=EmailTemplate)
+def invalidate_email_template_cache(sender, instance, **kwargs):
+    """
+    Invalidate compiled template cache của mọi process khi template thay đổi
+    (sau commit, để process khác không nạp lại bản cũ).
+    """
+    transaction.on_commit(bump_version)
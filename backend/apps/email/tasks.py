@@ -0,0 +1,56 @@
+from celery import shared_task
+from celery.utils.log import get_task_logger
+
+from apps.email.models import EmailCampaign
+from apps.email.services import EmailCampaignService, EmailOutboxService
+
+logger = get_task_logger(__name__)
+
+# Số lô tối đa trong 1 lần chạy, phần còn lại để lần chạy sau
+MAX_BATCHES_PER_RUN = 20
+
+
+@shared_task
+def deliver_email_outbox_task():
+    """
+    Gửi email trong outbox theo lô (kick sau commit + Celery beat định kỳ).
+    Email lỗi được gửi lại với backoff ở các lần chạy sau.
+    """
+    totals = {'claimed': 0, 'sent': 0, 'retried': 0, 'failed': 0}
+    batch_size = EmailOutboxService.get_batch_size()
+
+    for _ in range(MAX_BATCHES_PER_RUN):
+        stats = EmailOutboxService.deliver_batch(batch_size)
+        for key, value in stats.items():
+            totals[key] += value
+        if stats['claimed'] < batch_size:
+            break
+
+    if totals['claimed']:
+        logger.info(f"Email outbox delivered: {totals}")
+    return totals
+
+
+@shared_task
+def dispatch_due_campaigns_task():
+    """
+    Celery beat: nhận các campaign đã đến giờ gửi và chạy send_campaign_task.
+    """
+    campaign_ids = EmailCampaignService.claim_due_campaigns()
+    for campaign_id in campaign_ids:
+        send_campaign_task.delay(campaign_id)
+    return campaign_ids
+
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=5)
+def send_campaign_task(self, campaign_id):
+    """
+    Gửi campaign từ checkpoint. Hết thời gian chạy thì tự xếp hàng lần tiếp theo,
+    để worker không bị giữ quá lâu.
+    """
+    stats = EmailCampaignService.send(campaign_id)
+    logger.info(f"Campaign {campaign_id}: {stats}")
+
+    if stats['status'] == EmailCampaign.Status.SENDING and not stats['finished']:
+        send_campaign_task.delay(campaign_id)
+    return stats
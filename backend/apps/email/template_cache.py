@@ -0,0 +1,113 @@
+"""
+Cache template email đã compile trong process.
+
+- DB template: LRU theo (slug, updated_at). Mỗi process giữ thêm
+  slug -> entry kèm version; EmailTemplate được lưu/xóa thì version
+  trong Redis tăng, các process khác nạp lại ở lần gửi kế tiếp
+  (1 lệnh GET Redis thay cho 1 query DB + parse template).
+- File template (templates/emails/): dùng loader của Django, vốn đã
+  cache template đã compile (cached.Loader mặc định).
+"""
+import logging
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template import Template
+from django.template.loader import get_template
+
+from apps.core.caching import CacheKeyBuilder
+from apps.email.models import EmailTemplate
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 256
+
+CompiledTemplate = namedtuple('CompiledTemplate', ['template', 'subject', 'body'])
+
+_lock = threading.Lock()
+_compiled: OrderedDict = OrderedDict()   # (slug, updated_at) -> CompiledTemplate
+_by_slug: dict = {}                      # slug -> (version, CompiledTemplate)
+
+
+def get_cache_size() -> int:
+    return getattr(settings, 'EMAIL_TEMPLATE_CACHE_SIZE', DEFAULT_CACHE_SIZE)
+
+
+def get_version() -> int:
+    try:
+        return cache.get(CacheKeyBuilder.email_template_version()) or 1
+    except Exception as e:
+        logger.warning(f"Email template version unavailable: {e}")
+        return 0
+
+
+def bump_version() -> None:
+    """Báo cho mọi process nạp lại template (gọi khi EmailTemplate thay đổi)."""
+    key = CacheKeyBuilder.email_template_version()
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Key chưa tồn tại
+        cache.add(key, 2, None)
+    except Exception as e:
+        logger.warning(f"Could not bump email template version: {e}")
+
+
+def clear() -> None:
+    with _lock:
+        _compiled.clear()
+        _by_slug.clear()
+
+
+def _compile(template_obj: EmailTemplate) -> CompiledTemplate:
+    key = (template_obj.slug, template_obj.updated_at)
+    with _lock:
+        compiled = _compiled.get(key)
+        if compiled is not None:
+            _compiled.move_to_end(key)
+            return compiled
+
+    compiled = CompiledTemplate(
+        template=template_obj,
+        subject=Template(template_obj.subject),
+        body=Template(template_obj.body),
+    )
+    with _lock:
+        _compiled[key] = compiled
+        _compiled.move_to_end(key)
+        while len(_compiled) > get_cache_size():
+            _compiled.popitem(last=False)
+    return compiled
+
+
+def get_db_template(slug: str) -> Optional[CompiledTemplate]:
+    """
+    Template DB đã compile theo slug (chỉ template đang active).
+
+    Returns:
+        CompiledTemplate or None if not found
+    """
+    version = get_version()
+    with _lock:
+        entry = _by_slug.get(slug)
+    # version 0: Redis lỗi, không tin cache theo slug
+    if entry is not None and version and entry[0] == version:
+        return entry[1]
+
+    try:
+        template_obj = EmailTemplate.objects.get(slug=slug, is_active=True)
+    except EmailTemplate.DoesNotExist:
+        return None
+
+    compiled = _compile(template_obj)
+    with _lock:
+        _by_slug[slug] = (version, compiled)
+    return compiled
+
+
+def get_file_template(template_path: str):
+    """Template file đã compile (cache bởi template loader của Django)."""
+    return get_template(template_path)
@@ -0,0 +1,188 @@
+"""
+Email Campaign Dispatcher Tests
+"""
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.email.models import EmailCampaign, EmailTemplate, EmailTemplateCategory, SentEmail
+from apps.email.services import EmailCampaignService
+from apps.email.tasks import dispatch_due_campaigns_task
+
+User = get_user_model()
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    EMAIL_CAMPAIGN_CHUNK_SIZE=2,
+    EMAIL_CAMPAIGN_RATE_PER_SECOND=0
+)
+class TestEmailCampaignService(TestCase):
+    """Tests for batched campaign sending with checkpoints"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.candidates = [
+            User.objects.create_user(
+                email=f"candidate{i}@example.com",
+                password="password123",
+                full_name=f"Candidate {i}",
+                role='recruiter'
+            )
+            for i in range(5)
+        ]
+        cls.company_user = User.objects.create_user(
+            email="company@example.com",
+            password="password123",
+            full_name="Company",
+            role='company'
+        )
+        category = EmailTemplateCategory.objects.create(name="Newsletter", slug="newsletter-campaign")
+        cls.template = EmailTemplate.objects.create(
+            name="Newsletter",
+            slug="newsletter-campaign",
+            category=category,
+            subject="Tin tuyển dụng cho {{ name }}",
+            body="<p>Xin chào {{ name }}</p>"
+        )
+
+    def _campaign(self, **kwargs):
+        defaults = {
+            'name': 'Newsletter',
+            'template': self.template,
+            'audience': EmailCampaign.Audience.RECRUITER,
+            'status': EmailCampaign.Status.SENDING,
+        }
+        defaults.update(kwargs)
+        return EmailCampaign.objects.create(**defaults)
+
+    def test_send_renders_per_recipient_over_one_connection(self):
+        campaign = self._campaign()
+
+        with patch('django.core.mail.backends.locmem.EmailBackend.open') as mock_open:
+            stats = EmailCampaignService.send(campaign.id)
+
+        mock_open.assert_called_once()
+        self.assertEqual(stats, {'sent': 5, 'failed': 0, 'status': EmailCampaign.Status.SENT, 'finished': True})
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(mail.outbox[0].subject, "Tin tuyển dụng cho Candidate 0")
+        self.assertNotIn("company@example.com", [m.to[0] for m in mail.outbox])
+
+        campaign.refresh_from_db()
+        self.assertEqual(campaign.total_recipients, 5)
+        self.assertEqual(campaign.total_sent, 5)
+        self.assertEqual(campaign.last_recipient_id, self.candidates[-1].id)
+        self.assertEqual(SentEmail.objects.filter(campaign=campaign).count(), 5)
+
+    def test_pause_and_resume_from_checkpoint(self):
+        campaign = self._campaign(started_at=timezone.now())
+
+        # Hết thời gian sau chunk đầu tiên
+        stats = EmailCampaignService.send(campaign.id, run_seconds=0)
+        self.assertEqual(stats['sent'], 2)
+        self.assertFalse(stats['finished'])
+
+        self.assertTrue(EmailCampaignService.pause(campaign))
+        self.assertEqual(EmailCampaignService.send(campaign.id)['status'], EmailCampaign.Status.PAUSED)
+
+        with patch('apps.email.tasks.send_campaign_task.delay') as mock_delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertTrue(EmailCampaignService.resume(campaign))
+        mock_delay.assert_called_once_with(campaign.id)
+
+        stats = EmailCampaignService.send(campaign.id)
+        self.assertEqual(stats['sent'], 3)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(len({m.to[0] for m in mail.outbox}), 5)
+
+        campaign.refresh_from_db()
+        self.assertEqual(campaign.status, EmailCampaign.Status.SENT)
+        self.assertEqual(campaign.total_sent, 5)
+
+    def test_failed_recipients_are_logged(self):
+        campaign = self._campaign()
+
+        with patch('django.core.mail.EmailMultiAlternatives.send', side_effect=OSError("SMTP down")):
+            stats = EmailCampaignService.send(campaign.id)
+
+        self.assertEqual(stats['failed'], 5)
+        campaign.refresh_from_db()
+        self.assertEqual(campaign.total_failed, 5)
+        self.assertEqual(SentEmail.objects.filter(campaign=campaign, status=SentEmail.Status.FAILED).count(), 5)
+
+    @override_settings(EMAIL_CAMPAIGN_RATE_PER_SECOND=10)
+    def test_sending_is_throttled(self):
+        campaign = self._campaign()
+
+        with patch('apps.email.services.time.sleep') as mock_sleep:
+            EmailCampaignService.send(campaign.id)
+
+        self.assertTrue(mock_sleep.called)
+
+    def test_dispatch_claims_only_due_campaigns(self):
+        due = self._campaign(status=EmailCampaign.Status.DRAFT)
+        EmailCampaignService.schedule(due)
+        later = self._campaign(status=EmailCampaign.Status.DRAFT)
+        EmailCampaignService.schedule(later, timezone.now() + timedelta(hours=1))
+
+        with patch('apps.email.tasks.send_campaign_task.delay') as mock_delay:
+            claimed = dispatch_due_campaigns_task()
+
+        self.assertEqual(claimed, [due.id])
+        mock_delay.assert_called_once_with(due.id)
+        due.refresh_from_db()
+        self.assertEqual(due.status, EmailCampaign.Status.SENDING)
+        self.assertIsNotNone(due.started_at)
+
+    def test_schedule_requires_content(self):
+        campaign = self._campaign(status=EmailCampaign.Status.DRAFT, template=None)
+        with self.assertRaises(ValueError):
+            EmailCampaignService.schedule(campaign)
+
+    def test_resume_paused_scheduled_campaign_waits_for_schedule(self):
+        campaign = self._campaign(status=EmailCampaign.Status.DRAFT)
+        scheduled_at = timezone.now() + timedelta(hours=1)
+        EmailCampaignService.schedule(campaign, scheduled_at)
+        self.assertTrue(EmailCampaignService.pause(campaign))
+
+        with patch('apps.email.tasks.send_campaign_task.delay') as mock_delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertTrue(EmailCampaignService.resume(campaign))
+            self.assertEqual(dispatch_due_campaigns_task(), [])
+        mock_delay.assert_not_called()
+
+        campaign.refresh_from_db()
+        self.assertEqual(campaign.status, EmailCampaign.Status.SCHEDULED)
+        self.assertEqual(campaign.scheduled_at, scheduled_at)
+
+
+class TestEmailCampaignViews(APITestCase):
+    """Tests for campaign scheduling endpoints"""
+
+    def setUp(self):
+        admin = User.objects.create_superuser(email="admin@example.com", password="password123")
+        self.client.force_authenticate(user=admin)
+        category = EmailTemplateCategory.objects.create(name="Newsletter", slug="newsletter-campaign")
+        template = EmailTemplate.objects.create(
+            name="Newsletter",
+            slug="newsletter-campaign",
+            category=category,
+            subject="Tin tuyển dụng",
+            body="<p>Xin chào {{ name }}</p>"
+        )
+        self.campaign = EmailCampaign.objects.create(name='Newsletter', template=template)
+
+    def test_schedule_rejects_invalid_scheduled_at(self):
+        url = f'/api/email/campaigns/{self.campaign.id}/schedule/'
+        for value in ['next tuesday', '2026-13-45T10:00:00']:
+            response = self.client.post(url, {'scheduled_at': value}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.status, EmailCampaign.Status.DRAFT)
@@ -0,0 +1,106 @@
+"""
+Email Outbox Tests
+"""
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.email.services import EmailService, EmailOutboxService
+from apps.email.models import EmailOutbox, SentEmail
+from apps.email.tasks import deliver_email_outbox_task
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class TestEmailOutbox(TestCase):
+    """Tests for queue_email and batched outbox delivery"""
+
+    def _queue(self, recipient="user@example.com", **kwargs):
+        return EmailService.queue_email(
+            recipient=recipient,
+            subject="Outbox",
+            body="<p>Outbox content</p>",
+            **kwargs
+        )
+
+    def test_queue_email_does_not_send_and_schedules_after_commit(self):
+        """queue_email writes the outbox row; delivery is kicked after commit"""
+        with patch.object(EmailOutboxService, 'schedule_delivery') as mock_schedule:
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                outbox = self._queue()
+
+        self.assertEqual(outbox.status, EmailOutbox.Status.PENDING)
+        self.assertEqual(outbox.plain_content, "Outbox content")
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(len(callbacks), 1)
+        mock_schedule.assert_not_called()
+
+    def test_queue_email_invalid_template_returns_none(self):
+        outbox = EmailService.queue_email(
+            recipient="user@example.com",
+            subject="Fail",
+            template_slug="invalid-slug"
+        )
+        self.assertIsNone(outbox)
+        self.assertFalse(EmailOutbox.objects.exists())
+
+    def test_deliver_batch_sends_and_logs(self):
+        for i in range(3):
+            self._queue(recipient=f"user{i}@example.com")
+
+        with patch('django.core.mail.backends.locmem.EmailBackend.open') as mock_open:
+            stats = EmailOutboxService.deliver_batch()
+
+        mock_open.assert_called_once()
+        self.assertEqual(stats, {'claimed': 3, 'sent': 3, 'retried': 0, 'failed': 0})
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(mail.outbox[0].alternatives[0][0], "<p>Outbox content</p>")
+        self.assertFalse(EmailOutbox.objects.exclude(status=EmailOutbox.Status.SENT).exists())
+        self.assertEqual(SentEmail.objects.filter(status=SentEmail.Status.SENT).count(), 3)
+
+    @override_settings(EMAIL_OUTBOX_MAX_ATTEMPTS=2, EMAIL_OUTBOX_RETRY_BASE_SECONDS=60)
+    def test_failures_retry_with_backoff_then_fail(self):
+        outbox = self._queue()
+
+        with patch('django.core.mail.EmailMultiAlternatives.send', side_effect=OSError("SMTP down")):
+            stats = EmailOutboxService.deliver_batch()
+            self.assertEqual(stats['retried'], 1)
+
+            outbox.refresh_from_db()
+            self.assertEqual(outbox.status, EmailOutbox.Status.PENDING)
+            self.assertEqual(outbox.attempts, 1)
+            self.assertGreater(outbox.next_attempt_at, timezone.now() + timedelta(seconds=50))
+
+            # Chưa đến hạn retry
+            self.assertEqual(EmailOutboxService.deliver_batch()['claimed'], 0)
+
+            EmailOutbox.objects.filter(id=outbox.id).update(next_attempt_at=timezone.now())
+            stats = EmailOutboxService.deliver_batch()
+
+        self.assertEqual(stats['failed'], 1)
+        outbox.refresh_from_db()
+        self.assertEqual(outbox.status, EmailOutbox.Status.FAILED)
+        self.assertEqual(outbox.last_error, "SMTP down")
+        log = SentEmail.objects.get()
+        self.assertEqual(log.status, SentEmail.Status.FAILED)
+
+    def test_stale_sending_rows_are_reclaimed(self):
+        outbox = self._queue()
+        EmailOutbox.objects.filter(id=outbox.id).update(
+            status=EmailOutbox.Status.SENDING,
+            updated_at=timezone.now() - timedelta(hours=1)
+        )
+
+        self.assertEqual(EmailOutboxService.deliver_batch()['sent'], 1)
+
+    @override_settings(EMAIL_OUTBOX_BATCH_SIZE=2)
+    def test_task_drains_in_batches(self):
+        for i in range(5):
+            self._queue(recipient=f"user{i}@example.com")
+
+        totals = deliver_email_outbox_task()
+
+        self.assertEqual(totals['sent'], 5)
+        self.assertEqual(len(mail.outbox), 5)
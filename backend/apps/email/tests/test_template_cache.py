@@ -0,0 +1,71 @@
+"""
+Compiled Email Template Cache Tests
+"""
+from unittest.mock import patch
+
+from django.template import Template
+from django.test import TestCase
+
+from apps.email import template_cache
+from apps.email.models import EmailTemplate, EmailTemplateCategory
+from apps.email.services import EmailService
+
+
+class TestEmailTemplateCache(TestCase):
+    """Tests for the per-process compiled template cache"""
+
+    @classmethod
+    def setUpTestData(cls):
+        category = EmailTemplateCategory.objects.create(name="Cache", slug="cache")
+        cls.email_template = EmailTemplate.objects.create(
+            name="Cached",
+            slug="cached-template",
+            category=category,
+            subject="Hi {{ name }}",
+            body="Hello {{ name }}"
+        )
+
+    def setUp(self):
+        template_cache.clear()
+        self.addCleanup(template_cache.clear)
+
+    def _render(self):
+        return EmailService.render_email(None, template_slug="cached-template", context={"name": "An"})
+
+    def test_repeated_render_skips_db_and_parsing(self):
+        self.assertEqual(self._render()[:3], ("Hi An", "Hello An", "Hello An"))
+
+        with patch.object(template_cache, 'Template', wraps=Template) as mock_template:
+            with self.assertNumQueries(0):
+                subject, html, _, template_obj = self._render()
+
+        mock_template.assert_not_called()
+        self.assertEqual(html, "Hello An")
+        self.assertEqual(template_obj, self.email_template)
+
+    def test_save_invalidates_other_processes(self):
+        self._render()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.email_template.body = "Xin chào {{ name }}"
+            self.email_template.save()
+
+        self.assertEqual(self._render()[1], "Xin chào An")
+
+    def test_unchanged_template_is_not_recompiled_after_version_bump(self):
+        self._render()
+        template_cache.bump_version()
+
+        with patch.object(template_cache, 'Template', wraps=Template) as mock_template:
+            self._render()
+
+        mock_template.assert_not_called()
+
+    def test_deactivated_template_is_not_found(self):
+        self._render()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.email_template.is_active = False
+            self.email_template.save()
+
+        self.assertIsNone(self._render())
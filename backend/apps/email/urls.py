@@ -1,11 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from apps.email.views import EmailTemplateCategoryViewSet, EmailTemplateViewSet, SentEmailViewSet
+from apps.email.views import EmailTemplateCategoryViewSet, EmailTemplateViewSet, SentEmailViewSet, EmailCampaignViewSet
 
 router = DefaultRouter()
 router.register(r'template-categories', EmailTemplateCategoryViewSet)
 router.register(r'templates', EmailTemplateViewSet)
 router.register(r'logs', SentEmailViewSet)
+router.register(r'campaigns', EmailCampaignViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
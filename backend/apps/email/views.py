@@ -3,13 +3,16 @@ from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
-from apps.email.models import EmailTemplate, EmailTemplateCategory, SentEmail
+from django.utils.dateparse import parse_datetime
+
+from apps.email.models import EmailTemplate, EmailTemplateCategory, SentEmail, EmailCampaign
 from apps.email.serializers import (
     EmailTemplateSerializer, 
     EmailTemplateCategorySerializer, 
-    SentEmailSerializer
+    SentEmailSerializer,
+    EmailCampaignSerializer
 )
-from apps.email.services import EmailService
+from apps.email.services import EmailService, EmailCampaignService
 
 class EmailTemplateCategoryViewSet(viewsets.ModelViewSet):
     queryset = EmailTemplateCategory.objects.all()
@@ -47,3 +50,55 @@ class SentEmailViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = SentEmail.objects.all()
     serializer_class = SentEmailSerializer
     permission_classes = [IsAdminUser]
+
+class EmailCampaignViewSet(viewsets.ModelViewSet):
+    queryset = EmailCampaign.objects.all()
+    serializer_class = EmailCampaignSerializer
+    permission_classes = [IsAdminUser]
+
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
+
+    @action(detail=True, methods=['post'])
+    def schedule(self, request, pk=None):
+        campaign = self.get_object()
+        scheduled_at = request.data.get('scheduled_at')
+        if scheduled_at:
+            try:
+                scheduled_at = parse_datetime(scheduled_at)
+            except ValueError:
+                scheduled_at = None
+            if scheduled_at is None:
+                return Response(
+                    {"error": "Invalid scheduled_at, expected an ISO 8601 datetime"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        else:
+            scheduled_at = None
+        try:
+            campaign = EmailCampaignService.schedule(campaign, scheduled_at)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(self.get_serializer(campaign).data)
+
+    @action(detail=True, methods=['post'])
+    def pause(self, request, pk=None):
+        return self._transition(EmailCampaignService.pause)
+
+    @action(detail=True, methods=['post'])
+    def resume(self, request, pk=None):
+        return self._transition(EmailCampaignService.resume)
+
+    @action(detail=True, methods=['post'])
+    def cancel(self, request, pk=None):
+        return self._transition(EmailCampaignService.cancel)
+
+    def _transition(self, transition):
+        campaign = self.get_object()
+        if not transition(campaign):
+            return Response(
+                {"error": f"Invalid action for campaign in status '{campaign.status}'"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        campaign.refresh_from_db()
+        return Response(self.get_serializer(campaign).data)
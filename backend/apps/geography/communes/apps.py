@@ -5,3 +5,6 @@ class CommunesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.geography.communes'
     label = 'geography_communes'
+
+    def ready(self):
+        import apps.geography.communes.signals
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.core.caching import CacheService
+from apps.geography.communes.models import Commune
+
+
+@receiver([post_save, post_delete], sender=Commune)
+def invalidate_commune_cache(sender, instance, **kwargs):
+    """
+    Invalidate cache các endpoint đọc khi xã/phường thay đổi.
+    """
+    CacheService.invalidate_now_and_on_commit('communes', also=CacheService.invalidate_geography)
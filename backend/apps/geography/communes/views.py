@@ -2,6 +2,8 @@ from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAdminUser
 
+from apps.core.caching import cache_response
+
 from .models import Commune
 from .serializers import (
     CommuneListSerializer,
@@ -21,8 +23,20 @@ class CommuneViewSet(viewsets.ModelViewSet):
             - POST /                        → create (admin)
             - PUT  /:id/                    → update (admin)
             - GET  /api/provinces/:id/communes/  → by_province (public, nested route)
+        
+        Các endpoint GET được cache theo version (namespace 'communes'),
+        invalidate qua signals của Commune / Province.
     """
     http_method_names = ['get', 'post', 'put', 'head', 'options']
+    cache_namespace = 'communes'
+    
+    @cache_response
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    @cache_response
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
     
     def get_permissions(self):
         if self.action in ['create', 'update']:
@@ -46,6 +60,7 @@ class CommuneViewSet(viewsets.ModelViewSet):
             return CommuneCreateUpdateSerializer
         return CommuneListSerializer
     
+    @cache_response
     def by_province(self, request, province_id=None):
         """
             GET /api/provinces/:province_id/communes/
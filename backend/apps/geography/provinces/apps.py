@@ -5,3 +5,6 @@ class ProvincesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.geography.provinces'
     label = 'geography_provinces'
+
+    def ready(self):
+        import apps.geography.provinces.signals
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.core.caching import CacheService
+from apps.geography.provinces.models import Province
+
+
+@receiver([post_save, post_delete], sender=Province)
+def invalidate_province_cache(sender, instance, **kwargs):
+    """
+    Invalidate cache tỉnh/thành phố và xã/phường (response xã có tên tỉnh)
+    khi tỉnh thay đổi.
+    """
+    CacheService.invalidate_now_and_on_commit('provinces', also=CacheService.invalidate_geography)
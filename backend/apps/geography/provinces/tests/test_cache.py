@@ -0,0 +1,92 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from apps.core.caching import CachedGeographySelectors
+from apps.geography.communes.models import Commune
+from apps.geography.provinces.models import Province
+
+
+class ProvinceResponseCacheTests(TestCase):
+    """Tests cho cache + ETag của Provinces / Communes API"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.province = Province.objects.create(
+            province_code='HN',
+            province_name='Hà Nội',
+            province_type='municipality',
+            region='north',
+            is_active=True
+        )
+        self.commune = Commune.objects.create(
+            province=self.province,
+            commune_name='Phường Ba Đình',
+            commune_type='ward',
+            is_active=True
+        )
+
+    def test_second_request_served_from_cache(self):
+        """Lần gọi thứ 2 không query DB"""
+        first = self.client.get('/api/provinces/')
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/provinces/')
+
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_if_none_match_returns_304(self):
+        """Client gửi lại ETag -> 304, không query DB"""
+        etag = self.client.get('/api/provinces/')['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/provinces/', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_save_invalidates_cache_and_etag(self):
+        """Sửa tỉnh -> response và ETag mới"""
+        etag = self.client.get('/api/provinces/')['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.province.province_name = 'Thủ đô Hà Nội'
+            self.province.save()
+
+        response = self.client.get('/api/provinces/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data[0]['province_name'], 'Thủ đô Hà Nội')
+
+    def test_query_params_are_cached_separately(self):
+        """Mỗi bộ query param có cache riêng"""
+        self.client.get('/api/provinces/search/?q=Hà')
+        response = self.client.get('/api/provinces/search/?q=xyz')
+        self.assertEqual(response.data, [])
+
+    def test_province_change_invalidates_communes(self):
+        """Response xã có thông tin tỉnh -> đổi tỉnh phải invalidate xã"""
+        url = f'/api/communes/{self.commune.id}/'
+        self.assertEqual(self.client.get(url).data['province_name'], 'Hà Nội')
+
+        self.province.province_name = 'Thủ đô Hà Nội'
+        self.province.save()
+
+        self.assertEqual(self.client.get(url).data['province_name'], 'Thủ đô Hà Nội')
+
+    def test_commune_delete_invalidates_selector(self):
+        """CachedGeographySelectors dùng chung version với endpoint xã"""
+        communes = CachedGeographySelectors.get_communes_by_province(self.province.id)
+        self.assertEqual([c['commune_name'] for c in communes], ['Phường Ba Đình'])
+
+        self.commune.delete()
+
+        self.assertEqual(CachedGeographySelectors.get_communes_by_province(self.province.id), [])
+
+    def test_missing_object_is_not_cached(self):
+        """404 không được cache"""
+        response = self.client.get('/api/provinces/999999/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn('ETag', response)
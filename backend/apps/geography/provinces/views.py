@@ -3,6 +3,8 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 
+from apps.core.caching import cache_response
+
 from .models import Province
 from .serializers import ProvinceListSerializer, ProvinceDetailSerializer
 
@@ -17,8 +19,20 @@ class ProvinceViewSet(viewsets.ReadOnlyModelViewSet):
             - GET /:id/                → retrieve (public)
             - GET /by-region/:region/  → filter theo miền (public)
             - GET /search/?q=          → tìm kiếm (public)
+        
+        Response được cache theo version (namespace 'provinces'),
+        invalidate qua signals của Province.
     """
     permission_classes = [AllowAny]
+    cache_namespace = 'provinces'
+    
+    @cache_response
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    @cache_response
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
     
     def get_queryset(self):
         return Province.objects.filter(is_active=True).order_by('province_name')
@@ -29,6 +43,7 @@ class ProvinceViewSet(viewsets.ReadOnlyModelViewSet):
         return ProvinceListSerializer
     
     @action(detail=False, url_path='by-region/(?P<region>[^/.]+)')
+    @cache_response
     def by_region(self, request, region=None):
         """
             GET /api/provinces/by-region/:region/
@@ -44,6 +59,7 @@ class ProvinceViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
     
     @action(detail=False)
+    @cache_response
     def search(self, request):
         """
             GET /api/provinces/search/?q=hanoi
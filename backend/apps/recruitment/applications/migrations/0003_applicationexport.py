@@ -0,0 +1,32 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment_applications', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationExport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_format', models.CharField(max_length=10, verbose_name='Định dạng')),
+                ('file_path', models.CharField(max_length=255, verbose_name='Đường dẫn file')),
+                ('row_count', models.PositiveIntegerField(default=0, verbose_name='Số dòng')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Ngày tạo')),
+                ('expires_at', models.DateTimeField(db_index=True, verbose_name='Hết hạn lúc')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_exports', to=settings.AUTH_USER_MODEL, verbose_name='Người export')),
+            ],
+            options={
+                'verbose_name': 'File export đơn ứng tuyển',
+                'verbose_name_plural': 'File export đơn ứng tuyển',
+                'db_table': 'application_exports',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
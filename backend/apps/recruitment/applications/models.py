@@ -95,3 +95,43 @@ class Application(models.Model):
     
     def __str__(self):
         return f"{self.recruiter.user.full_name} - {self.job.title}"
+
+
+class ApplicationExport(models.Model):
+    """Bảng Application_Exports - File export applications chạy nền"""
+
+    user = models.ForeignKey(
+        'core_users.CustomUser',
+        on_delete=models.CASCADE,
+        related_name='application_exports',
+        verbose_name='Người export'
+    )
+    file_format = models.CharField(
+        max_length=10,
+        verbose_name='Định dạng'
+    )
+    file_path = models.CharField(
+        max_length=255,
+        verbose_name='Đường dẫn file'
+    )
+    row_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Số dòng'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Ngày tạo'
+    )
+    expires_at = models.DateTimeField(
+        db_index=True,
+        verbose_name='Hết hạn lúc'
+    )
+
+    class Meta:
+        db_table = 'application_exports'
+        verbose_name = 'File export đơn ứng tuyển'
+        verbose_name_plural = 'File export đơn ứng tuyển'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.user} - {self.file_path}"
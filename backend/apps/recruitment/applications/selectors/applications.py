@@ -3,7 +3,7 @@ from django.db.models import QuerySet, Q, Count
 from django.utils import timezone
 from datetime import timedelta
 
-from apps.recruitment.applications.models import Application
+from apps.recruitment.applications.models import Application, ApplicationExport
 from apps.recruitment.jobs.models import Job
 
 
@@ -106,6 +106,17 @@ def list_applications_for_export(user, job_id: int = None, status: str = None) -
     return queryset.order_by('-applied_at')
 
 
+def get_active_export_for_user(export_id: int, user) -> Optional[ApplicationExport]:
+    """
+        Lấy file export còn hạn của chính user.
+    """
+    return ApplicationExport.objects.filter(
+        id=export_id,
+        user=user,
+        expires_at__gt=timezone.now()
+    ).first()
+
+
 def list_applications_by_status(job_id: int, status: str) -> QuerySet[Application]:
     """
         Lấy danh sách applications theo job_id và status.
@@ -10,9 +10,12 @@ from apps.recruitment.application_status_history.services.application_status_his
 from apps.email.services import EmailService
 from apps.recruitment.applications.state_machine import (
     ApplicationStateMachine, ApplicationStatus, 
-    InvalidTransitionError, validate_status_transition
+    InvalidTransitionError, bulk_transition, validate_status_transition
 )
 
+STATUS_EMAIL_TEMPLATE = "emails/recruitment/application_status.html"
+
+
 class ApplicationCreateInput(BaseModel):
     """
         Pydantic input model cho tạo application
@@ -130,21 +133,9 @@ def change_application_status(
         raise ValueError(str(e))
     
     # Send Status Update Email
-    status_display = status.capitalize()
-    
-    EmailService.send_email(
-        recipient=application.recruiter_cv.email if hasattr(application, 'recruiter_cv') and application.recruiter_cv else (application.recruiter.user.email if hasattr(application.recruiter, 'user') else None),
-        subject=f"[JobPortal] Cập nhật trạng thái ứng tuyển: {application.job.title}",
-        template_path="emails/recruitment/application_status.html",
-        context={
-            "candidate_name": application.recruiter.user.full_name,
-            "job_title": application.job.title,
-            "company_name": application.job.company.company_name,
-            "status_class": status,
-            "status_display": status_display,
-            "notes": notes,
-            "recruiter_name": application.job.company.user.full_name
-        }
+    EmailService.queue_email(
+        template_path=STATUS_EMAIL_TEMPLATE,
+        **_status_email(application, status, notes)
     )
 
     return application
@@ -208,7 +199,7 @@ def send_offer(application: Application, offer_details: str, user, salary: str =
     application.save()
     
     # Send Offer Email
-    EmailService.send_email(
+    EmailService.queue_email(
         recipient=application.recruiter.user.email,
         subject=f"[JobPortal] Thư mời nhận việc: {application.job.title}",
         template_path="emails/recruitment/offer_letter.html",
@@ -261,63 +252,85 @@ def applicant_withdraw(application: Application, reason: str = None) -> Applicat
     return application
 
 
+# Trạng thái đích của các thao tác hàng loạt
+BULK_ACTION_STATUSES = {
+    'reject': ApplicationStatus.REJECTED,
+    'shortlist': ApplicationStatus.SHORTLISTED,
+}
+
+
 @transaction.atomic
 def bulk_action(application_ids: list, action: str, user, notes: str = None) -> dict:
     """
         Thực hiện thao tác hàng loạt trên nhiều applications.
+        Xử lý theo tập hợp: 1 UPDATE / DELETE cho cả lô, lịch sử và email
+        được ghi bằng bulk insert. Application có transition không hợp lệ
+        được trả về trong errors.
     """
+    application_ids = set(application_ids)
 
-    # Get applications và validate ownership
+    # Chỉ với jobs mà user sở hữu
     applications = Application.objects.filter(
         id__in=application_ids,
-        job__company__user=user  # Chỉ với jobs mà user sở hữu
-    ).select_related('job')
-    
-    if applications.count() != len(application_ids):
+        job__company__user=user
+    )
+
+    if action == 'delete':
+        owned_ids = set(applications.values_list('id', flat=True))
+        if owned_ids != application_ids:
+            raise ValueError("Some applications do not exist or you do not have permission!")
+        applications.delete()
+        return {
+            "processed": len(owned_ids),
+            "errors": []
+        }
+
+    result = bulk_transition(
+        applications.select_related('recruiter__user', 'job__company__user'),
+        BULK_ACTION_STATUSES[action],
+        performed_by=user,
+        notes=notes,
+        history_notes=notes or f"Bulk {action}"
+    )
+
+    found = len(result.transitioned) + len(result.errors)
+    if found != len(application_ids):
         raise ValueError("Some applications do not exist or you do not have permission!")
-    
-    processed = 0
-    errors = []
-    
-    for app in applications:
-        try:
-            old_status = app.status
-            
-            if action == 'reject':
-                app.status = 'rejected'
-                app.reviewed_by = user
-                app.reviewed_at = timezone.now()
-                if notes:
-                    app.notes = notes
-                app.save()
-                
-            elif action == 'shortlist':
-                app.status = 'shortlisted'
-                app.reviewed_by = user
-                app.reviewed_at = timezone.now()
-                if notes:
-                    app.notes = notes
-                app.save()
-                
-            elif action == 'delete':
-                app.delete()
-            
-            # Log history (except delete)
-            if action != 'delete':
-                log_status_history(
-                    app,
-                    old_status,
-                    app.status,
-                    user,
-                    notes or f"Bulk {action}"
-                )
-            
-            processed += 1
-            
-        except Exception as e:
-            errors.append({"id": app.id, "error": str(e)})
-    
+
+    _queue_status_emails(result.transitioned, BULK_ACTION_STATUSES[action].value, notes)
+
     return {
-        "processed": processed,
-        "errors": errors
+        "processed": len(result.transitioned),
+        "errors": result.errors
     }
+
+
+def _status_email(application: Application, status: str, notes: str = None) -> dict:
+    """
+        Email cập nhật trạng thái cho ứng viên (recipient, subject, context).
+        Dùng chung cho đổi trạng thái đơn lẻ và hàng loạt.
+        Recipient luôn là email tài khoản của ứng viên (RecruiterCV không có email).
+    """
+    return {
+        "recipient": application.recruiter.user.email,
+        "subject": f"[JobPortal] Cập nhật trạng thái ứng tuyển: {application.job.title}",
+        "context": {
+            "candidate_name": application.recruiter.user.full_name,
+            "job_title": application.job.title,
+            "company_name": application.job.company.company_name,
+            "status_class": status,
+            "status_display": status.capitalize(),
+            "notes": notes,
+            "recruiter_name": application.job.company.user.full_name
+        }
+    }
+
+
+def _queue_status_emails(applications: list, status: str, notes: str = None) -> None:
+    """
+        Gửi email cập nhật trạng thái cho ứng viên theo 1 lô outbox.
+    """
+    EmailService.queue_emails(
+        [_status_email(application, status, notes) for application in applications],
+        template_path=STATUS_EMAIL_TEMPLATE
+    )
@@ -0,0 +1,253 @@
+"""
+Export danh sách applications (CSV / XLSX).
+
+- Export nhỏ (CSV) được stream trực tiếp: queryset đọc theo chunk bằng
+  .iterator() trên các cột cần thiết (values_list), mỗi dòng CSV được
+  ghi ra response ngay, bộ nhớ chỉ giữ 1 chunk. Generator là async (mỗi
+  chunk lấy qua sync_to_async) để Daphne/ASGI stream thật thay vì gom cả
+  iterator đồng bộ vào 1 list.
+- Export lớn hơn APPLICATION_EXPORT_ASYNC_THRESHOLD dòng (hoặc XLSX) chạy
+  trong Celery: file được ghi ra file tạm theo chunk, lưu vào storage riêng
+  (APPLICATION_EXPORT_STORAGE, không public) và ghi 1 dòng ApplicationExport.
+  User được báo (notification + email); file chỉ tải được qua API có xác
+  thực của chính user đó và bị xóa sau APPLICATION_EXPORT_TTL_HOURS giờ.
+"""
+import csv
+import io
+import logging
+import os
+import tempfile
+import uuid
+from datetime import timedelta
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from apps.communication.notifications.services.notifications import send_notification
+from apps.email.services import EmailService
+from apps.recruitment.applications.models import ApplicationExport
+
+logger = logging.getLogger(__name__)
+
+
+EXPORT_HEADER = [
+    'ID', 'Job Title', 'Applicant Name', 'Email',
+    'Status', 'Rating', 'Applied At', 'Notes'
+]
+EXPORT_FIELDS = (
+    'id', 'job__title', 'recruiter__user__full_name', 'recruiter__user__email',
+    'status', 'rating', 'applied_at', 'notes'
+)
+EXPORT_FORMATS = ('csv', 'xlsx')
+
+DEFAULT_EXPORT_CHUNK_SIZE = 2000
+# Số dòng tối đa được stream trong request, lớn hơn thì chuyển sang Celery
+DEFAULT_EXPORT_ASYNC_THRESHOLD = 5000
+DEFAULT_EXPORT_TTL_HOURS = 24
+
+EXPORT_DIRECTORY = 'exports/applications'
+NOTIFICATION_TYPE_NAME = 'application_export_ready'
+
+
+def get_chunk_size() -> int:
+    return getattr(settings, 'APPLICATION_EXPORT_CHUNK_SIZE', DEFAULT_EXPORT_CHUNK_SIZE)
+
+
+def get_async_threshold() -> int:
+    return getattr(settings, 'APPLICATION_EXPORT_ASYNC_THRESHOLD', DEFAULT_EXPORT_ASYNC_THRESHOLD)
+
+
+def get_ttl() -> timedelta:
+    return timedelta(hours=getattr(settings, 'APPLICATION_EXPORT_TTL_HOURS', DEFAULT_EXPORT_TTL_HOURS))
+
+
+def get_export_storage():
+    """Storage chứa file export (cấu hình APPLICATION_EXPORT_STORAGE)."""
+    config = getattr(settings, 'APPLICATION_EXPORT_STORAGE', None)
+    if not config:
+        return FileSystemStorage(location=os.path.join(settings.BASE_DIR, 'private', 'exports'), base_url=None)
+    return import_string(config['BACKEND'])(**config.get('OPTIONS', {}))
+
+
+def iter_export_rows(queryset):
+    """
+    Duyệt các dòng export theo chunk (chỉ lấy các cột cần thiết).
+
+    Yields:
+        list: Giá trị 1 dòng theo EXPORT_HEADER
+    """
+    rows = queryset.values_list(*EXPORT_FIELDS).iterator(chunk_size=get_chunk_size())
+    for app_id, job_title, full_name, email, status, rating, applied_at, notes in rows:
+        yield [
+            app_id,
+            job_title,
+            full_name,
+            email,
+            status,
+            rating or '',
+            applied_at.strftime('%Y-%m-%d %H:%M'),
+            notes or ''
+        ]
+
+
+class _Echo:
+    """File-like object trả lại giá trị được ghi (cho csv.writer khi stream)."""
+
+    def write(self, value):
+        return value
+
+
+def _next_chunk(rows, size: int) -> list:
+    return list(islice(rows, size))
+
+
+async def stream_csv(queryset):
+    """
+    Async generator sinh nội dung CSV cho StreamingHttpResponse.
+
+    Mỗi chunk của iter_export_rows được đọc qua sync_to_async (cùng thread
+    với connection DB), các dòng của chunk được ghi ra response ngay.
+    """
+    writer = csv.writer(_Echo())
+    chunk_size = get_chunk_size()
+    rows = iter_export_rows(queryset)
+    try:
+        yield writer.writerow(EXPORT_HEADER)
+        while chunk := await sync_to_async(_next_chunk)(rows, chunk_size):
+            for row in chunk:
+                yield writer.writerow(row)
+    finally:
+        await sync_to_async(rows.close)()
+
+
+def _write_csv(queryset, file_obj) -> int:
+    writer = csv.writer(file_obj)
+    writer.writerow(EXPORT_HEADER)
+    count = 0
+    for row in iter_export_rows(queryset):
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def _write_xlsx(queryset, file_obj) -> int:
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise ValueError("XLSX export requires openpyxl to be installed!")
+
+    # write_only: các dòng được ghi thẳng ra file, không giữ cả sheet trong bộ nhớ
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Applications')
+    sheet.append(EXPORT_HEADER)
+    count = 0
+    for row in iter_export_rows(queryset):
+        sheet.append(row)
+        count += 1
+    workbook.save(file_obj)
+    return count
+
+
+def write_export_file(user, queryset, file_format: str = 'csv') -> ApplicationExport:
+    """
+    Ghi export ra file tạm theo chunk, lưu vào export storage và ghi lại
+    ApplicationExport (hết hạn sau APPLICATION_EXPORT_TTL_HOURS).
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {file_format}")
+
+    file_name = f"{EXPORT_DIRECTORY}/{uuid.uuid4().hex}.{file_format}"
+
+    with tempfile.TemporaryFile() as tmp:
+        if file_format == 'xlsx':
+            rows = _write_xlsx(queryset, tmp)
+        else:
+            text = io.TextIOWrapper(tmp, encoding='utf-8', newline='')
+            rows = _write_csv(queryset, text)
+            text.flush()
+            text.detach()
+        tmp.seek(0)
+        path = get_export_storage().save(file_name, File(tmp, name=file_name))
+
+    export = ApplicationExport.objects.create(
+        user=user,
+        file_format=file_format,
+        file_path=path,
+        row_count=rows,
+        expires_at=timezone.now() + get_ttl()
+    )
+    logger.info(f"Exported {rows} applications to {path}")
+    return export
+
+
+def get_download_path(export: ApplicationExport) -> str:
+    """Đường dẫn API (cần đăng nhập) để tải file export."""
+    return reverse('applications:application-export-download', kwargs={'pk': export.id})
+
+
+def open_export_file(export: ApplicationExport):
+    return get_export_storage().open(export.file_path, 'rb')
+
+
+def notify_export_ready(export: ApplicationExport) -> None:
+    """
+    Báo cho user file export đã sẵn sàng (notification + email).
+    Link trỏ tới API tải file có xác thực, không phải URL storage.
+    """
+    user = export.user
+    download_path = get_download_path(export)
+    expires_at = timezone.localtime(export.expires_at).strftime('%Y-%m-%d %H:%M')
+    title = "Application export is ready"
+    content = (
+        f"Your export of {export.row_count} applications is ready to download "
+        f"until {expires_at}."
+    )
+
+    notification = send_notification(
+        user.id,
+        NOTIFICATION_TYPE_NAME,
+        title,
+        content,
+        link=download_path,
+        entity_type='application_export',
+        entity_id=export.id
+    )
+    if notification is None:
+        logger.warning(f"NotificationType '{NOTIFICATION_TYPE_NAME}' missing, export {export.id} notified by email only")
+
+    frontend_url = getattr(settings, 'FRONTEND_URL', '').rstrip('/')
+    EmailService.queue_email(
+        recipient=user.email,
+        subject=f"[JobPortal] {title}",
+        body=(
+            f"<p>{content}</p>"
+            f"<p>Sign in to <a href=\"{frontend_url}\">JobPortal</a> and open your notifications to download it.</p>"
+        )
+    )
+
+
+def delete_expired_exports() -> int:
+    """
+    Xóa file và bản ghi của các export đã hết hạn.
+
+    Returns:
+        int: Số export đã xóa
+    """
+    storage = get_export_storage()
+    expired = list(
+        ApplicationExport.objects.filter(expires_at__lte=timezone.now()).values_list('id', 'file_path')
+    )
+    for _, path in expired:
+        try:
+            storage.delete(path)
+        except Exception as e:
+            logger.warning(f"Could not delete export file {path}: {e}")
+
+    ApplicationExport.objects.filter(id__in=[export_id for export_id, _ in expired]).delete()
+    return len(expired)
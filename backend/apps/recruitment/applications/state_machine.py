@@ -5,9 +5,11 @@ Sử dụng django-fsm pattern để quản lý trạng thái Application một
 Đảm bảo state transitions hợp lệ và tracking history.
 """
 from typing import List, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from django.db import transaction
+from django.db.models import Case, F, Q, TextField, Value, When
+from django.db.models.functions import Concat
 from django.utils import timezone
 import logging
 
@@ -77,8 +79,23 @@ class TransitionResult:
     to_state: str
     message: str
     application: 'Application' = None
+
+
+@dataclass
+class BulkTransitionResult:
+    """Kết quả của một bulk transition."""
+    transitioned: List['Application'] = field(default_factory=list)
+    errors: List[dict] = field(default_factory=list)
     
 
+# Các trạng thái ghi nhận người review (reviewed_by / reviewed_at)
+REVIEWER_STATES = {
+    ApplicationStatus.REVIEWING,
+    ApplicationStatus.SHORTLISTED,
+    ApplicationStatus.REJECTED,
+}
+
+
 class ApplicationStateMachine:
     """
     State Machine cho Application workflow.
@@ -168,11 +185,7 @@ class ApplicationStateMachine:
         application.status = target_state.value
         
         # Update reviewer info if applicable
-        if performed_by and target_state in [
-            ApplicationStatus.REVIEWING, 
-            ApplicationStatus.SHORTLISTED,
-            ApplicationStatus.REJECTED
-        ]:
+        if performed_by and target_state in REVIEWER_STATES:
             application.reviewed_by = performed_by
             application.reviewed_at = timezone.now()
         
@@ -280,6 +293,90 @@ class ApplicationStateMachine:
         return self.transition_to(ApplicationStatus.WITHDRAWN, notes=notes)
 
 
+@transaction.atomic
+def bulk_transition(
+    queryset,
+    target_state: ApplicationStatus,
+    performed_by = None,
+    notes: str = None,
+    history_notes: str = None
+) -> BulkTransitionResult:
+    """
+    Chuyển trạng thái hàng loạt theo tập hợp.
+    
+    Transition của từng application được validate trong bộ nhớ với
+    VALID_TRANSITIONS; các application hợp lệ được cập nhật bằng 1 câu
+    UPDATE ... WHERE id IN và lịch sử được ghi bằng 1 bulk_create.
+    Application không hợp lệ được trả về trong errors, không làm hỏng cả lô.
+    
+    Args:
+        queryset: QuerySet Application cần chuyển (đã lọc quyền)
+        target_state: Trạng thái đích
+        performed_by: User thực hiện action
+        notes: Ghi chú thêm vào Application.notes
+        history_notes: Ghi chú cho lịch sử (mặc định = notes)
+        
+    Returns:
+        BulkTransitionResult: Các application đã chuyển (status đã cập nhật) và lỗi
+    """
+    result = BulkTransitionResult()
+    applications = list(queryset.select_for_update(of=('self',)))
+    
+    valid = []
+    for application in applications:
+        if (ApplicationStatus(application.status), target_state) in VALID_TRANSITIONS:
+            valid.append(application)
+        else:
+            result.errors.append({
+                "id": application.id,
+                "error": InvalidTransitionError(application.status, target_state.value).message
+            })
+    
+    if not valid:
+        return result
+    
+    now = timezone.now()
+    values = {'status': target_state.value, 'updated_at': now}
+    
+    if performed_by and target_state in REVIEWER_STATES:
+        values['reviewed_by'] = performed_by
+        values['reviewed_at'] = now
+    
+    if notes:
+        new_note = f"[{now.strftime('%Y-%m-%d %H:%M')}] {target_state.value}: {notes}"
+        values['notes'] = Case(
+            When(Q(notes__isnull=True) | Q(notes=''), then=Value(new_note)),
+            default=Concat(F('notes'), Value(f"\n{new_note}")),
+            output_field=TextField()
+        )
+    
+    Application.objects.filter(id__in=[app.id for app in valid]).update(**values)
+    
+    history = []
+    for application in valid:
+        history.append(ApplicationStatusHistory(
+            application=application,
+            old_status=application.status,
+            new_status=target_state.value,
+            changed_by=performed_by,
+            notes=history_notes or notes
+        ))
+        application.status = target_state.value
+        application.updated_at = now
+        if 'reviewed_by' in values:
+            application.reviewed_by = performed_by
+            application.reviewed_at = now
+    ApplicationStatusHistory.objects.bulk_create(history, batch_size=1000)
+    
+    logger.info(
+        f"Bulk transitioned {len(valid)} applications to {target_state.value} "
+        f"({len(result.errors)} invalid)"
+    )
+    
+    result.transitioned = valid
+    return result
+
+
 # Helper functions for use in views/services
 def get_application_state_machine(application_id):
     """
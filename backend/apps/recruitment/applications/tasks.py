@@ -0,0 +1,40 @@
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from django.contrib.auth import get_user_model
+
+from apps.recruitment.applications.selectors.applications import list_applications_for_export
+from apps.recruitment.applications.services.exports import (
+    delete_expired_exports,
+    notify_export_ready,
+    write_export_file,
+)
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(autoretry_for=(Exception,), retry_backoff=True, max_retries=3)
+def export_applications_task(user_id: int, job_id: int = None, status: str = None, file_format: str = 'csv'):
+    """
+    Ghi file export applications (CSV / XLSX) vào export storage và báo cho user khi xong.
+    """
+    user = get_user_model().objects.filter(id=user_id).first()
+    if user is None:
+        return None
+
+    queryset = list_applications_for_export(user, job_id=job_id, status=status)
+    export = write_export_file(user, queryset, file_format)
+    notify_export_ready(export)
+
+    logger.info(f"Application export {export.id} for user {user_id} ready")
+    return export.id
+
+
+@shared_task
+def cleanup_application_exports_task():
+    """
+    Xóa các file export đã hết hạn.
+    """
+    deleted = delete_expired_exports()
+    if deleted:
+        logger.info(f"Deleted {deleted} expired application exports")
+    return deleted
@@ -0,0 +1,149 @@
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from apps.candidate.recruiter_cvs.models import RecruiterCV
+from apps.candidate.recruiters.models import Recruiter
+from apps.company.companies.models import Company
+from apps.core.users.models import CustomUser
+from apps.email.models import EmailOutbox
+from apps.recruitment.application_status_history.models import ApplicationStatusHistory
+from apps.recruitment.applications.models import Application
+from apps.recruitment.applications.services.applications import bulk_action, change_application_status
+from apps.recruitment.jobs.models import Job
+
+
+@override_settings(TEMPLATES=[{**settings.TEMPLATES[0], 'DIRS': [settings.BASE_DIR / 'templates']}])
+class BulkActionTests(TestCase):
+    """Tests cho thao tác hàng loạt theo tập hợp"""
+
+    def setUp(self):
+        self.owner = CustomUser.objects.create_user(
+            email="owner@example.com",
+            password="password123",
+            full_name="Job Owner"
+        )
+        company = Company.objects.create(user=self.owner, company_name="Test Company")
+        self.job = Job.objects.create(
+            company=company,
+            title="Python Developer",
+            slug="python-developer-bulk",
+            description="Job description",
+            requirements="Job requirements",
+            status="published",
+            created_by=self.owner
+        )
+
+    def _create_applications(self, count, status='reviewing', start=0):
+        applications = []
+        for i in range(start, start + count):
+            user = CustomUser.objects.create_user(
+                email=f"applicant{i}@example.com",
+                password="password123",
+                full_name=f"Applicant {i}"
+            )
+            recruiter = Recruiter.objects.create(user=user)
+            applications.append(Application.objects.create(job=self.job, recruiter=recruiter, status=status))
+        return applications
+
+    def test_shortlist_updates_history_and_queues_emails(self):
+        applications = self._create_applications(3)
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            result = bulk_action([app.id for app in applications], 'shortlist', self.owner, 'Strong profile')
+
+        self.assertEqual(result, {"processed": 3, "errors": []})
+        self.assertEqual(len(callbacks), 1)  # 1 lần schedule gửi outbox cho cả lô
+
+        for application in Application.objects.filter(id__in=[app.id for app in applications]):
+            self.assertEqual(application.status, 'shortlisted')
+            self.assertEqual(application.reviewed_by, self.owner)
+            self.assertIsNotNone(application.reviewed_at)
+            self.assertIn('shortlisted: Strong profile', application.notes)
+
+        self.assertEqual(
+            ApplicationStatusHistory.objects.filter(old_status='reviewing', new_status='shortlisted').count(), 3
+        )
+        self.assertEqual(
+            set(EmailOutbox.objects.values_list('recipient', flat=True)),
+            {app.recruiter.user.email for app in applications}
+        )
+
+    def test_bulk_email_matches_single_status_change(self):
+        single, bulk = self._create_applications(2)
+
+        change_application_status(single, 'shortlisted', self.owner, 'Strong profile')
+        bulk_action([bulk.id], 'shortlist', self.owner, 'Strong profile')
+
+        single_email = EmailOutbox.objects.get(recipient=single.recruiter.user.email)
+        bulk_email = EmailOutbox.objects.get(recipient=bulk.recruiter.user.email)
+        self.assertEqual(bulk_email.subject, single_email.subject)
+        self.assertIn('Job Owner', bulk_email.html_content)
+        self.assertEqual(
+            bulk_email.html_content.replace('Applicant 1', 'Applicant 0'),
+            single_email.html_content
+        )
+
+    def test_email_goes_to_applicant_account_when_cv_attached(self):
+        single, bulk = self._create_applications(2)
+        for application in (single, bulk):
+            application.cv = RecruiterCV.objects.create(
+                recruiter=application.recruiter, cv_name='CV', cv_data={}
+            )
+            application.save(update_fields=['cv'])
+
+        change_application_status(single, 'shortlisted', self.owner)
+        bulk_action([bulk.id], 'shortlist', self.owner)
+
+        self.assertEqual(
+            sorted(EmailOutbox.objects.values_list('recipient', flat=True)),
+            ['applicant0@example.com', 'applicant1@example.com']
+        )
+
+    def test_invalid_transitions_are_reported(self):
+        valid = self._create_applications(2)
+        pending = self._create_applications(1, status='pending', start=2)[0]
+
+        result = bulk_action([app.id for app in valid] + [pending.id], 'shortlist', self.owner)
+
+        self.assertEqual(result['processed'], 2)
+        self.assertEqual([error['id'] for error in result['errors']], [pending.id])
+        pending.refresh_from_db()
+        self.assertEqual(pending.status, 'pending')
+        self.assertEqual(ApplicationStatusHistory.objects.get(application=valid[0]).notes, 'Bulk shortlist')
+        self.assertEqual(EmailOutbox.objects.count(), 2)
+
+    def test_queries_do_not_grow_with_batch_size(self):
+        small = self._create_applications(2)
+        large = self._create_applications(20, start=2)
+
+        # SELECT (lock) + UPDATE + INSERT lịch sử + INSERT outbox, cùng 2 cặp SAVEPOINT / RELEASE
+        with self.assertNumQueries(8):
+            bulk_action([app.id for app in small], 'reject', self.owner)
+        with self.assertNumQueries(8):
+            bulk_action([app.id for app in large], 'reject', self.owner)
+
+        self.assertEqual(Application.objects.filter(status='rejected').count(), 22)
+
+    def test_not_owner_raises(self):
+        applications = self._create_applications(2)
+        other = CustomUser.objects.create_user(
+            email="other@example.com",
+            password="password123",
+            full_name="Other User"
+        )
+
+        with self.assertRaises(ValueError):
+            bulk_action([app.id for app in applications], 'reject', other)
+        with self.assertRaises(ValueError):
+            bulk_action([app.id for app in applications], 'delete', other)
+
+        self.assertFalse(Application.objects.filter(status='rejected').exists())
+        self.assertFalse(ApplicationStatusHistory.objects.exists())
+
+    def test_delete_removes_all(self):
+        applications = self._create_applications(3)
+
+        result = bulk_action([app.id for app in applications], 'delete', self.owner)
+
+        self.assertEqual(result, {"processed": 3, "errors": []})
+        self.assertFalse(Application.objects.exists())
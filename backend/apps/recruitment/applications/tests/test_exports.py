@@ -0,0 +1,156 @@
+import csv
+import io
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from django.http import StreamingHttpResponse
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.candidate.recruiters.models import Recruiter
+from apps.company.companies.models import Company
+from apps.core.users.models import CustomUser
+from apps.email.models import EmailOutbox
+from apps.recruitment.applications.models import Application, ApplicationExport
+from apps.recruitment.applications.services.exports import get_export_storage
+from apps.recruitment.applications.tasks import cleanup_application_exports_task, export_applications_task
+from apps.recruitment.jobs.models import Job
+
+
+class ApplicationExportTests(APITestCase):
+    """Tests cho export applications (stream CSV / export nền)"""
+
+    url = '/api/applications/export/'
+
+    def setUp(self):
+        self.owner = CustomUser.objects.create_user(
+            email="owner@example.com",
+            password="password123",
+            full_name="Job Owner"
+        )
+        company = Company.objects.create(user=self.owner, company_name="Test Company")
+        self.job = Job.objects.create(
+            company=company,
+            title="Python Developer",
+            slug="python-developer-export",
+            description="Job description",
+            requirements="Job requirements",
+            status="published",
+            created_by=self.owner
+        )
+        for i in range(3):
+            user = CustomUser.objects.create_user(
+                email=f"applicant{i}@example.com",
+                password="password123",
+                full_name=f"Applicant {i}"
+            )
+            recruiter = Recruiter.objects.create(user=user)
+            Application.objects.create(job=self.job, recruiter=recruiter, rating=i or None, notes=f"Note {i}")
+
+        self.client.force_authenticate(user=self.owner)
+
+    def _read_csv(self, content):
+        return list(csv.reader(io.StringIO(content)))
+
+    @staticmethod
+    async def _consume(response):
+        return [chunk async for chunk in response]
+
+    @override_settings(APPLICATION_EXPORT_CHUNK_SIZE=2)
+    def test_small_export_is_streamed(self):
+        response = self.client.get(self.url, {'job_id': self.job.id})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        # Async iterator: ASGI stream từng chunk, không gom thành list
+        self.assertTrue(response.is_async)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+
+        rows = self._read_csv(b''.join(async_to_sync(self._consume)(response)).decode('utf-8'))
+        self.assertEqual(rows[0][:4], ['ID', 'Job Title', 'Applicant Name', 'Email'])
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(
+            sorted(row[3] for row in rows[1:]),
+            ['applicant0@example.com', 'applicant1@example.com', 'applicant2@example.com']
+        )
+        self.assertEqual(
+            sorted((row[5], row[7]) for row in rows[1:]),
+            [('', 'Note 0'), ('1', 'Note 1'), ('2', 'Note 2')]
+        )
+
+    @override_settings(APPLICATION_EXPORT_ASYNC_THRESHOLD=2)
+    @patch('apps.recruitment.applications.views.export_applications_task')
+    def test_large_export_runs_in_background(self, mock_task):
+        response = self.client.get(self.url, {'job_id': self.job.id, 'status': 'pending'})
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        mock_task.delay.assert_called_once_with(
+            self.owner.id, job_id=self.job.id, status='pending', file_format='csv'
+        )
+
+    @patch('apps.recruitment.applications.views.export_applications_task')
+    def test_xlsx_export_runs_in_background(self, mock_task):
+        response = self.client.get(self.url, {'file_format': 'xlsx'})
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(mock_task.delay.call_args.kwargs['file_format'], 'xlsx')
+
+    def test_invalid_format(self):
+        response = self.client.get(self.url, {'file_format': 'pdf'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def _export_storage_settings(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        return override_settings(
+            APPLICATION_EXPORT_CHUNK_SIZE=2,
+            APPLICATION_EXPORT_STORAGE={
+                'BACKEND': 'django.core.files.storage.FileSystemStorage',
+                'OPTIONS': {'location': location, 'base_url': None},
+            }
+        )
+
+    def test_export_task_writes_file_and_notifies(self):
+        with self._export_storage_settings():
+            export = ApplicationExport.objects.get(id=export_applications_task(self.owner.id, job_id=self.job.id))
+            response = self.client.get(f'/api/applications/exports/{export.id}/download/')
+            rows = self._read_csv(b''.join(response.streaming_content).decode('utf-8'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(export.row_count, 3)
+        self.assertGreater(export.expires_at, timezone.now())
+
+        email = EmailOutbox.objects.get()
+        self.assertEqual(email.recipient, self.owner.email)
+        # Không lộ đường dẫn storage trong email
+        self.assertNotIn(export.file_path, email.html_content)
+
+    def test_export_download_is_private_and_expires(self):
+        other = CustomUser.objects.create_user(
+            email="other@example.com",
+            password="password123",
+            full_name="Other User"
+        )
+
+        with self._export_storage_settings():
+            export = ApplicationExport.objects.get(id=export_applications_task(self.owner.id))
+            url = f'/api/applications/exports/{export.id}/download/'
+
+            self.client.force_authenticate(user=other)
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+            self.client.force_authenticate(user=self.owner)
+            ApplicationExport.objects.filter(id=export.id).update(expires_at=timezone.now() - timedelta(minutes=1))
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+            self.assertEqual(cleanup_application_exports_task(), 1)
+            self.assertFalse(get_export_storage().exists(export.file_path))
+
+        self.assertFalse(ApplicationExport.objects.exists())
@@ -19,6 +19,7 @@ urlpatterns = [
     path('stats/', ApplicationViewSet.as_view({'get': 'stats'}), name='application-stats'),
     path('bulk-action/', ApplicationViewSet.as_view({'post': 'bulk_action_view'}), name='application-bulk-action'),
     path('export/', ApplicationViewSet.as_view({'get': 'export'}), name='application-export'),
+    path('exports/<int:pk>/download/', ApplicationViewSet.as_view({'get': 'download_export'}), name='application-export-download'),
     # Then pk-based routes
     path('<int:pk>/status/', ApplicationViewSet.as_view({'patch': 'change_status'}), name='application-status'),
     path('<int:pk>/rating/', ApplicationViewSet.as_view({'patch': 'rate'}), name='application-rating'),
@@ -1,5 +1,3 @@
-import csv
-
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
@@ -13,7 +11,7 @@ from apps.recruitment.application_status_history.serializers import StatusHistor
 from apps.recruitment.application_status_history.services.application_status_history import log_status_history
 from apps.candidate.recruiters.selectors.recruiters import get_recruiter_by_user
 
-from django.http import HttpResponse
+from django.http import FileResponse, StreamingHttpResponse
 
 from .models import Application
 
@@ -28,6 +26,8 @@ from .services.applications import (
     ApplicationUpdateInput,
     ApplicationCreateInput,
 )
+from .services.exports import EXPORT_FORMATS, get_async_threshold, open_export_file, stream_csv
+from .tasks import export_applications_task
 
 from .serializers import (
     ApplicationWithdrawSerializer,
@@ -47,6 +47,7 @@ from .selectors.applications import (
     list_applications_by_status,
     list_applications_by_rating,
     list_applications_for_export,
+    get_active_export_for_user,
     get_application_stats,
     get_application_by_id,
     search_applications,
@@ -630,12 +631,21 @@ class ApplicationViewSet(viewsets.GenericViewSet):
     
     def export(self, request):
         """
-            GET /api/applications/export/
-            Export danh sách applications (CSV)
+            GET /api/applications/export/?file_format=csv|xlsx
+            Export danh sách applications.
+            CSV nhỏ được stream trực tiếp; XLSX hoặc export lớn hơn ngưỡng
+            chạy trong Celery và user được báo khi file sẵn sàng (202).
         """
         
         job_id = request.query_params.get('job_id')
         status_filter = request.query_params.get('status')
+        file_format = request.query_params.get('file_format', 'csv')
+        
+        if file_format not in EXPORT_FORMATS:
+            return Response(
+                {"detail": f"file_format must be one of: {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
         applications = list_applications_for_export(
             request.user,
@@ -643,29 +653,41 @@ class ApplicationViewSet(viewsets.GenericViewSet):
             status=status_filter
         )
         
-        # Create CSV response
-        response = HttpResponse(content_type='text/csv')
+        if file_format == 'xlsx' or applications.count() > get_async_threshold():
+            export_applications_task.delay(
+                request.user.id,
+                job_id=int(job_id) if job_id else None,
+                status=status_filter,
+                file_format=file_format
+            )
+            return Response(
+                {"detail": "Export is being prepared. You will be notified when the file is ready."},
+                status=status.HTTP_202_ACCEPTED
+            )
+        
+        # Stream CSV theo chunk, không giữ cả file trong bộ nhớ
+        response = StreamingHttpResponse(stream_csv(applications), content_type='text/csv')
         response['Content-Disposition'] = 'attachment; filename="applications.csv"'
+        return response
+    
+    def download_export(self, request, pk=None):
+        """
+            GET /api/applications/exports/:id/download/
+            Tải file export chạy nền (chỉ người tạo, trước khi hết hạn)
+        """
         
-        writer = csv.writer(response)
-        writer.writerow([
-            'ID', 'Job Title', 'Applicant Name', 'Email', 
-            'Status', 'Rating', 'Applied At', 'Notes'
-        ])
-        
-        for app in applications:
-            writer.writerow([
-                app.id,
-                app.job.title,
-                app.recruiter.user.full_name,
-                app.recruiter.user.email,
-                app.status,
-                app.rating or '',
-                app.applied_at.strftime('%Y-%m-%d %H:%M'),
-                app.notes or ''
-            ])
+        export = get_active_export_for_user(int(pk), request.user)
+        if export is None:
+            return Response(
+                {"detail": "Export not found or expired"},
+                status=status.HTTP_404_NOT_FOUND
+            )
         
-        return response
+        return FileResponse(
+            open_export_file(export),
+            as_attachment=True,
+            filename=f"applications.{export.file_format}"
+        )
     
     def list_interviews(self, request, pk=None):
         """
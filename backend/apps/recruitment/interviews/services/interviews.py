@@ -210,7 +210,7 @@ def send_reminder(interview: Interview, message: str = None) -> dict:
     default_message = f"Nhắc nhở: Bạn có lịch phỏng vấn vào {interview.scheduled_at.strftime('%d/%m/%Y %H:%M')}"
     
     # Send Reminder Email
-    EmailService.send_email(
+    EmailService.queue_email(
         recipient=applicant.email,
         subject="[JobPortal] Nhắc nhở lịch phỏng vấn sắp tới",
         template_path="emails/recruitment/interview_reminder.html",
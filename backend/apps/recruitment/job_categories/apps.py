@@ -5,3 +5,6 @@ class JobCategoriesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.recruitment.job_categories'
     label = 'recruitment_job_categories'
+
+    def ready(self):
+        import apps.recruitment.job_categories.signals
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.core.caching import CacheService
+from apps.recruitment.job_categories.models import JobCategory
+
+
+@receiver([post_save, post_delete], sender=JobCategory)
+def invalidate_job_category_cache(sender, instance, **kwargs):
+    """
+    Invalidate cache các endpoint đọc khi danh mục việc làm thay đổi.
+    """
+    CacheService.invalidate_now_and_on_commit('job_categories', also=CacheService.invalidate_taxonomy)
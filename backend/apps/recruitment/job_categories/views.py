@@ -3,6 +3,8 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAdminUser
 
+from apps.core.caching import cache_response
+
 from .models import JobCategory
 from .serializers import JobCategorySerializer, JobCategoryTreeSerializer
 
@@ -19,8 +21,12 @@ class JobCategoryViewSet(viewsets.ModelViewSet):
         - POST /         → create (admin)
         - PUT /:id/      → update (admin)
         - DELETE /:id/   → destroy (admin)
+        
+        Các endpoint GET public được cache theo version (namespace 'job_categories'),
+        invalidate qua signals của JobCategory.
     """
     serializer_class = JobCategorySerializer
+    cache_namespace = 'job_categories'
     
     def get_queryset(self):
         queryset = JobCategory.objects.select_related('parent')
@@ -39,6 +45,14 @@ class JobCategoryViewSet(viewsets.ModelViewSet):
         
         return queryset.order_by('display_order', 'name')
     
+    @cache_response
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    @cache_response
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+    
     def get_permissions(self):
         """
             Public: list, retrieve, tree
@@ -49,6 +63,7 @@ class JobCategoryViewSet(viewsets.ModelViewSet):
         return [IsAdminUser()]
     
     @action(detail=False, methods=['get'])
+    @cache_response
     def tree(self, request):
         """
             GET /api/job-categories/tree/
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.recruitment.job_views.models import JobView, JobViewDaily
+from apps.recruitment.job_views.services.rollups import rollup_day
+
+
+class Command(BaseCommand):
+    help = (
+        'Điền device_type / referrer_domain cho các job_views cũ theo từng batch, '
+        'sau đó tổng hợp lại các ngày đã có rollup (job_views_daily)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        pending = JobView.objects.filter(referrer_domain__isnull=True).order_by('id')
+
+        total = 0
+        last_id = 0
+        touched_days = set()
+        while True:
+            # Keyset theo id: mỗi batch chỉ giữ batch_size dòng trong bộ nhớ
+            batch = list(
+                pending.filter(id__gt=last_id).only('id', 'user_agent', 'referrer', 'viewed_at')[:batch_size]
+            )
+            if not batch:
+                break
+
+            for view in batch:
+                view.classify()
+                touched_days.add(timezone.localdate(view.viewed_at))
+            JobView.objects.bulk_update(batch, ['device_type', 'referrer_domain'])
+
+            total += len(batch)
+            last_id = batch[-1].id
+            self.stdout.write(f"Classified {total} job views...")
+
+        self.stdout.write(self.style.SUCCESS(f"Successfully classified {total} job views."))
+
+        # Rollup của các ngày này được tính khi chưa phân loại (thiết bị trống,
+        # nguồn 'direct'): tổng hợp lại. Ngày sau watermark để beat tổng hợp.
+        watermark = JobViewDaily.objects.aggregate(last=Max('date'))['last']
+        stale_days = sorted(day for day in touched_days if watermark and day <= watermark)
+        for day in stale_days:
+            rollup_day(day)
+        if stale_days:
+            self.stdout.write(self.style.SUCCESS(
+                f"Re-rolled up {len(stale_days)} days ({stale_days[0]} - {stale_days[-1]})."
+            ))
@@ -0,0 +1,17 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment_job_views', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jobview',
+            name='viewed_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='Thời gian xem'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment_job_views', '0003_alter_jobview_viewed_at'),
+        ('recruitment_jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobViewDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(db_index=True, verbose_name='Ngày')),
+                ('views', models.PositiveIntegerField(default=0, verbose_name='Lượt xem')),
+                ('logged_in_views', models.PositiveIntegerField(default=0, verbose_name='Lượt xem đã đăng nhập')),
+                ('unique_users', models.PositiveIntegerField(default=0, verbose_name='Số người xem')),
+                ('unique_ips', models.PositiveIntegerField(default=0, verbose_name='Số IP ẩn danh')),
+                ('mobile_views', models.PositiveIntegerField(default=0, verbose_name='Lượt xem mobile')),
+                ('tablet_views', models.PositiveIntegerField(default=0, verbose_name='Lượt xem tablet')),
+                ('desktop_views', models.PositiveIntegerField(default=0, verbose_name='Lượt xem desktop')),
+                ('other_device_views', models.PositiveIntegerField(default=0, verbose_name='Lượt xem thiết bị khác')),
+                ('referrers', models.JSONField(blank=True, default=dict, verbose_name='Nguồn truy cập')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Ngày cập nhật')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_views', to='recruitment_jobs.job', verbose_name='Công việc')),
+            ],
+            options={
+                'verbose_name': 'Thống kê lượt xem theo ngày',
+                'verbose_name_plural': 'Thống kê lượt xem theo ngày',
+                'db_table': 'job_views_daily',
+                'ordering': ['date'],
+                'unique_together': {('job', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment_job_views', '0004_jobviewdaily'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobview',
+            name='device_type',
+            field=models.CharField(blank=True, choices=[('mobile', 'Mobile'), ('tablet', 'Tablet'), ('desktop', 'Desktop'), ('other', 'Khác')], max_length=10, null=True, verbose_name='Loại thiết bị'),
+        ),
+        migrations.AddField(
+            model_name='jobview',
+            name='referrer_domain',
+            field=models.CharField(blank=True, max_length=255, null=True, verbose_name='Domain nguồn truy cập'),
+        ),
+        migrations.AddIndex(
+            model_name='jobview',
+            index=models.Index(fields=['job', 'device_type'], name='idx_job_views_job_device'),
+        ),
+        migrations.AddIndex(
+            model_name='jobview',
+            index=models.Index(fields=['job', 'referrer_domain'], name='idx_job_views_job_referrer'),
+        ),
+    ]
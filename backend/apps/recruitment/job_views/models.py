@@ -1,9 +1,47 @@
+from typing import Optional
+from urllib.parse import urlparse
+
 from django.db import models
+from django.utils import timezone
+
+
+def classify_device(user_agent: Optional[str]) -> Optional[str]:
+    """Loại thiết bị từ user agent: mobile / tablet / desktop / other (None nếu không có UA)."""
+    if not user_agent:
+        return None
+    ua = user_agent.lower()
+    if 'mobile' in ua or 'android' in ua or 'iphone' in ua:
+        return 'mobile'
+    if 'tablet' in ua or 'ipad' in ua:
+        return 'tablet'
+    if 'windows' in ua or 'macintosh' in ua or 'linux' in ua:
+        return 'desktop'
+    return 'other'
+
+
+def referrer_source(referrer: Optional[str]) -> str:
+    """Domain nguồn truy cập (bỏ www.), 'direct' nếu không có referrer."""
+    if not referrer:
+        return 'direct'
+    try:
+        domain = urlparse(referrer).netloc or 'direct'
+    except ValueError:
+        return 'other'
+    # Loại bỏ prefix www
+    if domain.startswith('www.'):
+        domain = domain[4:]
+    return domain[:255]
 
 
 class JobView(models.Model):
     """Bảng Job_Views - Lượt xem công việc"""
     
+    class DeviceType(models.TextChoices):
+        MOBILE = 'mobile', 'Mobile'
+        TABLET = 'tablet', 'Tablet'
+        DESKTOP = 'desktop', 'Desktop'
+        OTHER = 'other', 'Khác'
+    
     job = models.ForeignKey(
         'recruitment_jobs.Job',
         on_delete=models.CASCADE,
@@ -36,8 +74,23 @@ class JobView(models.Model):
         blank=True,
         verbose_name='Nguồn truy cập'
     )
+    # Phân loại sẵn lúc ghi để thống kê bằng GROUP BY trong DB
+    device_type = models.CharField(
+        max_length=10,
+        choices=DeviceType.choices,
+        null=True,
+        blank=True,
+        verbose_name='Loại thiết bị'
+    )
+    referrer_domain = models.CharField(
+        max_length=255,
+        null=True,
+        blank=True,
+        verbose_name='Domain nguồn truy cập'
+    )
+    # default thay cho auto_now_add: bulk_create từ stream giữ thời điểm xem thật
     viewed_at = models.DateTimeField(
-        auto_now_add=True,
+        default=timezone.now,
         db_index=True,
         verbose_name='Thời gian xem'
     )
@@ -47,6 +100,87 @@ class JobView(models.Model):
         verbose_name = 'Lượt xem công việc'
         verbose_name_plural = 'Lượt xem công việc'
         ordering = ['-viewed_at']
+        indexes = [
+            models.Index(fields=['job', 'device_type'], name='idx_job_views_job_device'),
+            models.Index(fields=['job', 'referrer_domain'], name='idx_job_views_job_referrer'),
+        ]
     
     def __str__(self):
         return f"{self.job.title} - {self.viewed_at}"
+    
+    def classify(self):
+        """Điền device_type / referrer_domain từ user_agent / referrer."""
+        self.device_type = classify_device(self.user_agent)
+        self.referrer_domain = referrer_source(self.referrer)
+    
+    def save(self, *args, **kwargs):
+        if self.referrer_domain is None:
+            self.classify()
+        super().save(*args, **kwargs)
+
+
+class JobViewDaily(models.Model):
+    """Bảng Job_Views_Daily - Tổng hợp lượt xem công việc theo ngày"""
+    
+    job = models.ForeignKey(
+        'recruitment_jobs.Job',
+        on_delete=models.CASCADE,
+        related_name='daily_views',
+        verbose_name='Công việc'
+    )
+    date = models.DateField(
+        db_index=True,
+        verbose_name='Ngày'
+    )
+    views = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Lượt xem'
+    )
+    logged_in_views = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Lượt xem đã đăng nhập'
+    )
+    unique_users = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Số người xem'
+    )
+    unique_ips = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Số IP ẩn danh'
+    )
+    mobile_views = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Lượt xem mobile'
+    )
+    tablet_views = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Lượt xem tablet'
+    )
+    desktop_views = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Lượt xem desktop'
+    )
+    other_device_views = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Lượt xem thiết bị khác'
+    )
+    # {"google.com": 12, "direct": 5, ...}
+    referrers = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name='Nguồn truy cập'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Ngày cập nhật'
+    )
+    
+    class Meta:
+        db_table = 'job_views_daily'
+        verbose_name = 'Thống kê lượt xem theo ngày'
+        verbose_name_plural = 'Thống kê lượt xem theo ngày'
+        unique_together = ['job', 'date']
+        ordering = ['date']
+    
+    def __str__(self):
+        return f"{self.job_id} - {self.date}: {self.views}"
@@ -1,18 +1,79 @@
-from typing import Optional
+from typing import Optional, Tuple
 from datetime import date, timedelta
-from django.db.models import Count, Q
+from django.db.models import Count, Q, Sum
 from django.db.models.functions import TruncDate
 from django.utils import timezone
-from urllib.parse import urlparse
 
-import re
+import logging
 
-from apps.recruitment.job_views.models import JobView
+from django_redis import get_redis_connection
+
+from apps.recruitment.job_views.models import JobView, JobViewDaily
+from apps.recruitment.job_views.services.job_views import get_lifetime_unique_views, unique_views_key
+from apps.recruitment.job_views.services.rollups import (
+    DEVICE_FIELDS,
+    day_bounds,
+    get_rollup_watermark,
+    summarize_views,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _split_by_watermark(job_id: int) -> Tuple[object, object, Optional[date]]:
+    """
+        Tách dữ liệu lượt xem của job thành 2 phần:
+        rollup JobViewDaily cho các ngày đã tổng hợp và JobView của phần đuôi
+        (từ ngày sau watermark, thường chỉ là hôm nay).
+    """
+    watermark = get_rollup_watermark()
+    raw = JobView.objects.filter(job_id=job_id)
+    if watermark is None:
+        return JobViewDaily.objects.none(), raw, None
+    
+    tail_start, _ = day_bounds(watermark + timedelta(days=1))
+    rollups = JobViewDaily.objects.filter(job_id=job_id, date__lte=watermark)
+    return rollups, raw.filter(viewed_at__gte=tail_start), watermark
+
+
+def _count_unique_by_date(queryset) -> dict:
+    """Lượt xem duy nhất mỗi ngày (user, hoặc IP nếu ẩn danh) đếm trong DB."""
+    rows = queryset.annotate(
+        date=TruncDate('viewed_at')
+    ).values('date').annotate(
+        users=Count('user', distinct=True),
+        anonymous_ips=Count('ip_address', distinct=True, filter=Q(user__isnull=True))
+    ).order_by()
+    return {row['date']: row['users'] + row['anonymous_ips'] for row in rows}
+
+
+def _count_unique_viewers(queryset) -> int:
+    """Số người xem duy nhất trên toàn bộ queryset (user, hoặc IP nếu ẩn danh)."""
+    counts = queryset.aggregate(
+        users=Count('user', distinct=True),
+        anonymous_ips=Count('ip_address', distinct=True, filter=Q(user__isnull=True))
+    )
+    return counts['users'] + counts['anonymous_ips']
+
+
+def _get_unique_views(job_id: int) -> int:
+    """
+        Người xem duy nhất trên toàn bộ lịch sử job: PFCOUNT HLL trọn đời
+        (không cộng dồn theo ngày vì người xem nhiều ngày sẽ bị đếm lặp).
+        Không có Redis thì đếm distinct trong DB.
+    """
+    try:
+        return get_lifetime_unique_views(job_id, get_redis_connection("default"))
+    except Exception as e:
+        logger.debug(f"Lifetime unique view HLL unavailable, counting in DB: {e}")
+    return _count_unique_viewers(JobView.objects.filter(job_id=job_id))
 
 
 def get_view_stats(job_id: int) -> dict:
     """
         Lấy thống kê tổng hợp lượt xem cho job.
+        Các ngày đã kết thúc đọc từ JobViewDaily, chỉ phần đuôi quét job_views;
+        unique_views đọc từ HLL trọn đời của job.
         
         Returns:
             {
@@ -23,35 +84,33 @@ def get_view_stats(job_id: int) -> dict:
                 "views_this_month": int
             }
     """
-    today = timezone.now().date()
+    today = timezone.localdate()
     week_ago = today - timedelta(days=7)
     month_ago = today - timedelta(days=30)
     
-    queryset = JobView.objects.filter(job_id=job_id)
-    
-    # Tổng lượt xem
-    total_views = queryset.count()
+    rollups, tail, _ = _split_by_watermark(job_id)
     
-    # Lượt xem duy nhất (bởi user hoặc IP)
-    unique_by_user = queryset.exclude(user__isnull=True).values('user').distinct().count()
-    unique_by_ip = queryset.filter(user__isnull=True).values('ip_address').distinct().count()
-    unique_views = unique_by_user + unique_by_ip
+    # Các ngày đã tổng hợp
+    closed = rollups.aggregate(
+        total_views=Sum('views'),
+        views_this_week=Sum('views', filter=Q(date__gte=week_ago)),
+        views_this_month=Sum('views', filter=Q(date__gte=month_ago))
+    )
     
-    # Lượt xem hôm nay
-    views_today = queryset.filter(viewed_at__date=today).count()
-    
-    # Lượt xem tuần này
-    views_this_week = queryset.filter(viewed_at__date__gte=week_ago).count()
-    
-    # Lượt xem tháng này
-    views_this_month = queryset.filter(viewed_at__date__gte=month_ago).count()
+    # Phần đuôi chưa tổng hợp
+    recent = tail.aggregate(
+        total_views=Count('id'),
+        views_today=Count('id', filter=Q(viewed_at__gte=day_bounds(today)[0])),
+        views_this_week=Count('id', filter=Q(viewed_at__gte=day_bounds(week_ago)[0])),
+        views_this_month=Count('id', filter=Q(viewed_at__gte=day_bounds(month_ago)[0]))
+    )
     
     return {
-        "total_views": total_views,
-        "unique_views": unique_views,
-        "views_today": views_today,
-        "views_this_week": views_this_week,
-        "views_this_month": views_this_month
+        "total_views": (closed['total_views'] or 0) + recent['total_views'],
+        "unique_views": _get_unique_views(job_id),
+        "views_today": recent['views_today'],
+        "views_this_week": (closed['views_this_week'] or 0) + recent['views_this_week'],
+        "views_this_month": (closed['views_this_month'] or 0) + recent['views_this_month']
     }
 
 
@@ -66,36 +125,47 @@ def get_view_chart_data(job_id: int, period: str = '7d') -> dict:
         Returns:
             {
                 "period": str,
-                "data": [{"date": "YYYY-MM-DD", "views": int}, ...]
+                "data": [{"date": "YYYY-MM-DD", "views": int, "unique_views": int}, ...]
             }
     """
     # Quá trình chuyển đổi period thành số ngày
     days_map = {'7d': 7, '30d': 30, '90d': 90}
     days = days_map.get(period, 7)
     
-    start_date = timezone.now().date() - timedelta(days=days - 1)
+    end_date = timezone.localdate()
+    start_date = end_date - timedelta(days=days - 1)
+    
+    rollups, _, watermark = _split_by_watermark(job_id)
     
-    # Lấy lượt xem theo ngày
+    # Các ngày đã tổng hợp: mỗi ngày 1 dòng JobViewDaily
+    views_by_date = {}
+    unique_by_date = {}
+    for row in rollups.filter(date__gte=start_date).values('date', 'views', 'unique_users', 'unique_ips'):
+        views_by_date[row['date']] = row['views']
+        unique_by_date[row['date']] = row['unique_users'] + row['unique_ips']
+    
+    # Các ngày sau watermark: gom nhóm trực tiếp từ job_views
+    tail_start = max(start_date, watermark + timedelta(days=1)) if watermark else start_date
     queryset = JobView.objects.filter(
         job_id=job_id,
-        viewed_at__date__gte=start_date
+        viewed_at__gte=day_bounds(tail_start)[0]
     ).annotate(
         date=TruncDate('viewed_at')
     ).values('date').annotate(
         views=Count('id')
     ).order_by('date')
+    views_by_date.update({item['date']: item['views'] for item in queryset})
+    unique_by_date.update(_get_unique_views_by_date(job_id, tail_start, end_date))
     
     # Chuyển đổi thành list và điền các ngày thiếu
-    views_by_date = {item['date']: item['views'] for item in queryset}
-    
     data = []
     current_date = start_date
-    end_date = timezone.now().date()
     
     while current_date <= end_date:
         data.append({
             "date": current_date.isoformat(),
-            "views": views_by_date.get(current_date, 0)
+            "views": views_by_date.get(current_date, 0),
+            "unique_views": unique_by_date.get(current_date, 0)
         })
         current_date += timedelta(days=1)
     
@@ -105,9 +175,32 @@ def get_view_chart_data(job_id: int, period: str = '7d') -> dict:
     }
 
 
+def _get_unique_views_by_date(job_id: int, start_date: date, end_date: date) -> dict:
+    """
+        Lượt xem duy nhất (theo user, hoặc IP nếu ẩn danh) mỗi ngày.
+        Đọc HyperLogLog do ingest_job_views_task ghi (1 PFCOUNT/ngày trong
+        1 pipeline); không có Redis thì đếm distinct trong DB.
+    """
+    dates = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+    try:
+        redis_conn = get_redis_connection("default")
+        pipe = redis_conn.pipeline(transaction=False)
+        for day in dates:
+            pipe.pfcount(unique_views_key(job_id, day))
+        return dict(zip(dates, pipe.execute()))
+    except Exception as e:
+        logger.debug(f"Unique view HLL unavailable, counting in DB: {e}")
+    
+    return _count_unique_by_date(JobView.objects.filter(
+        job_id=job_id,
+        viewed_at__gte=day_bounds(start_date)[0]
+    ))
+
+
 def get_viewer_demographics(job_id: int) -> dict:
     """
         Lấy thống kê demographics của người xem.
+        Cộng dồn bucket thiết bị / nguồn truy cập của JobViewDaily với phần đuôi.
         
         Returns:
             {
@@ -116,25 +209,23 @@ def get_viewer_demographics(job_id: int) -> dict:
                 "authenticated_ratio": {"logged_in": int, "anonymous": int}
             }
     """
-    queryset = JobView.objects.filter(job_id=job_id)
+    rollups, tail, _ = _split_by_watermark(job_id)
     
-    # Thống kê theo referrer
     referrer_counts = {}
-    for view in queryset.exclude(referrer__isnull=True).exclude(referrer=''):
-        try:
-            parsed = urlparse(view.referrer)
-            domain = parsed.netloc or 'direct'
-            # Loại bỏ prefix www
-            if domain.startswith('www.'):
-                domain = domain[4:]
-            referrer_counts[domain] = referrer_counts.get(domain, 0) + 1
-        except:
-            referrer_counts['other'] = referrer_counts.get('other', 0) + 1
-    
-    # Thêm traffic trực tiếp
-    direct_count = queryset.filter(Q(referrer__isnull=True) | Q(referrer='')).count()
-    if direct_count > 0:
-        referrer_counts['direct'] = direct_count
+    device_counts = {"mobile": 0, "desktop": 0, "tablet": 0, "other": 0}
+    logged_in = 0
+    anonymous = 0
+    
+    buckets = list(rollups.values('views', 'logged_in_views', 'referrers', *DEVICE_FIELDS.values()))
+    buckets.extend(summarize_views(tail).values())
+    
+    for bucket in buckets:
+        for source, count in bucket['referrers'].items():
+            referrer_counts[source] = referrer_counts.get(source, 0) + count
+        for device, field in DEVICE_FIELDS.items():
+            device_counts[device] += bucket[field]
+        logged_in += bucket['logged_in_views']
+        anonymous += bucket['views'] - bucket['logged_in_views']
     
     by_referrer = sorted(
         [{"source": k, "count": v} for k, v in referrer_counts.items()],
@@ -142,26 +233,8 @@ def get_viewer_demographics(job_id: int) -> dict:
         reverse=True
     )[:10]  # Top 10
     
-    # Thống kê theo device (parse user_agent)
-    device_counts = {"mobile": 0, "desktop": 0, "tablet": 0, "other": 0}
-    
-    for view in queryset.exclude(user_agent__isnull=True).exclude(user_agent=''):
-        ua = view.user_agent.lower()
-        if 'mobile' in ua or 'android' in ua or 'iphone' in ua:
-            device_counts['mobile'] += 1
-        elif 'tablet' in ua or 'ipad' in ua:
-            device_counts['tablet'] += 1
-        elif 'windows' in ua or 'macintosh' in ua or 'linux' in ua:
-            device_counts['desktop'] += 1
-        else:
-            device_counts['other'] += 1
-    
     by_device = [{"device": k, "count": v} for k, v in device_counts.items() if v > 0]
     
-    # Tỷ lệ người dùng đã đăng nhập
-    logged_in = queryset.exclude(user__isnull=True).count()
-    anonymous = queryset.filter(user__isnull=True).count()
-    
     return {
         "by_referrer": by_referrer,
         "by_device": by_device,
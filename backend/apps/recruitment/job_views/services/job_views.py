@@ -0,0 +1,233 @@
+"""
+Ghi nhận lượt xem job qua Redis stream.
+
+POST /api/jobs/:id/view/ chỉ XADD một event gọn (job, user, ip, ua,
+referrer, thời điểm) vào stream, không INSERT đồng bộ. Celery beat gọi
+ingest_job_views_task: đọc stream theo lô, bulk_create JobView, PFADD
+người xem vào HyperLogLog theo job + ngày và HyperLogLog trọn đời của job
+(lượt xem duy nhất) rồi XDEL.
+
+Không có Redis (tests, local dev): tạo JobView trực tiếp như bình thường.
+"""
+import ipaddress
+import itertools
+import logging
+import time
+from collections import defaultdict
+from datetime import date, datetime, timezone as dt_timezone
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+from apps.core.users.models import CustomUser
+from apps.recruitment.job_views.models import JobView, classify_device, referrer_source
+from apps.recruitment.jobs.models import Job
+
+logger = logging.getLogger(__name__)
+
+
+STREAM_KEY = 'jobportal:job_views:stream'
+UNIQUE_KEY_TEMPLATE = 'jobportal:job_views:unique:{job_id}:{day}'
+# HLL trọn đời của job (không hết hạn) và cờ đã nạp lịch sử từ job_views
+LIFETIME_UNIQUE_KEY_TEMPLATE = 'jobportal:job_views:unique:{job_id}:all'
+LIFETIME_SEEDED_KEY_TEMPLATE = 'jobportal:job_views:unique:{job_id}:all:seeded'
+
+# Giới hạn (xấp xỉ) độ dài stream nếu consumer ngừng chạy
+DEFAULT_STREAM_MAXLEN = 1_000_000
+DEFAULT_BATCH_SIZE = 1000
+
+# HLL giữ lâu hơn khoảng dài nhất của biểu đồ (90 ngày)
+UNIQUE_KEY_TTL = 60 * 60 * 24 * 100
+
+MAX_USER_AGENT_LENGTH = 512
+MAX_REFERRER_LENGTH = 500
+
+
+def get_batch_size() -> int:
+    return getattr(settings, 'JOB_VIEW_INGEST_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+
+
+def unique_views_key(job_id: int, day: date) -> str:
+    return UNIQUE_KEY_TEMPLATE.format(job_id=job_id, day=day.strftime('%Y%m%d'))
+
+
+def lifetime_unique_views_key(job_id: int) -> str:
+    return LIFETIME_UNIQUE_KEY_TEMPLATE.format(job_id=job_id)
+
+
+def visitor_id(user_id: Optional[int], ip: Optional[str]) -> Optional[str]:
+    """Định danh người xem trong HLL: user, hoặc IP nếu ẩn danh."""
+    if user_id:
+        return f"u:{user_id}"
+    return f"ip:{ip}" if ip else None
+
+
+def get_lifetime_unique_views(job_id: int, redis_conn) -> int:
+    """
+    Số người xem duy nhất trên toàn bộ lịch sử job (PFCOUNT HLL trọn đời).
+
+    Lần đọc đầu tiên của mỗi job nạp người xem đã có trong job_views vào
+    HLL (1 lần quét, theo chunk); sau đó ingest_batch giữ HLL cập nhật.
+    PFADD lặp lại không làm sai số đếm nên nạp trùng cũng an toàn.
+    """
+    key = lifetime_unique_views_key(job_id)
+    seeded_key = LIFETIME_SEEDED_KEY_TEMPLATE.format(job_id=job_id)
+    if not redis_conn.exists(seeded_key):
+        batch_size = get_batch_size()
+        views = JobView.objects.filter(job_id=job_id).order_by()
+        users = views.filter(user__isnull=False).values_list('user_id', flat=True).distinct()
+        ips = views.filter(user__isnull=True, ip_address__isnull=False).values_list('ip_address', flat=True).distinct()
+        members = []
+        for member in itertools.chain(
+            (visitor_id(user_id, None) for user_id in users.iterator(chunk_size=batch_size)),
+            (visitor_id(None, ip) for ip in ips.iterator(chunk_size=batch_size)),
+        ):
+            members.append(member)
+            if len(members) >= batch_size:
+                redis_conn.pfadd(key, *members)
+                members = []
+        if members:
+            redis_conn.pfadd(key, *members)
+        redis_conn.set(seeded_key, 1)
+    return redis_conn.pfcount(key)
+
+
+def get_client_ip(request) -> Optional[str]:
+    """IP của client (ưu tiên X-Forwarded-For khi chạy sau proxy)."""
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        return x_forwarded_for.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR')
+
+
+def _clean_ip(value: Optional[str]) -> str:
+    """IP hợp lệ hoặc chuỗi rỗng (IP sai làm hỏng cả lô bulk_create)."""
+    if not value:
+        return ''
+    try:
+        return str(ipaddress.ip_address(value))
+    except ValueError:
+        return ''
+
+
+def enqueue_job_view(
+    job_id: int,
+    user_id: Optional[int] = None,
+    ip_address: Optional[str] = None,
+    user_agent: Optional[str] = None,
+    referrer: Optional[str] = None
+) -> bool:
+    """
+    Ghi nhận 1 lượt xem.
+
+    Returns:
+        True nếu đã đưa vào stream, False nếu đã tạo JobView trực tiếp (không có Redis)
+    """
+    event = {
+        'j': job_id,
+        'u': user_id or '',
+        'ip': _clean_ip(ip_address),
+        'ua': (user_agent or '')[:MAX_USER_AGENT_LENGTH],
+        'r': (referrer or '')[:MAX_REFERRER_LENGTH],
+        't': f"{time.time():.3f}",
+    }
+    try:
+        redis_conn = get_redis_connection("default")
+        redis_conn.xadd(
+            STREAM_KEY,
+            event,
+            maxlen=getattr(settings, 'JOB_VIEW_STREAM_MAXLEN', DEFAULT_STREAM_MAXLEN),
+            approximate=True
+        )
+        return True
+    except Exception as e:
+        logger.debug(f"Job view stream unavailable, writing directly: {e}")
+        JobView.objects.create(
+            job_id=job_id,
+            user_id=user_id,
+            ip_address=event['ip'] or None,
+            user_agent=event['ua'] or None,
+            referrer=event['r'] or None
+        )
+        return False
+
+
+def _decode(fields: dict) -> dict:
+    return {
+        (key.decode() if isinstance(key, bytes) else key): (value.decode() if isinstance(value, bytes) else value)
+        for key, value in fields.items()
+    }
+
+
+def ingest_batch(batch_size: Optional[int] = None) -> int:
+    """
+    Đọc 1 lô event từ stream, bulk_create JobView và cập nhật HLL.
+    Note: Requires Redis backend.
+
+    Returns:
+        int: Số event đã xử lý (kể cả event bị bỏ qua)
+    """
+    batch_size = batch_size or get_batch_size()
+    redis_conn = get_redis_connection("default")
+    entries = redis_conn.xrange(STREAM_KEY, count=batch_size)
+    if not entries:
+        return 0
+
+    events = []
+    for _entry_id, fields in entries:
+        event = _decode(fields)
+        try:
+            event['j'] = int(event['j'])
+            event['u'] = int(event['u']) if event.get('u') else None
+            event['t'] = datetime.fromtimestamp(float(event['t']), tz=dt_timezone.utc)
+        except (KeyError, ValueError):
+            logger.warning(f"Skipping malformed job view event: {fields}")
+            continue
+        events.append(event)
+
+    # Job/user có thể đã bị xóa trong lúc event nằm trong stream
+    job_ids = set(Job.objects.filter(id__in={e['j'] for e in events}).values_list('id', flat=True))
+    user_ids = set(CustomUser.objects.filter(
+        id__in={e['u'] for e in events if e['u']}
+    ).values_list('id', flat=True))
+
+    views = []
+    visitors = defaultdict(set)
+    for event in events:
+        if event['j'] not in job_ids:
+            continue
+        user_id = event['u'] if event['u'] in user_ids else None
+        ip = event.get('ip') or None
+        user_agent = event.get('ua') or None
+        referrer = event.get('r') or None
+        views.append(JobView(
+            job_id=event['j'],
+            user_id=user_id,
+            ip_address=ip,
+            user_agent=user_agent,
+            referrer=referrer,
+            device_type=classify_device(user_agent),
+            referrer_domain=referrer_source(referrer),
+            viewed_at=event['t']
+        ))
+        visitor = visitor_id(user_id, ip)
+        if visitor:
+            day = timezone.localtime(event['t']).date()
+            visitors[(event['j'], day)].add(visitor)
+
+    with transaction.atomic():
+        JobView.objects.bulk_create(views, batch_size=batch_size)
+
+    pipe = redis_conn.pipeline(transaction=False)
+    for (job_id, day), members in visitors.items():
+        key = unique_views_key(job_id, day)
+        pipe.pfadd(key, *members)
+        pipe.expire(key, UNIQUE_KEY_TTL)
+        pipe.pfadd(lifetime_unique_views_key(job_id), *members)
+    pipe.xdel(STREAM_KEY, *[entry_id for entry_id, _ in entries])
+    pipe.execute()
+
+    return len(entries)
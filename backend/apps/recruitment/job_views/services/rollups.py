@@ -0,0 +1,129 @@
+"""
+Tổng hợp lượt xem job theo ngày (bảng job_views_daily).
+
+Celery beat gọi rollup_pending_days định kỳ: mỗi ngày đã kết thúc được gom
+thành 1 dòng JobViewDaily / job (lượt xem, người xem, IP ẩn danh, thiết bị,
+nguồn truy cập). Selector đọc rollup cho các ngày <= watermark và chỉ quét
+bảng job_views cho phần đuôi (thường là hôm nay).
+"""
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q
+from django.utils import timezone
+
+from apps.recruitment.job_views.models import JobView, JobViewDaily
+
+logger = logging.getLogger(__name__)
+
+
+DEVICE_FIELDS = {
+    'mobile': 'mobile_views',
+    'tablet': 'tablet_views',
+    'desktop': 'desktop_views',
+    'other': 'other_device_views',
+}
+
+# Số ngày tối đa tổng hợp trong 1 lần chạy (lần đầu có thể phải chạy bù nhiều ngày)
+MAX_DAYS_PER_RUN = 31
+
+
+def day_bounds(day: date) -> Tuple[datetime, datetime]:
+    """Khoảng [bắt đầu, kết thúc) của một ngày theo múi giờ hiện tại."""
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def get_rollup_watermark() -> Optional[date]:
+    """
+    Ngày gần nhất đã được tổng hợp. Các ngày <= watermark đọc từ JobViewDaily,
+    các ngày sau đó đọc trực tiếp từ job_views.
+    """
+    last = JobViewDaily.objects.aggregate(last=Max('date'))['last']
+    if last is None:
+        return None
+    return min(last, timezone.localdate() - timedelta(days=1))
+
+
+def summarize_views(queryset) -> Dict[int, dict]:
+    """
+    Tổng hợp queryset JobView theo job. Việc đếm / gom nhóm chạy hoàn toàn
+    trong DB theo device_type / referrer_domain đã phân loại lúc ghi.
+
+    Returns:
+        dict: job_id -> {views, logged_in_views, unique_users, unique_ips,
+                         mobile_views, ..., referrers}
+    """
+    queryset = queryset.order_by()
+    summary = {}
+
+    totals = queryset.values('job_id').annotate(
+        views=Count('id'),
+        logged_in_views=Count('user'),
+        unique_users=Count('user', distinct=True),
+        unique_ips=Count('ip_address', distinct=True, filter=Q(user__isnull=True))
+    )
+    for row in totals:
+        job_id = row.pop('job_id')
+        summary[job_id] = {**row, **dict.fromkeys(DEVICE_FIELDS.values(), 0), 'referrers': {}}
+
+    devices = queryset.filter(device_type__isnull=False).values(
+        'job_id', 'device_type'
+    ).annotate(count=Count('id'))
+    for row in devices:
+        summary[row['job_id']][DEVICE_FIELDS[row['device_type']]] += row['count']
+
+    referrers = queryset.values('job_id', 'referrer_domain').annotate(count=Count('id'))
+    for row in referrers:
+        # Dòng chưa backfill (referrer_domain NULL) tính là direct
+        source = row['referrer_domain'] or 'direct'
+        job_referrers = summary[row['job_id']]['referrers']
+        job_referrers[source] = job_referrers.get(source, 0) + row['count']
+
+    return summary
+
+
+def rollup_day(day: date) -> int:
+    """
+    Tổng hợp (lại) lượt xem của một ngày cho mọi job.
+
+    Returns:
+        int: Số dòng JobViewDaily đã ghi
+    """
+    start, end = day_bounds(day)
+    summary = summarize_views(JobView.objects.filter(viewed_at__gte=start, viewed_at__lt=end))
+    rows = [JobViewDaily(job_id=job_id, date=day, **data) for job_id, data in summary.items()]
+
+    with transaction.atomic():
+        JobViewDaily.objects.filter(date=day).delete()
+        JobViewDaily.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def rollup_pending_days(max_days: int = MAX_DAYS_PER_RUN) -> int:
+    """
+    Tổng hợp các ngày đã kết thúc chưa có rollup. Ngày của watermark được
+    tổng hợp lại để nhận các event vào job_views muộn (stream ingest).
+
+    Returns:
+        int: Số ngày đã tổng hợp
+    """
+    yesterday = timezone.localdate() - timedelta(days=1)
+    watermark = JobViewDaily.objects.aggregate(last=Max('date'))['last']
+    if watermark is None:
+        first_view = JobView.objects.aggregate(first=Min('viewed_at'))['first']
+        if first_view is None:
+            return 0
+        day = timezone.localdate(first_view)
+    else:
+        day = min(watermark, yesterday)
+
+    processed = 0
+    while day <= yesterday and processed < max_days:
+        rows = rollup_day(day)
+        logger.debug(f"Rolled up {rows} job view rows for {day}")
+        day += timedelta(days=1)
+        processed += 1
+    return processed
@@ -0,0 +1,73 @@
+import uuid
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from django.core.cache import cache
+
+from apps.core.caching import CacheKeyBuilder
+from apps.recruitment.job_views.services.job_views import get_batch_size, ingest_batch
+from apps.recruitment.job_views.services.rollups import rollup_pending_days
+
+logger = get_task_logger(__name__)
+
+# Số lô tối đa trong 1 lần chạy, phần còn lại để lần chạy sau
+MAX_BATCHES_PER_RUN = 50
+
+# Lock được gia hạn sau mỗi lô, timeout chỉ cần lớn hơn thời gian 1 lô
+INGEST_LOCK_TIMEOUT = 60 * 5
+
+ROLLUP_LOCK_TIMEOUT = 60 * 30
+
+
+@shared_task
+def ingest_job_views_task():
+    """
+    Chuyển event lượt xem từ Redis stream vào bảng job_views theo lô
+    (1 worker tại một thời điểm để không xử lý trùng event).
+
+    Lock mang token của lần chạy và được gia hạn sau mỗi lô; nếu lock đã
+    hết hạn / bị worker khác lấy thì dừng ngay, không đọc thêm lô nào.
+    """
+    lock_key = CacheKeyBuilder.build('job_views', 'ingest', 'lock')
+    token = uuid.uuid4().hex
+    if not cache.add(lock_key, token, INGEST_LOCK_TIMEOUT):
+        return 0
+
+    total = 0
+    batch_size = get_batch_size()
+    try:
+        for _ in range(MAX_BATCHES_PER_RUN):
+            processed = ingest_batch(batch_size)
+            total += processed
+            if processed < batch_size:
+                break
+            if cache.get(lock_key) != token:
+                logger.warning("Job view ingest lock lost, stopping this run")
+                break
+            cache.touch(lock_key, INGEST_LOCK_TIMEOUT)
+    finally:
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+
+    if total:
+        logger.info(f"Ingested {total} job view events")
+    return total
+
+
+@shared_task
+def rollup_job_views_task():
+    """
+    Tổng hợp lượt xem các ngày đã kết thúc vào bảng job_views_daily.
+    """
+    lock_key = CacheKeyBuilder.build('job_views', 'rollup', 'lock')
+    if not cache.add(lock_key, 1, ROLLUP_LOCK_TIMEOUT):
+        return 0
+
+    try:
+        days = rollup_pending_days()
+    finally:
+        cache.delete(lock_key)
+
+    if days:
+        logger.info(f"Rolled up job views for {days} day(s)")
+    return days
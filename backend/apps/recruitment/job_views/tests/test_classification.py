@@ -0,0 +1,97 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.company.companies.models import Company
+from apps.core.users.models import CustomUser
+from apps.recruitment.job_views.models import JobView, JobViewDaily
+from apps.recruitment.job_views.selectors.job_views import get_viewer_demographics
+from apps.recruitment.job_views.services.rollups import rollup_day
+from apps.recruitment.jobs.models import Job
+
+
+class JobViewClassificationTests(TestCase):
+    """Tests cho device_type / referrer_domain phân loại lúc ghi"""
+
+    def setUp(self):
+        owner = CustomUser.objects.create_user(
+            email="owner@example.com",
+            password="password123",
+            full_name="Job Owner"
+        )
+        company = Company.objects.create(user=owner, company_name="Test Company")
+        self.job = Job.objects.create(
+            company=company,
+            title="Python Developer",
+            slug="python-developer-classify",
+            description="Job description",
+            requirements="Job requirements",
+            status="published",
+            created_by=owner
+        )
+
+    def _create_views(self, count):
+        sources = [
+            ('Mozilla/5.0 (iPhone; CPU iPhone OS 17_0)', 'https://www.google.com/search?q=python'),
+            ('Mozilla/5.0 (Windows NT 10.0; Win64; x64)', 'https://linkedin.com/jobs/view/1'),
+            (None, None),
+        ]
+        for i in range(count):
+            user_agent, referrer = sources[i % len(sources)]
+            JobView.objects.create(job=self.job, user_agent=user_agent, referrer=referrer)
+
+    def test_save_classifies_view(self):
+        self._create_views(3)
+
+        self.assertEqual(
+            list(JobView.objects.order_by('id').values_list('device_type', 'referrer_domain')),
+            [('mobile', 'google.com'), ('desktop', 'linkedin.com'), (None, 'direct')]
+        )
+
+    def test_demographics_queries_do_not_grow_with_views(self):
+        self._create_views(30)
+
+        # watermark + tổng hợp + thiết bị + nguồn truy cập
+        with self.assertNumQueries(4):
+            demographics = get_viewer_demographics(self.job.id)
+
+        self.assertEqual(demographics['by_device'], [
+            {"device": "mobile", "count": 10},
+            {"device": "desktop", "count": 10},
+        ])
+        self.assertEqual(
+            {r['source']: r['count'] for r in demographics['by_referrer']},
+            {'google.com': 10, 'linkedin.com': 10, 'direct': 10}
+        )
+        self.assertEqual(demographics['authenticated_ratio'], {"logged_in": 0, "anonymous": 30})
+
+    def test_backfill_command_classifies_existing_rows(self):
+        self._create_views(5)
+        JobView.objects.update(device_type=None, referrer_domain=None)
+
+        out = StringIO()
+        call_command('backfill_job_view_classification', batch_size=2, stdout=out)
+
+        self.assertIn('Successfully classified 5 job views', out.getvalue())
+        self.assertFalse(JobView.objects.filter(referrer_domain__isnull=True).exists())
+        self.assertEqual(JobView.objects.filter(device_type='mobile').count(), 2)
+
+    def test_backfill_command_refreshes_rolled_up_days(self):
+        self._create_views(5)
+        yesterday = timezone.localdate() - timedelta(days=1)
+        JobView.objects.update(
+            viewed_at=timezone.now() - timedelta(days=1), device_type=None, referrer_domain=None
+        )
+        rollup_day(yesterday)
+        self.assertEqual(JobViewDaily.objects.get(job=self.job, date=yesterday).mobile_views, 0)
+
+        out = StringIO()
+        call_command('backfill_job_view_classification', stdout=out)
+
+        daily = JobViewDaily.objects.get(job=self.job, date=yesterday)
+        self.assertEqual(daily.mobile_views, 2)
+        self.assertEqual(daily.referrers, {'google.com': 2, 'linkedin.com': 2, 'direct': 1})
+        self.assertIn('Re-rolled up 1 days', out.getvalue())
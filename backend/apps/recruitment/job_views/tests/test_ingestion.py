@@ -0,0 +1,188 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.company.companies.models import Company
+from apps.core.caching import CacheKeyBuilder
+from apps.core.users.models import CustomUser
+from apps.recruitment.job_views.models import JobView
+from apps.recruitment.job_views.services.job_views import STREAM_KEY, enqueue_job_view, lifetime_unique_views_key
+from apps.recruitment.job_views.tasks import ingest_job_views_task
+from apps.recruitment.jobs.models import Job
+
+
+class FakeRedis:
+    """Redis tối giản cho stream + HyperLogLog (HLL mô phỏng bằng set)."""
+
+    def __init__(self):
+        self.streams = {}
+        self.sets = {}
+        self.values = {}
+        self.sequence = 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def xadd(self, key, fields, maxlen=None, approximate=True):
+        self.sequence += 1
+        entry_id = f"{self.sequence}-0".encode()
+        data = {str(k).encode(): str(v).encode() for k, v in fields.items()}
+        self.streams.setdefault(key, []).append((entry_id, data))
+        return entry_id
+
+    def xrange(self, key, min='-', max='+', count=None):
+        return list(self.streams.get(key, []))[:count]
+
+    def xdel(self, key, *ids):
+        before = len(self.streams.get(key, []))
+        self.streams[key] = [entry for entry in self.streams.get(key, []) if entry[0] not in ids]
+        return before - len(self.streams[key])
+
+    def pfadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+
+    def pfcount(self, key):
+        return len(self.sets.get(key, ()))
+
+    def expire(self, key, seconds):
+        return True
+
+    def exists(self, key):
+        return int(key in self.sets or key in self.values)
+
+    def set(self, key, value):
+        self.values[key] = value
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        return [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+class JobViewIngestionTests(APITestCase):
+    """Tests cho pipeline Redis stream -> bảng job_views"""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = CustomUser.objects.create_user(
+            email="owner@example.com",
+            password="password123",
+            full_name="Job Owner"
+        )
+        self.viewer = CustomUser.objects.create_user(
+            email="viewer@example.com",
+            password="password123",
+            full_name="Job Viewer"
+        )
+        company = Company.objects.create(user=self.owner, company_name="Test Company")
+        self.job = Job.objects.create(
+            company=company,
+            title="Python Developer",
+            slug="python-developer-ingest",
+            description="Job description",
+            requirements="Job requirements",
+            status="published",
+            created_by=self.owner
+        )
+
+        self.redis = FakeRedis()
+        for target in (
+            'apps.recruitment.job_views.services.job_views.get_redis_connection',
+            'apps.recruitment.job_views.selectors.job_views.get_redis_connection',
+        ):
+            patcher = patch(target, return_value=self.redis)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_view_endpoint_appends_event_without_insert(self):
+        self.client.force_authenticate(user=self.viewer)
+
+        response = self.client.post(
+            f'/api/jobs/{self.job.id}/view/',
+            HTTP_USER_AGENT='Mozilla/5.0 (iPhone)',
+            HTTP_REFERER='https://www.google.com/search?q=python',
+            HTTP_X_FORWARDED_FOR='203.0.113.5, 10.0.0.1'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(JobView.objects.exists())
+        (_, event), = self.redis.streams[STREAM_KEY]
+        self.assertEqual(event[b'j'], str(self.job.id).encode())
+        self.assertEqual(event[b'u'], str(self.viewer.id).encode())
+        self.assertEqual(event[b'ip'], b'203.0.113.5')
+        self.assertEqual(event[b'ua'], b'Mozilla/5.0 (iPhone)')
+
+    def test_ingest_bulk_creates_views_and_counts_unique(self):
+        viewed_at = timezone.now() - timedelta(minutes=5)
+        with patch('apps.recruitment.job_views.services.job_views.time.time', return_value=viewed_at.timestamp()):
+            enqueue_job_view(self.job.id, user_id=self.viewer.id, ip_address='10.0.0.1')
+            enqueue_job_view(self.job.id, user_id=self.viewer.id, ip_address='10.0.0.2')
+            enqueue_job_view(self.job.id, ip_address='10.0.0.3', referrer='https://linkedin.com/jobs')
+            enqueue_job_view(self.job.id, ip_address='not-an-ip')
+            enqueue_job_view(999999, user_id=self.viewer.id)
+
+        with self.assertNumQueries(5):  # job ids, user ids, SAVEPOINT + INSERT + RELEASE
+            processed = ingest_job_views_task()
+
+        self.assertEqual(processed, 5)
+        self.assertEqual(self.redis.streams[STREAM_KEY], [])
+        self.assertEqual(JobView.objects.filter(job=self.job).count(), 4)
+        self.assertEqual(JobView.objects.filter(ip_address__isnull=True).count(), 1)
+        self.assertTrue(all(
+            abs((view.viewed_at - viewed_at).total_seconds()) < 1 for view in JobView.objects.all()
+        ))
+
+        self.client.force_authenticate(user=self.owner)
+        chart = self.client.get(f'/api/jobs/{self.job.id}/views/chart/?period=7d')
+        today = chart.data['data'][-1]
+        self.assertEqual(today['views'], 4)
+        self.assertEqual(today['unique_views'], 2)
+        self.assertEqual(self.redis.pfcount(lifetime_unique_views_key(self.job.id)), 2)
+
+    def test_without_redis_view_is_written_directly(self):
+        with patch(
+            'apps.recruitment.job_views.services.job_views.get_redis_connection',
+            side_effect=NotImplementedError
+        ):
+            self.assertFalse(enqueue_job_view(self.job.id, ip_address='10.0.0.1'))
+
+        self.assertEqual(JobView.objects.get().ip_address, '10.0.0.1')
+
+    @patch('apps.recruitment.job_views.tasks.get_batch_size', return_value=10)
+    @patch('apps.recruitment.job_views.tasks.ingest_batch', side_effect=[10, 10, 3])
+    def test_ingest_lock_is_extended_between_batches(self, mock_ingest, mock_batch_size):
+        with patch('apps.recruitment.job_views.tasks.cache.touch', wraps=cache.touch) as mock_touch:
+            self.assertEqual(ingest_job_views_task(), 23)
+
+        self.assertEqual(mock_touch.call_count, 2)
+        self.assertIsNone(cache.get(CacheKeyBuilder.build('job_views', 'ingest', 'lock')))
+
+    @patch('apps.recruitment.job_views.tasks.get_batch_size', return_value=10)
+    @patch('apps.recruitment.job_views.tasks.ingest_batch')
+    def test_ingest_stops_when_lock_is_lost(self, mock_ingest, mock_batch_size):
+        lock_key = CacheKeyBuilder.build('job_views', 'ingest', 'lock')
+
+        def expire_and_take_over(batch_size):
+            # Lock hết hạn giữa chừng, worker khác đã lấy lock
+            cache.set(lock_key, 'other-worker')
+            return batch_size
+        mock_ingest.side_effect = expire_and_take_over
+
+        self.assertEqual(ingest_job_views_task(), 10)
+
+        mock_ingest.assert_called_once()
+        self.assertEqual(cache.get(lock_key), 'other-worker')
@@ -0,0 +1,147 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.company.companies.models import Company
+from apps.core.users.models import CustomUser
+from apps.recruitment.job_views.models import JobView, JobViewDaily
+from apps.recruitment.job_views.selectors.job_views import (
+    get_view_chart_data,
+    get_view_stats,
+    get_viewer_demographics,
+)
+from apps.recruitment.job_views.tasks import rollup_job_views_task
+from apps.recruitment.job_views.tests.test_ingestion import FakeRedis
+from apps.recruitment.jobs.models import Job
+
+
+class JobViewRollupTests(TestCase):
+    """Tests cho bảng tổng hợp lượt xem theo ngày"""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = CustomUser.objects.create_user(
+            email="owner@example.com",
+            password="password123",
+            full_name="Job Owner"
+        )
+        self.viewer = CustomUser.objects.create_user(
+            email="viewer@example.com",
+            password="password123",
+            full_name="Job Viewer"
+        )
+        company = Company.objects.create(user=self.owner, company_name="Test Company")
+        self.job = Job.objects.create(
+            company=company,
+            title="Python Developer",
+            slug="python-developer-rollup",
+            description="Job description",
+            requirements="Job requirements",
+            status="published",
+            created_by=self.owner
+        )
+        self.now = timezone.now()
+
+        self._view(days_ago=3, user=self.viewer, user_agent='Mozilla/5.0 (iPhone)',
+                   referrer='https://www.google.com/search?q=python')
+        self._view(days_ago=3, user=self.viewer, user_agent='Mozilla/5.0 (Windows NT 10.0)')
+        self._view(days_ago=3, ip='10.0.0.1', referrer='https://linkedin.com/jobs')
+        self._view(days_ago=1, ip='10.0.0.1')
+        self._view(days_ago=1, ip='10.0.0.2', user_agent='Mozilla/5.0 (iPad; tablet)')
+        self._view(days_ago=0, user=self.viewer, referrer='https://google.com/')
+
+    def _view(self, days_ago, user=None, ip=None, user_agent=None, referrer=None):
+        return JobView.objects.create(
+            job=self.job,
+            user=user,
+            ip_address=ip,
+            user_agent=user_agent,
+            referrer=referrer,
+            viewed_at=self.now - timedelta(days=days_ago)
+        )
+
+    def _snapshot(self):
+        return (
+            get_view_stats(self.job.id),
+            get_view_chart_data(self.job.id, '7d'),
+            get_viewer_demographics(self.job.id),
+        )
+
+    def test_rollup_builds_daily_rows(self):
+        self.assertEqual(rollup_job_views_task(), 3)  # 3 ngày trước -> hôm qua
+
+        self.assertEqual(JobViewDaily.objects.count(), 2)
+        day = JobViewDaily.objects.get(date=timezone.localdate() - timedelta(days=3))
+        self.assertEqual(day.views, 3)
+        self.assertEqual(day.logged_in_views, 2)
+        self.assertEqual(day.unique_users, 1)
+        self.assertEqual(day.unique_ips, 1)
+        self.assertEqual((day.mobile_views, day.desktop_views, day.tablet_views), (1, 1, 0))
+        self.assertEqual(day.referrers, {'google.com': 1, 'linkedin.com': 1, 'direct': 1})
+
+    def test_selectors_match_raw_counts(self):
+        before = self._snapshot()
+
+        rollup_job_views_task()
+
+        self.assertEqual(self._snapshot(), before)
+        stats = before[0]
+        self.assertEqual(stats['total_views'], 6)
+        # viewer (3 ngày) + 2 IP ẩn danh, mỗi người chỉ đếm 1 lần
+        self.assertEqual(stats['unique_views'], 3)
+        self.assertEqual(stats['views_today'], 1)
+
+    def test_closed_days_read_from_rollups(self):
+        rollup_job_views_task()
+        before = self._snapshot()
+
+        # Dữ liệu thô của các ngày đã tổng hợp không còn được quét
+        # (trừ unique_views: đếm distinct trên toàn bộ lịch sử)
+        JobView.objects.filter(viewed_at__lt=self.now - timedelta(hours=12)).delete()
+
+        after = self._snapshot()
+        for snapshot in (before, after):
+            snapshot[0].pop('unique_views')
+        self.assertEqual(after, before)
+
+    def test_stats_never_scan_closed_days(self):
+        redis = FakeRedis()
+        with patch('apps.recruitment.job_views.selectors.job_views.get_redis_connection', return_value=redis):
+            rollup_job_views_task()
+            # Lần đọc đầu nạp HLL trọn đời từ job_views
+            before = get_view_stats(self.job.id)
+
+            with CaptureQueriesContext(connection) as queries:
+                after = get_view_stats(self.job.id)
+            # Xóa dữ liệu thô của các ngày đã tổng hợp: kết quả không đổi
+            JobView.objects.filter(viewed_at__lt=self.now - timedelta(hours=12)).delete()
+            deleted = get_view_stats(self.job.id)
+
+        self.assertEqual(before['unique_views'], 3)
+        self.assertEqual(after, before)
+        self.assertEqual(deleted, before)
+        raw_scans = [q['sql'] for q in queries.captured_queries if '"job_views"' in q['sql']]
+        self.assertTrue(raw_scans)
+        self.assertTrue(all('"viewed_at" >=' in sql for sql in raw_scans))
+
+    def test_unique_views_counts_repeat_viewer_once(self):
+        rollup_job_views_task()
+        self._view(days_ago=0, ip='10.0.0.1')
+
+        self.assertEqual(get_view_stats(self.job.id)['unique_views'], 3)
+
+    def test_rerun_picks_up_late_events(self):
+        rollup_job_views_task()
+        self._view(days_ago=1, ip='10.0.0.3')
+
+        rollup_job_views_task()
+
+        yesterday = JobViewDaily.objects.get(date=timezone.localdate() - timedelta(days=1))
+        self.assertEqual(yesterday.views, 3)
+        self.assertEqual(yesterday.unique_ips, 3)
+        self.assertEqual(get_view_stats(self.job.id)['total_views'], 7)
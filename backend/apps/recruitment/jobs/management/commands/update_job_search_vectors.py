@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from apps.recruitment.jobs.models import Job
+from apps.recruitment.jobs.services.jobs import update_job_search_vectors
+
+
+class Command(BaseCommand):
+    help = 'Rebuild search_vector (full-text search) cho tất cả jobs theo từng batch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        job_ids = Job.objects.order_by('id').values_list('id', flat=True)
+
+        total = 0
+        batch = []
+        for job_id in job_ids.iterator(chunk_size=batch_size):
+            batch.append(job_id)
+            if len(batch) >= batch_size:
+                total += update_job_search_vectors(batch)
+                batch = []
+                self.stdout.write(f"Updated {total} jobs...")
+
+        if batch:
+            total += update_job_search_vectors(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Successfully rebuilt search vectors for {total} jobs."))
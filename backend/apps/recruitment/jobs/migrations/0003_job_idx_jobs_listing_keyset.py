@@ -0,0 +1,17 @@
+# Generated by Django 5.2.10 on 2026-10-16 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment_jobs', '0002_job_idx_jobs_title_desc_gin'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'published')), fields=['-featured', '-published_at', '-created_at', 'id'], name='idx_jobs_listing_keyset'),
+        ),
+    ]
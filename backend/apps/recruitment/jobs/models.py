@@ -1,10 +1,14 @@
 from django.db import models
 from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 
 
 class Job(models.Model):
     """Bảng Jobs - Tin tuyển dụng"""
     
+    # Text search config cho tsvector (nội dung tiếng Việt không có stemmer)
+    SEARCH_CONFIG = 'simple'
+    
     class JobType(models.TextChoices):
         FULL_TIME = 'full-time', 'Toàn thời gian'
         PART_TIME = 'part-time', 'Bán thời gian'
@@ -171,6 +175,12 @@ class Job(models.Model):
         db_index=True,
         verbose_name='Ngày đăng'
     )
+    search_vector = SearchVectorField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Full-text search vector'
+    )
     created_by = models.ForeignKey(
         'core_users.CustomUser',
         on_delete=models.CASCADE,
@@ -193,12 +203,19 @@ class Job(models.Model):
         indexes = [
             models.Index(fields=['company', 'status'], name='idx_jobs_company_status'),
             models.Index(fields=['category', 'status'], name='idx_jobs_category_status'),
+            # Keyset pagination cho public listing (JobKeysetPagination)
+            models.Index(
+                fields=['-featured', '-published_at', '-created_at', 'id'],
+                name='idx_jobs_listing_keyset',
+                condition=models.Q(status='published'),
+            ),
             # FTS Index
             GinIndex(
                 fields=['title', 'description'], 
                 name='idx_jobs_title_desc_gin',
                 opclasses=['gin_trgm_ops', 'gin_trgm_ops']
             ),
+            GinIndex(fields=['search_vector'], name='idx_jobs_search_vector_gin'),
         ]
     
     def __str__(self):
@@ -1,14 +1,33 @@
 from typing import Optional
 
-from django.db.models import QuerySet, Q, Count, Case, When, IntegerField, Value
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import connection
+from django.db.models import QuerySet, Q, F, Count, Case, When, IntegerField, CharField, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from datetime import timedelta
 
+from apps.core.counters import job_view_counter
 from apps.recruitment.jobs.models import Job
 from apps.recruitment.applications.models import Application
 from apps.candidate.recruiter_skills.models import RecruiterSkill
 from apps.recruitment.job_skills.models import JobSkill
+from apps.candidate.skills.models import Skill
+
+# Ngưỡng similarity cho gợi ý "did you mean" (pg_trgm mặc định 0.3)
+SUGGESTION_SIMILARITY_THRESHOLD = 0.3
+
+# Salary buckets cho facet (VND/tháng), theo salary_max (fallback salary_min)
+# (key, label, min inclusive, max exclusive)
+SALARY_BUCKETS = [
+    ('under_10m', 'Dưới 10 triệu', None, 10_000_000),
+    ('10m_20m', '10 - 20 triệu', 10_000_000, 20_000_000),
+    ('20m_30m', '20 - 30 triệu', 20_000_000, 30_000_000),
+    ('30m_50m', '30 - 50 triệu', 30_000_000, 50_000_000),
+    ('over_50m', 'Trên 50 triệu', 50_000_000, None),
+]
+SALARY_BUCKET_NEGOTIABLE = ('negotiable', 'Thỏa thuận')
 
 def list_jobs(filters: dict = None) -> QuerySet[Job]:
     """
@@ -20,14 +39,15 @@ def list_jobs(filters: dict = None) -> QuerySet[Job]:
             - job_type: str (full-time, part-time, etc.)
             - level: str (intern, fresher, junior, etc.)
             - status: str (draft, published, closed, expired)
+            - province_id: int
             - is_remote: bool
             - salary_min: decimal
             - salary_max: decimal
-            - search: str (search in title)
+            - search: str (full-text search, sắp xếp theo độ liên quan)
     """
     queryset = Job.objects.select_related(
         'company', 'category', 'created_by'
-    )
+    ).defer('search_vector')
     
     if not filters:
         return queryset.order_by('-published_at', '-created_at')
@@ -55,6 +75,10 @@ def list_jobs(filters: dict = None) -> QuerySet[Job]:
         # Default: only show published jobs for public
         queryset = queryset.filter(status='published')
     
+    # Filter by province (địa chỉ làm việc)
+    if filters.get('province_id'):
+        queryset = queryset.filter(address__province_id=filters['province_id'])
+    
     # Filter by is_remote
     if filters.get('is_remote') is not None:
         queryset = queryset.filter(is_remote=filters['is_remote'])
@@ -70,13 +94,168 @@ def list_jobs(filters: dict = None) -> QuerySet[Job]:
             Q(salary_min__lte=filters['salary_max']) | Q(is_salary_negotiable=True)
         )
     
-    # Search in title
+    # Full-text search
     if filters.get('search'):
-        queryset = queryset.filter(title__icontains=filters['search'])
+        return _apply_full_text_search(queryset, filters['search'])
     
     return queryset.order_by('-featured', '-published_at', '-created_at')
 
 
+def _apply_full_text_search(queryset: QuerySet[Job], query: str) -> QuerySet[Job]:
+    """
+        Full-text search trên search_vector (GIN index), sắp xếp theo SearchRank.
+        Backend không phải PostgreSQL (SQLite khi test) fallback về icontains.
+    """
+    if connection.vendor != 'postgresql':
+        return queryset.filter(
+            Q(title__icontains=query) | Q(description__icontains=query)
+        ).order_by('-featured', '-published_at', '-created_at')
+    
+    search_query = SearchQuery(query, search_type='websearch', config=Job.SEARCH_CONFIG)
+    return queryset.filter(
+        search_vector=search_query
+    ).annotate(
+        rank=SearchRank(F('search_vector'), search_query)
+    ).order_by('-rank', '-featured', '-published_at')
+
+
+def search_jobs(query: str, filters: dict = None) -> QuerySet[Job]:
+    """
+        Tìm kiếm jobs đã đăng theo từ khóa, kết hợp các filter của list_jobs.
+        Kết quả sắp xếp theo độ liên quan (SearchRank).
+    """
+    filters = dict(filters or {})
+    filters['search'] = query
+    filters.setdefault('status', 'published')
+    return list_jobs(filters)
+
+
+def _salary_bucket_expressions() -> tuple:
+    """
+        Expressions phân loại job vào salary bucket.
+        Returns: (salary_value, salary_bucket) - salary_bucket tham chiếu
+        annotation salary_value nên phải annotate theo đúng thứ tự.
+    """
+    salary = Coalesce('salary_max', 'salary_min')
+    whens = [When(salary_min__isnull=True, salary_max__isnull=True, then=Value(SALARY_BUCKET_NEGOTIABLE[0]))]
+    for key, _label, lower, upper in SALARY_BUCKETS:
+        condition = Q()
+        if lower is not None:
+            condition &= Q(salary_value__gte=lower)
+        if upper is not None:
+            condition &= Q(salary_value__lt=upper)
+        whens.append(When(condition, then=Value(key)))
+    return salary, Case(*whens, default=Value(SALARY_BUCKET_NEGOTIABLE[0]), output_field=CharField())
+
+
+def get_job_facets(queryset: QuerySet[Job]) -> dict:
+    """
+        Đếm facet (category, level, job_type, province, salary) cho tập jobs.
+        
+        Dùng MỘT câu GROUP BY trên tổ hợp các chiều facet rồi cộng dồn
+        từng chiều ở Python (số tổ hợp nhỏ hơn nhiều so với số jobs).
+        Counts phản ánh filter hiện tại của queryset.
+    """
+    salary_value, salary_bucket = _salary_bucket_expressions()
+    
+    rows = queryset.order_by().annotate(
+        salary_value=salary_value
+    ).annotate(
+        salary_bucket=salary_bucket
+    ).values(
+        'category_id', 'category__name',
+        'address__province_id', 'address__province__province_name',
+        'level', 'job_type', 'salary_bucket'
+    ).annotate(
+        count=Count('id')
+    )
+    
+    categories = {}
+    provinces = {}
+    levels = {}
+    job_types = {}
+    salaries = {}
+    for row in rows:
+        count = row['count']
+        if row['category_id']:
+            entry = categories.setdefault(row['category_id'], {
+                'id': row['category_id'], 'name': row['category__name'], 'count': 0
+            })
+            entry['count'] += count
+        if row['address__province_id']:
+            entry = provinces.setdefault(row['address__province_id'], {
+                'id': row['address__province_id'],
+                'name': row['address__province__province_name'],
+                'count': 0
+            })
+            entry['count'] += count
+        levels[row['level']] = levels.get(row['level'], 0) + count
+        job_types[row['job_type']] = job_types.get(row['job_type'], 0) + count
+        salaries[row['salary_bucket']] = salaries.get(row['salary_bucket'], 0) + count
+    
+    level_labels = dict(Job.Level.choices)
+    job_type_labels = dict(Job.JobType.choices)
+    salary_labels = {key: label for key, label, _lower, _upper in SALARY_BUCKETS}
+    salary_labels[SALARY_BUCKET_NEGOTIABLE[0]] = SALARY_BUCKET_NEGOTIABLE[1]
+    
+    def _sorted(items):
+        return sorted(items, key=lambda item: item['count'], reverse=True)
+    
+    return {
+        'category': _sorted(categories.values()),
+        'level': _sorted(
+            {'value': key, 'label': level_labels.get(key, key), 'count': count}
+            for key, count in levels.items()
+        ),
+        'job_type': _sorted(
+            {'value': key, 'label': job_type_labels.get(key, key), 'count': count}
+            for key, count in job_types.items()
+        ),
+        'province': _sorted(provinces.values()),
+        # Salary giữ thứ tự bucket thay vì theo count
+        'salary': [
+            {'value': key, 'label': salary_labels[key], 'count': salaries[key]}
+            for key in [SALARY_BUCKET_NEGOTIABLE[0]] + [bucket[0] for bucket in SALARY_BUCKETS]
+            if key in salaries
+        ],
+    }
+
+
+def get_search_suggestions(query: str, limit: int = 5) -> list[str]:
+    """
+        Gợi ý "did you mean" dựa trên trigram similarity
+        với title của jobs đã đăng và tên skills.
+        Trả về list rỗng nếu không phải PostgreSQL.
+    """
+    if connection.vendor != 'postgresql' or not query:
+        return []
+    
+    # trigram_similar dùng operator % → tận dụng idx_jobs_title_desc_gin
+    titles = Job.objects.filter(
+        status='published',
+        title__trigram_similar=query
+    ).annotate(
+        similarity=TrigramSimilarity('title', query)
+    ).order_by('-similarity').values_list('title', 'similarity')[:limit * 3]
+    
+    skills = Skill.objects.annotate(
+        similarity=TrigramSimilarity('name', query)
+    ).filter(
+        similarity__gte=SUGGESTION_SIMILARITY_THRESHOLD
+    ).order_by('-similarity').values_list('name', 'similarity')[:limit]
+    
+    candidates = sorted(list(titles) + list(skills), key=lambda item: item[1], reverse=True)
+    
+    suggestions = []
+    for text, _similarity in candidates:
+        if text.lower() == query.lower() or text in suggestions:
+            continue
+        suggestions.append(text)
+        if len(suggestions) >= limit:
+            break
+    return suggestions
+
+
 def get_job_by_id(job_id: int) -> Optional[Job]:
     """
         Lấy job theo ID.
@@ -124,7 +303,7 @@ def get_job_stats(job_id: int) -> dict:
     applications_by_status = {item['status']: item['count'] for item in status_counts}
     
     return {
-        'view_count': job.view_count,
+        'view_count': job_view_counter.value(job),
         'application_count': job.application_count,
         'applications_by_status': applications_by_status
     }
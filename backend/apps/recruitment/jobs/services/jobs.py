@@ -4,13 +4,18 @@ from decimal import Decimal
 import uuid
 
 from pydantic import BaseModel
-from django.db import transaction
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchVector
+from django.db import connection, transaction
+from django.db.models import OuterRef, Subquery
 from django.utils.text import slugify
 from django.utils import timezone
 
 from apps.recruitment.jobs.models import Job
+from apps.recruitment.job_skills.models import JobSkill
 from apps.company.companies.models import Company
 from apps.core.users.models import CustomUser
+from apps.core.counters import job_view_counter
 
 
 class JobInput(BaseModel):
@@ -244,17 +249,12 @@ def duplicate_job(user: CustomUser, job: Job) -> Job:
     return new_job
 
 
-@transaction.atomic
-def record_job_view(job: Job) -> Job:
+def record_job_view(job: Job) -> int:
     """
-        Ghi nhận lượt xem (atomic increment).
+        Ghi nhận lượt xem (write-behind qua Redis, flush xuống DB định kỳ).
+        Returns: view_count hiện tại (gồm lượt xem chưa flush)
     """
-    from django.db.models import F
-    Job.objects.filter(id=job.id).update(
-        view_count=F('view_count') + 1
-    )
-    job.refresh_from_db()
-    return job
+    return job_view_counter.increment(job)
 
 
 @transaction.atomic
@@ -276,3 +276,36 @@ def set_job_featured(job: Job, featured: bool, featured_until=None) -> Job:
     
     job.save()
     return job
+
+
+def update_job_search_vectors(job_ids: list[int]) -> int:
+    """
+        Cập nhật search_vector (tsvector) cho các job bằng một câu UPDATE.
+        
+        Trọng số:
+            - A: title
+            - B: tên các skill yêu cầu
+            - C: requirements
+            - D: description
+        
+        Chỉ chạy trên PostgreSQL, các backend khác bỏ qua.
+        Returns: số job đã cập nhật
+    """
+    if connection.vendor != 'postgresql' or not job_ids:
+        return 0
+    
+    skill_names = JobSkill.objects.filter(
+        job_id=OuterRef('pk')
+    ).values('job_id').annotate(
+        names=StringAgg('skill__name', delimiter=' ')
+    ).values('names')
+    
+    config = Job.SEARCH_CONFIG
+    return Job.objects.filter(id__in=job_ids).update(
+        search_vector=(
+            SearchVector('title', weight='A', config=config)
+            + SearchVector(Subquery(skill_names), weight='B', config=config)
+            + SearchVector('requirements', weight='C', config=config)
+            + SearchVector('description', weight='D', config=config)
+        )
+    )
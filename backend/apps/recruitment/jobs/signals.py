@@ -0,0 +1,68 @@
+from django.db import connection
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from apps.core.caching import CacheService
+from apps.recruitment.jobs.models import Job
+from apps.recruitment.jobs.services.jobs import update_job_search_vectors
+from apps.recruitment.job_skills.models import JobSkill
+
+# Các field của Job đóng góp vào search_vector
+SEARCH_VECTOR_FIELDS = {'title', 'requirements', 'description'}
+
+
+@receiver(post_save, sender=Job)
+def invalidate_job_list_cache(sender, instance, **kwargs):
+    """
+    Invalidate job listing cache khi job được publish/close
+    hoặc khi một job đang hiển thị công khai bị chỉnh sửa.
+    Job nháp không xuất hiện trong listing public nên bỏ qua.
+    """
+    if instance.status != Job.Status.DRAFT:
+        CacheService.invalidate_job_list()
+
+
+@receiver(post_delete, sender=Job)
+def invalidate_job_list_cache_on_delete(sender, instance, **kwargs):
+    """
+    Invalidate job listing cache khi xóa job.
+    """
+    if instance.status != Job.Status.DRAFT:
+        CacheService.invalidate_job_list()
+
+
+@receiver(pre_save, sender=Job)
+def remember_job_search_text(sender, instance, update_fields=None, **kwargs):
+    """
+    Đọc nội dung text đang lưu của job trước một save đầy đủ, để
+    refresh_job_search_vector biết text có thật sự thay đổi không.
+    Chỉ cần trên PostgreSQL (backend khác không có search_vector).
+    """
+    instance._search_text = None
+    if update_fields is not None or instance._state.adding or connection.vendor != 'postgresql':
+        return
+    instance._search_text = Job.objects.filter(pk=instance.pk).values(*SEARCH_VECTOR_FIELDS).first()
+
+
+@receiver(post_save, sender=Job)
+def refresh_job_search_vector(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Cập nhật search_vector khi nội dung text của job thay đổi.
+    Bỏ qua các save chỉ đụng tới field không liên quan (update_fields)
+    và các save đầy đủ không làm đổi title / requirements / description.
+    """
+    stored = instance.__dict__.pop('_search_text', None)
+    if not created:
+        if update_fields is not None and not SEARCH_VECTOR_FIELDS.intersection(update_fields):
+            return
+        if stored and all(stored[field] == getattr(instance, field) for field in SEARCH_VECTOR_FIELDS):
+            return
+    update_job_search_vectors([instance.id])
+
+
+@receiver([post_save, post_delete], sender=JobSkill)
+def refresh_job_search_vector_skills(sender, instance, **kwargs):
+    """
+    Cập nhật search_vector khi skill của job được thêm/xóa.
+    """
+    update_job_search_vectors([instance.job_id])
@@ -0,0 +1,129 @@
+from unittest import skipUnless
+from unittest.mock import Mock, patch
+
+from django.db import connection, connections
+from django.db.backends.postgresql.base import DatabaseWrapper
+from django.test import TestCase
+
+from apps.candidate.skill_categories.models import SkillCategory
+from apps.candidate.skills.models import Skill
+from apps.company.companies.models import Company
+from apps.core.users.models import CustomUser
+from apps.recruitment.job_skills.models import JobSkill
+from apps.recruitment.jobs.models import Job
+from apps.recruitment.jobs.selectors import jobs as job_selectors
+from apps.recruitment.jobs.selectors.jobs import search_jobs
+
+
+class JobSearchTestMixin:
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            email="employer@example.com",
+            password="password123",
+            full_name="Employer User"
+        )
+        self.company = Company.objects.create(user=self.user, company_name="Test Company")
+
+    def _create_job(self, title, slug, description="Job description", requirements="Job requirements"):
+        return Job.objects.create(
+            company=self.company,
+            title=title,
+            slug=slug,
+            description=description,
+            requirements=requirements,
+            status="published",
+            created_by=self.user
+        )
+
+
+class FullTextSearchQueryTests(JobSearchTestMixin, TestCase):
+    """Tests cho câu SQL full-text search sinh ra cho PostgreSQL"""
+
+    def _postgres_connection(self):
+        return DatabaseWrapper(
+            {**connections['default'].settings_dict, 'ENGINE': 'django.db.backends.postgresql', 'NAME': 'jobportal'},
+            alias='postgres-sql'
+        )
+
+    def test_search_uses_search_vector_and_rank(self):
+        postgres = self._postgres_connection()
+        with patch.object(job_selectors, 'connection', postgres):
+            queryset = search_jobs('python django')
+
+        self.assertIn('rank', queryset.query.annotations)
+        self.assertEqual(queryset.query.order_by, ('-rank', '-featured', '-published_at'))
+
+        sql, params = queryset.query.get_compiler(connection=postgres).as_sql()
+        self.assertIn('"jobs"."search_vector" @@ (websearch_to_tsquery(%s::regconfig, %s))', sql)
+        self.assertIn('ts_rank("jobs"."search_vector", websearch_to_tsquery(%s::regconfig, %s)) AS "rank"', sql)
+        self.assertNotIn('LIKE', sql)
+        self.assertEqual(params.count('python django'), 2)
+        self.assertIn(Job.SEARCH_CONFIG, params)
+
+    def test_other_backends_fall_back_to_icontains(self):
+        self._create_job("Python Developer", "python-developer-fallback")
+        self._create_job("Accountant", "accountant-fallback")
+
+        queryset = search_jobs('python')
+
+        self.assertNotIn('rank', queryset.query.annotations)
+        self.assertEqual([job.title for job in queryset], ["Python Developer"])
+
+
+@patch('apps.recruitment.jobs.signals.update_job_search_vectors')
+@patch('apps.recruitment.jobs.signals.connection', Mock(vendor='postgresql'))
+class SearchVectorSignalTests(JobSearchTestMixin, TestCase):
+    """Tests cho việc chỉ tính lại search_vector khi text thay đổi"""
+
+    def setUp(self):
+        super().setUp()
+        self.job = self._create_job("Python Developer", "python-developer-signal")
+
+    def test_created_job_is_indexed(self, mock_update):
+        job = self._create_job("Go Developer", "go-developer-signal")
+        mock_update.assert_called_once_with([job.id])
+
+    def test_full_save_without_text_change_is_skipped(self, mock_update):
+        job = Job.objects.get(id=self.job.id)
+        job.featured = True
+        job.save()
+
+        mock_update.assert_not_called()
+
+    def test_full_save_with_text_change_is_indexed(self, mock_update):
+        job = Job.objects.get(id=self.job.id)
+        job.requirements = "Django, PostgreSQL"
+        job.save()
+
+        mock_update.assert_called_once_with([job.id])
+
+    def test_unrelated_update_fields_are_skipped(self, mock_update):
+        self.job.view_count = 10
+        self.job.save(update_fields=['view_count'])
+        self.job.title = "Senior Python Developer"
+        self.job.save(update_fields=['title'])
+
+        mock_update.assert_called_once_with([self.job.id])
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Full-text search requires PostgreSQL')
+class PostgresFullTextSearchTests(JobSearchTestMixin, TestCase):
+    """Tests full-text search chạy thật trên PostgreSQL"""
+
+    def test_search_ranks_title_above_description(self):
+        in_description = self._create_job(
+            "Backend Engineer", "backend-engineer-fts", description="We use python every day"
+        )
+        in_title = self._create_job("Python Developer", "python-developer-fts")
+        self._create_job("Accountant", "accountant-fts")
+
+        self.assertEqual(list(search_jobs('python')), [in_title, in_description])
+
+    def test_skill_names_are_searchable(self):
+        job = self._create_job("Backend Engineer", "backend-engineer-skill-fts")
+        category = SkillCategory.objects.create(name="Backend", slug="backend-fts")
+        skill = Skill.objects.create(name="Kubernetes", slug="kubernetes-fts", category=category)
+        JobSkill.objects.create(job=job, skill=skill, is_required=True)
+
+        self.assertEqual(list(search_jobs('kubernetes')), [job])
@@ -3,6 +3,9 @@ from rest_framework import status
 from apps.core.users.models import CustomUser
 from apps.company.companies.models import Company
 from apps.recruitment.jobs.models import Job
+from apps.recruitment.job_categories.models import JobCategory
+from apps.geography.provinces.models import Province
+from apps.geography.addresses.models import Address
 
 
 class JobViewTests(APITestCase):
@@ -49,7 +52,8 @@ class JobViewTests(APITestCase):
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertGreaterEqual(len(response.data), 1)
+        self.assertGreaterEqual(len(response.data['jobs']), 1)
+        self.assertIn('count', response.data)
     
     def test_list_jobs_with_filters(self):
         """Test GET /api/jobs/?job_type=full-time"""
@@ -57,9 +61,161 @@ class JobViewTests(APITestCase):
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        for job in response.data:
+        for job in response.data['jobs']:
             self.assertEqual(job['job_type'], 'full-time')
     
+    def test_list_jobs_page_size(self):
+        """Test GET /api/jobs/?page_size=2 - page number pagination"""
+        self._create_published_jobs(3)
+        
+        response = self.client.get('/api/jobs/?page_size=2')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['jobs']), 2)
+        self.assertEqual(response.data['count'], 4)
+        self.assertIsNotNone(response.data['next'])
+    
+    def test_list_jobs_cursor_pagination(self):
+        """Test GET /api/jobs/?pagination=cursor - keyset pagination đi hết các trang"""
+        self._create_published_jobs(4)
+        
+        url = '/api/jobs/?pagination=cursor&page_size=2'
+        seen_ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['jobs']), 2)
+            seen_ids.extend(job['id'] for job in response.data['jobs'])
+            url = response.data['next']
+        
+        self.assertEqual(len(seen_ids), 5)
+        self.assertEqual(len(set(seen_ids)), 5)
+    
+    def test_list_jobs_cursor_featured_first(self):
+        """Test keyset pagination giữ thứ tự featured trước"""
+        jobs = self._create_published_jobs(2)
+        Job.objects.filter(id=jobs[1].id).update(featured=True)
+        
+        response = self.client.get('/api/jobs/?pagination=cursor&page_size=1')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['jobs'][0]['id'], jobs[1].id)
+    
+    def test_list_jobs_invalid_cursor(self):
+        """Test cursor không hợp lệ → 404"""
+        response = self.client.get('/api/jobs/?cursor=not-a-cursor')
+        
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_list_jobs_cache_invalidated_on_publish(self):
+        """Test listing cache bị invalidate khi job mới được publish"""
+        self.client.get('/api/jobs/')
+        
+        draft = Job.objects.create(
+            company=self.company,
+            title="Go Developer",
+            slug="go-developer-1-test",
+            job_type="full-time",
+            level="junior",
+            description="Job description",
+            requirements="Job requirements",
+            status="draft",
+            created_by=self.user
+        )
+        self.client.force_authenticate(user=self.user)
+        self.client.post(f'/api/jobs/{draft.id}/publish/')
+        self.client.force_authenticate(user=None)
+        
+        response = self.client.get('/api/jobs/')
+        
+        job_ids = [job['id'] for job in response.data['jobs']]
+        self.assertIn(draft.id, job_ids)
+    
+    def test_list_jobs_search(self):
+        """Test GET /api/jobs/?search=python - full-text search"""
+        self._create_published_jobs(2)
+        
+        response = self.client.get('/api/jobs/?search=python')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        job_ids = [job['id'] for job in response.data['jobs']]
+        self.assertEqual(job_ids, [self.job.id])
+    
+    def test_list_jobs_search_no_results_has_suggestions(self):
+        """Test search không có kết quả → trả về did_you_mean"""
+        response = self.client.get('/api/jobs/?search=pyhton')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['jobs'], [])
+        self.assertIn('did_you_mean', response.data)
+    
+    # ========== SEARCH + FACETS Tests ==========
+    
+    def test_search_jobs_with_facets(self):
+        """Test GET /api/jobs/search/ - kết quả kèm facet counts"""
+        category = JobCategory.objects.create(name='IT', slug='it')
+        province = Province.objects.create(
+            province_code='HN',
+            province_name='Hà Nội',
+            province_type='municipality',
+            region='north',
+            is_active=True
+        )
+        address = Address.objects.create(address_line='1 Tràng Tiền', province=province)
+        jobs = self._create_published_jobs(2)
+        Job.objects.filter(id__in=[job.id for job in jobs]).update(
+            category=category, address=address, salary_max=15_000_000
+        )
+        
+        response = self.client.get('/api/jobs/search/')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        facets = response.data['facets']
+        self.assertEqual(facets['category'], [{'id': category.id, 'name': 'IT', 'count': 2}])
+        self.assertEqual(facets['province'], [{'id': province.id, 'name': 'Hà Nội', 'count': 2}])
+        level_counts = {item['value']: item['count'] for item in facets['level']}
+        self.assertEqual(level_counts, {'middle': 2, 'senior': 1})
+        salary_counts = {item['value']: item['count'] for item in facets['salary']}
+        self.assertEqual(salary_counts, {'negotiable': 1, '10m_20m': 2})
+    
+    def test_search_jobs_facets_follow_filters(self):
+        """Test facet counts phản ánh filter hiện tại"""
+        self._create_published_jobs(2)
+        
+        response = self.client.get('/api/jobs/search/?q=python&level=senior')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([job['id'] for job in response.data['jobs']], [self.job.id])
+        self.assertEqual(response.data['facets']['job_type'], [
+            {'value': 'full-time', 'label': 'Toàn thời gian', 'count': 1}
+        ])
+    
+    def test_search_jobs_excludes_drafts(self):
+        """Test /api/jobs/search/ chỉ trả về job đã đăng"""
+        Job.objects.filter(id=self.job.id).update(status='draft')
+        
+        response = self.client.get('/api/jobs/search/?status=draft')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 0)
+    
+    def _create_published_jobs(self, count):
+        return [
+            Job.objects.create(
+                company=self.company,
+                title=f"Backend Developer {i}",
+                slug=f"backend-developer-{i}-test",
+                job_type="full-time",
+                level="middle",
+                description="Job description",
+                requirements="Job requirements",
+                status="published",
+                created_by=self.user
+            )
+            for i in range(count)
+        ]
+    
     # ========== RETRIEVE Tests ==========
     
     def test_get_job_by_id(self):
@@ -3,6 +3,10 @@ from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny
 
+from apps.core.caching import CacheKeyBuilder, CacheService, CACHE_TIMEOUT_JOB_LIST
+from apps.core.counters import job_view_counter
+from apps.core.pagination import JobSearchPagination, JobKeysetPagination
+
 from .models import Job
 from .permissions import IsJobOwnerOrReadOnly
 from .serializers import (
@@ -20,7 +24,9 @@ from .selectors.jobs import (
     list_featured_jobs,
     list_urgent_jobs,
     get_similar_jobs,
-    get_job_recommendations
+    get_job_recommendations,
+    get_search_suggestions,
+    get_job_facets
 )
 from .services.jobs import (
     create_job,
@@ -42,6 +48,7 @@ from apps.recruitment.saved_jobs.selectors.saved_jobs import is_job_saved
 from apps.recruitment.job_views.selectors.job_views import get_viewer_demographics as get_demographics
 from apps.recruitment.job_views.selectors.job_views import get_view_chart_data
 from apps.recruitment.job_views.selectors.job_views import get_view_stats as get_job_view_stats
+from apps.recruitment.job_views.services.job_views import enqueue_job_view, get_client_ip
 
 
 class JobViewSet(viewsets.GenericViewSet):
@@ -50,12 +57,39 @@ class JobViewSet(viewsets.GenericViewSet):
     
     Endpoints:
     - GET    /api/jobs/               → list (public)
+    - GET    /api/jobs/search/        → search + facet counts (public)
     - POST   /api/jobs/               → create (authenticated + company owner)
     - GET    /api/jobs/:id/           → retrieve (public)
     - GET    /api/jobs/slug/:slug/    → retrieve by slug (public)
     - PUT    /api/jobs/:id/           → update (authenticated + owner)
     """
     permission_classes = [IsJobOwnerOrReadOnly]
+    pagination_class = JobSearchPagination
+    
+    # Chỉ cache N trang đầu của mỗi tổ hợp filter (trang được xem nhiều nhất)
+    LIST_CACHE_MAX_PAGE = 3
+    
+    @property
+    def paginator(self):
+        """
+        ?pagination=cursor → keyset pagination (chi phí mỗi trang không đổi),
+        mặc định → page number (JobSearchPagination).
+        """
+        if not hasattr(self, '_paginator'):
+            if self._use_keyset_pagination():
+                self._paginator = JobKeysetPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+    
+    def _use_keyset_pagination(self):
+        params = self.request.query_params
+        if self.action != 'list':
+            return False
+        # Kết quả search sắp xếp theo rank → không dùng keyset được
+        if params.get('search') or params.get('q'):
+            return False
+        return params.get('pagination') == 'cursor' or bool(params.get('cursor'))
     
     def get_queryset(self):
         filters = self._build_filters()
@@ -83,6 +117,9 @@ class JobViewSet(viewsets.GenericViewSet):
         if params.get('status'):
             filters['status'] = params['status']
         
+        if params.get('province_id'):
+            filters['province_id'] = int(params['province_id'])
+        
         if params.get('is_remote'):
             filters['is_remote'] = params['is_remote'].lower() == 'true'
         
@@ -92,19 +129,102 @@ class JobViewSet(viewsets.GenericViewSet):
         if params.get('salary_max'):
             filters['salary_max'] = params['salary_max']
         
-        if params.get('search'):
-            filters['search'] = params['search']
+        search = params.get('search') or params.get('q')
+        if search:
+            filters['search'] = search
         
         return filters
     
+    def _get_list_cache_key(self):
+        """
+        Build cache key cho trang listing/search hiện tại.
+        Trả về None nếu request không nên cache (trang sâu, listing không public).
+        """
+        params = self.request.query_params
+        
+        if self.action == 'list' and params.get('status') not in (None, '', 'published'):
+            return None
+        
+        if self._use_keyset_pagination():
+            # Chỉ cache trang đầu của cursor mode
+            if params.get('cursor'):
+                return None
+            page = 'cursor'
+        else:
+            page = params.get('page', '1')
+            if not page.isdigit() or int(page) > self.LIST_CACHE_MAX_PAGE:
+                return None
+        
+        return CacheKeyBuilder.job_list(
+            CacheService.get_job_list_version(),
+            view=self.action,
+            page=page,
+            page_size=params.get('page_size', ''),
+            **self._build_filters()
+        )
+    
     def list(self, request):
         """
             GET /api/jobs/
-            Danh sách tin tuyển dụng (public, có filter)
-        """
+            Danh sách tin tuyển dụng (public, có filter, phân trang)
+            
+            Query params:
+            - page, page_size: page number pagination (mặc định)
+            - pagination=cursor, cursor: keyset pagination
+            - search: full-text search, kèm did_you_mean khi không có kết quả
+        """
+        cache_key = self._get_list_cache_key()
+        if cache_key:
+            cached_data = CacheService.get(cache_key)
+            if cached_data is not None:
+                return Response(cached_data)
+        
         queryset = self.get_queryset()
-        serializer = JobListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        page = self.paginate_queryset(queryset)
+        serializer = JobListSerializer(page, many=True)
+        response = self.get_paginated_response(serializer.data)
+        
+        search = self._build_filters().get('search')
+        if search and not page:
+            response.data['did_you_mean'] = get_search_suggestions(search)
+        
+        if cache_key:
+            CacheService.set(cache_key, response.data, CACHE_TIMEOUT_JOB_LIST)
+        
+        return response
+    
+    @action(detail=False, methods=['get'], url_path='search')
+    def search(self, request):
+        """
+            GET /api/jobs/search/
+            Tìm kiếm việc làm đã đăng kèm facet counts trong một response
+            
+            Query params: q (hoặc search), các filter như list, page, page_size
+            Response: jobs (phân trang) + facets (category, level, job_type,
+            province, salary)
+        """
+        cache_key = self._get_list_cache_key()
+        if cache_key:
+            cached_data = CacheService.get(cache_key)
+            if cached_data is not None:
+                return Response(cached_data)
+        
+        filters = self._build_filters()
+        filters['status'] = 'published'
+        queryset = list_jobs(filters)
+        
+        page = self.paginate_queryset(queryset)
+        serializer = JobListSerializer(page, many=True)
+        response = self.get_paginated_response(serializer.data)
+        response.data['facets'] = get_job_facets(queryset)
+        
+        if filters.get('search') and not page:
+            response.data['did_you_mean'] = get_search_suggestions(filters['search'])
+        
+        if cache_key:
+            CacheService.set(cache_key, response.data, CACHE_TIMEOUT_JOB_LIST)
+        
+        return response
     
     def create(self, request):
         """
@@ -136,7 +256,7 @@ class JobViewSet(viewsets.GenericViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        return Response(JobDetailSerializer(job).data)
+        return Response(self._serialize_detail(job))
     
     @action(detail=False, methods=['get'], url_path='slug/(?P<slug>[^/.]+)')
     def retrieve_by_slug(self, request, slug=None):
@@ -151,7 +271,13 @@ class JobViewSet(viewsets.GenericViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        return Response(JobDetailSerializer(job).data)
+        return Response(self._serialize_detail(job))
+    
+    def _serialize_detail(self, job):
+        """Chi tiết job, view_count gồm cả lượt xem chưa flush xuống DB."""
+        data = JobDetailSerializer(job).data
+        data['view_count'] = job_view_counter.value(job)
+        return data
     
     def update(self, request, pk=None):
         """
@@ -306,21 +432,29 @@ class JobViewSet(viewsets.GenericViewSet):
     def featured(self, request):
         """
             GET /api/jobs/featured/
-            Việc làm nổi bật
-        """
-        queryset = list_featured_jobs()
-        serializer = JobListSerializer(queryset, many=True)
-        return Response(serializer.data)
+            Việc làm nổi bật (cache theo version job listing)
+        """
+        cache_key = CacheKeyBuilder.job_list(CacheService.get_job_list_version(), view='featured')
+        data = CacheService.get_or_set(
+            cache_key,
+            lambda: JobListSerializer(list_featured_jobs(), many=True).data,
+            CACHE_TIMEOUT_JOB_LIST
+        )
+        return Response(data)
     
     @action(detail=False, methods=['get'], url_path='urgent')
     def urgent(self, request):
         """
             GET /api/jobs/urgent/
-            Việc làm gấp (deadline trong 7 ngày)
-        """
-        queryset = list_urgent_jobs()
-        serializer = JobListSerializer(queryset, many=True)
-        return Response(serializer.data)
+            Việc làm gấp (deadline trong 7 ngày, cache theo version job listing)
+        """
+        cache_key = CacheKeyBuilder.job_list(CacheService.get_job_list_version(), view='urgent')
+        data = CacheService.get_or_set(
+            cache_key,
+            lambda: JobListSerializer(list_urgent_jobs(), many=True).data,
+            CACHE_TIMEOUT_JOB_LIST
+        )
+        return Response(data)
     
     @action(detail=True, methods=['get'], url_path='similar')
     def similar(self, request, pk=None):
@@ -366,7 +500,7 @@ class JobViewSet(viewsets.GenericViewSet):
     def record_view(self, request, pk=None):
         """
             POST /api/jobs/:id/view/
-            Ghi nhận lượt xem
+            Ghi nhận lượt xem (counter + event vào stream, không INSERT đồng bộ)
         """
         job = get_job_by_id(pk)
         if not job:
@@ -375,8 +509,15 @@ class JobViewSet(viewsets.GenericViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        updated = record_job_view(job)
-        return Response({"view_count": updated.view_count})
+        view_count = record_job_view(job)
+        enqueue_job_view(
+            job.id,
+            user_id=request.user.id if request.user.is_authenticated else None,
+            ip_address=get_client_ip(request),
+            user_agent=request.META.get('HTTP_USER_AGENT'),
+            referrer=request.META.get('HTTP_REFERER')
+        )
+        return Response({"view_count": view_count})
     
     @action(detail=True, methods=['post', 'delete'], url_path='feature')
     def feature(self, request, pk=None):
@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class CounterFlushesConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.system.counter_flushes'
+    label = 'system_counter_flushes'
@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CounterFlush',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('generation', models.CharField(max_length=64, unique=True, verbose_name='Mã lần flush')),
+                ('counter', models.CharField(max_length=150, verbose_name='Bộ đếm')),
+                ('record_count', models.PositiveIntegerField(default=0, verbose_name='Số bản ghi')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Ngày tạo')),
+            ],
+            options={
+                'verbose_name': 'Lần flush bộ đếm',
+                'verbose_name_plural': 'Lần flush bộ đếm',
+                'db_table': 'counter_flushes',
+            },
+        ),
+    ]
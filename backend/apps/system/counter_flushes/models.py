@@ -0,0 +1,33 @@
+from django.db import models
+
+
+class CounterFlush(models.Model):
+    """Bảng Counter_Flushes - Các lần flush bộ đếm write-behind đã ghi xuống DB"""
+    
+    generation = models.CharField(
+        max_length=64,
+        unique=True,
+        verbose_name='Mã lần flush'
+    )
+    counter = models.CharField(
+        max_length=150,
+        verbose_name='Bộ đếm'
+    )
+    record_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Số bản ghi'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True,
+        verbose_name='Ngày tạo'
+    )
+    
+    class Meta:
+        app_label = 'system_counter_flushes'
+        db_table = 'counter_flushes'
+        verbose_name = 'Lần flush bộ đếm'
+        verbose_name_plural = 'Lần flush bộ đếm'
+    
+    def __str__(self):
+        return f"{self.counter} - {self.generation}"
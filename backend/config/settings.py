@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+from celery.schedules import crontab
 from dotenv import load_dotenv
 
 # Load .env file
@@ -173,6 +174,7 @@ INSTALLED_APPS = [
     'apps.system.search_history',
     'apps.system.faqs',
     'apps.system.job_search_history',
+    'apps.system.counter_flushes',
 ]
 
 MIDDLEWARE = [
@@ -219,6 +221,12 @@ CHANNEL_LAYERS = {
 # EventStream Settings cho SSE
 EVENTSTREAM_STORAGE_CLASS = 'django_eventstream.storage.DjangoModelStorage'
 
+# Redis pub/sub cho SSE notifications
+NOTIFICATION_STREAM_REDIS_URL = os.getenv(
+    'NOTIFICATION_STREAM_REDIS_URL',
+    f"redis://{os.getenv('REDIS_HOST', 'localhost')}:6379/0"
+)
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -350,6 +358,16 @@ EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'True').lower() == 'true'
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
 DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', EMAIL_HOST_USER)
+# Email outbox: số email mỗi lô (1 kết nối SMTP / lô), số lần thử và backoff (giây)
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', 100))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', 5))
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = int(os.getenv('EMAIL_OUTBOX_RETRY_BASE_SECONDS', 60))
+# Email campaign: số người nhận mỗi chunk, tốc độ gửi (email/giây), thời gian tối đa mỗi lần chạy task (giây)
+EMAIL_CAMPAIGN_CHUNK_SIZE = int(os.getenv('EMAIL_CAMPAIGN_CHUNK_SIZE', 200))
+EMAIL_CAMPAIGN_RATE_PER_SECOND = float(os.getenv('EMAIL_CAMPAIGN_RATE_PER_SECOND', 50))
+EMAIL_CAMPAIGN_RUN_SECONDS = int(os.getenv('EMAIL_CAMPAIGN_RUN_SECONDS', 240))
+# Số email template (DB) đã compile giữ trong mỗi process
+EMAIL_TEMPLATE_CACHE_SIZE = int(os.getenv('EMAIL_TEMPLATE_CACHE_SIZE', 256))
 
 # ===== VN Pay Configuration =====
 VNP_TMN_CODE = os.getenv('VNP_TMN_CODE', '')
@@ -360,10 +378,66 @@ VNP_RETURN_URL = os.getenv('VNP_RETURN_URL', 'http://localhost:3000/billing/paym
 # ===== MongoDB Configuration (Chat) =====
 MONGO_URI = os.getenv('MONGO_URI', 'mongodb://mongo:27017/')
 MONGO_DB_NAME = os.getenv('MONGO_DB_NAME', 'jobportal_chat')
+# Tạo index messages / unread_counters khi process kết nối Mongo lần đầu
+MONGO_ENSURE_INDEXES = os.getenv('MONGO_ENSURE_INDEXES', 'True').lower() == 'true'
+# Buffer tin nhắn WebSocket: flush khi đủ số tin hoặc sau số giây
+CHAT_BUFFER_MAX_MESSAGES = int(os.getenv('CHAT_BUFFER_MAX_MESSAGES', 200))
+CHAT_BUFFER_FLUSH_INTERVAL = float(os.getenv('CHAT_BUFFER_FLUSH_INTERVAL', 0.5))
 
 # ===== AI Configuration =====
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+# Backend embedding cho semantic matching (dotted path)
+AI_EMBEDDING_BACKEND = os.getenv(
+    'AI_EMBEDDING_BACKEND',
+    'apps.assessment.ai_matching_scores.services.embeddings.GeminiEmbeddingBackend'
+)
+# Số ứng viên / việc làm tối đa được đưa vào bước chấm điểm (top-K)
+AI_MATCHING_SHORTLIST_SIZE = int(os.getenv('AI_MATCHING_SHORTLIST_SIZE', 500))
+# Số đối tượng chấm điểm trong mỗi Celery subtask
+AI_MATCHING_CHUNK_SIZE = int(os.getenv('AI_MATCHING_CHUNK_SIZE', 100))
+# Thời gian gom (giây) các thay đổi trước khi tính lại AI matching
+AI_MATCHING_DEBOUNCE_SECONDS = int(os.getenv('AI_MATCHING_DEBOUNCE_SECONDS', 60))
+
+# ===== Job Alerts =====
+# Số alert được xử lý (tạo notification) trong mỗi Celery subtask
+JOB_ALERT_FANOUT_CHUNK_SIZE = int(os.getenv('JOB_ALERT_FANOUT_CHUNK_SIZE', 1000))
+# Số user được gửi digest (daily/weekly) trong mỗi Celery subtask
+JOB_ALERT_DIGEST_CHUNK_SIZE = int(os.getenv('JOB_ALERT_DIGEST_CHUNK_SIZE', 500))
+# Số việc làm tối đa liệt kê cho mỗi alert trong email digest
+JOB_ALERT_DIGEST_MAX_JOBS = int(os.getenv('JOB_ALERT_DIGEST_MAX_JOBS', 10))
+# URL frontend dùng cho link trong email
+FRONTEND_URL = os.getenv('FRONTEND_URL', 'http://localhost:3000')
+
+# ===== Job Views =====
+# Số event lượt xem mỗi lô khi đọc từ Redis stream
+JOB_VIEW_INGEST_BATCH_SIZE = int(os.getenv('JOB_VIEW_INGEST_BATCH_SIZE', 1000))
+# Độ dài tối đa (xấp xỉ) của stream nếu consumer ngừng chạy
+JOB_VIEW_STREAM_MAXLEN = int(os.getenv('JOB_VIEW_STREAM_MAXLEN', 1000000))
+
+# ===== Application Export =====
+# Số dòng đọc từ DB mỗi chunk khi export
+APPLICATION_EXPORT_CHUNK_SIZE = int(os.getenv('APPLICATION_EXPORT_CHUNK_SIZE', 2000))
+# Export nhiều hơn số dòng này được ghi ra file trong Celery thay vì stream trong request
+APPLICATION_EXPORT_ASYNC_THRESHOLD = int(os.getenv('APPLICATION_EXPORT_ASYNC_THRESHOLD', 5000))
+# Số giờ file export chạy nền được giữ lại để tải về
+APPLICATION_EXPORT_TTL_HOURS = int(os.getenv('APPLICATION_EXPORT_TTL_HOURS', 24))
+# Storage riêng cho file export (chứa dữ liệu ứng viên): không phục vụ qua /media/,
+# chỉ tải qua API có xác thực. Cần dùng chung giữa Celery worker và web
+# (Cloudinary raw hoặc volume chung).
+if os.getenv('CLOUDINARY_CLOUD_NAME'):
+    APPLICATION_EXPORT_STORAGE = {
+        'BACKEND': 'cloudinary_storage.storage.RawMediaCloudinaryStorage',
+        'OPTIONS': {},
+    }
+else:
+    APPLICATION_EXPORT_STORAGE = {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+        'OPTIONS': {
+            'location': os.getenv('APPLICATION_EXPORT_ROOT', os.path.join(BASE_DIR, 'private', 'exports')),
+            'base_url': None,
+        },
+    }
 
 # ===== Celery Configuration =====
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://redis:6379/0')
@@ -372,6 +446,61 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+# apps.core không phải Django app nên autodiscover_tasks không tìm thấy
+CELERY_IMPORTS = ('apps.core.tasks',)
+CELERY_BEAT_SCHEDULE = {
+    # Gom các thay đổi hồ sơ / việc làm rồi mới tính lại AI matching
+    'ai-matching-flush-dirty': {
+        'task': 'apps.assessment.ai_matching_scores.tasks.flush_dirty_matches_task',
+        'schedule': 30.0,
+    },
+    # Gửi email còn tồn trong outbox (email lỗi chờ retry, kick bị mất)
+    'email-outbox-deliver': {
+        'task': 'apps.email.tasks.deliver_email_outbox_task',
+        'schedule': 60.0,
+    },
+    # Bắt đầu gửi các email campaign đã đến giờ
+    'email-campaigns-dispatch': {
+        'task': 'apps.email.tasks.dispatch_due_campaigns_task',
+        'schedule': 60.0,
+    },
+    # Digest job alert: daily lúc 8h mỗi ngày, weekly lúc 8h thứ Hai
+    'job-alert-daily-digest': {
+        'task': 'apps.communication.job_alerts.tasks.dispatch_job_alert_digests_task',
+        'schedule': crontab(hour=8, minute=0),
+        'args': ('daily',),
+    },
+    'job-alert-weekly-digest': {
+        'task': 'apps.communication.job_alerts.tasks.dispatch_job_alert_digests_task',
+        'schedule': crontab(hour=8, minute=0, day_of_week='monday'),
+        'args': ('weekly',),
+    },
+    # Chuyển event lượt xem job từ Redis stream vào bảng job_views
+    'job-views-ingest': {
+        'task': 'apps.recruitment.job_views.tasks.ingest_job_views_task',
+        'schedule': 10.0,
+    },
+    # Tổng hợp lượt xem job theo ngày (chạy mỗi giờ để nhận event đến muộn)
+    'job-views-rollup': {
+        'task': 'apps.recruitment.job_views.tasks.rollup_job_views_task',
+        'schedule': crontab(minute=10),
+    },
+    # Ghi các bộ đếm lượt xem / lượt tải đang đệm trong Redis xuống DB
+    'counters-flush': {
+        'task': 'apps.core.tasks.flush_counters_task',
+        'schedule': 30.0,
+    },
+    # Xóa file export applications đã hết hạn
+    'application-exports-cleanup': {
+        'task': 'apps.recruitment.applications.tasks.cleanup_application_exports_task',
+        'schedule': crontab(minute=20),
+    },
+    # Dọn cache key của các tag version cũ (SCAN, ngoài giờ cao điểm)
+    'cache-sweep-stale-tags': {
+        'task': 'apps.core.tasks.sweep_stale_cache_tags_task',
+        'schedule': crontab(hour=3, minute=30),
+    },
+}
 # ===== Redis Cache Configuration =====
 CACHES = {
     'default': {
@@ -405,6 +534,13 @@ if DEBUG and not os.getenv('REDIS_CACHE_URL'):
         }
     }
 
+# L1 cache trong process đặt trước Redis cho CacheService.get_or_set
+CACHE_L1_MAX_ENTRIES = int(os.getenv('CACHE_L1_MAX_ENTRIES', '1024'))
+CACHE_L1_TTL = float(os.getenv('CACHE_L1_TTL', '5'))
+# Thời gian giữ bản cũ sau khi hết hạn (phục vụ trong lúc 1 worker tính lại)
+CACHE_STALE_TTL = int(os.getenv('CACHE_STALE_TTL', '300'))
+CACHE_RECOMPUTE_LOCK_TIMEOUT = int(os.getenv('CACHE_RECOMPUTE_LOCK_TIMEOUT', '30'))
+
 # Session engine using cache (optional - for performance)
 # SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
 # SESSION_CACHE_ALIAS = 'default'
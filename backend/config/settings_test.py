@@ -59,6 +59,7 @@ INSTALLED_APPS = [
     'apps.system.search_history',
     'apps.system.faqs',
     'apps.system.job_search_history',
+    'apps.system.counter_flushes',
     # Candidate Domain (recruiters, education, experience, skills, certifications, languages, projects)
     'apps.candidate.recruiters',
     'apps.candidate.recruiter_education',